@@ -0,0 +1,3 @@
+"""
+Offline benchmarks of the Waves-Litecoin-Gateway services.
+"""
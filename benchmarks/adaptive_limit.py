@@ -0,0 +1,110 @@
+"""
+Scans blocks while catching up and sends payouts at the same time against a FakeLitecoind that handles only a few
+requests at a time and rejects requests exceeding its work queue, like a node with small rpcthreads and rpcworkqueue.
+Compares sending every request right away through a large connection pool with the LitecoinAdaptiveLimiter.
+
+Run with: python3.5 -m benchmarks.adaptive_limit --blocks 100 --txs 50 --rpc-threads 4 --work-queue 2 --payouts 50
+"""
+
+import argparse
+import time
+from decimal import Decimal
+from typing import Any, List, Optional
+
+import gevent
+from waves_gateway import TransactionAttempt, TransactionAttemptReceiver
+
+from waves_litecoin_gateway.lib import LitecoinAdaptiveLimiter, LitecoinChainQueryService, \
+    LitecoinRpcConnectionPool, LitecoinTransactionDecoder, LitecoinTransactionService
+from .fake_litecoind import FakeLitecoind
+from .rpc_suite import call_with_retries, percentile
+from .synthetic_chain import SyntheticChain
+
+
+def measure(mode: str, node: FakeLitecoind, chain: SyntheticChain, blocks: int, payouts: int, pool_size: int,
+            prefetch_window: int, max_limit: Optional[int]) -> None:
+    """Scans the given number of blocks while sending the payouts one after another and reports the results."""
+    limiter = None
+
+    if max_limit is not None:
+        # like the gateway, so that the requests wait for the limiter by their priority instead of for a connection
+        pool_size = max(pool_size, max_limit)
+
+    ltc_proxy = LitecoinRpcConnectionPool(node.url, pool_size=pool_size)  # type: Any
+
+    if max_limit is not None:
+        limiter = LitecoinAdaptiveLimiter(ltc_proxy, initial_limit=4, max_limit=max_limit)
+        ltc_proxy = limiter
+
+    chain_query_service = LitecoinChainQueryService(
+        ltc_proxy, batch_size=100, transaction_decoder=LitecoinTransactionDecoder(), prefetch_window=prefetch_window)
+    transaction_service = LitecoinTransactionService(ltc_proxy, chain_query_service)
+    payout_latencies = list()  # type: List[float]
+    retries = [0]
+    scan_duration = [0.0]
+
+    def scan() -> None:
+        start = time.perf_counter()
+        call_with_retries(chain_query_service.get_height_of_highest_block, retries)
+
+        for height in range(0, blocks):
+            call_with_retries(lambda: chain_query_service.get_transactions_of_block_at_height(height), retries)
+
+        scan_duration[0] = time.perf_counter() - start
+
+    def send_coins() -> None:
+        for _ in range(0, payouts):
+            attempt = TransactionAttempt(
+                sender=node.wallet_address,
+                receivers=[TransactionAttemptReceiver(address=chain.create_address(), amount=Decimal('0.01'))],
+                fee=Decimal('0.0001'),
+                currency='ltc')
+            start = time.perf_counter()
+            call_with_retries(lambda: transaction_service.send_coin(attempt), retries)
+            payout_latencies.append(time.perf_counter() - start)
+
+    node.reset_counters()
+    gevent.joinall([gevent.spawn(scan), gevent.spawn(send_coins)], raise_error=True)
+
+    print('%-22s %8.3fs scan %6d requests %5d rejected %5d retries %9.1fms payout p50 %9.1fms payout p99 %s' %
+          (mode, scan_duration[0], node.requests, node.rejected, retries[0], 1000 * percentile(payout_latencies, 0.5),
+           1000 * percentile(payout_latencies, 0.99), '' if limiter is None else 'limit %d' % limiter.limit))
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--blocks', type=int, default=100, help='blocks to scan')
+    arg_parser.add_argument('--txs', type=int, default=50, help='transactions per block')
+    arg_parser.add_argument('--inputs', type=int, default=2, help='inputs per transaction')
+    arg_parser.add_argument('--payouts', type=int, default=50, help='payouts to send while scanning')
+    arg_parser.add_argument('--rpc-threads', type=int, default=4, help='requests the node handles at a time')
+    arg_parser.add_argument('--work-queue', type=int, default=2, help='requests the node queues')
+    arg_parser.add_argument('--pool-size', type=int, default=32)
+    arg_parser.add_argument('--prefetch-window', type=int, default=32)
+    arg_parser.add_argument('--max-limit', type=int, default=32)
+    arg_parser.add_argument('--latency-ms', type=float, default=5.0, help='simulated latency per HTTP request')
+    args = arg_parser.parse_args()
+
+    chain = SyntheticChain(txs_per_block=args.txs, inputs_per_tx=args.inputs)
+
+    # the blocks closest to the highest block are never prefetched
+    for _ in range(0, args.blocks + args.prefetch_window):
+        chain.create_block()
+
+    for mode, max_limit in [('without limit', None), ('adaptive limit', args.max_limit)]:
+        node = FakeLitecoind(
+            chain,
+            latency_s=args.latency_ms / 1000,
+            wallet_utxos=args.payouts * 2,
+            rpc_threads=args.rpc_threads,
+            work_queue=args.work_queue)
+        node.start()
+
+        try:
+            measure(mode, node, chain, args.blocks, args.payouts, args.pool_size, args.prefetch_window, max_limit)
+        finally:
+            node.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Compares the integer conversion of the LitecoinIntegerConverterService with the conversion it used before,
+which converted every amount on its own by using the Fractions of the framework.
+
+Run with: python3.5 -m benchmarks.amount_conversion --txs 2000 --receivers 2
+"""
+
+import argparse
+import random
+import time
+from decimal import Decimal
+from numbers import Number
+from typing import Callable, List
+
+import waves_gateway as wg
+
+from waves_litecoin_gateway.lib import LitecoinIntegerConverterService
+
+
+class OriginalIntegerConverterService(wg.IntegerConverterService):
+    """The LitecoinIntegerConverterService before the conversions were computed on Decimals."""
+
+    def __init__(self, ltc_factor: int, ltc_round_precision: int) -> None:
+        self._ltc_factor = ltc_factor
+        self._ltc_round_precision = ltc_round_precision
+
+    def convert_amount_to_int(self, amount: Decimal) -> int:
+        return wg.convert_to_int(amount, self._ltc_factor)
+
+    def revert_amount_conversion(self, amount: int) -> Number:
+        return wg.convert_to_decimal(amount, self._ltc_factor, self._ltc_round_precision)
+
+
+def create_block(txs: int, receivers: int, rng: random.Random) -> List[wg.Transaction]:
+    return [
+        wg.Transaction(
+            tx='%064x' % i,
+            receivers=[
+                wg.TransactionReceiver('receiver' + str(n),
+                                       Decimal(rng.randint(1, 10**10)).scaleb(-8)) for n in range(0, receivers)
+            ],
+            senders=[wg.TransactionSender('sender' + str(i))]) for i in range(0, txs)
+    ]
+
+
+def measure(name: str, repetitions: int, func: Callable[[], object]) -> None:
+    start = time.perf_counter()
+
+    for _ in range(0, repetitions):
+        func()
+
+    duration = time.perf_counter() - start
+
+    print('%-48s %10.3fms' % (name, duration * 1000 / repetitions))
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--txs', type=int, default=2000, help='transactions per block')
+    arg_parser.add_argument('--receivers', type=int, default=2, help='receivers per transaction')
+    arg_parser.add_argument('--repetitions', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(1)
+    block = create_block(args.txs, args.receivers, rng)
+    amounts = [receiver.amount for transaction in block for receiver in transaction.receivers]
+    original = OriginalIntegerConverterService(10**8, 8)
+    converter = LitecoinIntegerConverterService(10**8, 8)
+    satoshis = converter.convert_amounts_to_int(amounts)
+
+    measure('original: convert block', args.repetitions,
+            lambda: [original.convert_transaction_to_int(transaction) for transaction in block])
+    measure('satoshis: convert block', args.repetitions, lambda: converter.convert_transactions_to_int(block))
+    measure('original: revert amounts', args.repetitions,
+            lambda: [original.revert_amount_conversion(amount) for amount in satoshis])
+    measure('satoshis: revert amounts', args.repetitions, lambda: converter.revert_amount_conversions(satoshis))
+
+    drift = sum(1 for amount in satoshis if original.revert_amount_conversion(amount) != Decimal(amount).scaleb(-8))
+    print('%d of %d amounts are reverted inexactly by the original conversion' % (drift, len(satoshis)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Measures the latency of HTTP requests served by the same process while the LitecoinChainQueryService scans a large
+block, when decoding the transactions in the gateway and when decoding them in a LitecoinDecodingPool.
+The simulated node returns the blocks without decoded transactions, so that every transaction is decoded from
+its serialized form in both cases.
+
+Run with: python3.5 -m benchmarks.api_latency --txs 20000 --inputs 2 --processes 4
+"""
+
+import argparse
+import time
+import urllib.request
+from typing import List, Optional
+
+import gevent
+from gevent.pywsgi import WSGIServer
+
+from waves_litecoin_gateway.lib import LitecoinChainQueryService, LitecoinDecodingPool, LitecoinTransactionDecoder
+from .synthetic_chain import SyntheticChain, SimulatedLitecoinProxy
+
+
+def _application(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'application/json')])
+    return [b'{"status": "ok"}']
+
+
+def _request_continuously(url: str, interval_s: float, latencies: List[float]) -> None:
+    """
+    Sends a request every interval_s seconds. The latency is measured from the time the request was due,
+    so that it includes the time the request greenlet could not run.
+    """
+    due = time.perf_counter()
+
+    while True:
+        gevent.sleep(max(0.0, due - time.perf_counter()))
+        urllib.request.urlopen(url).read()
+        latencies.append(time.perf_counter() - due)
+        due += interval_s
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(len(values) * percentile))]
+
+
+def measure(mode: str, chain: SyntheticChain, batch_size: int, decoding_pool: Optional[LitecoinDecodingPool], url: str,
+            interval_s: float, latency_s: float) -> None:
+    """Scans the highest block of the given chain while requesting the given url and reports the latencies."""
+    chain_query_service = LitecoinChainQueryService(
+        SimulatedLitecoinProxy(chain, latency_s=latency_s, supports_verbose_blocks=False),
+        batch_size=batch_size,
+        transaction_decoder=LitecoinTransactionDecoder(),
+        decoding_pool=decoding_pool)
+    latencies = list()  # type: List[float]
+    requests = gevent.spawn(_request_continuously, url, interval_s, latencies)
+
+    start = time.perf_counter()
+    transactions = len(chain_query_service.get_transactions_of_block_at_height(chain.height))
+    duration = time.perf_counter() - start
+    requests.kill()
+
+    print('%-24s %6d txs %8.3fs scan %5d requests %8.1fms p50 %8.1fms p99 %8.1fms max' %
+          (mode, transactions, duration, len(latencies), _percentile(latencies, 0.5) * 1000,
+           _percentile(latencies, 0.99) * 1000, max(latencies) * 1000))
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--txs', type=int, default=20000, help='transactions per block')
+    arg_parser.add_argument('--inputs', type=int, default=2, help='inputs per transaction')
+    arg_parser.add_argument('--batch-size', type=int, default=100)
+    arg_parser.add_argument('--processes', type=int, default=4, help='worker processes of the decoding pool')
+    arg_parser.add_argument('--interval-ms', type=float, default=10.0, help='pause between two HTTP requests')
+    arg_parser.add_argument('--latency-ms', type=float, default=1.0, help='simulated latency per round trip')
+    args = arg_parser.parse_args()
+
+    chain = SyntheticChain(txs_per_block=args.txs, inputs_per_tx=args.inputs)
+    chain.create_block()
+
+    server = WSGIServer(('127.0.0.1', 0), _application, log=None)
+    server.start()
+    url = 'http://127.0.0.1:%d/' % server.server_port
+    decoding_pool = LitecoinDecodingPool(args.processes)
+    decoding_pool.start()
+    # the first call waits until the worker processes are ready
+    decoding_pool.decode_transactions([chain.get_raw_transaction(chain.get_block(0)['tx'][0]['txid'])] * args.processes)
+
+    try:
+        measure('decoded in the gateway', chain, args.batch_size, None, url, args.interval_ms / 1000,
+                args.latency_ms / 1000)
+        measure('decoding pool', chain, args.batch_size, decoding_pool, url, args.interval_ms / 1000,
+                args.latency_ms / 1000)
+    finally:
+        decoding_pool.stop()
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Compares how fast the LitecoinChainQueryService catches up with a chain through a FakeLitecoind and how many bytes
+the node sends, when fetching every block and when skipping the blocks whose compact filter (BIP158) does not match
+an address of the gateway. Every deposit_interval-th block pays to one of the addresses.
+
+Run with: python3.5 -m benchmarks.block_filters --blocks 200 --txs 200 --addresses 100 --deposit-interval 20
+"""
+
+import argparse
+import time
+from typing import List
+
+from waves_litecoin_gateway.lib import LitecoinAddressIndex, LitecoinChainQueryService, LitecoinNetwork, \
+    LitecoinRpcConnectionPool, LitecoinTransactionDecoder
+from .fake_litecoind import FakeLitecoind
+from .synthetic_chain import SyntheticChain
+
+
+def measure(node: FakeLitecoind, addresses: List[str], blocks: int, prefetch_window: int, block_filters: bool) -> None:
+    """Scans the given number of blocks in order and reports the duration and the transferred bytes."""
+    chain_query_service = LitecoinChainQueryService(
+        LitecoinRpcConnectionPool(node.url, pool_size=8),
+        batch_size=100,
+        transaction_decoder=LitecoinTransactionDecoder(),
+        address_index=LitecoinAddressIndex(addresses, network=LitecoinNetwork.by_name('mainnet')),
+        prefetch_window=prefetch_window,
+        block_filters=block_filters)
+    node.reset_counters()
+    deposits = 0
+
+    start = time.perf_counter()
+    chain_query_service.get_height_of_highest_block()
+
+    for height in range(0, blocks):
+        deposits += len(chain_query_service.get_transactions_of_block_at_height(height))
+
+    duration = time.perf_counter() - start
+
+    print('%-16s %6d blocks %8.3fs %8.1f blocks/s %9.2f MB %5d deposits %5d skipped %4d false positives' %
+          ('block filters'
+           if block_filters else 'full blocks', blocks, duration, blocks / duration, node.response_bytes / 1e6,
+           deposits, chain_query_service.block_filter_skipped_blocks, chain_query_service.block_filter_false_positives))
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--blocks', type=int, default=200, help='blocks to catch up with')
+    arg_parser.add_argument('--txs', type=int, default=200, help='transactions per block')
+    arg_parser.add_argument('--addresses', type=int, default=100, help='addresses of the gateway')
+    arg_parser.add_argument('--deposit-interval', type=int, default=20, help='blocks per block with a deposit')
+    arg_parser.add_argument('--latency-ms', type=float, default=1.0, help='simulated latency per HTTP request')
+    arg_parser.add_argument('--prefetch-window', type=int, default=16)
+    args = arg_parser.parse_args()
+
+    chain = SyntheticChain(txs_per_block=args.txs, inputs_per_tx=1)
+    addresses = [chain.create_address() for _ in range(0, args.addresses)]
+
+    # the blocks closest to the highest block are never prefetched
+    for height in range(0, args.blocks + args.prefetch_window):
+        if height % args.deposit_interval == 0:
+            chain.create_block(deposits=[(addresses[height % len(addresses)], 100000)])
+        else:
+            chain.create_block()
+
+        # the filters are built in advance, as the node keeps them in its index
+        chain.get_block_filter(chain.get_block(height)['hash'])
+
+    node = FakeLitecoind(chain, latency_s=args.latency_ms / 1000, wallet_utxos=0)
+    node.start()
+
+    try:
+        for block_filters in [False, True]:
+            measure(node, addresses, args.blocks, args.prefetch_window, block_filters)
+    finally:
+        node.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Compares the block ingestion of the LitecoinChainQueryService with and without JSON-RPC batch requests
+and local transaction decoding, as well as with an address index that only matches some of the transactions.
+
+Run with: python3.5 -m benchmarks.block_ingestion --txs 2000 --inputs 2 --latency-ms 1 --relevant-ratio 0.01
+"""
+
+import argparse
+import time
+from typing import Optional
+
+import waves_gateway as wg
+
+from waves_litecoin_gateway.lib import LitecoinChainQueryService, LitecoinTransactionDecoder, LitecoinAddressIndex
+from .synthetic_chain import SyntheticChain, SimulatedLitecoinProxy
+
+
+def measure(chain: SyntheticChain,
+            latency_s: float,
+            batch_size: Optional[int],
+            supports_verbose_blocks: bool,
+            decode_locally: bool = False,
+            address_index: Optional[LitecoinAddressIndex] = None) -> None:
+    """Scans the newest block of the given chain and prints the round trips and the wall time."""
+    proxy = SimulatedLitecoinProxy(chain, latency_s=latency_s, supports_verbose_blocks=supports_verbose_blocks)
+    transaction_decoder = LitecoinTransactionDecoder() if decode_locally else None
+    chain_query_service = LitecoinChainQueryService(
+        wg.ProxyGuard(proxy, max_parallel_access=1),
+        batch_size=batch_size,
+        transaction_decoder=transaction_decoder,
+        address_index=address_index)
+
+    start = time.perf_counter()
+    transactions = chain_query_service.get_transactions_of_block_at_height(chain.height)
+    duration = time.perf_counter() - start
+
+    if batch_size is None:
+        mode = 'single calls'
+    elif supports_verbose_blocks:
+        mode = 'batch size %d, getblock verbosity 2' % batch_size
+    else:
+        mode = 'batch size %d, getblock verbosity 1' % batch_size
+
+    if decode_locally:
+        mode += ', local decoding'
+
+    if address_index is not None:
+        mode += ', prefiltered'
+
+    print('%-68s %6d txs %8d round trips %8d calls %10.3fs' % (mode, len(transactions), proxy.round_trips, proxy.calls,
+                                                               duration))
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--txs', type=int, default=2000, help='transactions per block')
+    arg_parser.add_argument('--inputs', type=int, default=2, help='inputs per transaction')
+    arg_parser.add_argument('--latency-ms', type=float, default=1.0, help='simulated latency per round trip')
+    arg_parser.add_argument('--batch-size', type=int, default=100, help='calls per batch request')
+    arg_parser.add_argument(
+        '--relevant-ratio', type=float, default=0.01, help='share of the transactions that pay to a gateway address')
+    args = arg_parser.parse_args()
+
+    chain = SyntheticChain(txs_per_block=args.txs, inputs_per_tx=args.inputs)
+    block = chain.create_block()
+    latency_s = args.latency_ms / 1000
+
+    measure(chain, latency_s, None, True)
+    measure(chain, latency_s, None, True, decode_locally=True)
+    measure(chain, latency_s, args.batch_size, False)
+    measure(chain, latency_s, args.batch_size, False, decode_locally=True)
+    measure(chain, latency_s, args.batch_size, True)
+    measure(chain, latency_s, args.batch_size, True, decode_locally=True)
+
+    relevant_transactions = block['tx'][0:max(1, int(len(block['tx']) * args.relevant_ratio))]
+    address_index = LitecoinAddressIndex(
+        transaction['vout'][0]['scriptPubKey']['addresses'][0] for transaction in relevant_transactions)
+
+    measure(chain, latency_s, None, True, decode_locally=True, address_index=address_index)
+    measure(chain, latency_s, args.batch_size, True, decode_locally=True, address_index=address_index)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Measures the peak memory used while scanning large blocks, when collecting every transaction of a block at once
+with an unbounded number of greenlets and when iterating the transactions as they are resolved.
+
+Run with: python3.5 -m benchmarks.block_memory --txs 1000 4000 --inputs 2 --max-concurrency 16
+"""
+
+import argparse
+import copy
+import time
+import tracemalloc
+from typing import Optional
+
+from waves_litecoin_gateway.lib import LitecoinChainQueryService, LitecoinTransactionDecoder
+from .synthetic_chain import SyntheticChain, SimulatedLitecoinProxy
+
+
+class DecodingLitecoinProxy(SimulatedLitecoinProxy):
+    """Returns a new copy of a verbose block with every response, like a JSON-RPC client decoding it."""
+
+    def _getblock(self, block_hash: str, verbosity: int = 1):
+        return copy.deepcopy(super()._getblock(block_hash, verbosity))
+
+
+def measure(mode: str, chain: SyntheticChain, batch_size: Optional[int], max_concurrency: int, streaming: bool,
+            latency_s: float) -> None:
+    """Scans the highest block of the given chain and reports the peak of the memory allocated meanwhile."""
+    chain_query_service = LitecoinChainQueryService(
+        DecodingLitecoinProxy(chain, latency_s=latency_s),
+        batch_size=batch_size,
+        transaction_decoder=LitecoinTransactionDecoder(),
+        max_concurrency=max_concurrency)
+    transactions = 0
+
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    if streaming:
+        for _ in chain_query_service.iter_transactions_of_block_at_height(chain.height):
+            transactions += 1
+    else:
+        transactions = len(chain_query_service.get_transactions_of_block_at_height(chain.height))
+
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print('%-36s %6d txs %10.3fs %10.2f MB peak' % (mode, transactions, duration, peak / 1024 / 1024))
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--txs', type=int, nargs='+', default=[1000, 4000], help='transactions per block')
+    arg_parser.add_argument('--inputs', type=int, default=2, help='inputs per transaction')
+    arg_parser.add_argument('--batch-size', type=int, default=100)
+    arg_parser.add_argument('--max-concurrency', type=int, default=LitecoinChainQueryService.DEFAULT_MAX_CONCURRENCY)
+    arg_parser.add_argument('--latency-ms', type=float, default=1.0, help='simulated latency per round trip')
+    args = arg_parser.parse_args()
+
+    latency_s = args.latency_ms / 1000
+
+    for txs in args.txs:
+        chain = SyntheticChain(txs_per_block=txs, inputs_per_tx=args.inputs)
+        chain.create_block()
+
+        measure('unbounded, collected', chain, None, txs, False, latency_s)
+        measure('bounded, streamed', chain, None, args.max_concurrency, True, latency_s)
+        measure('batched, collected', chain, args.batch_size, args.max_concurrency, False, latency_s)
+        measure('batched, streamed', chain, args.batch_size, args.max_concurrency, True, latency_s)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Compares how fast the LitecoinChainQueryService detects new blocks when polling the node
+and when receiving zmqpubhashblock notifications from a local stand-in for the node.
+
+Run with: python3.5 -m benchmarks.block_notifications --blocks 20 --polling-interval-s 1
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+import gevent
+import zmq.green as zmq
+
+from waves_litecoin_gateway.lib import LitecoinChainQueryService, LitecoinZmqNotificationListener
+from .synthetic_chain import SyntheticChain, SimulatedLitecoinProxy
+
+
+def print_latencies(mode: str, latencies: List[float]) -> None:
+    latencies = sorted(latencies)
+    print('%-16s %6d blocks %10.3fms mean %10.3fms max' % (mode, len(latencies), 1000 * sum(latencies) / len(latencies),
+                                                           1000 * latencies[-1]))
+
+
+def poll_heights(chain_query_service: LitecoinChainQueryService, polling_interval_s: float,
+                 detected: Dict[int, float]) -> None:
+    """Polls the height like the TransactionPollingService and records when each height was seen first."""
+    while True:
+        height = chain_query_service.get_height_of_highest_block()
+        detected.setdefault(height, time.perf_counter())
+        gevent.sleep(polling_interval_s)
+
+
+def measure(chain: SyntheticChain, blocks: int, interval_s: float, polling_interval_s: float,
+            notifications: bool) -> List[float]:
+    """Creates blocks in random intervals and returns the time until each one was detected."""
+    proxy = SimulatedLitecoinProxy(chain, latency_s=0.001)
+    chain_query_service = LitecoinChainQueryService(proxy)
+    publisher = None
+    listener = None
+
+    if notifications:
+        publisher = zmq.Context.instance().socket(zmq.PUB)
+        port = publisher.bind_to_random_port('tcp://127.0.0.1')
+        listener = LitecoinZmqNotificationListener(['tcp://127.0.0.1:' + str(port)],
+                                                   chain_query_service.notify_block_hash)
+        listener.start()
+        gevent.sleep(0.1)
+
+    # a notified height is available immediately, so the poller only needs to pick it up
+    detected = dict()  # type: Dict[int, float]
+    poller = gevent.spawn(poll_heights, chain_query_service, polling_interval_s
+                          if publisher is None else 0.001, detected)
+    created = dict()  # type: Dict[int, float]
+    rng = random.Random(1)
+
+    for _ in range(0, blocks):
+        gevent.sleep(rng.uniform(0, interval_s))
+        block = chain.create_block()
+        created[block['height']] = time.perf_counter()
+
+        if publisher is not None:
+            publisher.send_multipart([b'hashblock', bytes.fromhex(block['hash']), b'\x00\x00\x00\x00'])
+
+    while max(detected) < max(created):
+        gevent.sleep(0.001)
+
+    poller.kill()
+
+    if listener is not None:
+        listener.stop()
+        publisher.close(linger=0)
+
+    # a height that was skipped by the poller is detected together with the next one
+    return [
+        min(detected_at for detected_height, detected_at in detected.items() if detected_height >= height) - created_at
+        for height, created_at in created.items()
+    ]
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--blocks', type=int, default=20)
+    arg_parser.add_argument('--block-interval-s', type=float, default=0.5, help='maximum time between two blocks')
+    arg_parser.add_argument('--polling-interval-s', type=float, default=1.0)
+    args = arg_parser.parse_args()
+
+    chain = SyntheticChain(txs_per_block=1, inputs_per_tx=1)
+    chain.create_block()
+
+    print_latencies('polling', measure(chain, args.blocks, args.block_interval_s, args.polling_interval_s, False))
+    print_latencies('notifications', measure(chain, args.blocks, args.block_interval_s, args.polling_interval_s, True))
+
+
+if __name__ == '__main__':
+    main()
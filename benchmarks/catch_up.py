@@ -0,0 +1,70 @@
+"""
+Compares how fast the LitecoinChainQueryService catches up with a chain after some downtime
+with and without prefetching the following blocks.
+
+Run with: python3.5 -m benchmarks.catch_up --blocks 200 --txs 100 --latency-ms 5 --prefetch-window 16
+"""
+
+import argparse
+import time
+from typing import Optional
+
+from waves_litecoin_gateway.lib import LitecoinChainQueryService, LitecoinTransactionDecoder, LitecoinAddressIndex
+from .synthetic_chain import SyntheticChain, SimulatedLitecoinProxy
+
+
+def measure(chain: SyntheticChain,
+            blocks: int,
+            latency_s: float,
+            prefetch_window: Optional[int],
+            address_index: Optional[LitecoinAddressIndex] = None) -> None:
+    """Scans the first blocks of the given chain in order, like the Gateway does after a restart."""
+    proxy = SimulatedLitecoinProxy(chain, latency_s=latency_s)
+    chain_query_service = LitecoinChainQueryService(
+        proxy,
+        batch_size=100,
+        transaction_decoder=LitecoinTransactionDecoder(),
+        address_index=address_index,
+        prefetch_window=prefetch_window)
+
+    start = time.perf_counter()
+
+    for height in range(0, blocks):
+        chain_query_service.get_height_of_highest_block()
+        chain_query_service.get_transactions_of_block_at_height(height)
+
+    duration = time.perf_counter() - start
+
+    mode = 'prefetch window %d' % prefetch_window if prefetch_window is not None else 'sequential'
+
+    if address_index is not None:
+        mode += ', prefiltered'
+
+    print('%-40s %6d blocks %10.3fs %8.1f blocks/s' % (mode, blocks, duration, blocks / duration))
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--blocks', type=int, default=200, help='blocks to catch up with')
+    arg_parser.add_argument('--txs', type=int, default=100, help='transactions per block')
+    arg_parser.add_argument('--latency-ms', type=float, default=5.0, help='simulated latency per round trip')
+    arg_parser.add_argument('--prefetch-window', type=int, default=16)
+    args = arg_parser.parse_args()
+
+    chain = SyntheticChain(txs_per_block=args.txs, inputs_per_tx=1)
+
+    # the blocks closest to the highest block are never prefetched
+    for _ in range(0, args.blocks + args.prefetch_window):
+        chain.create_block()
+
+    latency_s = args.latency_ms / 1000
+    address_index = LitecoinAddressIndex()
+
+    measure(chain, args.blocks, latency_s, None)
+    measure(chain, args.blocks, latency_s, args.prefetch_window)
+    measure(chain, args.blocks, latency_s, None, address_index=address_index)
+    measure(chain, args.blocks, latency_s, args.prefetch_window, address_index=address_index)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Compares the coin selection strategies of the LitecoinTransactionService with the original selection algorithm
+on synthetic sets of unspent outputs.
+
+Run with: python3.5 -m benchmarks.coin_selection --sizes 100 1000 10000 100000 --payouts 20
+"""
+
+import argparse
+import random
+import time
+from decimal import Decimal
+from functools import cmp_to_key
+from typing import List, Optional, Callable
+
+from waves_litecoin_gateway.lib import create_coin_selector, sum_unspents, to_satoshis
+
+
+def original_optimize_unspents(unspents: List[dict], dst_amount: Decimal) -> Optional[List]:
+    """The selection algorithm the LitecoinTransactionService used before the coin selectors were introduced."""
+    res = list()  # type: List[dict]
+    unspents = list(unspents)
+
+    if sum_unspents(unspents) < dst_amount:
+        return None
+
+    for i in range(0, len(unspents)):
+
+        diff_dst_amount = dst_amount - sum_unspents(res)
+
+        def comparator(value: dict, other: dict) -> int:
+            distance_a = value['amount'] - diff_dst_amount
+            distance_b = other['amount'] - diff_dst_amount
+
+            if abs(distance_a) != abs(distance_b):
+                return abs(distance_a) - abs(distance_b)
+            else:
+                return distance_a - distance_b
+
+        sorted_unspents = sorted(unspents, key=cmp_to_key(comparator))
+
+        best_fit = sorted_unspents[0]
+
+        res.append(best_fit)
+        unspents.remove(best_fit)
+
+        if sum_unspents(res) >= dst_amount:
+            return res
+
+    return None
+
+
+def create_unspents(size: int, rng: random.Random) -> List[dict]:
+    """Creates unspent outputs between 0.0001 and 2 LTC with a bias towards small amounts."""
+    return [{'amount': Decimal(int(rng.paretovariate(1.2) * 10000)).scaleb(-8).min(Decimal(2))} for _ in range(0, size)]
+
+
+def measure(name: str, size: int, payouts: List[Decimal], select: Callable[[Decimal], Optional[List]]) -> None:
+    """Runs the given selection for every payout and prints the average time and the average number of inputs."""
+    inputs = 0
+    start = time.perf_counter()
+
+    for payout in payouts:
+        selection = select(payout)
+        inputs += len(selection) if selection is not None else 0
+
+    duration = time.perf_counter() - start
+
+    print('%-32s %8d utxos %10.3fms per payout %8.1f inputs per payout' % (name, size, duration * 1000 / len(payouts),
+                                                                           inputs / len(payouts)))
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000], help='utxo set sizes')
+    arg_parser.add_argument('--payouts', type=int, default=20, help='payouts per utxo set')
+    arg_parser.add_argument(
+        '--max-original-size', type=int, default=10000, help='largest utxo set to run the original algorithm on')
+    arg_parser.add_argument('--cost-of-change', type=Decimal, default=Decimal('0.00002'), help='in LTC')
+    arg_parser.add_argument('--seed', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cost_of_change = to_satoshis(args.cost_of_change)
+    strategies = [['best_fit'], ['branch_and_bound', 'best_fit'], ['branch_and_bound', 'largest_first'],
+                  ['largest_first'], ['single_random_draw']]
+
+    for size in args.sizes:
+        unspents = create_unspents(size, rng)
+        payouts = [Decimal(rng.randint(10000, 50000000)).scaleb(-8) for _ in range(0, args.payouts)]
+
+        if size <= args.max_original_size:
+            measure('original', size, payouts, lambda payout: original_optimize_unspents(unspents, payout))
+
+        for strategy in strategies:
+            selector = create_coin_selector(strategy, cost_of_change)
+
+            def select(payout: Decimal) -> Optional[List]:
+                amounts = [to_satoshis(unspent['amount']) for unspent in unspents]
+                return selector.select(amounts, to_satoshis(payout))
+
+            measure(', '.join(strategy), size, payouts, select)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+"""
+FakeLitecoind
+"""
+
+import json
+import random
+import socket
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import gevent
+from gevent.lock import BoundedSemaphore
+from gevent.pywsgi import WSGIServer
+
+from waves_litecoin_gateway.lib import to_satoshis, from_satoshis
+from .synthetic_chain import SyntheticChain
+
+
+class FakeLitecoindError(Exception):
+    """An error that is returned to the client as JSON-RPC error."""
+
+    def __init__(self, code: int, message: str) -> None:
+        Exception.__init__(self, message)
+        self.code = code
+        self.message = message
+
+
+class _NoDelayWSGIServer(WSGIServer):
+    """Disables Nagle's algorithm, so that small responses are not held back until the client acknowledges."""
+
+    def handle(self, sock, address):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        WSGIServer.handle(self, sock, address)
+
+
+class FakeLitecoind(object):
+    """
+    A local JSON-RPC server that answers the calls of the gateway like a Litecoin node would,
+    from the blocks and transactions of a SyntheticChain. It runs in a greenlet of the current process,
+    so the gateway services may be benchmarked offline through their real HTTP clients.
+
+    The server has a wallet with a single address that is funded by wallet_utxos unspent outputs.
+    Transactions that are sent by the gateway are added to the chain and update the unspent outputs of the wallet.
+
+    Every HTTP request is delayed by latency_s seconds, a batch request counts as one. The size of all responses
+    is counted in response_bytes.
+    Each call fails with the probability error_rate with the JSON-RPC error that the node returns while it is
+    loading its block index.
+
+    Like the node, the server may handle at most rpc_threads requests at a time and queue up to work_queue further
+    requests. Requests exceeding the queue are rejected with the HTTP status 503, which is counted as rejected.
+    """
+
+    RPC_INVALID_ADDRESS_OR_KEY = -5
+    RPC_INVALID_PARAMETER = -8
+    RPC_DESERIALIZATION_ERROR = -22
+    RPC_VERIFY_ERROR = -25
+    RPC_IN_WARMUP = -28
+    RPC_METHOD_NOT_FOUND = -32601
+
+    def __init__(self,
+                 chain: SyntheticChain,
+                 latency_s: float = 0.0,
+                 error_rate: float = 0.0,
+                 wallet_utxos: int = 100,
+                 wallet_utxo_amount: int = 100000000,
+                 seed: int = 0,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 rpc_threads: Optional[int] = None,
+                 work_queue: Optional[int] = None) -> None:
+        self._chain = chain
+        self._latency_s = latency_s
+        self._error_rate = error_rate
+        self._rpc_threads = BoundedSemaphore(rpc_threads) if rpc_threads is not None else None
+        self._work_queue = work_queue
+        self._queued_requests = 0
+        self._random = random.Random(seed)
+        self._server = _NoDelayWSGIServer((host, port), self._handle_request, log=None, error_log=None)
+        self.wallet_address = chain.create_address()
+        self._unspents = dict()  # type: Dict[Tuple[str, int], dict]
+        self.requests = 0
+        self.calls = 0
+        self.calls_by_method = dict()  # type: Dict[str, int]
+        self.errors = 0
+        self.rejected = 0
+        self.response_bytes = 0
+
+        if wallet_utxos > 0:
+            self._add_unspents(
+                chain.create_funding_transaction(self.wallet_address, [wallet_utxo_amount] * wallet_utxos))
+
+    def start(self) -> None:
+        self._server.start()
+
+    def stop(self) -> None:
+        self._server.stop()
+
+    @property
+    def url(self) -> str:
+        """The URL of the server including credentials, as expected by the AuthServiceProxy."""
+        return 'http://user:password@%s:%d' % (self._server.server_host, self._server.server_port)
+
+    def reset_counters(self) -> None:
+        self.requests = 0
+        self.calls = 0
+        self.calls_by_method = dict()
+        self.errors = 0
+        self.rejected = 0
+        self.response_bytes = 0
+
+    def _add_unspents(self, transaction: dict) -> None:
+        for output in transaction['vout']:
+            if self.wallet_address in output['scriptPubKey'].get('addresses', []):
+                self._unspents[(transaction['txid'], output['n'])] = {
+                    'txid': transaction['txid'],
+                    'vout': output['n'],
+                    'address': self.wallet_address,
+                    'amount': output['value'],
+                    'confirmations': 1
+                }
+
+    @staticmethod
+    def _encode_value(value: Any) -> Any:
+        if isinstance(value, Decimal):
+            return float(value)
+
+        raise TypeError('Can not encode values of type ' + type(value).__name__)
+
+    def _get_method(self, name: str) -> Callable:
+        method = getattr(self, '_rpc_' + str(name), None)
+
+        if method is None:
+            raise FakeLitecoindError(FakeLitecoind.RPC_METHOD_NOT_FOUND, 'Method not found')
+
+        return method
+
+    def _call(self, request: dict) -> dict:
+        method = request.get('method')
+        self.calls += 1
+        self.calls_by_method[method] = self.calls_by_method.get(method, 0) + 1
+
+        try:
+            if self._error_rate > 0 and self._random.random() < self._error_rate:
+                raise FakeLitecoindError(FakeLitecoind.RPC_IN_WARMUP, 'Loading block index...')
+
+            result = self._get_method(method)(*request.get('params', []))
+            return {'result': result, 'error': None, 'id': request.get('id')}
+        except FakeLitecoindError as error:
+            self.errors += 1
+            return {'result': None, 'error': {'code': error.code, 'message': error.message}, 'id': request.get('id')}
+
+    def _handle_request(self, environ: dict, start_response: Callable) -> List[bytes]:
+        self.requests += 1
+
+        if self._rpc_threads is None:
+            return self._answer_request(environ, start_response)
+
+        if self._work_queue is not None and self._queued_requests >= self._work_queue and self._rpc_threads.locked():
+            self.rejected += 1
+            start_response('503 Service Unavailable', [('Content-Type', 'text/html')])
+            return [b'Work queue depth exceeded']
+
+        self._queued_requests += 1
+
+        try:
+            self._rpc_threads.acquire()
+        finally:
+            self._queued_requests -= 1
+
+        try:
+            return self._answer_request(environ, start_response)
+        finally:
+            self._rpc_threads.release()
+
+    def _answer_request(self, environ: dict, start_response: Callable) -> List[bytes]:
+        if self._latency_s > 0:
+            gevent.sleep(self._latency_s)
+
+        body = environ['wsgi.input'].read()
+        request = json.loads(body.decode('utf8'), parse_float=Decimal)
+        status = '200 OK'
+
+        if isinstance(request, list):
+            response = [self._call(call) for call in request]  # type: Any
+        else:
+            response = self._call(request)
+
+            # like the node, single calls that fail are answered with an error status
+            if response['error'] is not None:
+                status = '500 Internal Server Error'
+
+        response_body = json.dumps(response, default=self._encode_value).encode('utf8')
+        self.response_bytes += len(response_body)
+        start_response(status, [('Content-Type', 'application/json'), ('Content-Length', str(len(response_body)))])
+        return [response_body]
+
+    def _rpc_getblockcount(self) -> int:
+        return self._chain.height
+
+    def _rpc_getinfo(self) -> dict:
+        return {'blocks': self._chain.height}
+
+    def _rpc_getblockhash(self, height: int) -> str:
+        if height < 0 or height > self._chain.height:
+            raise FakeLitecoindError(FakeLitecoind.RPC_INVALID_PARAMETER, 'Block height out of range')
+
+        return self._chain.get_block(height)['hash']
+
+    def _get_block_by_hash(self, block_hash: str) -> dict:
+        try:
+            return self._chain.get_block_by_hash(block_hash)
+        except (ValueError, IndexError):
+            raise FakeLitecoindError(FakeLitecoind.RPC_INVALID_ADDRESS_OR_KEY, 'Block not found')
+
+    def _rpc_getblock(self, block_hash: str, verbosity: Any = 1) -> Any:
+        block = self._get_block_by_hash(block_hash)
+
+        if verbosity == 0:
+            return self._chain.get_raw_block(block_hash)
+
+        if verbosity == 2:
+            return block
+
+        return {'hash': block['hash'], 'height': block['height'], 'tx': [tx['txid'] for tx in block['tx']]}
+
+    def _rpc_getblockfilter(self, block_hash: str, filter_type: str = 'basic') -> dict:
+        self._get_block_by_hash(block_hash)
+
+        if filter_type != 'basic':
+            raise FakeLitecoindError(FakeLitecoind.RPC_INVALID_ADDRESS_OR_KEY, 'Unknown filtertype')
+
+        return {'filter': self._chain.get_block_filter(block_hash), 'header': '00' * 32}
+
+    def _rpc_getblockheader(self, block_hash: str) -> dict:
+        block = self._get_block_by_hash(block_hash)
+        return {'hash': block['hash'], 'height': block['height']}
+
+    def _rpc_getrawtransaction(self, txid: str, verbose: int = 0) -> Any:
+        try:
+            raw_transaction = self._chain.get_raw_transaction(txid)
+        except KeyError:
+            raise FakeLitecoindError(FakeLitecoind.RPC_INVALID_ADDRESS_OR_KEY,
+                                     'No such mempool or blockchain transaction')
+
+        if verbose:
+            return self._chain.get_transaction(txid)
+
+        return raw_transaction
+
+    def _rpc_decoderawtransaction(self, raw_transaction: str) -> dict:
+        try:
+            return self._chain.get_transaction_by_raw_transaction(raw_transaction)
+        except KeyError:
+            raise FakeLitecoindError(FakeLitecoind.RPC_DESERIALIZATION_ERROR, 'TX decode failed')
+
+    def _rpc_getnewaddress(self, *args) -> str:
+        return self._chain.create_address()
+
+    def _rpc_validateaddress(self, address: str) -> dict:
+        if self._chain.is_valid_address(address):
+            return {'isvalid': True, 'address': address}
+
+        return {'isvalid': False}
+
+    def _rpc_listunspent(self,
+                         minconf: Optional[int] = None,
+                         maxconf: Optional[int] = None,
+                         addresses: Optional[List[str]] = None) -> List[dict]:
+        if addresses is not None and self.wallet_address not in addresses:
+            return []
+
+        return list(self._unspents.values())
+
+    def _rpc_createrawtransaction(self, inputs: List[dict], outputs: Dict[str, Decimal]) -> str:
+        try:
+            return self._chain.serialize_payment([(unspent['txid'], unspent['vout']) for unspent in inputs],
+                                                 [(address, to_satoshis(amount))
+                                                  for address, amount in outputs.items()])
+        except ValueError as error:
+            raise FakeLitecoindError(FakeLitecoind.RPC_INVALID_ADDRESS_OR_KEY, str(error))
+
+    def _rpc_signrawtransaction(self, raw_transaction: str) -> dict:
+        return {'hex': raw_transaction, 'complete': True}
+
+    def _rpc_sendrawtransaction(self, raw_transaction: str) -> str:
+        spent = [(vin['txid'], vin['vout']) for vin in self._chain.decode_raw_transaction(raw_transaction)['vin']]
+
+        if any(outpoint not in self._unspents for outpoint in spent):
+            raise FakeLitecoindError(FakeLitecoind.RPC_VERIFY_ERROR, 'Missing inputs')
+
+        transaction = self._chain.add_raw_transaction(raw_transaction)
+
+        for outpoint in spent:
+            del self._unspents[outpoint]
+
+        self._add_unspents(transaction)
+
+        return transaction['txid']
+
+    @property
+    def wallet_balance(self) -> Decimal:
+        return from_satoshis(sum(to_satoshis(unspent['amount']) for unspent in self._unspents.values()))
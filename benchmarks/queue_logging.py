@@ -0,0 +1,105 @@
+"""
+Measures how much logging to a rotating log file delays the gevent hub. A greenlet logs bursts of records like the
+RPC client of the Gateway every millisecond while another greenlet wakes up every millisecond and records how late it
+was woken up. Every flush of the log file blocks for the given latency, like a busy disk. Compares writing the records
+synchronously with queueing them for the native thread of a LitecoinQueueLogHandler.
+
+Run with: python3.5 -m benchmarks.queue_logging --records 20000 --burst 5 --write-latency-ms 0.1
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+from typing import List
+
+import gevent
+import gevent.monkey
+import waves_gateway  # pylint: disable=unused-import
+
+from waves_litecoin_gateway.lib import LitecoinQueueLogHandler
+from .rpc_suite import percentile
+
+# blocks the calling thread like a disk write, even on the hub
+_blocking_sleep = gevent.monkey.get_original('time', 'sleep')
+
+
+class SlowRotatingFileHandler(RotatingFileHandler):
+    """A RotatingFileHandler whose flushes take the given latency."""
+
+    def __init__(self, filename: str, write_latency_s: float, **kwargs) -> None:
+        super().__init__(filename, **kwargs)
+        self._write_latency_s = write_latency_s
+
+    def flush(self) -> None:
+        super().flush()
+        _blocking_sleep(self._write_latency_s)
+
+
+def measure(mode: str, directory: str, records: int, burst: int, write_latency_s: float, max_bytes: int,
+            queue_size: int) -> None:
+    """Logs the given number of records and reports the delays of the hub."""
+    file_handler = SlowRotatingFileHandler(
+        os.path.join(directory, mode + '.log'), write_latency_s, maxBytes=max_bytes, backupCount=5, encoding='utf8')
+    file_handler.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s {%(name)s} - %(message)s"))
+    handler = file_handler  # type: logging.Handler
+
+    if queue_size > 0:
+        handler = LitecoinQueueLogHandler([file_handler], capacity=queue_size)
+        handler.start()
+
+    logger = logging.getLogger('BitcoinRPC')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(handler)
+    delays = list()  # type: List[float]
+    done = [False]
+
+    def tick() -> None:
+        while not done[0]:
+            start = time.perf_counter()
+            gevent.sleep(0.001)
+            delays.append(time.perf_counter() - start - 0.001)
+
+    def log() -> None:
+        for i in range(0, records):
+            logger.info('-%d-> getrawtransaction ["%s", 1]', i, '%064x' % i)
+
+            if i % burst == burst - 1:
+                gevent.sleep(0.001)
+
+        done[0] = True
+
+    start = time.perf_counter()
+
+    try:
+        gevent.joinall([gevent.spawn(tick), gevent.spawn(log)], raise_error=True)
+        duration = time.perf_counter() - start
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+        file_handler.close()
+
+    print('%-14s %8.3fs logging %9.1f records/s %8.2fms delay p50 %8.2fms delay p99 %8.2fms delay max %6d dropped' %
+          (mode, duration, records / duration, 1000 * percentile(delays, 0.5), 1000 * percentile(delays, 0.99),
+           1000 * max(delays), handler.dropped if isinstance(handler, LitecoinQueueLogHandler) else 0))
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--records', type=int, default=20000, help='records to log')
+    arg_parser.add_argument('--burst', type=int, default=5, help='records logged per millisecond')
+    arg_parser.add_argument('--write-latency-ms', type=float, default=0.1, help='simulated latency per flush')
+    arg_parser.add_argument('--max-bytes', type=int, default=1000000, help='size of a log file before it is rotated')
+    arg_parser.add_argument('--queue-size', type=int, default=10000)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for mode, queue_size in [('synchronous', 0), ('queue', args.queue_size)]:
+            measure(mode, directory, args.records, args.burst, args.write_latency_ms / 1000, args.max_bytes, queue_size)
+
+
+if __name__ == '__main__':
+    main()
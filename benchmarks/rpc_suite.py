@@ -0,0 +1,177 @@
+"""
+Measures the block scanning and payout throughput of the gateway services against a FakeLitecoind,
+so that the whole path including the JSON-RPC clients, the HTTP round trips and the JSON encoding is covered.
+Reports blocks/s, RPC calls per block, send_coin throughput and the p50/p99 latencies.
+The results may be written to a JSON file to compare them across commits.
+
+Run with: python3.5 -m benchmarks.rpc_suite --blocks 50 --txs 100 --inputs 2 --payouts 200 --latency-ms 1
+"""
+
+import argparse
+import json
+import subprocess
+import time
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+import gevent
+from bitcoinrpc.authproxy import JSONRPCException
+from waves_gateway import TransactionAttempt, TransactionAttemptReceiver
+
+from waves_litecoin_gateway.lib import LitecoinChainQueryService, LitecoinTransactionService, \
+    LitecoinTransactionDecoder, LitecoinRpcConnectionPool
+from .fake_litecoind import FakeLitecoind
+from .synthetic_chain import SyntheticChain
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Returns the nearest-rank percentile of the given values."""
+    if len(values) == 0:
+        return 0.0
+
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def call_with_retries(func: Callable, retries: List[int]):
+    """Repeats calls that fail with a JSON-RPC error, like the polling service of the framework does."""
+    while True:
+        try:
+            return func()
+        except JSONRPCException:
+            retries[0] += 1
+
+
+def summarize(node: FakeLitecoind, count: int, duration: float, latencies: List[float], retries: int) -> Dict:
+    return {
+        'count': count,
+        'duration_s': round(duration, 6),
+        'per_s': round(count / duration, 3),
+        'rpc_calls_per_item': round(node.calls / count, 3),
+        'http_requests_per_item': round(node.requests / count, 3),
+        'p50_ms': round(1000 * percentile(latencies, 0.5), 3),
+        'p99_ms': round(1000 * percentile(latencies, 0.99), 3),
+        'errors': node.errors,
+        'retries': retries,
+        'calls_by_method': dict(node.calls_by_method)
+    }
+
+
+def measure_scan(node: FakeLitecoind, blocks: int, pool_size: int, batch_size: Optional[int],
+                 prefetch_window: Optional[int]) -> Dict:
+    """Scans the blocks of the chain in order, like the Gateway does while catching up."""
+    chain_query_service = LitecoinChainQueryService(
+        LitecoinRpcConnectionPool(node.url, pool_size=pool_size),
+        batch_size=batch_size,
+        transaction_decoder=LitecoinTransactionDecoder(),
+        prefetch_window=prefetch_window)
+    latencies = list()  # type: List[float]
+    retries = [0]
+
+    node.reset_counters()
+    start = time.perf_counter()
+
+    for height in range(0, blocks):
+        block_start = time.perf_counter()
+        call_with_retries(chain_query_service.get_height_of_highest_block, retries)
+        call_with_retries(lambda: chain_query_service.get_transactions_of_block_at_height(height), retries)
+        latencies.append(time.perf_counter() - block_start)
+
+    return summarize(node, blocks, time.perf_counter() - start, latencies, retries[0])
+
+
+def measure_send_coin(node: FakeLitecoind, chain: SyntheticChain, payouts: int, concurrency: int,
+                      pool_size: int) -> Dict:
+    """Sends the given number of payouts from the wallet of the node with the given number of greenlets."""
+    ltc_proxy = LitecoinRpcConnectionPool(node.url, pool_size=pool_size)
+    transaction_service = LitecoinTransactionService(ltc_proxy,
+                                                     LitecoinChainQueryService(
+                                                         ltc_proxy, transaction_decoder=LitecoinTransactionDecoder()))
+    attempts = [
+        TransactionAttempt(
+            sender=node.wallet_address,
+            receivers=[TransactionAttemptReceiver(address=chain.create_address(), amount=Decimal('0.01'))],
+            fee=Decimal('0.0001'),
+            currency='ltc') for _ in range(0, payouts)
+    ]
+    latencies = list()  # type: List[float]
+    retries = [0]
+
+    def send_coins(worker: int) -> None:
+        for attempt in attempts[worker::concurrency]:
+            payout_start = time.perf_counter()
+            call_with_retries(lambda: transaction_service.send_coin(attempt), retries)
+            latencies.append(time.perf_counter() - payout_start)
+
+    node.reset_counters()
+    start = time.perf_counter()
+    gevent.joinall([gevent.spawn(send_coins, worker) for worker in range(0, concurrency)], raise_error=True)
+
+    return summarize(node, payouts, time.perf_counter() - start, latencies, retries[0])
+
+
+def get_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL).decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(name: str, unit: str, result: Dict) -> None:
+    print('%-28s %6d %-7s %10.3fs %10.1f %s/s %8.2f calls/%s %8.2f requests/%s %9.3fms p50 %9.3fms p99 %5d errors' %
+          (name, result['count'], unit, result['duration_s'], result['per_s'], unit, result['rpc_calls_per_item'], unit,
+           result['http_requests_per_item'], unit, result['p50_ms'], result['p99_ms'], result['errors']))
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--blocks', type=int, default=50, help='blocks to scan')
+    arg_parser.add_argument('--txs', type=int, default=100, help='transactions per block')
+    arg_parser.add_argument('--inputs', type=int, default=2, help='inputs per transaction')
+    arg_parser.add_argument('--utxos', type=int, default=1000, help='unspent outputs of the wallet')
+    arg_parser.add_argument('--payouts', type=int, default=200, help='payouts to send')
+    arg_parser.add_argument('--concurrency', type=int, default=4, help='greenlets that send payouts')
+    arg_parser.add_argument('--pool-size', type=int, default=LitecoinRpcConnectionPool.DEFAULT_POOL_SIZE)
+    arg_parser.add_argument('--batch-size', type=int, default=100)
+    arg_parser.add_argument('--prefetch-window', type=int, default=16)
+    arg_parser.add_argument('--latency-ms', type=float, default=1.0, help='simulated latency per HTTP request')
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help='probability that a call fails')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--json', help='writes the results to the given file')
+    args = arg_parser.parse_args()
+
+    chain = SyntheticChain(txs_per_block=args.txs, inputs_per_tx=args.inputs)
+
+    # the blocks closest to the highest block are never prefetched
+    for _ in range(0, args.blocks + args.prefetch_window):
+        chain.create_block()
+
+    node = FakeLitecoind(
+        chain, latency_s=args.latency_ms / 1000, error_rate=args.error_rate, wallet_utxos=args.utxos, seed=args.seed)
+    node.start()
+
+    try:
+        results = {
+            'commit': get_commit(),
+            'parameters': vars(args),
+            'scan_sequential': measure_scan(node, args.blocks, args.pool_size, None, None),
+            'scan_batched': measure_scan(node, args.blocks, args.pool_size, args.batch_size, None),
+            'scan_prefetched': measure_scan(node, args.blocks, args.pool_size, args.batch_size, args.prefetch_window),
+            'send_coin': measure_send_coin(node, chain, args.payouts, args.concurrency, args.pool_size)
+        }
+    finally:
+        node.stop()
+
+    print_result('scan without batching', 'block', results['scan_sequential'])
+    print_result('scan batched', 'block', results['scan_batched'])
+    print_result('scan batched and prefetched', 'block', results['scan_prefetched'])
+    print_result('send_coin', 'payout', results['send_coin'])
+
+    if args.json is not None:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
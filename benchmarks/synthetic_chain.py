@@ -0,0 +1,263 @@
+"""
+SyntheticChain
+"""
+
+import hashlib
+import struct
+import time
+from typing import List, Dict, Any, Sequence, Tuple, Optional
+
+from bitcoinrpc.authproxy import JSONRPCException
+
+from waves_litecoin_gateway.lib import LitecoinBlockFilter, LitecoinTransactionDecoder, LitecoinNetwork
+from waves_litecoin_gateway.lib.litecoin_address_encoding import base58check_encode, base58check_decode
+
+
+class SyntheticChain(object):
+    """
+    Generates serialized Litecoin transactions and blocks together with their decoded representation,
+    as they would be returned by a node.
+    Every transaction of a block spends outputs of coinbase-like funding transactions that are not part of any block.
+    Transactions that pay to P2PKH addresses may be added to simulate the payouts of a wallet.
+    """
+
+    SCRIPT_SIG_LENGTH = 107
+    NULL_TXID = '00' * 32
+    COINBASE_VOUT = 0xffffffff
+
+    def __init__(self,
+                 txs_per_block: int,
+                 inputs_per_tx: int,
+                 outputs_per_tx: int = 2,
+                 network: LitecoinNetwork = LitecoinNetwork.by_name('mainnet')) -> None:
+        self._txs_per_block = txs_per_block
+        self._inputs_per_tx = inputs_per_tx
+        self._outputs_per_tx = outputs_per_tx
+        self._network = network
+        self._decoder = LitecoinTransactionDecoder(network)
+        self._transactions = dict()  # type: Dict[str, dict]
+        self._raw_transactions = dict()  # type: Dict[str, str]
+        self._txids_by_raw_transaction = dict()  # type: Dict[str, str]
+        self._blocks = list()  # type: List[dict]
+        self._block_filters = dict()  # type: Dict[str, str]
+        self._output_counter = 0
+
+    @staticmethod
+    def _varint(value: int) -> bytes:
+        if value < 0xfd:
+            return bytes([value])
+
+        return b'\xfd' + struct.pack('<H', value)
+
+    @staticmethod
+    def _pubkey_hash_script(key_hash: bytes) -> bytes:
+        return b'\x76\xa9\x14' + key_hash + b'\x88\xac'
+
+    def _next_key_hash(self) -> bytes:
+        self._output_counter += 1
+        return hashlib.sha256(struct.pack('<Q', self._output_counter)).digest()[:20]
+
+    def _next_output_script(self) -> bytes:
+        return self._pubkey_hash_script(self._next_key_hash())
+
+    def create_address(self) -> str:
+        """Returns a new P2PKH address of the network of the chain."""
+        return base58check_encode(self._network.pubkey_address_prefix, self._next_key_hash())
+
+    def _address_script(self, address: str) -> bytes:
+        if not self.is_valid_address(address):
+            raise ValueError('Only P2PKH addresses of the ' + self._network.name + ' network are supported')
+
+        return self._pubkey_hash_script(base58check_decode(address)[1])
+
+    def is_valid_address(self, address: str) -> bool:
+        decoded = base58check_decode(address)
+        return decoded is not None and decoded[0] == self._network.pubkey_address_prefix
+
+    def _serialize_transaction(self, vin: List[Tuple[str, int]],
+                               outputs: Optional[List[Tuple[bytes, int]]] = None) -> bytes:
+        result = struct.pack('<i', 2) + self._varint(len(vin))
+
+        for txid, vout in vin:
+            result += bytes.fromhex(txid)[::-1] + struct.pack('<I', vout)
+            result += bytes([SyntheticChain.SCRIPT_SIG_LENGTH]) + bytes(SyntheticChain.SCRIPT_SIG_LENGTH)
+            result += struct.pack('<I', 0xffffffff)
+
+        if outputs is None:
+            outputs = [(self._next_output_script(), 1000000 * (n + 1)) for n in range(0, self._outputs_per_tx)]
+
+        result += self._varint(len(outputs))
+
+        for script, amount in outputs:
+            result += struct.pack('<q', amount) + bytes([len(script)]) + script
+
+        return result + struct.pack('<I', 0)
+
+    def serialize_payment(self, vin: List[Tuple[str, int]], outputs: List[Tuple[str, int]]) -> str:
+        """Serializes a transaction that pays the given amounts of satoshis to the given addresses."""
+        return self._serialize_transaction(
+            vin, [(self._address_script(address), amount) for address, amount in outputs]).hex()
+
+    def decode_raw_transaction(self, raw_transaction: str) -> dict:
+        return self._decoder.decode(raw_transaction)
+
+    def add_raw_transaction(self, raw_transaction: str) -> dict:
+        """Makes the given transaction known to the chain without adding it to a block and returns it decoded."""
+        transaction = self._decoder.decode(raw_transaction)
+
+        self._transactions[transaction['txid']] = transaction
+        self._raw_transactions[transaction['txid']] = raw_transaction
+        self._txids_by_raw_transaction[raw_transaction] = transaction['txid']
+
+        return transaction
+
+    def _create_transaction(self, vin: List[Tuple[str, int]]) -> dict:
+        return self.add_raw_transaction(self._serialize_transaction(vin).hex())
+
+    def create_funding_transaction(self, address: str, amounts: List[int]) -> dict:
+        """Creates a coinbase-like transaction that pays the given amounts of satoshis to the given address."""
+        return self.add_raw_transaction(
+            self.serialize_payment([(SyntheticChain.NULL_TXID, SyntheticChain.COINBASE_VOUT)],
+                                   [(address, amount) for amount in amounts]))
+
+    def create_block(self, deposits: Sequence[Tuple[str, int]] = ()) -> dict:
+        """
+        Appends a new block to the chain and returns it. If deposits are given, the block contains another
+        transaction paying the given amounts of satoshis to the given addresses.
+        """
+        transactions = list()
+
+        for _ in range(0, self._txs_per_block):
+            funding_transaction = self._create_transaction([(SyntheticChain.NULL_TXID, SyntheticChain.COINBASE_VOUT)])
+            vin = [(funding_transaction['txid'], n % self._outputs_per_tx) for n in range(0, self._inputs_per_tx)]
+            transactions.append(self._create_transaction(vin))
+
+        if len(deposits) > 0:
+            funding_transaction = self._create_transaction([(SyntheticChain.NULL_TXID, SyntheticChain.COINBASE_VOUT)])
+            transactions.append(
+                self.add_raw_transaction(self.serialize_payment([(funding_transaction['txid'], 0)], list(deposits))))
+
+        block = {'hash': '%064x' % (len(self._blocks) + 1), 'height': len(self._blocks), 'tx': transactions}
+        self._blocks.append(block)
+        return block
+
+    @property
+    def height(self) -> int:
+        return len(self._blocks) - 1
+
+    def get_block(self, height: int) -> dict:
+        return self._blocks[height]
+
+    def get_block_by_hash(self, block_hash: str) -> dict:
+        return self._blocks[int(block_hash, 16) - 1]
+
+    def get_raw_block(self, block_hash: str) -> str:
+        """Serializes the given block with an empty header, as it would be returned by getblock with verbosity 0."""
+        block = self.get_block_by_hash(block_hash)
+        raw_transactions = [self._raw_transactions[transaction['txid']] for transaction in block['tx']]
+
+        return '00' * 80 + self._varint(len(raw_transactions)).hex() + ''.join(raw_transactions)
+
+    def get_block_filter(self, block_hash: str) -> str:
+        """
+        Returns the basic block filter (BIP158) of the given block, as it would be returned by getblockfilter.
+        It contains the output scripts of the block and the scripts of the outputs spent by its inputs.
+        """
+        if block_hash in self._block_filters:
+            return self._block_filters[block_hash]
+
+        scripts = list()  # type: List[bytes]
+
+        for transaction in self.get_block_by_hash(block_hash)['tx']:
+            for vin in transaction['vin']:
+                if 'txid' in vin and vin['txid'] != SyntheticChain.NULL_TXID:
+                    script = self._transactions[vin['txid']]['vout'][vin['vout']]['scriptPubKey']['hex']
+                    scripts.append(bytes.fromhex(script))
+
+            scripts.extend(bytes.fromhex(vout['scriptPubKey']['hex']) for vout in transaction['vout'])
+
+        self._block_filters[block_hash] = LitecoinBlockFilter.create(block_hash, scripts)
+
+        return self._block_filters[block_hash]
+
+    def get_transaction(self, txid: str) -> dict:
+        return self._transactions[txid]
+
+    def get_raw_transaction(self, txid: str) -> str:
+        return self._raw_transactions[txid]
+
+    def get_transaction_by_raw_transaction(self, raw_transaction: str) -> dict:
+        return self._transactions[self._txids_by_raw_transaction[raw_transaction]]
+
+
+class SimulatedLitecoinProxy(object):
+    """
+    Answers the RPC calls used by the gateway services from a SyntheticChain.
+    Every HTTP round trip is delayed by the given latency and counted, a batch request counts as one.
+    """
+
+    def __init__(self, chain: SyntheticChain, latency_s: float = 0.0, supports_verbose_blocks: bool = True) -> None:
+        self._chain = chain
+        self._latency_s = latency_s
+        self._supports_verbose_blocks = supports_verbose_blocks
+        self.round_trips = 0
+        self.calls = 0
+
+    def _round_trip(self) -> None:
+        self.round_trips += 1
+
+        if self._latency_s > 0:
+            time.sleep(self._latency_s)
+
+    def _call(self, method: str, *args) -> Any:
+        self.calls += 1
+        return getattr(self, '_' + method)(*args)
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def rpc_method(*args):
+            self._round_trip()
+            return self._call(name, *args)
+
+        return rpc_method
+
+    def batch_(self, rpc_calls: List[list]) -> list:
+        self._round_trip()
+        return [self._call(rpc_call[0], *rpc_call[1:]) for rpc_call in rpc_calls]
+
+    def _getblockhash(self, height: int) -> str:
+        return self._chain.get_block(height)['hash']
+
+    def _getblock(self, block_hash: str, verbosity: int = 1) -> Any:
+        if verbosity == 0:
+            return self._chain.get_raw_block(block_hash)
+
+        block = self._chain.get_block_by_hash(block_hash)
+
+        if verbosity == 2:
+            if not self._supports_verbose_blocks:
+                raise JSONRPCException({'code': -1, 'message': 'JSON value is not a boolean as expected'})
+            return block
+
+        return {'hash': block['hash'], 'height': block['height'], 'tx': [tx['txid'] for tx in block['tx']]}
+
+    def _getrawtransaction(self, txid: str) -> str:
+        return self._chain.get_raw_transaction(txid)
+
+    def _decoderawtransaction(self, raw_transaction: str) -> dict:
+        return self._chain.get_transaction_by_raw_transaction(raw_transaction)
+
+    def _getblockfilter(self, block_hash: str, filter_type: str = 'basic') -> dict:
+        return {'filter': self._chain.get_block_filter(block_hash), 'header': '00' * 32}
+
+    def _getblockheader(self, block_hash: str) -> dict:
+        block = self._chain.get_block_by_hash(block_hash)
+        return {'hash': block['hash'], 'height': block['height']}
+
+    def _getblockcount(self) -> int:
+        return self._chain.height
+
+    def _getinfo(self) -> dict:
+        return {'blocks': self._chain.height}
@@ -6,8 +6,10 @@ gevent.monkey.patch_all()
 
 from waves_litecoin_gateway import LitecoinGateway
 
-file = open("config.cfg", "r")
+# the worker processes of the decoding pool import this module again, but must not run a gateway of their own
+if __name__ == '__main__':
+    file = open("config.cfg", "r")
 
-gateway = LitecoinGateway.from_config_file(file.read())
+    gateway = LitecoinGateway.from_config_file(file.read())
 
-gateway.run()
+    gateway.run()
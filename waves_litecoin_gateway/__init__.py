@@ -3,4 +3,5 @@ Implements a LitecoinGateway for waves based on the waves_gateway package.
 """
 
 from .litecoin_gateway import LitecoinGateway
+from .litecoin_gateway_config import LitecoinGatewayConfig, LitecoinGatewayConfigParser
 from .lib import *
@@ -6,5 +6,29 @@ from .litecoin_address_factory import LitecoinAddressFactory
 from .litecoin_chain_query_service import LitecoinChainQueryService
 from .litecoin_integer_converter_service import LitecoinIntegerConverterService
 from .litecoin_transaction_service import LitecoinTransactionService
+from .litecoin_batching_transaction_service import LitecoinBatchingTransactionService
+from .litecoin_utxo_reservation_ledger import LitecoinUtxoReservationLedger
+from .litecoin_utxo_set import LitecoinUtxoSet
+from .litecoin_zmq_notification_listener import LitecoinZmqNotificationListener
 from .litecoin_address_validation_service import LitecoinAddressValidationService
-from .util import sum_unspents
+from .litecoin_transaction_cache import LitecoinTransactionCache
+from .litecoin_rpc_connection_pool import LitecoinRpcConnectionPool
+from .litecoin_address_encoding import LitecoinNetwork
+from .litecoin_transaction_decoder import LitecoinTransactionDecoder
+from .litecoin_address_index import LitecoinAddressIndex
+from .litecoin_address_pool import LitecoinAddressPool
+from .litecoin_block_cache import LitecoinBlockCache
+from .litecoin_block_filter import LitecoinBlockFilter
+from .litecoin_transaction_store import LitecoinTransactionStore
+from .litecoin_metrics import LitecoinMetrics
+from .litecoin_instrumented_proxy import LitecoinInstrumentedProxy
+from .litecoin_instrumented_transaction_service import LitecoinInstrumentedTransactionService
+from .litecoin_node_router import LitecoinNodeRouter
+from .litecoin_mempool_watcher import LitecoinMempoolWatcher
+from .litecoin_decoding_pool import LitecoinDecodingPool
+from .litecoin_adaptive_limiter import LitecoinAdaptiveLimiter
+from .litecoin_queue_log_handler import LitecoinQueueLogHandler
+from .coin_selection import CoinSelector, BestFitCoinSelector, BranchAndBoundCoinSelector, \
+    LargestFirstCoinSelector, SingleRandomDrawCoinSelector, FallbackCoinSelector, create_coin_selector, \
+    COIN_SELECTION_STRATEGIES
+from .util import sum_unspents, to_satoshis, from_satoshis
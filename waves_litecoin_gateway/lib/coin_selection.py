@@ -0,0 +1,218 @@
+"""
+Coin selection
+
+Every CoinSelector works on the amounts of the available unspent outputs in satoshis and returns the indices
+of the outputs that should be spent to pay at least the target amount.
+"""
+
+import bisect
+import random
+from typing import List, Optional, Sequence
+
+
+class CoinSelector(object):
+    """
+    Selects unspent outputs whose sum is at least a given target amount.
+    """
+
+    def select(self, amounts: Sequence[int], target: int) -> Optional[List[int]]:
+        """
+        Returns the indices of the selected amounts or None if no suitable combination was found.
+        """
+        raise NotImplementedError()
+
+
+class BestFitCoinSelector(CoinSelector):
+    """
+    Repeatedly selects the output whose amount is the closest to the remaining target amount,
+    preferring the smaller one on ties. The amounts are kept sorted, so that the closest one is found by bisection.
+    """
+
+    def select(self, amounts: Sequence[int], target: int) -> Optional[List[int]]:
+        if sum(amounts) < target:
+            return None
+
+        indices = sorted(range(0, len(amounts)), key=lambda i: (amounts[i], i))
+        values = [amounts[i] for i in indices]
+        remaining = target
+        result = list()  # type: List[int]
+
+        while len(values) > 0:
+            position = bisect.bisect_left(values, remaining)
+
+            if position == len(values) or (position > 0
+                                           and remaining - values[position - 1] <= values[position] - remaining):
+                position = bisect.bisect_left(values, values[position - 1])
+
+            result.append(indices[position])
+            remaining -= values[position]
+            del values[position]
+            del indices[position]
+
+            if remaining <= 0:
+                return result
+
+        return None
+
+
+class LargestFirstCoinSelector(CoinSelector):
+    """
+    Selects the largest outputs until the target amount is reached, which minimizes the number of inputs.
+    """
+
+    def select(self, amounts: Sequence[int], target: int) -> Optional[List[int]]:
+        result = list()  # type: List[int]
+        total = 0
+
+        for index in sorted(range(0, len(amounts)), key=lambda i: amounts[i], reverse=True):
+            if total >= target:
+                break
+
+            result.append(index)
+            total += amounts[index]
+
+        return result if total >= target else None
+
+
+class SingleRandomDrawCoinSelector(CoinSelector):
+    """
+    Selects randomly drawn outputs until the target amount is reached.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self._rng = rng if rng is not None else random.Random()
+
+    def select(self, amounts: Sequence[int], target: int) -> Optional[List[int]]:
+        indices = list(range(0, len(amounts)))
+        self._rng.shuffle(indices)
+
+        result = list()  # type: List[int]
+        total = 0
+
+        for index in indices:
+            if total >= target:
+                break
+
+            result.append(index)
+            total += amounts[index]
+
+        return result if total >= target else None
+
+
+class BranchAndBoundCoinSelector(CoinSelector):
+    """
+    Searches for a combination of outputs whose sum exceeds the target amount by at most cost_of_change,
+    so that no change output is necessary. The depth first search explores the largest amounts first
+    and gives up after max_tries steps.
+    """
+
+    DEFAULT_MAX_TRIES = 100000
+
+    def __init__(self, cost_of_change: int, max_tries: int = DEFAULT_MAX_TRIES) -> None:
+        self._cost_of_change = cost_of_change
+        self._max_tries = max_tries
+
+    def select(self, amounts: Sequence[int], target: int) -> Optional[List[int]]:
+        indices = sorted(range(0, len(amounts)), key=lambda i: amounts[i], reverse=True)
+        values = [amounts[i] for i in indices]
+        upper_bound = target + self._cost_of_change
+        available = sum(values)
+
+        if available < target:
+            return None
+
+        selection = list()  # type: List[int]
+        current = 0
+        best_selection = None  # type: Optional[List[int]]
+        best_excess = 0
+        position = 0
+
+        for _ in range(0, self._max_tries):
+            if current + available < target or current > upper_bound:
+                backtrack = True
+            elif current >= target:
+                if best_selection is None or current - target < best_excess:
+                    best_selection = list(selection)
+                    best_excess = current - target
+
+                    if best_excess == 0:
+                        break
+
+                backtrack = True
+            else:
+                backtrack = False
+
+            if backtrack:
+                if len(selection) == 0:
+                    break
+
+                # the outputs after the last included one were omitted, they become available again
+                position -= 1
+
+                while position > selection[-1]:
+                    available += values[position]
+                    position -= 1
+
+                current -= values[position]
+                selection.pop()
+            else:
+                available -= values[position]
+
+                # omitting an output and including another one of the same amount leads to the same sums
+                if len(selection) == 0 or position - 1 == selection[-1] or values[position] != values[position - 1]:
+                    selection.append(position)
+                    current += values[position]
+
+            position += 1
+
+        if best_selection is None:
+            return None
+
+        return [indices[position] for position in best_selection]
+
+
+class FallbackCoinSelector(CoinSelector):
+    """
+    Returns the result of the first of the given selectors that finds a suitable combination.
+    """
+
+    def __init__(self, selectors: List[CoinSelector]) -> None:
+        self._selectors = selectors
+
+    def select(self, amounts: Sequence[int], target: int) -> Optional[List[int]]:
+        for selector in self._selectors:
+            result = selector.select(amounts, target)
+
+            if result is not None:
+                return result
+
+        return None
+
+
+COIN_SELECTION_STRATEGIES = ('branch_and_bound', 'best_fit', 'largest_first', 'single_random_draw')
+
+
+def create_coin_selector(strategies: List[str], cost_of_change: int) -> CoinSelector:
+    """
+    Creates a selector that tries the given strategies in order. Every strategy has to be one of
+    COIN_SELECTION_STRATEGIES.
+    """
+    selectors = list()  # type: List[CoinSelector]
+
+    for strategy in strategies:
+        if strategy == 'branch_and_bound':
+            selectors.append(BranchAndBoundCoinSelector(cost_of_change))
+        elif strategy == 'best_fit':
+            selectors.append(BestFitCoinSelector())
+        elif strategy == 'largest_first':
+            selectors.append(LargestFirstCoinSelector())
+        elif strategy == 'single_random_draw':
+            selectors.append(SingleRandomDrawCoinSelector())
+        else:
+            raise ValueError(
+                'Unknown coin selection strategy ' + strategy + '. Use one of ' + ', '.join(COIN_SELECTION_STRATEGIES))
+
+    if len(selectors) == 1:
+        return selectors[0]
+
+    return FallbackCoinSelector(selectors)
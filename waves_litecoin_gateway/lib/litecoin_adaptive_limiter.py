@@ -0,0 +1,182 @@
+"""
+LitecoinAdaptiveLimiter
+"""
+
+import http.client
+import logging
+import time
+from collections import deque
+from functools import partial
+from typing import Any, Callable, List, Optional
+
+from bitcoinrpc.authproxy import AuthServiceProxy, JSONRPCException
+from gevent.event import Event
+
+
+class LitecoinAdaptiveLimiter(object):
+    """
+    Provides the same interface as an AuthServiceProxy, but limits the number of concurrent requests to the node
+    and adapts the limit to what the node is able to handle (additive increase, multiplicative decrease).
+
+    Every successful request that was sent while the limit was exhausted raises the limit by 1 / limit, so by about
+    one per round of requests, up to max_limit. A request that indicates an overloaded node lowers the limit by
+    decrease_factor, down to min_limit. The limit is lowered at most once per smoothed latency, so that
+    the requests that failed because of the same overload lower it only once. The node is considered overloaded
+    if it rejects a request because its work queue is full, if the connection fails or times out, or if a request
+    takes longer than max_latency_s.
+
+    Requests that wait for the limit are admitted by priority: calls of BULK_METHODS, which are used to scan the
+    blocks, only after all other calls, like the ones of payouts and the wallet. A batch request is a bulk request
+    if all of its calls are.
+    """
+
+    BULK_METHODS = frozenset([
+        'getblock', 'getblockfilter', 'getblockhash', 'getblockheader', 'getrawmempool', 'getrawtransaction',
+        'decoderawtransaction'
+    ])
+    # the code of the JSONRPCException raised by the AuthServiceProxy for non-JSON responses, which the node
+    # sends when its work queue is full
+    HTTP_ERROR_CODE = -342
+    DEFAULT_MIN_LIMIT = 1
+    DEFAULT_MAX_LIMIT = 64
+    DEFAULT_DECREASE_FACTOR = 0.5
+    LATENCY_SMOOTHING = 0.1
+
+    def __init__(self,
+                 ltc_proxy: AuthServiceProxy,
+                 initial_limit: int,
+                 min_limit: int = DEFAULT_MIN_LIMIT,
+                 max_limit: int = DEFAULT_MAX_LIMIT,
+                 decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+                 max_latency_s: Optional[float] = None) -> None:
+        self._ltc_proxy = ltc_proxy
+        self._limit = float(max(min_limit, min(max_limit, initial_limit)))
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._decrease_factor = decrease_factor
+        self._max_latency_s = max_latency_s
+        self._in_flight = 0
+        self._priority_waiters = deque()  # type: deque
+        self._bulk_waiters = deque()  # type: deque
+        self._latency = None  # type: Optional[float]
+        self._last_decrease = 0.0
+        self._decreases = 0
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def _admit_waiters(self) -> None:
+        while self._in_flight < int(self._limit) and (len(self._priority_waiters) > 0 or len(self._bulk_waiters) > 0):
+            waiters = self._priority_waiters if len(self._priority_waiters) > 0 else self._bulk_waiters
+            self._in_flight += 1
+            waiters.popleft().set()
+
+    def _acquire(self, bulk: bool) -> None:
+        """Waits until the request may be sent. Bulk requests also wait for every waiting priority request."""
+        waiting = len(self._priority_waiters) + (len(self._bulk_waiters) if bulk else 0)
+
+        if waiting == 0 and self._in_flight < int(self._limit):
+            self._in_flight += 1
+            return
+
+        waiter = Event()
+        waiters = self._bulk_waiters if bulk else self._priority_waiters
+        waiters.append(waiter)
+
+        try:
+            waiter.wait()
+        except BaseException:
+            if waiter.is_set():
+                self._release()
+            else:
+                waiters.remove(waiter)
+
+            raise
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._admit_waiters()
+
+    def _is_overload(self, ex: BaseException) -> bool:
+        if isinstance(ex, JSONRPCException):
+            return ex.code == LitecoinAdaptiveLimiter.HTTP_ERROR_CODE
+
+        return isinstance(ex, (OSError, http.client.HTTPException))
+
+    def _increase(self, exhausted: bool) -> None:
+        if exhausted and self._limit < self._max_limit:
+            self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+            self._admit_waiters()
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+
+        if self._latency is not None and now - self._last_decrease < self._latency:
+            return
+
+        self._last_decrease = now
+        self._decreases += 1
+        self._limit = max(self._min_limit, self._limit * self._decrease_factor)
+        self._logger.debug('Lowered the limit to %d: %s', int(self._limit), reason)
+
+    def _record_latency(self, latency: float) -> None:
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += LitecoinAdaptiveLimiter.LATENCY_SMOOTHING * (latency - self._latency)
+
+    def _send(self, bulk: bool, func: Callable, *args) -> Any:
+        self._acquire(bulk)
+        exhausted = self._in_flight >= int(self._limit)
+        start = time.monotonic()
+
+        try:
+            result = func(*args)
+        except BaseException as ex:
+            if self._is_overload(ex):
+                self._decrease(str(ex))
+
+            raise
+        finally:
+            self._release()
+
+        latency = time.monotonic() - start
+        self._record_latency(latency)
+
+        if self._max_latency_s is not None and latency > self._max_latency_s:
+            self._decrease('Request took %.3fs' % latency)
+        else:
+            self._increase(exhausted)
+
+        return result
+
+    def call(self, method: str, *args) -> Any:
+        return self._send(method in LitecoinAdaptiveLimiter.BULK_METHODS, getattr(self._ltc_proxy, method), *args)
+
+    def batch_(self, rpc_calls: List[list]) -> list:
+        bulk = all(rpc_call[0] in LitecoinAdaptiveLimiter.BULK_METHODS for rpc_call in rpc_calls)
+        return self._send(bulk, self._ltc_proxy.batch_, rpc_calls)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def priority_queue_depth(self) -> int:
+        return len(self._priority_waiters)
+
+    @property
+    def bulk_queue_depth(self) -> int:
+        return len(self._bulk_waiters)
+
+    @property
+    def decreases(self) -> int:
+        return self._decreases
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        return partial(self.call, name)
@@ -0,0 +1,337 @@
+"""
+Encoding of Litecoin addresses
+"""
+
+import hashlib
+from typing import List, Optional, Tuple
+
+
+class LitecoinNetwork(object):
+    """
+    The address prefixes of a Litecoin network.
+    """
+
+    def __init__(self,
+                 name: str,
+                 pubkey_address_prefix: int,
+                 script_address_prefix: int,
+                 legacy_script_address_prefix: int,
+                 bech32_hrp: str,
+                 mweb_hrp: Optional[str] = None) -> None:
+        self._name = name
+        self._pubkey_address_prefix = pubkey_address_prefix
+        self._script_address_prefix = script_address_prefix
+        self._legacy_script_address_prefix = legacy_script_address_prefix
+        self._bech32_hrp = bech32_hrp
+        self._mweb_hrp = mweb_hrp
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def pubkey_address_prefix(self) -> int:
+        return self._pubkey_address_prefix
+
+    @property
+    def script_address_prefix(self) -> int:
+        return self._script_address_prefix
+
+    @property
+    def legacy_script_address_prefix(self) -> int:
+        """The prefix that was used for P2SH addresses before the M (or Q on testnet) addresses were introduced."""
+        return self._legacy_script_address_prefix
+
+    @property
+    def bech32_hrp(self) -> str:
+        return self._bech32_hrp
+
+    @property
+    def mweb_hrp(self) -> Optional[str]:
+        """The human readable part of the MWEB addresses, which are not decoded locally."""
+        return self._mweb_hrp
+
+    @staticmethod
+    def by_name(name: str) -> 'LitecoinNetwork':
+        """Returns one of the known networks: mainnet, testnet or regtest."""
+        for network in [MAINNET, TESTNET, REGTEST]:
+            if network.name == name:
+                return network
+
+        raise ValueError('Unknown Litecoin network ' + name + '. Use mainnet, testnet or regtest')
+
+
+MAINNET = LitecoinNetwork('mainnet', 48, 50, 5, 'ltc', 'ltcmweb')
+TESTNET = LitecoinNetwork('testnet', 111, 58, 196, 'tltc', 'tmweb')
+REGTEST = LitecoinNetwork('regtest', 111, 58, 196, 'rltc', 'tmweb')
+
+_BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+_BECH32_ALPHABET = 'qpzry9x8gf2tvdw0s3jn54khce6mua7l'
+_BECH32_GENERATOR = [0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3]
+
+BECH32_CONSTANT = 1
+BECH32M_CONSTANT = 0x2bc830a3
+
+
+def double_sha256(data: bytes) -> bytes:
+    return hashlib.sha256(hashlib.sha256(data).digest()).digest()
+
+
+def _ripemd160_fallback(data: bytes) -> bytes:
+    """Pure python RIPEMD-160 for OpenSSL builds that do not provide the algorithm anymore."""
+    # yapf: disable
+    r_left = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15,
+              7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8,
+              3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12,
+              1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2,
+              4, 0, 5, 9, 7, 12, 2, 10, 14, 1, 3, 8, 11, 6, 15, 13]
+    r_right = [5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12,
+               6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2,
+               15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13,
+               8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14,
+               12, 15, 10, 4, 1, 5, 8, 7, 6, 2, 13, 14, 0, 3, 9, 11]
+    s_left = [11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8,
+              7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12,
+              11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5,
+              11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12,
+              9, 15, 5, 11, 6, 8, 13, 12, 5, 12, 13, 14, 11, 8, 5, 6]
+    s_right = [8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6,
+               9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11,
+               9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5,
+               15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8,
+               8, 5, 12, 9, 12, 5, 14, 6, 8, 13, 6, 5, 15, 13, 11, 11]
+    # yapf: enable
+    k_left = [0x00000000, 0x5a827999, 0x6ed9eba1, 0x8f1bbcdc, 0xa953fd4e]
+    k_right = [0x50a28be6, 0x5c4dd124, 0x6d703ef3, 0x7a6d76e9, 0x00000000]
+    mask = 0xffffffff
+
+    def rotate(value: int, bits: int) -> int:
+        return ((value << bits) | (value >> (32 - bits))) & mask
+
+    def f(j: int, x: int, y: int, z: int) -> int:
+        if j < 16:
+            return x ^ y ^ z
+        elif j < 32:
+            return (x & y) | (~x & z)
+        elif j < 48:
+            return (x | ~y) ^ z
+        elif j < 64:
+            return (x & z) | (y & ~z)
+        else:
+            return x ^ (y | ~z)
+
+    message = bytearray(data) + b'\x80'
+    message += b'\x00' * ((56 - len(message) % 64) % 64)
+    message += (8 * len(data)).to_bytes(8, 'little')
+
+    h = [0x67452301, 0xefcdab89, 0x98badcfe, 0x10325476, 0xc3d2e1f0]
+
+    for offset in range(0, len(message), 64):
+        x = [int.from_bytes(message[offset + 4 * i:offset + 4 * i + 4], 'little') for i in range(0, 16)]
+        al, bl, cl, dl, el = h
+        ar, br, cr, dr, er = h
+
+        for j in range(0, 80):
+            t = (rotate((al + f(j, bl, cl, dl) + x[r_left[j]] + k_left[j // 16]) & mask, s_left[j]) + el) & mask
+            al, el, dl, cl, bl = el, dl, rotate(cl, 10), bl, t
+            t = (rotate((ar + f(79 - j, br, cr, dr) + x[r_right[j]] + k_right[j // 16]) & mask, s_right[j]) + er) & mask
+            ar, er, dr, cr, br = er, dr, rotate(cr, 10), br, t
+
+        t = (h[1] + cl + dr) & mask
+        h[1] = (h[2] + dl + er) & mask
+        h[2] = (h[3] + el + ar) & mask
+        h[3] = (h[4] + al + br) & mask
+        h[4] = (h[0] + bl + cr) & mask
+        h[0] = t
+
+    return b''.join(value.to_bytes(4, 'little') for value in h)
+
+
+def hash160(data: bytes) -> bytes:
+    """RIPEMD-160 of the SHA-256 of the given data, as used for P2PKH and P2SH addresses."""
+    sha256 = hashlib.sha256(data).digest()
+
+    try:
+        return hashlib.new('ripemd160', sha256).digest()
+    except ValueError:
+        return _ripemd160_fallback(sha256)
+
+
+def base58check_encode(prefix: int, payload: bytes) -> str:
+    """Encodes the given payload with the given version prefix as Base58Check string."""
+    data = bytes([prefix]) + bytes(payload)
+    data += double_sha256(data)[:4]
+
+    value = int.from_bytes(data, 'big')
+    result = list()  # type: List[str]
+
+    while value > 0:
+        value, remainder = divmod(value, 58)
+        result.append(_BASE58_ALPHABET[remainder])
+
+    for byte in data:
+        if byte != 0:
+            break
+        result.append(_BASE58_ALPHABET[0])
+
+    return ''.join(reversed(result))
+
+
+def is_base58(text: str) -> bool:
+    """Returns whether the given string only consists of characters of the Base58 alphabet."""
+    return all(character in _BASE58_ALPHABET for character in text)
+
+
+def base58check_decode(address: str) -> Optional[Tuple[int, bytes]]:
+    """Returns the version prefix and the payload of the given Base58Check string or None if it is invalid."""
+    value = 0
+
+    for character in address:
+        digit = _BASE58_ALPHABET.find(character)
+
+        if digit < 0:
+            return None
+
+        value = value * 58 + digit
+
+    leading_zeros = len(address) - len(address.lstrip(_BASE58_ALPHABET[0]))
+    data = bytes(leading_zeros) + value.to_bytes((value.bit_length() + 7) // 8, 'big')
+
+    if len(data) < 5 or double_sha256(data[:-4])[:4] != data[-4:]:
+        return None
+
+    return data[0], data[1:-4]
+
+
+def _bech32_polymod(values: List[int]) -> int:
+    checksum = 1
+
+    for value in values:
+        top = checksum >> 25
+        checksum = (checksum & 0x1ffffff) << 5 ^ value
+
+        for i in range(0, 5):
+            checksum ^= _BECH32_GENERATOR[i] if ((top >> i) & 1) else 0
+
+    return checksum
+
+
+def _bech32_hrp_expand(hrp: str) -> List[int]:
+    return [ord(x) >> 5 for x in hrp] + [0] + [ord(x) & 31 for x in hrp]
+
+
+def _convert_bits(data: bytes, from_bits: int, to_bits: int) -> List[int]:
+    """Regroups the bits of the given data, padding the last group with zeros."""
+    accumulator = 0
+    bits = 0
+    result = list()  # type: List[int]
+    max_value = (1 << to_bits) - 1
+
+    for value in data:
+        accumulator = (accumulator << from_bits) | value
+        bits += from_bits
+
+        while bits >= to_bits:
+            bits -= to_bits
+            result.append((accumulator >> bits) & max_value)
+
+    if bits > 0:
+        result.append((accumulator << (to_bits - bits)) & max_value)
+
+    return result
+
+
+def _convert_bits_strict(data: List[int], from_bits: int, to_bits: int) -> Optional[bytes]:
+    """Regroups the bits of the given data and returns None unless it ends with less than from_bits zero bits."""
+    accumulator = 0
+    bits = 0
+    result = bytearray()
+    max_value = (1 << to_bits) - 1
+
+    for value in data:
+        accumulator = (accumulator << from_bits) | value
+        bits += from_bits
+
+        while bits >= to_bits:
+            bits -= to_bits
+            result.append((accumulator >> bits) & max_value)
+
+    if bits >= from_bits or (accumulator << (to_bits - bits)) & max_value:
+        return None
+
+    return bytes(result)
+
+
+def bech32_encode(hrp: str, witness_version: int, witness_program: bytes) -> str:
+    """
+    Encodes a segwit address. Version 0 programs use bech32 (BIP173), all later versions bech32m (BIP350).
+    """
+    data = [witness_version] + _convert_bits(witness_program, 8, 5)
+    constant = BECH32_CONSTANT if witness_version == 0 else BECH32M_CONSTANT
+    polymod = _bech32_polymod(_bech32_hrp_expand(hrp) + data + [0, 0, 0, 0, 0, 0]) ^ constant
+    checksum = [(polymod >> 5 * (5 - i)) & 31 for i in range(0, 6)]
+
+    return hrp + '1' + ''.join(_BECH32_ALPHABET[value] for value in data + checksum)
+
+
+def bech32_decode(hrp: str, address: str) -> Optional[Tuple[int, bytes]]:
+    """
+    Returns the witness version and the witness program of the given segwit address or None if it is not a valid
+    address with the given human readable part (BIP173 and BIP350).
+    """
+    if len(address) > 90 or (address.lower() != address and address.upper() != address):
+        return None
+
+    address = address.lower()
+    separator = address.rfind('1')
+
+    if address[:separator] != hrp or len(address) - separator - 1 < 7:
+        return None
+
+    data = [_BECH32_ALPHABET.find(character) for character in address[separator + 1:]]
+
+    if min(data) < 0:
+        return None
+
+    witness_version = data[0]
+    constant = BECH32_CONSTANT if witness_version == 0 else BECH32M_CONSTANT
+
+    if witness_version > 16 or _bech32_polymod(_bech32_hrp_expand(hrp) + data) != constant:
+        return None
+
+    witness_program = _convert_bits_strict(data[1:-6], 5, 8)
+
+    if witness_program is None or not 2 <= len(witness_program) <= 40 or \
+            (witness_version == 0 and len(witness_program) not in (20, 32)):
+        return None
+
+    return witness_version, witness_program
+
+
+def address_to_script(address: str, network: LitecoinNetwork) -> Optional[bytes]:
+    """
+    Returns the output script that pays to the given P2PKH, P2SH or segwit address of the given network
+    or None if it is not a valid address of the network.
+    """
+    decoded = base58check_decode(address)
+
+    if decoded is not None:
+        prefix, payload = decoded
+
+        if len(payload) != 20:
+            return None
+        elif prefix == network.pubkey_address_prefix:
+            return b'\x76\xa9\x14' + payload + b'\x88\xac'
+        elif prefix in (network.script_address_prefix, network.legacy_script_address_prefix):
+            return b'\xa9\x14' + payload + b'\x87'
+
+        return None
+
+    decoded_segwit = bech32_decode(network.bech32_hrp, address)
+
+    if decoded_segwit is None:
+        return None
+
+    witness_version, witness_program = decoded_segwit
+
+    return bytes([0 if witness_version == 0 else 0x50 + witness_version, len(witness_program)]) + witness_program
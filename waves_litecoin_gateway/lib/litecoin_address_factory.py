@@ -4,16 +4,38 @@ LitecoinAddressFactory
 
 import waves_gateway as gw
 from bitcoinrpc.authproxy import AuthServiceProxy
+from typing import Optional
+
+from .litecoin_address_index import LitecoinAddressIndex
+from .litecoin_address_pool import LitecoinAddressPool
 
 
 class LitecoinAddressFactory(gw.CoinAddressFactory):
     """
     Implements an AddressFactory using the getnewaddress function provided by the Litecoin client.
+    Every created address is added to the optional address_index.
+    If an address_pool is given, the addresses are taken from the pool and getnewaddress is only called
+    while the pool is empty.
     """
 
-    def __init__(self, ltc_proxy: AuthServiceProxy) -> None:
+    def __init__(self,
+                 ltc_proxy: AuthServiceProxy,
+                 address_index: Optional[LitecoinAddressIndex] = None,
+                 address_pool: Optional[LitecoinAddressPool] = None) -> None:
         self._access = ltc_proxy
+        self._address_index = address_index
+        self._address_pool = address_pool
 
     def create_address(self) -> gw.CoinAddress:
+        address = None
+
+        if self._address_pool is not None:
+            address = self._address_pool.take()
+
+        if address is None:
+            address = self._access.getnewaddress()
+
+        if self._address_index is not None:
+            self._address_index.add(address)
 
-        return self._access.getnewaddress()
+        return address
@@ -0,0 +1,110 @@
+"""
+LitecoinAddressIndex
+"""
+
+import hashlib
+import math
+from typing import Iterable, Optional, Set
+
+from .litecoin_address_encoding import LitecoinNetwork, address_to_script
+
+
+class _BloomFilter(object):
+    """
+    Space efficient set membership test that may report false positives, but never false negatives.
+    The bit positions are derived from a single SHA-256 digest by double hashing.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float) -> None:
+        self._num_bits = max(8, int(math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2)**2))))
+        self._num_hashes = max(1, int(round(self._num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self._num_bits + 7) // 8)
+
+    def _positions(self, value: str) -> Iterable[int]:
+        digest = hashlib.sha256(value.encode('utf-8')).digest()
+        first = int.from_bytes(digest[0:8], 'little')
+        second = int.from_bytes(digest[8:16], 'little') | 1
+
+        return ((first + i * second) % self._num_bits for i in range(0, self._num_hashes))
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    @property
+    def size(self) -> int:
+        """The size of the bit array in bytes."""
+        return len(self._bits)
+
+
+class LitecoinAddressIndex(object):
+    """
+    In-memory index of the Litecoin addresses that are owned by the Gateway.
+    It allows to skip transactions that do not pay to any of those addresses before their senders are resolved.
+
+    By default the addresses are kept in a set. For very large numbers of addresses, a bloom_filter_capacity
+    may be given, so that only a Bloom filter is kept in memory. A false positive only causes a transaction to be
+    resolved unnecessarily; it is filtered by the Gateway afterwards anyway.
+
+    If a network is given, the output scripts paying to the addresses are kept as well, so that they can be
+    matched against block filters. As a block filter cannot be matched against addresses without a known script,
+    scripts is None once such an address was added.
+    """
+
+    DEFAULT_FALSE_POSITIVE_RATE = 0.001
+
+    def __init__(self,
+                 addresses: Iterable[str] = (),
+                 bloom_filter_capacity: Optional[int] = None,
+                 false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+                 network: Optional[LitecoinNetwork] = None) -> None:
+        self._addresses = set()  # type: set
+        self._bloom_filter = None  # type: Optional[_BloomFilter]
+        self._count = 0
+        self._network = network
+        self._scripts = set() if network is not None else None  # type: Optional[Set[bytes]]
+
+        if bloom_filter_capacity is not None:
+            self._bloom_filter = _BloomFilter(bloom_filter_capacity, false_positive_rate)
+
+        self.add_all(addresses)
+
+    def add(self, address: str) -> None:
+        """Adds the given address to the index."""
+        if self._scripts is not None:
+            script = address_to_script(address, self._network)
+
+            if script is None:
+                self._scripts = None
+            else:
+                self._scripts.add(script)
+
+        if self._bloom_filter is not None:
+            if address not in self._bloom_filter:
+                self._bloom_filter.add(address)
+                self._count += 1
+        elif address not in self._addresses:
+            self._addresses.add(address)
+            self._count += 1
+
+    def add_all(self, addresses: Iterable[str]) -> None:
+        for address in addresses:
+            self.add(address)
+
+    def __contains__(self, address: str) -> bool:
+        if self._bloom_filter is not None:
+            return address in self._bloom_filter
+        else:
+            return address in self._addresses
+
+    @property
+    def scripts(self) -> Optional[Set[bytes]]:
+        """The output scripts of the indexed addresses, if they are kept and known for every address."""
+        return self._scripts
+
+    def __len__(self) -> int:
+        """The number of indexed addresses. It is approximated if a Bloom filter is used."""
+        return self._count
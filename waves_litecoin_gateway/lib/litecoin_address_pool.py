@@ -0,0 +1,90 @@
+"""
+LitecoinAddressPool
+"""
+
+import logging
+from collections import deque
+from typing import List, Optional
+
+import gevent
+from bitcoinrpc.authproxy import AuthServiceProxy
+from pymongo.collection import Collection
+
+
+class LitecoinAddressPool(object):
+    """
+    Keeps addresses that were created in advance by the Litecoin client, so that taking an address
+    does not wait for a getnewaddress call.
+
+    The pool is refilled in the background up to high_watermark addresses as soon as it contains less than
+    low_watermark addresses. The addresses are created by JSON-RPC batch requests of at most refill_batch_size
+    calls and stored in the given collection before they are added to the pool, so that they survive a restart.
+
+    An address is removed from the collection before it is handed out. Only the Gateway instance that removed it
+    hands it out, so the collection may be shared by several instances.
+    """
+
+    DICT_ADDRESS_KEY = 'address'
+    DEFAULT_HIGH_WATERMARK = 1000
+    DEFAULT_REFILL_BATCH_SIZE = 100
+
+    def __init__(self,
+                 ltc_proxy: AuthServiceProxy,
+                 collection: Collection,
+                 high_watermark: int = DEFAULT_HIGH_WATERMARK,
+                 low_watermark: Optional[int] = None,
+                 refill_batch_size: int = DEFAULT_REFILL_BATCH_SIZE) -> None:
+        if low_watermark is None:
+            low_watermark = high_watermark // 2
+
+        self._ltc_proxy = ltc_proxy
+        self._collection = collection
+        self._high_watermark = high_watermark
+        self._low_watermark = low_watermark
+        self._refill_batch_size = refill_batch_size
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._addresses = deque(
+            entry[LitecoinAddressPool.DICT_ADDRESS_KEY] for entry in collection.find(sort=[('_id', 1)]))
+        self._refill_greenlet = None  # type: Optional[gevent.Greenlet]
+
+    def _create_addresses(self, count: int) -> List[str]:
+        return self._ltc_proxy.batch_([['getnewaddress'] for _ in range(0, count)])
+
+    def refill(self) -> None:
+        """Creates and stores new addresses until the pool contains high_watermark addresses."""
+        while len(self._addresses) < self._high_watermark:
+            addresses = self._create_addresses(
+                min(self._refill_batch_size, self._high_watermark - len(self._addresses)))
+            self._collection.insert_many([{LitecoinAddressPool.DICT_ADDRESS_KEY: address} for address in addresses])
+            self._addresses.extend(addresses)
+
+    def _refill_in_background(self) -> None:
+        try:
+            self.refill()
+        except Exception as ex:  # pylint: disable=broad-except
+            self._logger.warning('Failed to refill the address pool: %s', str(ex))
+        finally:
+            self._refill_greenlet = None
+
+    def start_refill(self) -> None:
+        """Starts refilling the pool in the background, unless it is already being refilled."""
+        if self._refill_greenlet is None:
+            self._refill_greenlet = gevent.spawn(self._refill_in_background)
+
+    def take(self) -> Optional[str]:
+        """Removes and returns an address of the pool or returns None if the pool is empty."""
+        address = None
+
+        while address is None and len(self._addresses) > 0:
+            candidate = self._addresses.popleft()
+
+            if self._collection.delete_one({LitecoinAddressPool.DICT_ADDRESS_KEY: candidate}).deleted_count > 0:
+                address = candidate
+
+        if len(self._addresses) < self._low_watermark:
+            self.start_refill()
+
+        return address
+
+    def __len__(self) -> int:
+        return len(self._addresses)
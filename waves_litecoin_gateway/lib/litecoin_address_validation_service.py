@@ -2,18 +2,88 @@
 LitecoinAddressValidationService
 """
 
+from collections import OrderedDict
+
 import waves_gateway as wg
 from bitcoinrpc.authproxy import AuthServiceProxy
+from typing import Optional
+
+from .litecoin_address_encoding import LitecoinNetwork, base58check_decode, bech32_decode, is_base58
 
 
 class LitecoinAddressValidationService(wg.AddressValidationService):
     """
     Validates an Litecoin address by using an RPC service.
+
+    If a network is given, Base58Check and segwit addresses of this network are validated locally instead.
+    Only the MWEB addresses of this network are still validated by the RPC service, every other form is invalid
+    without a call, so that a burst of invalid addresses does not load the node.
+    In strict mode, addresses that are valid locally are checked by the RPC service as well.
+    The results are kept in an LRU cache of cache_size addresses, None disables the cache.
     """
 
-    def __init__(self, ltc_proxy: AuthServiceProxy) -> None:
+    DEFAULT_CACHE_SIZE = 10000
+    HASH160_SIZE = 20
+
+    def __init__(self,
+                 ltc_proxy: AuthServiceProxy,
+                 network: Optional[LitecoinNetwork] = None,
+                 strict: bool = False,
+                 cache_size: Optional[int] = DEFAULT_CACHE_SIZE) -> None:
         self._ltc_proxy = ltc_proxy
+        self._network = network
+        self._strict = strict
+        self._cache_size = cache_size
+        self._cache = OrderedDict()  # type: OrderedDict
 
-    def validate_address(self, address: str) -> bool:
+    def _validate_locally(self, address: str) -> Optional[bool]:
+        """Returns None for an MWEB address, which can only be validated by the RPC service."""
+        if address.lower().startswith(self._network.bech32_hrp + '1'):
+            return bech32_decode(self._network.bech32_hrp, address) is not None
+
+        if not is_base58(address):
+            if self._network.mweb_hrp is not None and address.lower().startswith(self._network.mweb_hrp + '1'):
+                return None
+
+            return False
+
+        decoded = base58check_decode(address)
+
+        if decoded is None:
+            return False
+
+        prefix, payload = decoded
+        prefixes = (self._network.pubkey_address_prefix, self._network.script_address_prefix,
+                    self._network.legacy_script_address_prefix)
+
+        return prefix in prefixes and len(payload) == LitecoinAddressValidationService.HASH160_SIZE
+
+    def _validate_by_node(self, address: str) -> bool:
         validation_result = self._ltc_proxy.validateaddress(address)
         return validation_result['isvalid']
+
+    def _validate(self, address: str) -> bool:
+        if self._network is None:
+            return self._validate_by_node(address)
+
+        valid = self._validate_locally(address)
+
+        if valid is None:
+            return self._validate_by_node(address)
+
+        return valid and (not self._strict or self._validate_by_node(address))
+
+    def validate_address(self, address: str) -> bool:
+        if address in self._cache:
+            self._cache.move_to_end(address)
+            return self._cache[address]
+
+        result = self._validate(address)
+
+        if self._cache_size is not None:
+            self._cache[address] = result
+
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+        return result
@@ -0,0 +1,86 @@
+"""
+LitecoinBatchingTransactionService
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import gevent
+import waves_gateway as gw
+from gevent.event import AsyncResult
+
+from .litecoin_transaction_service import LitecoinTransactionService
+
+
+class _PendingPayout(object):
+    """
+    A TransactionAttempt that waits for the transaction of its batch.
+    """
+
+    def __init__(self, attempt: gw.TransactionAttempt) -> None:
+        self.attempt = attempt
+        self.result = AsyncResult()
+
+
+class LitecoinBatchingTransactionService(gw.TransactionService):
+    """
+    Collects the TransactionAttempts of concurrent send_coin calls and sends the attempts of the same sender
+    as a single transaction with one output per receiver. A batch is sent as soon as it contains max_batch_size
+    attempts or batch_window_s seconds after its first attempt arrived. Every attempt of a batch results in the
+    same transaction.
+
+    The merged transaction only pays the highest fee of its attempts. If it fails, every attempt of the batch fails.
+    """
+
+    DEFAULT_MAX_BATCH_SIZE = 20
+    DEFAULT_BATCH_WINDOW_S = 2.0
+
+    def __init__(self,
+                 transaction_service: LitecoinTransactionService,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 batch_window_s: float = DEFAULT_BATCH_WINDOW_S) -> None:
+        self._transaction_service = transaction_service
+        self._max_batch_size = max_batch_size
+        self._batch_window_s = batch_window_s
+        self._batches = dict()  # type: Dict[Tuple[str, Optional[str]], List[_PendingPayout]]
+
+    def _merge_attempts(self, attempts: List[gw.TransactionAttempt]) -> gw.TransactionAttempt:
+        receivers = list()  # type: List[gw.TransactionAttemptReceiver]
+
+        for attempt in attempts:
+            receivers.extend(attempt.receivers)
+
+        return gw.TransactionAttempt(
+            sender=attempts[0].sender,
+            receivers=receivers,
+            fee=max(attempt.fee for attempt in attempts),
+            currency=attempts[0].currency)
+
+    def _send_batch(self, key: Tuple[str, Optional[str]]) -> None:
+        batch = self._batches.pop(key)
+        attempt = self._merge_attempts([payout.attempt for payout in batch])
+
+        try:
+            transaction = self._transaction_service.send_coin(attempt, key[1])
+        except Exception as ex:  # pylint: disable=broad-except
+            for payout in batch:
+                payout.result.set_exception(ex)
+        else:
+            for payout in batch:
+                payout.result.set(transaction)
+
+    def _send_batch_after_window(self, key: Tuple[str, Optional[str]], batch: List[_PendingPayout]) -> None:
+        if self._batches.get(key) is batch:
+            self._send_batch(key)
+
+    def send_coin(self, attempt: gw.TransactionAttempt, secret: Optional[str] = None) -> gw.Transaction:
+        key = (attempt.sender, secret)
+        payout = _PendingPayout(attempt)
+        batch = self._batches.setdefault(key, list())
+        batch.append(payout)
+
+        if len(batch) >= self._max_batch_size:
+            self._send_batch(key)
+        elif len(batch) == 1:
+            gevent.spawn_later(self._batch_window_s, self._send_batch_after_window, key, batch)
+
+        return payout.result.get()
@@ -0,0 +1,74 @@
+"""
+LitecoinBlockCache
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+
+class LitecoinBlockCache(object):
+    """
+    Keeps the decoded transactions of the max_blocks highest blocks that were scanned, keyed by their height
+    and hash. The hash of the block at a height is expected to be looked up by the caller (e.g. by getblockhash)
+    on every access. If it differs from the cached one, the block was replaced by a reorganization and the cached
+    block is evicted together with all cached blocks above it.
+    """
+
+    DEFAULT_MAX_BLOCKS = 8
+
+    def __init__(self, max_blocks: int = DEFAULT_MAX_BLOCKS) -> None:
+        self._max_blocks = max_blocks
+        self._blocks = dict()  # type: Dict[int, Tuple[str, List[dict]]]
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def _invalidate_from(self, height: int) -> None:
+        for invalidated_height in [
+                invalidated_height for invalidated_height in self._blocks if invalidated_height >= height
+        ]:
+            del self._blocks[invalidated_height]
+            self._invalidations += 1
+
+    def get(self, height: int, block_hash: str) -> Optional[List[dict]]:
+        """Returns the decoded transactions of the given block or None if it is not cached."""
+        entry = self._blocks.get(height)
+
+        if entry is not None and entry[0] == block_hash:
+            self._hits += 1
+            return entry[1]
+
+        if entry is not None:
+            self._logger.warning('Block %s at height %d was replaced by block %s', entry[0], height, block_hash)
+            self._invalidate_from(height)
+
+        self._misses += 1
+
+        return None
+
+    def put(self, height: int, block_hash: str, transactions: List[dict]) -> None:
+        """Caches the decoded transactions of the given block and evicts the lowest blocks if necessary."""
+        if height in self._blocks and self._blocks[height][0] != block_hash:
+            self._invalidate_from(height)
+
+        self._blocks[height] = (block_hash, transactions)
+
+        while len(self._blocks) > self._max_blocks:
+            del self._blocks[min(self._blocks)]
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def invalidations(self) -> int:
+        """The number of cached blocks that were evicted because they were replaced by a reorganization."""
+        return self._invalidations
+
+    def __len__(self) -> int:
+        return len(self._blocks)
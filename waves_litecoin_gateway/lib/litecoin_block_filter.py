@@ -0,0 +1,173 @@
+"""
+LitecoinBlockFilter
+"""
+
+import struct
+from typing import Iterable, Iterator, List
+
+_MASK_64 = 0xffffffffffffffff
+
+
+def _sip_round(v0: int, v1: int, v2: int, v3: int):
+    v0 = (v0 + v1) & _MASK_64
+    v1 = ((v1 << 13) | (v1 >> 51)) & _MASK_64 ^ v0
+    v0 = ((v0 << 32) | (v0 >> 32)) & _MASK_64
+    v2 = (v2 + v3) & _MASK_64
+    v3 = ((v3 << 16) | (v3 >> 48)) & _MASK_64 ^ v2
+    v0 = (v0 + v3) & _MASK_64
+    v3 = ((v3 << 21) | (v3 >> 43)) & _MASK_64 ^ v0
+    v2 = (v2 + v1) & _MASK_64
+    v1 = ((v1 << 17) | (v1 >> 47)) & _MASK_64 ^ v2
+    v2 = ((v2 << 32) | (v2 >> 32)) & _MASK_64
+    return v0, v1, v2, v3
+
+
+def siphash24(k0: int, k1: int, data: bytes) -> int:
+    """SipHash-2-4 of the given data with the 128 bit key given as two little endian 64 bit integers."""
+    v0 = k0 ^ 0x736f6d6570736575
+    v1 = k1 ^ 0x646f72616e646f6d
+    v2 = k0 ^ 0x6c7967656e657261
+    v3 = k1 ^ 0x7465646279746573
+    length = len(data)
+    tail = length - length % 8
+    words = list(struct.unpack_from('<%dQ' % (tail // 8), data))
+    words.append(int.from_bytes(data[tail:], 'little') | ((length & 0xff) << 56))
+
+    for word in words:
+        v3 ^= word
+        v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+        v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+        v0 ^= word
+
+    v2 ^= 0xff
+
+    for _ in range(0, 4):
+        v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def _read_compact_size(data: bytes) -> tuple:
+    """Returns the CompactSize at the start of the given data and its length."""
+    if len(data) == 0:
+        raise ValueError('Empty block filter')
+
+    if data[0] < 0xfd:
+        return data[0], 1
+
+    length = {0xfd: 2, 0xfe: 4, 0xff: 8}[data[0]]
+
+    if len(data) < 1 + length:
+        raise ValueError('Unexpected end of block filter')
+
+    return int.from_bytes(data[1:1 + length], 'little'), 1 + length
+
+
+def _write_compact_size(value: int) -> bytes:
+    if value < 0xfd:
+        return bytes([value])
+    elif value <= 0xffff:
+        return b'\xfd' + value.to_bytes(2, 'little')
+    elif value <= 0xffffffff:
+        return b'\xfe' + value.to_bytes(4, 'little')
+    else:
+        return b'\xff' + value.to_bytes(8, 'little')
+
+
+class LitecoinBlockFilter(object):
+    """
+    A basic compact block filter (BIP158) as returned by getblockfilter. It is a Golomb-coded set of the hashes
+    of the output scripts of a block and of the scripts of the outputs its inputs spend.
+
+    match_any tests whether a block may contain any of the given scripts. It hashes the scripts with the key
+    of the block, sorts them and walks them along the deltas of the filter, so that the filter is decoded at most
+    once and only until the first match. A match may be a false positive with a probability of 1 / BASIC_FILTER_M
+    for every script, a mismatch is never wrong.
+    """
+
+    BASIC_FILTER_P = 19
+    BASIC_FILTER_M = 784931
+
+    def __init__(self, block_hash: str, filter_hex: str) -> None:
+        data = bytes.fromhex(filter_hex)
+        self._n, offset = _read_compact_size(data)
+        self._data = data[offset:]
+        key = bytes.fromhex(block_hash)[::-1]
+        self._k0 = int.from_bytes(key[0:8], 'little')
+        self._k1 = int.from_bytes(key[8:16], 'little')
+
+    @staticmethod
+    def _hash_to_range(k0: int, k1: int, script: bytes, f: int) -> int:
+        return (siphash24(k0, k1, script) * f) >> 64
+
+    def _values(self) -> Iterator[int]:
+        """Decodes the sorted hashed values of the filter."""
+        p = LitecoinBlockFilter.BASIC_FILTER_P
+        bits = bin(int.from_bytes(self._data, 'big'))[2:].zfill(len(self._data) * 8) if len(self._data) > 0 else ''
+        position = 0
+        value = 0
+
+        for _ in range(0, self._n):
+            # the quotient is encoded in unary as ones terminated by a zero, followed by p bits of the remainder
+            end = bits.find('0', position)
+
+            if end < 0 or end + 1 + p > len(bits):
+                raise ValueError('Unexpected end of block filter')
+
+            value += ((end - position) << p) | int(bits[end + 1:end + 1 + p], 2)
+            position = end + 1 + p
+
+            yield value
+
+    def match_any(self, scripts: Iterable[bytes]) -> bool:
+        """Returns whether the block may contain any of the given scripts."""
+        if self._n == 0:
+            return False
+
+        f = self._n * LitecoinBlockFilter.BASIC_FILTER_M
+        queries = sorted(set(LitecoinBlockFilter._hash_to_range(self._k0, self._k1, script, f) for script in scripts))
+
+        if len(queries) == 0:
+            return False
+
+        index = 0
+
+        for value in self._values():
+            while queries[index] < value:
+                index += 1
+
+                if index == len(queries):
+                    return False
+
+            if queries[index] == value:
+                return True
+
+        return False
+
+    def __len__(self) -> int:
+        """The number of elements of the filter."""
+        return self._n
+
+    @staticmethod
+    def create(block_hash: str, scripts: Iterable[bytes]) -> str:
+        """Creates the hex encoded basic filter of the given block hash containing the given scripts."""
+        p = LitecoinBlockFilter.BASIC_FILTER_P
+        elements = set(script for script in scripts if len(script) > 0)
+        key = bytes.fromhex(block_hash)[::-1]
+        k0 = int.from_bytes(key[0:8], 'little')
+        k1 = int.from_bytes(key[8:16], 'little')
+        f = len(elements) * LitecoinBlockFilter.BASIC_FILTER_M
+        values = sorted(LitecoinBlockFilter._hash_to_range(k0, k1, script, f) for script in elements)
+        parts = list()  # type: List[str]
+        last_value = 0
+
+        for value in values:
+            delta = value - last_value
+            parts.append('1' * (delta >> p) + '0' + format(delta & ((1 << p) - 1), '0%db' % p))
+            last_value = value
+
+        bits = ''.join(parts)
+        bits += '0' * (-len(bits) % 8)
+        data = int(bits, 2).to_bytes(len(bits) // 8, 'big') if len(bits) > 0 else b''
+
+        return (_write_compact_size(len(elements)) + data).hex()
@@ -2,31 +2,146 @@
 LitecoinChainQueryService
 """
 
+import logging
+import time
+from collections import OrderedDict, deque
+
+import gevent
 import waves_gateway as gw
+from gevent.event import AsyncResult
+from gevent.threadpool import ThreadPool
 from bitcoinrpc.authproxy import AuthServiceProxy, JSONRPCException
-from typing import List, Optional
+from typing import FrozenSet, Iterable, Iterator, List, Optional, Dict, Set, Tuple
 import gevent.pool as pool
 
 from decimal import Decimal
 
 from waves_gateway import Transaction
 
+from .litecoin_address_index import LitecoinAddressIndex
+from .litecoin_block_cache import LitecoinBlockCache
+from .litecoin_block_filter import LitecoinBlockFilter
+from .litecoin_decoding_pool import LitecoinDecodingPool
+from .litecoin_transaction_cache import LitecoinTransactionCache
+from .litecoin_transaction_decoder import LitecoinTransactionDecoder
+from .litecoin_transaction_store import LitecoinTransactionStore
+from .litecoin_utxo_set import LitecoinUtxoSet
 from .util import sum_unspents
 
 
 class LitecoinChainQueryService(gw.ChainQueryService):
     """
     Implementation of an ChainQueryService on the Litecoin Blockchain.
+
+    If a batch_size is given, the transactions of a block are fetched by using JSON-RPC batch requests
+    containing at most batch_size calls each. Otherwise, every transaction is fetched on its own.
+    Decoded transactions are kept in the optional transaction_cache, so that resolving the senders of
+    inputs that spend already known transactions does not require any RPC call.
+    If a transaction_decoder is given, raw transactions are decoded locally instead of calling
+    decoderawtransaction.
+    If an address_index is given, only the transactions of a block that pay to one of its addresses are returned,
+    so that the senders of all other transactions are never resolved.
+    Every transaction of a scanned block is applied to the optional utxo_set.
+
+    The node may notify the service about new blocks and transactions, e.g. by using a
+    LitecoinZmqNotificationListener. The height of the last notified block is used as long as the last block
+    notification is not older than notification_timeout_s, afterwards the node is polled with getblockcount.
+
+    If a prefetch_window is given and the requested block is more than prefetch_window blocks behind the highest
+    block, the service catches up by fetching and decoding the next prefetch_window blocks concurrently
+    (only when using batch requests). The transactions are still applied and returned strictly in the order
+    of the requested heights. Blocks closer than prefetch_window to the highest block are never prefetched,
+    so that a reorganization near the highest block cannot affect them.
+    Recently scanned blocks are kept in the optional block_cache (only when using batch requests), so that
+    a block that is requested again only costs a getblockhash call as long as it was not replaced.
+    Decoded transactions are also persisted in the optional transaction_store and looked up there before
+    they are fetched from the node, so that they survive a restart.
+
+    The transactions of a block may be iterated while they are resolved. At most max_concurrency transactions
+    are resolved concurrently when not using batch requests, and the senders of batch_size transactions at a time
+    when using batch requests, so that the memory used for the transactions their inputs spend does not grow
+    with the size of the block.
+
+    Unconfirmed transactions may be resolved ahead of their block by resolve_pending_transaction, e.g. by a
+    LitecoinMempoolWatcher. A scanned block takes its transactions from the up to MAX_PENDING_TRANSACTIONS
+    most recently resolved pending transactions instead of resolving them again.
+
+    If a decoding_pool is given, blocks are fetched serialized and their transactions are decoded in the worker
+    processes of the pool together with the transactions fetched by batch requests (only when using batch
+    requests), so that large blocks do not block the other greenlets while they are decoded.
+
+    If block_filters is set, the basic compact filter (BIP158) of every block is fetched first and matched against
+    the output scripts of the address_index (only when using batch requests). Blocks that neither pay to nor spend
+    from any of these scripts are skipped without fetching them, so that their transactions are neither returned
+    nor applied to the utxo_set. The node has to keep the filters (-blockfilterindex). A block is fetched if its
+    filter cannot be fetched, and block filters are not used at all as long as the script of an address is unknown.
+    The filters are decoded and matched on a separate thread, so that hashing the scripts of many addresses does
+    not block the other greenlets.
     """
 
+    BLOCK_VERBOSITY_RAW = 0
+    BLOCK_VERBOSITY_TRANSACTIONS = 2
+
+    # the errors of nodes that do not support a verbosity level: the misc error of a failed type conversion,
+    # the type error and the invalid parameter error
+    UNSUPPORTED_VERBOSITY_ERROR_CODES = (-1, -3, -8)
+    # the errors of the decoding pool: a transaction it failed to decode and a worker process that died, which
+    # breaks its pipe
+    DECODING_POOL_ERRORS = (ValueError, OSError, EOFError)
+    DEFAULT_NOTIFICATION_TIMEOUT_S = 60.0
+    DEFAULT_MAX_CONCURRENCY = 16
+    MAX_PENDING_TRANSACTIONS = 10000
+    CATCH_UP_LOG_INTERVAL = 100
+
     def get_transaction_by_tx(self, tx: str) -> Optional[Transaction]:
         try:
             return self.get_transaction(tx)
         except JSONRPCException:
             raise gw.InvalidTransactionIdentifier()
 
-    def __init__(self, ltc_proxy: AuthServiceProxy) -> None:
+    def __init__(self,
+                 ltc_proxy: AuthServiceProxy,
+                 batch_size: Optional[int] = None,
+                 transaction_cache: Optional[LitecoinTransactionCache] = None,
+                 transaction_decoder: Optional[LitecoinTransactionDecoder] = None,
+                 address_index: Optional[LitecoinAddressIndex] = None,
+                 utxo_set: Optional[LitecoinUtxoSet] = None,
+                 notification_timeout_s: float = DEFAULT_NOTIFICATION_TIMEOUT_S,
+                 prefetch_window: Optional[int] = None,
+                 block_cache: Optional[LitecoinBlockCache] = None,
+                 transaction_store: Optional[LitecoinTransactionStore] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 decoding_pool: Optional[LitecoinDecodingPool] = None,
+                 block_filters: bool = False) -> None:
         self._ltc_proxy = ltc_proxy
+        self._batch_size = batch_size
+        self._transaction_cache = transaction_cache
+        self._transaction_decoder = transaction_decoder
+        self._address_index = address_index
+        self._utxo_set = utxo_set
+        self._notification_timeout_s = notification_timeout_s
+        self._notified_height = None  # type: Optional[int]
+        self._last_block_notification = None  # type: Optional[float]
+        self._verbose_blocks_supported = True
+        self._prefetch_window = prefetch_window
+        self._block_cache = block_cache
+        self._transaction_store = transaction_store
+        self._max_concurrency = max_concurrency
+        self._decoding_pool = decoding_pool
+        self._block_filters = block_filters and address_index is not None
+        self._block_filter_thread_pool = ThreadPool(1) if self._block_filters else None
+        self._prefetched_blocks = dict()  # type: Dict[int, AsyncResult]
+        self._highest_height = None  # type: Optional[int]
+        self._catch_up_start = None  # type: Optional[float]
+        self._caught_up_blocks = 0
+        self._scanned_blocks = 0
+        self._resolved_transactions = 0
+        self._pending_transactions = OrderedDict()  # type: OrderedDict
+        self._pending_transaction_hits = 0
+        self._filter_skipped_blocks = 0
+        self._filter_matched_blocks = 0
+        self._filter_false_positives = 0
+        self._logger = logging.getLogger(self.__class__.__name__)
 
     def _extract_receivers(self, transaction: dict) -> List[gw.TransactionReceiver]:
         """Extracts the receivers of an unparsed LTC transaction."""
@@ -51,6 +166,69 @@ class LitecoinChainQueryService(gw.ChainQueryService):
 
         return results
 
+    def _is_relevant(self, transaction: dict) -> bool:
+        """Returns whether the given unparsed LTC transaction pays to an address of the address index."""
+        if self._address_index is None:
+            return True
+
+        for vout in transaction['vout']:
+            for address in vout['scriptPubKey'].get('addresses', list()):
+                if address in self._address_index:
+                    return True
+
+        return False
+
+    def _spends_output(self, vin: dict) -> bool:
+        """Returns whether the given input spends the output of a previous transaction."""
+        return ('txid' in vin) and ('vout' in vin)
+
+    def _extract_prevout_addresses(self, vin_transaction: dict, vout: int) -> List[str]:
+        """Extracts the addresses of the given output of an unparsed LTC transaction."""
+        return vin_transaction['vout'][vout]['scriptPubKey'].get('addresses', list())
+
+    def _get_cached_prevout_addresses(self, vin: dict) -> Optional[List[str]]:
+        """Returns the addresses of the output spent by the given input, if they are cached."""
+        if self._transaction_cache is None:
+            return None
+
+        return self._transaction_cache.get_prevout_addresses(vin['txid'], vin['vout'])
+
+    def _cache_transaction(self, tx: str, transaction: dict) -> None:
+        if self._transaction_cache is not None:
+            self._transaction_cache.put_transaction(tx, transaction)
+
+    def _store_transactions(self, transactions: List[dict]) -> None:
+        if self._transaction_store is not None and len(transactions) > 0:
+            self._transaction_store.put_transactions(transactions)
+
+    def _decode_raw_transaction(self, raw_transaction: str) -> dict:
+        if self._transaction_decoder is not None:
+            return self._transaction_decoder.decode(raw_transaction)
+        else:
+            return self._ltc_proxy.decoderawtransaction(raw_transaction)
+
+    def _get_decoded_transaction(self, tx: str) -> dict:
+        """Returns the decoded transaction from the cache or the store or fetches it from the node."""
+        if self._transaction_cache is not None:
+            transaction = self._transaction_cache.get_transaction(tx)
+
+            if transaction is not None:
+                return transaction
+
+        transaction = None
+
+        if self._transaction_store is not None:
+            transaction = self._transaction_store.get_transaction(tx)
+
+        if transaction is None:
+            raw_transaction = self._ltc_proxy.getrawtransaction(tx)
+            transaction = self._decode_raw_transaction(raw_transaction)
+            self._store_transactions([transaction])
+
+        self._cache_transaction(tx, transaction)
+
+        return transaction
+
     def _resolve_senders(self, transaction: dict) -> List[gw.TransactionSender]:
         """Extracts the senders of an unparsed LTC transaction"""
 
@@ -61,42 +239,502 @@ class LitecoinChainQueryService(gw.ChainQueryService):
 
         for vin in transaction['vin']:
 
-            if ('txid' not in vin) or ('vout' not in vin):
+            if not self._spends_output(vin):
                 continue
 
-            vin_transaction_raw = self._ltc_proxy.getrawtransaction(vin['txid'])
-            vin_transaction = self._ltc_proxy.decoderawtransaction(vin_transaction_raw)
+            addresses = self._get_cached_prevout_addresses(vin)
 
-            if 'addresses' not in vin_transaction['vout'][vin['vout']]['scriptPubKey']:
-                continue
+            if addresses is None:
+                vin_transaction = self._get_decoded_transaction(vin['txid'])
+                addresses = self._extract_prevout_addresses(vin_transaction, vin['vout'])
 
-            for address in vin_transaction['vout'][vin['vout']]['scriptPubKey']['addresses']:
+            for address in addresses:
                 ltc_transaction_sender = gw.TransactionSender(address=address)
                 results.append(ltc_transaction_sender)
 
         return self._filter_sender_duplicates(results)
 
-    def get_transaction(self, tx: str) -> gw.Transaction:
-        raw_transaction = self._ltc_proxy.getrawtransaction(tx)
-        transaction = self._ltc_proxy.decoderawtransaction(raw_transaction)
-
+    def _create_transaction(self, tx: str, transaction: dict) -> gw.Transaction:
         transaction_receivers = self._extract_receivers(transaction)
         transaction_sender = self._resolve_senders(transaction)
 
         return gw.Transaction(tx, transaction_receivers, transaction_sender)
 
-    def get_transactions_of_block_at_height(self, height: gw.CoinBlockHeight) -> List[gw.Transaction]:
+    def get_transaction(self, tx: str) -> gw.Transaction:
+        return self._create_transaction(tx, self._get_decoded_transaction(tx))
+
+    def resolve_pending_transaction(self, transaction: dict) -> Optional[gw.Transaction]:
+        """
+        Caches the given unconfirmed transaction. If it is relevant to the Gateway, its senders are resolved
+        right away and the resulting transaction is kept until the block containing it is scanned.
+        """
+        tx = transaction['txid']
+        self._cache_transaction(tx, transaction)
+
+        if tx in self._pending_transactions or not self._is_relevant(transaction):
+            return self._pending_transactions.get(tx)
+
+        pending_transaction = self._create_transaction(tx, transaction)
+        self._pending_transactions[tx] = pending_transaction
+
+        if len(self._pending_transactions) > LitecoinChainQueryService.MAX_PENDING_TRANSACTIONS:
+            self._pending_transactions.popitem(last=False)
+
+        return pending_transaction
+
+    def _pop_pending_transaction(self, tx: str) -> Optional[gw.Transaction]:
+        pending_transaction = self._pending_transactions.pop(tx, None)
+
+        if pending_transaction is not None:
+            self._pending_transaction_hits += 1
+
+        return pending_transaction
+
+    def _get_relevant_transaction(self, tx: str) -> Optional[gw.Transaction]:
+        """
+        Like get_transaction, but for the transactions of a scanned block.
+        Returns None for transactions that are not relevant to the Gateway.
+        """
+        pending_transaction = self._pop_pending_transaction(tx)
+
+        if pending_transaction is not None and self._utxo_set is None:
+            return pending_transaction
+
+        transaction = self._get_decoded_transaction(tx)
+
+        if self._utxo_set is not None:
+            self._utxo_set.apply_transaction(transaction)
+
+        if pending_transaction is not None:
+            return pending_transaction
+
+        if not self._is_relevant(transaction):
+            return None
+
+        return self._create_transaction(tx, transaction)
+
+    def _batch_call(self, method: str, params: List[list]) -> list:
+        """
+        Calls the given RPC method once for every entry of params.
+        The calls are sent as JSON-RPC batch requests with at most batch_size calls each.
+        """
+        results = list()  # type: list
+
+        for start in range(0, len(params), self._batch_size):
+            calls = [[method] + list(call_params) for call_params in params[start:start + self._batch_size]]
+            results.extend(self._ltc_proxy.batch_(calls))
+
+        return results
+
+    def _get_decoded_transactions(self, txs: List[str]) -> List[dict]:
+        """Fetches and decodes the given transactions by using batch requests."""
+        raw_transactions = self._batch_call('getrawtransaction', [[tx] for tx in txs])
+
+        if self._decoding_pool is not None:
+            try:
+                return self._decoding_pool.decode_transactions(raw_transactions)
+            except LitecoinChainQueryService.DECODING_POOL_ERRORS as ex:
+                self._logger.warning('Failed to decode %d transactions: %s', len(raw_transactions), str(ex))
+
+        if self._transaction_decoder is not None:
+            return [self._transaction_decoder.decode(raw_transaction) for raw_transaction in raw_transactions]
+
+        return self._batch_call('decoderawtransaction', [[raw] for raw in raw_transactions])
+
+    def _get_decoded_block_transactions(self, block_hash: str) -> List[dict]:
+        """
+        Returns the decoded transactions of the given block.
+        The serialized block is decoded by the decoding_pool, if there is one.
+        Nodes that support a verbosity level of 2 return them already decoded as part of the block.
+        Otherwise, they are fetched separately. Other errors, e.g. of an overloaded node, are raised.
+        """
+        if self._decoding_pool is not None:
+            raw_block = self._ltc_proxy.getblock(block_hash, LitecoinChainQueryService.BLOCK_VERBOSITY_RAW)
+
+            try:
+                return self._decoding_pool.decode_block(raw_block)
+            except LitecoinChainQueryService.DECODING_POOL_ERRORS as ex:
+                self._logger.warning('Failed to decode block %s: %s', block_hash, str(ex))
+
+        if self._verbose_blocks_supported:
+            try:
+                block = self._ltc_proxy.getblock(block_hash, LitecoinChainQueryService.BLOCK_VERBOSITY_TRANSACTIONS)
+
+                if all(isinstance(transaction, dict) for transaction in block['tx']):
+                    return block['tx']
+            except JSONRPCException as ex:
+                if ex.code not in LitecoinChainQueryService.UNSUPPORTED_VERBOSITY_ERROR_CODES:
+                    raise
+
+            self._verbose_blocks_supported = False
+
+        block = self._ltc_proxy.getblock(block_hash)
+
+        return self._get_decoded_transactions(block['tx'])
+
+    @staticmethod
+    def _match_scripts(block_hash: str, encoded_filter: str, scripts: FrozenSet[bytes]) -> bool:
+        return LitecoinBlockFilter(block_hash, encoded_filter).match_any(scripts)
+
+    def _match_block_filter(self, block_hash: str) -> Optional[bool]:
+        """
+        Returns whether the filter of the given block matches the script of any address of the address index
+        or None if block filters are not used or the filter could not be fetched.
+        """
+        if not self._block_filters:
+            return None
+
+        scripts = self._address_index.scripts
+
+        if scripts is None:
+            self._logger.warning('Not using block filters, as the script of an indexed address is unknown')
+            self._block_filters = False
+            return None
+
+        try:
+            block_filter = self._ltc_proxy.getblockfilter(block_hash, 'basic')
+            # a copy, as the address index may grow while the thread iterates the scripts
+            return self._block_filter_thread_pool.apply(self._match_scripts,
+                                                        (block_hash, block_filter['filter'], frozenset(scripts)))
+        except (JSONRPCException, ValueError) as ex:
+            self._logger.warning('Failed to match the filter of block %s: %s', block_hash, str(ex))
+            return None
+
+    def _fetch_block_at_height(self, height: gw.CoinBlockHeight) -> List[dict]:
         block_hash = self._ltc_proxy.getblockhash(height)
+        block_transactions = None
+
+        if self._block_cache is not None:
+            block_transactions = self._block_cache.get(height, block_hash)
+
+        if block_transactions is not None:
+            return block_transactions
+
+        block_filter_matches = self._match_block_filter(block_hash)
+
+        if block_filter_matches is False:
+            self._filter_skipped_blocks += 1
+            return list()
+
+        block_transactions = self._get_decoded_block_transactions(block_hash)
+
+        if block_filter_matches:
+            self._filter_matched_blocks += 1
+
+            if not any(self._is_relevant(transaction) for transaction in block_transactions):
+                self._filter_false_positives += 1
+
+        if self._block_cache is not None:
+            self._block_cache.put(height, block_hash, block_transactions)
+
+        return block_transactions
+
+    def _prefetch_block(self, height: gw.CoinBlockHeight, result: AsyncResult) -> None:
+        try:
+            result.set(self._fetch_block_at_height(height))
+        except Exception as ex:  # pylint: disable=broad-except
+            result.set_exception(ex)
+
+    def _is_catching_up(self, height: gw.CoinBlockHeight) -> bool:
+        return self._prefetch_window is not None and self._highest_height is not None and \
+            self._highest_height - height > self._prefetch_window
+
+    def _prefetch_blocks(self, height: gw.CoinBlockHeight) -> None:
+        """Starts fetching the blocks following the given height that are not being fetched yet."""
+        last_height = min(height + self._prefetch_window, self._highest_height - self._prefetch_window)
+
+        for prefetch_height in range(height + 1, last_height + 1):
+            if prefetch_height not in self._prefetched_blocks:
+                result = AsyncResult()
+                self._prefetched_blocks[prefetch_height] = result
+                gevent.spawn(self._prefetch_block, prefetch_height, result)
+
+    def _report_catch_up(self, height: gw.CoinBlockHeight) -> None:
+        if self._catch_up_start is None:
+            self._catch_up_start = time.monotonic()
+            self._caught_up_blocks = 0
+
+        self._caught_up_blocks += 1
+
+        if self._caught_up_blocks % LitecoinChainQueryService.CATCH_UP_LOG_INTERVAL == 0:
+            self._logger.info('Catching up at %.1f blocks/s, %d blocks behind', self.catch_up_rate,
+                              self._highest_height - height)
+
+    def _get_decoded_block_transactions_at_height(self, height: gw.CoinBlockHeight) -> List[dict]:
+        """
+        Returns the decoded transactions of the block at the given height, either from the prefetched blocks
+        or by fetching it now. At most prefetch_window blocks are held at any time.
+        """
+        for stale_height in [stale_height for stale_height in self._prefetched_blocks if stale_height < height]:
+            del self._prefetched_blocks[stale_height]
+
+        prefetched_block = self._prefetched_blocks.pop(height, None)
+
+        if self._is_catching_up(height):
+            self._report_catch_up(height)
+            self._prefetch_blocks(height)
+        else:
+            self._catch_up_start = None
+
+        if prefetched_block is not None:
+            return prefetched_block.get()
+
+        return self._fetch_block_at_height(height)
+
+    def _resolve_transactions_batched(self, transactions: List[dict],
+                                      block_outputs: Dict[str, List[List[str]]]) -> List[gw.Transaction]:
+        """
+        Resolves the senders of the given transactions by fetching the transactions their inputs spend
+        with a few batch requests. The outputs of the transactions of the same block are looked up in block_outputs,
+        which maps their ids to the addresses of each of their outputs.
+        """
+        vin_transactions = dict()  # type: Dict[str, dict]
+        prevout_addresses = dict()  # type: Dict[Tuple[str, int], List[str]]
+        missing_vin_txs = list()  # type: List[str]
+        missing_vin_tx_set = set()  # type: Set[str]
+
+        for transaction in transactions:
+            for vin in transaction.get('vin', list()):
+                if not self._spends_output(vin) or vin['txid'] in block_outputs:
+                    continue
+
+                addresses = self._get_cached_prevout_addresses(vin)
+
+                if addresses is not None:
+                    prevout_addresses[(vin['txid'], vin['vout'])] = addresses
+                elif vin['txid'] not in missing_vin_tx_set:
+                    missing_vin_tx_set.add(vin['txid'])
+                    missing_vin_txs.append(vin['txid'])
+
+        if self._transaction_store is not None:
+            stored_transactions = self._transaction_store.get_transactions(missing_vin_txs)
+            missing_vin_txs = [vin_tx for vin_tx in missing_vin_txs if vin_tx not in stored_transactions]
+
+            for vin_tx, vin_transaction in stored_transactions.items():
+                vin_transactions[vin_tx] = vin_transaction
+                self._cache_transaction(vin_tx, vin_transaction)
+
+        fetched_transactions = self._get_decoded_transactions(missing_vin_txs)
+        self._store_transactions(fetched_transactions)
+
+        for vin_tx, vin_transaction in zip(missing_vin_txs, fetched_transactions):
+            vin_transactions[vin_tx] = vin_transaction
+            self._cache_transaction(vin_tx, vin_transaction)
+
+        results = list()  # type: List[gw.Transaction]
+
+        for transaction in transactions:
+            senders = list()  # type: List[gw.TransactionSender]
+
+            for vin in transaction.get('vin', list()):
+                if not self._spends_output(vin):
+                    continue
+
+                addresses = prevout_addresses.get((vin['txid'], vin['vout']))
+
+                if addresses is None and vin['txid'] in block_outputs:
+                    addresses = block_outputs[vin['txid']][vin['vout']]
+                elif addresses is None:
+                    addresses = self._extract_prevout_addresses(vin_transactions[vin['txid']], vin['vout'])
+
+                senders.extend(gw.TransactionSender(address=address) for address in addresses)
+
+            results.append(
+                gw.Transaction(transaction['txid'], self._extract_receivers(transaction),
+                               self._filter_sender_duplicates(senders)))
+
+        return results
+
+    def _extract_block_outputs(self, transactions: Iterable[dict],
+                               block_transactions: Dict[str, dict]) -> Dict[str, List[List[str]]]:
+        """
+        Returns the addresses of each output of the transactions of the same block the inputs of the given
+        transactions spend, by their ids.
+        """
+        block_outputs = dict()  # type: Dict[str, List[List[str]]]
+
+        for transaction in transactions:
+            for vin in transaction.get('vin', list()):
+                if self._spends_output(vin) and vin['txid'] in block_transactions:
+                    vin_transaction = block_transactions[vin['txid']]
+                    block_outputs[vin['txid']] = [
+                        self._extract_prevout_addresses(vin_transaction, vout)
+                        for vout in range(len(vin_transaction['vout']))
+                    ]
+
+        return block_outputs
+
+    def _iter_transactions_of_block_batched(self, block_transactions: List[dict]) -> Iterator[gw.Transaction]:
+        """
+        Resolves the senders of the given block transactions and all the transactions their inputs spend
+        by using a few batch requests instead of several requests per transaction.
+        The senders are resolved for batch_size transactions at a time, so that the transactions their inputs
+        spend are released before the next ones are fetched. Of the block itself, only its relevant transactions and
+        the addresses of the outputs they spend are kept, and each chunk of them is released once it is resolved.
+        """
+        block_transactions_by_txid = dict()  # type: Dict[str, dict]
+
+        for transaction in block_transactions:
+            block_transactions_by_txid[transaction['txid']] = transaction
+            self._cache_transaction(transaction['txid'], transaction)
+
+            if self._utxo_set is not None:
+                self._utxo_set.apply_transaction(transaction)
+
+        self._store_transactions(block_transactions)
+
+        transactions = deque()  # type: deque
+
+        for transaction in block_transactions:
+            if not self._is_relevant(transaction):
+                continue
+
+            pending_transaction = self._pop_pending_transaction(transaction['txid'])
+
+            if pending_transaction is not None:
+                yield pending_transaction
+            else:
+                transactions.append(transaction)
+
+        block_outputs = self._extract_block_outputs(transactions, block_transactions_by_txid)
+
+        # the decoded block is not referenced by the caller, so that its irrelevant transactions are released unless
+        # the block or transaction cache holds them
+        del block_transactions, block_transactions_by_txid
+
+        while len(transactions) > 0:
+            chunk = [transactions.popleft() for _ in range(min(self._batch_size, len(transactions)))]
+
+            resolved_transactions = self._resolve_transactions_batched(chunk, block_outputs)
+            del chunk
+
+            for transaction in resolved_transactions:
+                yield transaction
+
+    def _iter_transactions_of_block_at_height(self, height: gw.CoinBlockHeight) -> Iterator[gw.Transaction]:
+        if self._batch_size is not None:
+            return self._iter_transactions_of_block_batched(self._get_decoded_block_transactions_at_height(height))
+
+        block_hash = self._ltc_proxy.getblockhash(height)
+
         block = self._ltc_proxy.getblock(block_hash)
 
-        get_transaction_tasks = pool.Pool()  # litecoin server does not accept more than one parallel connection
+        # the parallel RPC calls are limited by the size of the connection pool, the greenlets and their
+        # decoded transactions by max_concurrency
+        get_transaction_tasks = pool.Pool(self._max_concurrency)
+
+        transactions = get_transaction_tasks.imap(
+            self._get_relevant_transaction, block['tx'], maxsize=self._max_concurrency)
 
-        return [a for a in get_transaction_tasks.map(self.get_transaction, block['tx'])]
+        return (transaction for transaction in transactions if transaction is not None)
+
+    def iter_transactions_of_block_at_height(self, height: gw.CoinBlockHeight) -> Iterator[gw.Transaction]:
+        """Like get_transactions_of_block_at_height, but yields the transactions as soon as they are resolved."""
+        for transaction in self._iter_transactions_of_block_at_height(height):
+            self._resolved_transactions += 1
+            yield transaction
+
+        self._scanned_blocks += 1
+
+    def get_transactions_of_block_at_height(self, height: gw.CoinBlockHeight) -> List[gw.Transaction]:
+        return list(self.iter_transactions_of_block_at_height(height))
+
+    def warm_up(self, blocks: int) -> None:
+        """
+        Caches and stores the transactions of the given number of blocks below the highest block, so that the
+        senders of new transactions that spend their outputs are resolved without RPC calls.
+        Requires batch requests.
+        """
+        highest_height = self.get_height_of_highest_block()
+        transactions = 0
+
+        for height in range(max(0, highest_height - blocks + 1), highest_height + 1):
+            block_transactions = self._get_decoded_block_transactions(self._ltc_proxy.getblockhash(height))
+
+            for transaction in block_transactions:
+                self._cache_transaction(transaction['txid'], transaction)
+
+            self._store_transactions(block_transactions)
+            transactions += len(block_transactions)
+
+        self._logger.info('Warmed up with %d transactions of %d blocks', transactions, blocks)
 
     def get_amount_of_transaction(self, transaction: str) -> Decimal:
         transaction = self._ltc_proxy.gettransaction(transaction)
         return transaction['amount']  # type: ignore
 
+    def notify_block_hash(self, block_hash: str) -> None:
+        """Is called with the hash of every new block the node accepted."""
+        header = self._ltc_proxy.getblockheader(block_hash)
+
+        self._notified_height = header['height']
+        self._last_block_notification = time.monotonic()
+
+    def notify_raw_transaction(self, raw_transaction: bytes) -> None:
+        """
+        Is called with every new transaction the node accepted. It is cached if it can be decoded locally,
+        so that the senders of transactions spending it are resolved without RPC calls.
+        """
+        if self._transaction_cache is None or self._transaction_decoder is None:
+            return
+
+        transaction = self._transaction_decoder.decode(raw_transaction)
+        self._cache_transaction(transaction['txid'], transaction)
+
     def get_height_of_highest_block(self) -> gw.CoinBlockHeight:
-        info = self._ltc_proxy.getinfo()
-        return info['blocks']
+        if self._last_block_notification is not None and \
+                time.monotonic() - self._last_block_notification <= self._notification_timeout_s:
+            self._highest_height = self._notified_height
+        else:
+            self._highest_height = self._ltc_proxy.getblockcount()
+
+        return self._highest_height
+
+    @property
+    def catch_up_rate(self) -> Optional[float]:
+        """The number of blocks per second since the current catch up started or None if it is not catching up."""
+        if self._catch_up_start is None:
+            return None
+
+        duration = time.monotonic() - self._catch_up_start
+
+        return self._caught_up_blocks / duration if duration > 0 else None
+
+    @property
+    def scanned_blocks(self) -> int:
+        return self._scanned_blocks
+
+    @property
+    def resolved_transactions(self) -> int:
+        """The number of transactions of the scanned blocks whose senders were resolved."""
+        return self._resolved_transactions
+
+    @property
+    def block_filter_skipped_blocks(self) -> int:
+        """The number of blocks that were not fetched, as their filter did not match."""
+        return self._filter_skipped_blocks
+
+    @property
+    def block_filter_matched_blocks(self) -> int:
+        """The number of blocks that were fetched, as their filter matched."""
+        return self._filter_matched_blocks
+
+    @property
+    def block_filter_false_positives(self) -> int:
+        """The number of blocks whose filter matched, but that contain no transaction paying to an address."""
+        return self._filter_false_positives
+
+    @property
+    def block_filter_false_positive_rate(self) -> Optional[float]:
+        """
+        The share of the blocks without a transaction paying to an address whose filter matched anyway
+        or None if no such block was scanned.
+        """
+        irrelevant_blocks = self._filter_skipped_blocks + self._filter_false_positives
+
+        return self._filter_false_positives / irrelevant_blocks if irrelevant_blocks > 0 else None
+
+    @property
+    def pending_transaction_hits(self) -> int:
+        """The number of transactions of the scanned blocks that were resolved before they were mined."""
+        return self._pending_transaction_hits
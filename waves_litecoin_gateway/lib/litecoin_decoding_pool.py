@@ -0,0 +1,187 @@
+"""
+LitecoinDecodingPool
+"""
+
+import logging
+import multiprocessing
+from multiprocessing.connection import Connection
+from typing import Any, List, Union
+
+import gevent
+import gevent.pool as pool
+from gevent.queue import Queue
+from gevent.socket import wait_read
+
+from .litecoin_address_encoding import LitecoinNetwork, MAINNET
+from .litecoin_transaction_decoder import LitecoinTransactionDecoder
+
+
+def _compact_transaction(transaction: dict) -> dict:
+    """Keeps only the fields of a decoded transaction that are used by the Gateway."""
+    vin = list()  # type: List[dict]
+
+    for current_vin in transaction['vin']:
+        if 'coinbase' in current_vin:
+            vin.append({'coinbase': current_vin['coinbase']})
+        else:
+            vin.append({'txid': current_vin['txid'], 'vout': current_vin['vout']})
+
+    vout = list()  # type: List[dict]
+
+    for current_vout in transaction['vout']:
+        script_pub_key = {'hex': current_vout['scriptPubKey']['hex']}
+
+        if 'addresses' in current_vout['scriptPubKey']:
+            script_pub_key['addresses'] = current_vout['scriptPubKey']['addresses']
+
+        vout.append({'value': current_vout['value'], 'n': current_vout['n'], 'scriptPubKey': script_pub_key})
+
+    return {'txid': transaction['txid'], 'vin': vin, 'vout': vout}
+
+
+def _serve(requests: Connection, results: Connection, network: LitecoinNetwork) -> None:
+    """Decodes the raw blocks and transactions received from requests until it is closed."""
+    decoder = LitecoinTransactionDecoder(network)
+
+    while True:
+        try:
+            method, argument = requests.recv()
+        except EOFError:
+            return
+
+        try:
+            if method == LitecoinDecodingPool.DECODE_BLOCK:
+                transactions = decoder.decode_block(argument)
+            else:
+                transactions = [decoder.decode(raw_transaction) for raw_transaction in argument]
+        except ValueError as ex:
+            results.send((False, str(ex), False))
+            continue
+
+        chunk_size = LitecoinDecodingPool.RESULT_CHUNK_SIZE
+        chunks = [transactions[start:start + chunk_size] for start in range(0, max(1, len(transactions)), chunk_size)]
+
+        for index, chunk in enumerate(chunks):
+            results.send((True, [_compact_transaction(transaction) for transaction in chunk], index < len(chunks) - 1))
+
+
+class _Worker(object):
+    def __init__(self, process: multiprocessing.Process, requests: Connection, results: Connection) -> None:
+        self.process = process
+        self.requests = requests
+        self.results = results
+
+
+class LitecoinDecodingPool(object):
+    """
+    Decodes raw blocks and transactions in the given number of worker processes, so that decoding the
+    transactions of large blocks does not block the other greenlets, like the ones serving the HTTP API.
+
+    The greenlet that waits for a result yields to the others until the worker process answers.
+    The decoded transactions are returned in the structure of decoderawtransaction, but only with the fields
+    used by the Gateway: the txid, the txid and vout of every input and the value, the index, the script and
+    the addresses of every output. This keeps the results that are sent back from the worker processes small.
+    They are sent back in chunks of RESULT_CHUNK_SIZE transactions, so that the other greenlets may run
+    between receiving two chunks.
+
+    The worker processes are started by start() or by the first call.
+    """
+
+    DECODE_BLOCK = 'decode_block'
+    DECODE_TRANSACTIONS = 'decode_transactions'
+    STOP_TIMEOUT_S = 5.0
+    RESULT_CHUNK_SIZE = 500
+
+    def __init__(self, processes: int, network: LitecoinNetwork = MAINNET) -> None:
+        self._processes = processes
+        self._network = network
+        self._context = multiprocessing.get_context('spawn')
+        self._workers = list()  # type: List[_Worker]
+        self._idle_workers = Queue()  # type: Queue
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def _start_worker(self) -> None:
+        # one-way pipes, as the sockets of a duplex pipe would be non-blocking after gevent patched the socket module
+        worker_requests, requests = self._context.Pipe(duplex=False)
+        results, worker_results = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_serve, args=(worker_requests, worker_results, self._network), daemon=True)
+        process.start()
+        worker_requests.close()
+        worker_results.close()
+
+        worker = _Worker(process, requests, results)
+        self._workers.append(worker)
+        self._idle_workers.put(worker)
+
+    def _stop_worker(self, worker: _Worker) -> None:
+        self._workers.remove(worker)
+        worker.requests.close()
+        worker.results.close()
+        worker.process.join(LitecoinDecodingPool.STOP_TIMEOUT_S)
+
+        if worker.process.is_alive():
+            worker.process.terminate()
+
+    def start(self) -> None:
+        """Starts the worker processes."""
+        while len(self._workers) < self._processes:
+            self._start_worker()
+
+    def stop(self) -> None:
+        """Stops the worker processes once they are idle."""
+        while len(self._workers) > 0:
+            self._stop_worker(self._idle_workers.get())
+
+    def _call(self, method: str, argument: Any) -> List[dict]:
+        self.start()
+        worker = self._idle_workers.get()
+
+        results = list()  # type: List[dict]
+        has_more = True
+
+        try:
+            worker.requests.send((method, argument))
+
+            while has_more:
+                wait_read(worker.results.fileno())
+                success, result, has_more = worker.results.recv()
+
+                if not success:
+                    break
+
+                results.extend(result)
+                gevent.idle()
+        except BaseException:
+            # the answer of an interrupted call must not be received by the next one
+            self._logger.warning('Replacing a decoding worker after a failed call')
+            self._stop_worker(worker)
+            self._start_worker()
+            raise
+
+        self._idle_workers.put(worker)
+
+        if not success:
+            raise ValueError(result)
+
+        return results
+
+    def decode_block(self, raw_block: str) -> List[dict]:
+        """Decodes the transactions of the given serialized block, see LitecoinTransactionDecoder.decode_block."""
+        return self._call(LitecoinDecodingPool.DECODE_BLOCK, raw_block)
+
+    def decode_transactions(self, raw_transactions: List[Union[str, bytes]]) -> List[dict]:
+        """Decodes the given serialized transactions, distributed over all worker processes."""
+        chunk_size = max(1, -(-len(raw_transactions) // self._processes))
+        chunks = [raw_transactions[start:start + chunk_size] for start in range(0, len(raw_transactions), chunk_size)]
+        results = list()  # type: List[dict]
+
+        for transactions in pool.Group().imap(lambda chunk: self._call(LitecoinDecodingPool.DECODE_TRANSACTIONS, chunk),
+                                              chunks):
+            results.extend(transactions)
+
+        return results
+
+    @property
+    def processes(self) -> int:
+        return self._processes
@@ -0,0 +1,63 @@
+"""
+LitecoinInstrumentedProxy
+"""
+
+import time
+from functools import partial
+from typing import Any, List
+
+from bitcoinrpc.authproxy import AuthServiceProxy
+
+from .litecoin_metrics import LitecoinMetrics
+
+
+class LitecoinInstrumentedProxy(object):
+    """
+    Provides the same interface as the wrapped AuthServiceProxy or LitecoinRpcConnectionPool and records
+    the number of calls, the number of failed calls, the calls in flight and the latency of every RPC method.
+
+    The calls of a batch request are counted by their method, while its latency and failure are recorded
+    for the method batch.
+    """
+
+    BATCH_METHOD = 'batch'
+
+    def __init__(self, ltc_proxy: AuthServiceProxy, metrics: LitecoinMetrics) -> None:
+        self._ltc_proxy = ltc_proxy
+        self._calls = metrics.counter('litecoin_rpc_calls_total', 'RPC calls to the Litecoin node', ['method'])
+        self._errors = metrics.counter('litecoin_rpc_errors_total', 'RPC calls to the Litecoin node that failed',
+                                       ['method'])
+        self._in_flight = metrics.gauge('litecoin_rpc_in_flight', 'RPC requests waiting for the Litecoin node',
+                                        ['method'])
+        self._durations = metrics.histogram('litecoin_rpc_duration_seconds',
+                                            'Duration of the RPC requests to the Litecoin node', ['method'])
+
+    def _record(self, method: str, func, *args) -> Any:
+        in_flight = self._in_flight.labels(method)
+        in_flight.inc()
+        start = time.monotonic()
+
+        try:
+            return func(*args)
+        except BaseException:
+            self._errors.labels(method).inc()
+            raise
+        finally:
+            self._durations.labels(method).observe(time.monotonic() - start)
+            in_flight.dec()
+
+    def call(self, method: str, *args) -> Any:
+        self._calls.labels(method).inc()
+        return self._record(method, getattr(self._ltc_proxy, method), *args)
+
+    def batch_(self, rpc_calls: List[list]) -> list:
+        for rpc_call in rpc_calls:
+            self._calls.labels(rpc_call[0]).inc()
+
+        return self._record(LitecoinInstrumentedProxy.BATCH_METHOD, self._ltc_proxy.batch_, rpc_calls)
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        return partial(self.call, name)
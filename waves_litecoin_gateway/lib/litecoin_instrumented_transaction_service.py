@@ -0,0 +1,32 @@
+"""
+LitecoinInstrumentedTransactionService
+"""
+
+import time
+from typing import Optional
+
+import waves_gateway as gw
+
+from .litecoin_metrics import LitecoinMetrics
+
+
+class LitecoinInstrumentedTransactionService(gw.TransactionService):
+    """
+    Passes every TransactionAttempt to the wrapped TransactionService and records the duration
+    and the outcome of the payout.
+    """
+
+    def __init__(self, transaction_service: gw.TransactionService, metrics: LitecoinMetrics) -> None:
+        self._transaction_service = transaction_service
+        self._durations = metrics.histogram('litecoin_payout_duration_seconds', 'Duration of the payouts', ['outcome'])
+
+    def send_coin(self, attempt: gw.TransactionAttempt, secret: Optional[str] = None) -> gw.Transaction:
+        start = time.monotonic()
+        outcome = 'failure'
+
+        try:
+            transaction = self._transaction_service.send_coin(attempt, secret)
+            outcome = 'success'
+            return transaction
+        finally:
+            self._durations.labels(outcome).observe(time.monotonic() - start)
@@ -2,7 +2,7 @@
 LitecoinIntegerConverterService
 """
 
-from numbers import Number
+from typing import Iterable, List
 
 import waves_gateway as gw
 from decimal import Decimal
@@ -13,14 +13,43 @@ class LitecoinIntegerConverterService(gw.IntegerConverterService):
     Implementation of an IntegerConverterService.
     Converts the Decimal values provided by the bitcoinrpc package into integers that can be processed
     by the Gateway.
+
+    The conversions are computed on Decimals, so that reverted amounts are exact and not rounded through floats.
+    The amounts of whole blocks may be converted at once by using the bulk methods.
     """
 
     def __init__(self, ltc_factor: int, ltc_round_precision: int) -> None:
-        self._ltc_factor = ltc_factor
+        self._ltc_factor = Decimal(ltc_factor)
         self._ltc_round_precision = ltc_round_precision
+        self._ltc_quantum = Decimal(1).scaleb(-ltc_round_precision)
 
     def convert_amount_to_int(self, amount: Decimal) -> int:
-        return gw.convert_to_int(amount, self._ltc_factor)
+        if not isinstance(amount, Decimal):
+            amount = Decimal(amount)
+
+        return int((amount * self._ltc_factor).to_integral_value())
+
+    def revert_amount_conversion(self, amount: int) -> Decimal:
+        return (Decimal(amount) / self._ltc_factor).quantize(self._ltc_quantum)
+
+    def convert_amounts_to_int(self, amounts: Iterable[Decimal]) -> List[int]:
+        """Converts every given amount into an integer."""
+        return [self.convert_amount_to_int(amount) for amount in amounts]
+
+    def revert_amount_conversions(self, amounts: Iterable[int]) -> List[Decimal]:
+        """Reverts the conversion of every given integer."""
+        return [self.revert_amount_conversion(amount) for amount in amounts]
+
+    def convert_transaction_to_int(self, transaction: gw.Transaction) -> gw.Transaction:
+        """Converts the amounts of the receivers without copying the rest of the transaction."""
+        amounts = self.convert_amounts_to_int(receiver.amount for receiver in transaction.receivers)
+        receivers = [
+            gw.TransactionReceiver(receiver.address, amount)
+            for receiver, amount in zip(transaction.receivers, amounts)
+        ]
+
+        return gw.Transaction(tx=transaction.tx, receivers=receivers, senders=transaction.senders)
 
-    def revert_amount_conversion(self, amount: int) -> Number:
-        return gw.convert_to_decimal(amount, self._ltc_factor, self._ltc_round_precision)
+    def convert_transactions_to_int(self, transactions: Iterable[gw.Transaction]) -> List[gw.Transaction]:
+        """Converts the amounts of all given transactions, e.g. the transactions of a block."""
+        return [self.convert_transaction_to_int(transaction) for transaction in transactions]
@@ -0,0 +1,142 @@
+"""
+LitecoinMempoolWatcher
+"""
+
+import logging
+from typing import List, Optional, Set, Union
+
+import gevent
+import gevent.pool as pool
+from bitcoinrpc.authproxy import AuthServiceProxy, JSONRPCException
+
+from .litecoin_chain_query_service import LitecoinChainQueryService
+from .litecoin_transaction_decoder import LitecoinTransactionDecoder
+
+
+class LitecoinMempoolWatcher(object):
+    """
+    Passes the unconfirmed transactions of the node to the resolve_pending_transaction method of the
+    LitecoinChainQueryService, so that deposits are resolved before their block is scanned.
+
+    The transactions are either received by notify_raw_transaction, e.g. from a LitecoinZmqNotificationListener,
+    or found by polling getrawmempool every polling_interval_s seconds once polling was started.
+    New transactions of the mempool are fetched by batch requests with at most batch_size calls each.
+    If a transaction_decoder is given, raw transactions are decoded locally instead of calling
+    decoderawtransaction.
+
+    notify_raw_transaction returns immediately, so that it does not delay the notifications that follow. The
+    notified transactions are resolved by at most max_concurrency greenlets, and a notification is dropped while
+    all of them are busy, as the transaction is resolved again when its block is scanned.
+    """
+
+    DEFAULT_POLLING_INTERVAL_S = 2.0
+    DEFAULT_BATCH_SIZE = 100
+    DEFAULT_MAX_CONCURRENCY = 16
+
+    def __init__(self,
+                 ltc_proxy: AuthServiceProxy,
+                 chain_query_service: LitecoinChainQueryService,
+                 transaction_decoder: Optional[LitecoinTransactionDecoder] = None,
+                 polling_interval_s: float = DEFAULT_POLLING_INTERVAL_S,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        self._ltc_proxy = ltc_proxy
+        self._chain_query_service = chain_query_service
+        self._transaction_decoder = transaction_decoder
+        self._polling_interval_s = polling_interval_s
+        self._batch_size = batch_size
+        self._known_txs = set()  # type: Set[str]
+        self._notification_pool = pool.Pool(max_concurrency)
+        self._dropped_notifications = 0
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._greenlet = None  # type: Optional[gevent.Greenlet]
+
+    def _resolve(self, transaction: dict) -> None:
+        try:
+            self._chain_query_service.resolve_pending_transaction(transaction)
+        except Exception as ex:  # pylint: disable=broad-except
+            # the transaction is resolved again when its block is scanned
+            self._logger.debug('Failed to resolve pending transaction %s: %s', transaction['txid'], str(ex))
+
+    @property
+    def dropped_notifications(self) -> int:
+        """The number of notified transactions that were dropped because all the greenlets were busy."""
+        return self._dropped_notifications
+
+    def _resolve_raw_transaction(self, raw_transaction: Union[bytes, str]) -> None:
+        try:
+            transaction = self._decode_raw_transaction(raw_transaction)
+        except Exception as ex:  # pylint: disable=broad-except
+            self._logger.debug('Failed to decode pending transaction: %s', str(ex))
+            return
+
+        self._resolve(transaction)
+
+    def _decode_raw_transaction(self, raw_transaction: Union[bytes, str]) -> dict:
+        if self._transaction_decoder is not None:
+            return self._transaction_decoder.decode(raw_transaction)
+
+        if isinstance(raw_transaction, bytes):
+            raw_transaction = raw_transaction.hex()
+
+        return self._ltc_proxy.decoderawtransaction(raw_transaction)
+
+    def notify_raw_transaction(self, raw_transaction: Union[bytes, str]) -> None:
+        """Is called with every new transaction the node accepted."""
+        if self._notification_pool.full():
+            self._dropped_notifications += 1
+            return
+
+        self._notification_pool.spawn(self._resolve_raw_transaction, raw_transaction)
+
+    def _get_decoded_transactions(self, txs: List[str]) -> List[dict]:
+        raw_transactions = self._ltc_proxy.batch_([['getrawtransaction', tx] for tx in txs])
+
+        if self._transaction_decoder is not None:
+            return [self._transaction_decoder.decode(raw_transaction) for raw_transaction in raw_transactions]
+
+        return self._ltc_proxy.batch_(
+            [['decoderawtransaction', raw_transaction] for raw_transaction in raw_transactions])
+
+    def poll(self) -> int:
+        """Resolves the transactions that entered the mempool since the last call and returns their number."""
+        mempool_txs = self._ltc_proxy.getrawmempool()
+        new_txs = [tx for tx in mempool_txs if tx not in self._known_txs]
+        self._known_txs = set(mempool_txs)
+
+        for start in range(0, len(new_txs), self._batch_size):
+            txs = new_txs[start:start + self._batch_size]
+
+            try:
+                transactions = self._get_decoded_transactions(txs)
+            except JSONRPCException as ex:
+                # a transaction left the mempool meanwhile, the others are fetched again by the next poll
+                self._known_txs.difference_update(txs)
+                self._logger.debug('Failed to fetch mempool transactions: %s', str(ex))
+                continue
+
+            for transaction in transactions:
+                self._resolve(transaction)
+
+        return len(new_txs)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.poll()
+            except Exception as ex:  # pylint: disable=broad-except
+                self._logger.warning('Failed to poll the mempool: %s', str(ex))
+
+            gevent.sleep(self._polling_interval_s)
+
+    def start(self) -> None:
+        """Starts polling the mempool every polling_interval_s seconds."""
+        if self._greenlet is None:
+            self._greenlet = gevent.spawn(self._run)
+
+    def stop(self) -> None:
+        if self._greenlet is not None:
+            self._greenlet.kill()
+            self._greenlet = None
+
+        self._notification_pool.kill()
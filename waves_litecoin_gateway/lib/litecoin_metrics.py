@@ -0,0 +1,227 @@
+"""
+LitecoinMetrics
+"""
+
+import bisect
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from gevent.pywsgi import WSGIServer
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[str]) -> str:
+    if len(label_names) == 0:
+        return ''
+
+    return '{' + ','.join(name + '="' + _escape_label_value(value) + '"'
+                          for name, value in zip(label_names, label_values)) + '}'
+
+
+class _Value(object):
+    """The value of a counter or a gauge with a single combination of label values."""
+
+    def __init__(self) -> None:
+        self.value = 0  # type: float
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramValue(object):
+    """The observations of a histogram with a single combination of label values."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.sum = 0.0  # type: float
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+
+        if index < len(self.bucket_counts):
+            self.bucket_counts[index] += 1
+
+        self.sum += value
+        self.count += 1
+
+
+class _Metric(object):
+    """A metric family with the values of every combination of label values."""
+
+    def __init__(self, name: str, documentation: str, metric_type: str, label_names: Sequence[str],
+                 create_value: Callable) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.metric_type = metric_type
+        self.label_names = tuple(label_names)
+        self._create_value = create_value
+        self._values = dict()  # type: Dict[Tuple[str, ...], object]
+
+    def labels(self, *label_values: str):
+        """Returns the value of the given label values, which is created on the first access."""
+        if len(label_values) != len(self.label_names):
+            raise ValueError('Expected the labels ' + ', '.join(self.label_names) + ' for the metric ' + self.name)
+
+        key = tuple(str(value) for value in label_values)
+
+        if key not in self._values:
+            self._values[key] = self._create_value()
+
+        return self._values[key]
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Returns the name suffix, the formatted labels and the value of every sample of the metric."""
+        result = list()  # type: List[Tuple[str, str, float]]
+
+        for label_values, value in sorted(self._values.items()):
+            if isinstance(value, _HistogramValue):
+                cumulative_count = 0
+
+                for bucket, bucket_count in zip(value.buckets, value.bucket_counts):
+                    cumulative_count += bucket_count
+                    result.append(('_bucket',
+                                   _format_labels(self.label_names + ('le', ),
+                                                  label_values + (_format_value(bucket), )), cumulative_count))
+
+                result.append(('_bucket', _format_labels(self.label_names + ('le', ), label_values + ('+Inf', )),
+                               value.count))
+                result.append(('_sum', _format_labels(self.label_names, label_values), value.sum))
+                result.append(('_count', _format_labels(self.label_names, label_values), value.count))
+            else:
+                result.append(('', _format_labels(self.label_names, label_values), value.value))
+
+        return result
+
+
+class _FunctionMetric(object):
+    """A metric without labels whose value is read from a function whenever the metrics are rendered."""
+
+    def __init__(self, name: str, documentation: str, metric_type: str, func: Callable[[], Optional[float]]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.metric_type = metric_type
+        self._func = func
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        value = self._func()
+
+        if value is None:
+            return list()
+
+        return [('', '', value)]
+
+
+class LitecoinMetrics(object):
+    """
+    Collects counters, gauges and histograms and renders them in the text format of Prometheus.
+    The metrics may be served over HTTP by start_server.
+
+    The values of counters and gauges that are already tracked by other objects, like the hits of a cache,
+    may be registered as functions that are called whenever the metrics are rendered.
+    """
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+    METRICS_PATH = '/metrics'
+
+    def __init__(self) -> None:
+        self._metrics = dict()  # type: Dict[str, object]
+        self._server = None  # type: Optional[WSGIServer]
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError('The metric ' + metric.name + ' is already registered')
+
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> _Metric:
+        return self._register(_Metric(name, documentation, 'counter', label_names, _Value))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> _Metric:
+        return self._register(_Metric(name, documentation, 'gauge', label_names, _Value))
+
+    def histogram(self,
+                  name: str,
+                  documentation: str,
+                  label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> _Metric:
+        buckets = sorted(buckets)
+        return self._register(_Metric(name, documentation, 'histogram', label_names, lambda: _HistogramValue(buckets)))
+
+    def counter_function(self, name: str, documentation: str, func: Callable[[], Optional[float]]) -> None:
+        """Registers a counter whose value is returned by the given function. None omits the sample."""
+        self._register(_FunctionMetric(name, documentation, 'counter', func))
+
+    def gauge_function(self, name: str, documentation: str, func: Callable[[], Optional[float]]) -> None:
+        """Registers a gauge whose value is returned by the given function. None omits the sample."""
+        self._register(_FunctionMetric(name, documentation, 'gauge', func))
+
+    def render(self) -> str:
+        lines = list()  # type: List[str]
+
+        for name in sorted(self._metrics.keys()):
+            metric = self._metrics[name]
+            samples = metric.samples()  # type: ignore
+            documentation = metric.documentation.replace('\\', '\\\\').replace('\n', '\\n')  # type: ignore
+
+            lines.append('# HELP ' + name + ' ' + documentation)
+            lines.append('# TYPE ' + name + ' ' + metric.metric_type)  # type: ignore
+
+            for suffix, labels, value in samples:
+                lines.append(name + suffix + labels + ' ' + _format_value(value))
+
+        return '\n'.join(lines) + '\n'
+
+    def _handle_request(self, environ: dict, start_response: Callable) -> List[bytes]:
+        if environ.get('PATH_INFO') != LitecoinMetrics.METRICS_PATH:
+            start_response('404 Not Found', [('Content-Type', 'text/plain')])
+            return [b'Not Found']
+
+        body = self.render().encode('utf8')
+        start_response('200 OK', [('Content-Type', LitecoinMetrics.CONTENT_TYPE), ('Content-Length', str(len(body)))])
+        return [body]
+
+    def start_server(self, host: str, port: int) -> None:
+        """Serves the metrics on the given port at /metrics."""
+        if self._server is not None:
+            return
+
+        self._server = WSGIServer((host, port), self._handle_request, log=None)
+        self._server.start()
+
+    def stop_server(self) -> None:
+        if self._server is None:
+            return
+
+        self._server.stop()
+        self._server = None
+
+    @property
+    def server_port(self) -> Optional[int]:
+        """The port the metrics are served on or None if the server is not running."""
+        if self._server is None:
+            return None
+
+        return self._server.server_port
@@ -0,0 +1,167 @@
+"""
+LitecoinNodeRouter
+"""
+
+import logging
+import time
+from functools import partial
+from typing import Any, Callable, List, Optional, Set
+
+import gevent
+from bitcoinrpc.authproxy import AuthServiceProxy, JSONRPCException
+
+
+class _Node(object):
+    """
+    A read node together with its smoothed latency, the number of its requests in flight and its health.
+    """
+
+    def __init__(self, index: int, proxy: AuthServiceProxy) -> None:
+        self.index = index
+        self.proxy = proxy
+        self.latency = 0.0
+        self.in_flight = 0
+        self.failures = 0
+        self.ejected = False
+
+
+class LitecoinNodeRouter(object):
+    """
+    Provides the same interface as an AuthServiceProxy, but sends read-only calls to a set of read nodes,
+    while every other call, including all wallet calls, is sent to the wallet node.
+
+    A read-only call is sent to the healthy read node with the lowest smoothed latency multiplied by its number of
+    requests in flight. If a node fails with anything else than a JSON-RPC error, the call is repeated on the next
+    node. A node that fails max_failures times in a row is ejected and probed every ejection_s seconds
+    until it answers again.
+
+    Read nodes may lag behind the wallet node, so a call that fails with a JSON-RPC error on a read node,
+    like asking for a transaction the wallet node just broadcast, is repeated on the wallet node.
+    The wallet node also answers the read-only calls while every read node is ejected.
+    """
+
+    READ_METHODS = frozenset([
+        'getbestblockhash', 'getblock', 'getblockcount', 'getblockfilter', 'getblockhash', 'getblockheader',
+        'getrawmempool', 'getrawtransaction', 'decoderawtransaction', 'validateaddress'
+    ])
+    DEFAULT_MAX_FAILURES = 3
+    DEFAULT_EJECTION_S = 30.0
+    LATENCY_SMOOTHING = 0.3
+    HEALTH_CHECK_METHOD = 'getblockcount'
+
+    def __init__(self,
+                 wallet_proxy: AuthServiceProxy,
+                 read_proxies: List[AuthServiceProxy],
+                 max_failures: int = DEFAULT_MAX_FAILURES,
+                 ejection_s: float = DEFAULT_EJECTION_S) -> None:
+        self._wallet_proxy = wallet_proxy
+        self._read_nodes = [_Node(index, proxy) for index, proxy in enumerate(read_proxies)]
+        self._max_failures = max_failures
+        self._ejection_s = ejection_s
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def _select_read_node(self, excluded: Set[int]) -> Optional[_Node]:
+        candidates = [node for node in self._read_nodes if not node.ejected and node.index not in excluded]
+
+        if len(candidates) == 0:
+            return None
+
+        return min(candidates, key=lambda node: node.latency * (node.in_flight + 1))
+
+    def _probe(self, node: _Node) -> None:
+        """Waits until the given ejected node answers again."""
+        while node.ejected:
+            gevent.sleep(self._ejection_s)
+
+            try:
+                getattr(node.proxy, LitecoinNodeRouter.HEALTH_CHECK_METHOD)()
+            except JSONRPCException:
+                pass
+            except Exception as ex:  # pylint: disable=broad-except
+                self._logger.debug('Read node %d is still unavailable: %s', node.index, str(ex))
+                continue
+
+            node.failures = 0
+            node.ejected = False
+            self._logger.info('Read node %d is available again', node.index)
+
+    def _record_failure(self, node: _Node, ex: Exception) -> None:
+        node.failures += 1
+
+        if node.failures >= self._max_failures and not node.ejected:
+            node.ejected = True
+            self._logger.warning('Ejected read node %d after %d failures: %s', node.index, node.failures, str(ex))
+            gevent.spawn(self._probe, node)
+
+    def _call_read_node(self, node: _Node, func: Callable[[AuthServiceProxy], Any]) -> Any:
+        node.in_flight += 1
+        start = time.monotonic()
+
+        try:
+            result = func(node.proxy)
+        except JSONRPCException:
+            node.failures = 0
+            raise
+        except Exception as ex:
+            self._record_failure(node, ex)
+            raise
+        finally:
+            node.in_flight -= 1
+
+        node.failures = 0
+        node.latency += LitecoinNodeRouter.LATENCY_SMOOTHING * (time.monotonic() - start - node.latency)
+
+        return result
+
+    def _read(self, func: Callable[[AuthServiceProxy], Any]) -> Any:
+        tried = set()  # type: Set[int]
+        node = self._select_read_node(tried)
+
+        while node is not None:
+            tried.add(node.index)
+
+            try:
+                return self._call_read_node(node, func)
+            except JSONRPCException:
+                break
+            except Exception as ex:  # pylint: disable=broad-except
+                self._logger.debug('Read node %d failed: %s', node.index, str(ex))
+
+            node = self._select_read_node(tried)
+
+        return func(self._wallet_proxy)
+
+    @staticmethod
+    def _call_method(method: str, args: tuple, proxy: AuthServiceProxy) -> Any:
+        return getattr(proxy, method)(*args)
+
+    @staticmethod
+    def _call_batch(rpc_calls: List[list], proxy: AuthServiceProxy) -> list:
+        # the AuthServiceProxy removes the method names from the given calls
+        return proxy.batch_([list(rpc_call) for rpc_call in rpc_calls])
+
+    def call(self, method: str, *args) -> Any:
+        func = partial(LitecoinNodeRouter._call_method, method, args)
+
+        if method in LitecoinNodeRouter.READ_METHODS:
+            return self._read(func)
+
+        return func(self._wallet_proxy)
+
+    def batch_(self, rpc_calls: List[list]) -> list:
+        func = partial(LitecoinNodeRouter._call_batch, rpc_calls)
+
+        if all(rpc_call[0] in LitecoinNodeRouter.READ_METHODS for rpc_call in rpc_calls):
+            return self._read(func)
+
+        return func(self._wallet_proxy)
+
+    @property
+    def healthy_read_nodes(self) -> int:
+        return sum(1 for node in self._read_nodes if not node.ejected)
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        return partial(self.call, name)
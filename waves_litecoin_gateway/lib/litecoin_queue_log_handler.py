@@ -0,0 +1,197 @@
+"""
+LitecoinQueueLogHandler
+"""
+
+import copy
+import logging
+from collections import deque
+from typing import Dict, Iterable, List
+
+import gevent.monkey
+
+# the Gateway monkey patches threading, so that a thread of the threading module would be a greenlet on the hub
+_start_new_thread = gevent.monkey.get_original('_thread', 'start_new_thread')
+_allocate_lock = gevent.monkey.get_original('_thread', 'allocate_lock')
+
+
+class LitecoinQueueLogHandler(logging.Handler):
+    """
+    Decouples logging from the gevent hub. emit only formats the message of a record and appends it to a bounded
+    in-memory queue, while a native thread writes the queued records in batches to the wrapped handlers, so that
+    disk writes and rotations of a file handler never block scanning or payouts.
+
+    Records of the sampled loggers (and their children) below WARNING are sampled: only every sample_interval-th
+    record of such a logger is queued. If the queue is full, a record is dropped and the writer reports the number
+    of dropped records with the next batch.
+
+    The level of the wrapped handlers still applies. setLevel sets the level of the wrapped handlers as well, like
+    the log level endpoint of the Gateway would set it on the handlers themselves.
+    """
+
+    DEFAULT_CAPACITY = 10000
+    DEFAULT_BATCH_SIZE = 100
+    WAKE_UP_INTERVAL_S = 1.0
+    CLOSE_TIMEOUT_S = 5.0
+
+    def __init__(self,
+                 handlers: Iterable[logging.Handler],
+                 capacity: int = DEFAULT_CAPACITY,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 sampled_loggers: Iterable[str] = (),
+                 sample_interval: int = 1) -> None:
+        self._handlers = list(handlers)
+        super().__init__(min([handler.level for handler in self._handlers], default=logging.NOTSET))
+        self._capacity = capacity
+        self._batch_size = batch_size
+        self._sampled_loggers = list(sampled_loggers)
+        self._sample_interval = sample_interval
+        self._sample_counters = dict()  # type: Dict[str, int]
+        self._records = deque()  # type: deque
+        self._dropped = 0
+        self._reported_drops = 0
+        self._sampled = 0
+        self._written = 0
+        self._started = False
+        self._stopped = False
+
+        # the writer waits for this lock, which is released as a signal whenever a record is queued
+        self._wake_up = _allocate_lock()
+        self._wake_up.acquire()
+        self._finished = _allocate_lock()
+        self._finished.acquire()
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of records waiting to be written."""
+        return len(self._records)
+
+    @property
+    def dropped(self) -> int:
+        """The number of records that were dropped because the queue was full."""
+        return self._dropped
+
+    @property
+    def sampled(self) -> int:
+        """The number of records of the sampled loggers that were skipped."""
+        return self._sampled
+
+    @property
+    def written(self) -> int:
+        """The number of records that were handed to the wrapped handlers."""
+        return self._written
+
+    def start(self) -> None:
+        """Starts the native thread writing the queued records."""
+        if not self._started:
+            self._started = True
+            _start_new_thread(self._write_until_stopped, ())
+
+    def setLevel(self, level) -> None:
+        super().setLevel(level)
+
+        for handler in self._handlers:
+            handler.setLevel(level)
+
+    def _is_sampled(self, logger_name: str) -> bool:
+        for sampled_logger in self._sampled_loggers:
+            if logger_name == sampled_logger or logger_name.startswith(sampled_logger + '.'):
+                return True
+
+        return False
+
+    def _prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Merges the arguments and the exception of a record into its message, so that the record no longer refers to
+        objects that may change until it is written. The wrapped handlers still apply their own formatters.
+        """
+        message = self.format(record)
+        record = copy.copy(record)
+        record.msg = message
+        record.message = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._sample_interval > 1 and record.levelno < logging.WARNING and self._is_sampled(record.name):
+            count = self._sample_counters.get(record.name, 0)
+            self._sample_counters[record.name] = count + 1
+
+            if count % self._sample_interval != 0:
+                self._sampled += 1
+                return
+
+        if len(self._records) >= self._capacity:
+            self._dropped += 1
+            return
+
+        try:
+            self._records.append(self._prepare(record))
+        except Exception:
+            self.handleError(record)
+            return
+
+        self._signal()
+
+    def _signal(self) -> None:
+        try:
+            self._wake_up.release()
+        except RuntimeError:
+            # the writer was already signalled
+            pass
+
+    def _write_until_stopped(self) -> None:
+        try:
+            while not self._stopped:
+                self._wake_up.acquire(True, LitecoinQueueLogHandler.WAKE_UP_INTERVAL_S)
+                self._write_queued_records()
+
+            # the records queued until close stopped the writer
+            self._write_queued_records()
+        finally:
+            self._finished.release()
+
+    def _write_queued_records(self) -> None:
+        while len(self._records) > 0 or self._dropped > self._reported_drops:
+            batch = list()  # type: List[logging.LogRecord]
+            dropped = self._dropped
+
+            if dropped > self._reported_drops:
+                batch.append(
+                    logging.makeLogRecord({
+                        'name': self.__class__.__name__,
+                        'levelno': logging.WARNING,
+                        'levelname': logging.getLevelName(logging.WARNING),
+                        'msg': 'Dropped %d log records as the queue was full',
+                        'args': (dropped - self._reported_drops, )
+                    }))
+                self._reported_drops = dropped
+
+            while len(self._records) > 0 and len(batch) < self._batch_size:
+                batch.append(self._records.popleft())
+
+            self._write(batch)
+
+    def _write(self, batch: List[logging.LogRecord]) -> None:
+        for handler in self._handlers:
+            for record in batch:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+            handler.flush()
+
+        self._written += len(batch)
+
+    def close(self) -> None:
+        """Stops the writer after it wrote the queued records. The wrapped handlers are closed by their owner."""
+        if self._started and not self._stopped:
+            self._stopped = True
+            self._signal()
+            self._finished.acquire(True, LitecoinQueueLogHandler.CLOSE_TIMEOUT_S)
+        elif not self._started:
+            self._stopped = True
+            self._write_queued_records()
+
+        super().close()
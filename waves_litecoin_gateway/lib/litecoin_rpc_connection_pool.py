@@ -0,0 +1,110 @@
+"""
+LitecoinRpcConnectionPool
+"""
+
+import time
+from functools import partial
+from typing import Any
+
+import bitcoinrpc.authproxy as authproxy
+import gevent.queue as queue
+
+
+class _PooledConnection(object):
+    """
+    A single AuthServiceProxy together with the time it was last used.
+    The AuthServiceProxy keeps its HTTP/1.1 connection alive between calls.
+    """
+
+    def __init__(self, proxy: authproxy.AuthServiceProxy) -> None:
+        self.proxy = proxy
+        self.last_used = time.monotonic()
+
+
+class LitecoinRpcConnectionPool(object):
+    """
+    Provides the same interface as an AuthServiceProxy, but distributes the calls over a fixed number of
+    persistent connections to the Litecoin node. A greenlet that performs a call while every connection is
+    in use waits until another greenlet returns one.
+
+    Connections that have been idle for longer than health_check_interval_s are checked with a cheap call
+    before they are used again, as the node closes idle connections on its own.
+    Connections that fail with anything else than a JSON-RPC error, or with a response that is not JSON-RPC,
+    are replaced by a new one.
+    """
+
+    DEFAULT_POOL_SIZE = 4
+    DEFAULT_HEALTH_CHECK_INTERVAL_S = 15.0
+    HEALTH_CHECK_METHOD = 'getblockcount'
+    # the code of the JSONRPCException raised by the AuthServiceProxy for non-JSON responses
+    HTTP_ERROR_CODE = -342
+
+    def __init__(self,
+                 service_url: str,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 health_check_interval_s: float = DEFAULT_HEALTH_CHECK_INTERVAL_S) -> None:
+        self._service_url = service_url
+        self._pool_size = pool_size
+        self._health_check_interval_s = health_check_interval_s
+        self._connections = queue.LifoQueue()  # most recently used connections are the most likely to be alive
+
+        for _ in range(0, pool_size):
+            self._connections.put(self._create_connection())
+
+    def _create_connection(self) -> _PooledConnection:
+        return _PooledConnection(authproxy.AuthServiceProxy(self._service_url))
+
+    def _is_healthy(self, connection: _PooledConnection) -> bool:
+        try:
+            getattr(connection.proxy, LitecoinRpcConnectionPool.HEALTH_CHECK_METHOD)()
+            return True
+        except authproxy.JSONRPCException:
+            return True
+        except Exception:  # pylint: disable=broad-except
+            return False
+
+    def _checkout(self) -> _PooledConnection:
+        """Waits for a free connection and ensures that it is still usable."""
+        connection = self._connections.get()
+
+        if time.monotonic() - connection.last_used > self._health_check_interval_s and not self._is_healthy(connection):
+            connection = self._create_connection()
+
+        return connection
+
+    def _checkin(self, connection: _PooledConnection) -> None:
+        connection.last_used = time.monotonic()
+        self._connections.put(connection)
+
+    def call(self, method: str, *args) -> Any:
+        """Performs the given RPC call on the next free connection."""
+        connection = self._checkout()
+
+        try:
+            result = getattr(connection.proxy, method)(*args)
+        except authproxy.JSONRPCException as ex:
+            # the body of a non-JSON response, like the one of a full work queue, is left unread on the connection
+            self._checkin(connection
+                          if ex.code != LitecoinRpcConnectionPool.HTTP_ERROR_CODE else self._create_connection())
+            raise
+        except BaseException:
+            self._checkin(self._create_connection())
+            raise
+
+        self._checkin(connection)
+
+        return result
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool_size
+
+    @property
+    def idle_connections(self) -> int:
+        return self._connections.qsize()
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        return partial(self.call, name)
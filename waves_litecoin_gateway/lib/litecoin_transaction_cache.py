@@ -0,0 +1,108 @@
+"""
+LitecoinTransactionCache
+"""
+
+import sys
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+
+class LitecoinTransactionCache(object):
+    """
+    Bounded LRU cache of decoded Litecoin transactions and the addresses of their outputs.
+    The outputs are stored separately under the key txid:vout, so that the senders of an input
+    can still be resolved after the full transaction has been evicted.
+    The size of every entry is estimated in bytes and the least recently used entries are evicted
+    as soon as the overall size exceeds max_size.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._entries = OrderedDict()  # type: OrderedDict
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _estimate_size(value: Any) -> int:
+        """Estimates the memory consumption of the given decoded JSON value in bytes."""
+        size = sys.getsizeof(value)
+
+        if isinstance(value, dict):
+            for key, item in value.items():
+                size += sys.getsizeof(key) + LitecoinTransactionCache._estimate_size(item)
+        elif isinstance(value, list):
+            for item in value:
+                size += LitecoinTransactionCache._estimate_size(item)
+
+        return size
+
+    @staticmethod
+    def _prevout_key(txid: str, vout: int) -> str:
+        return txid + ':' + str(vout)
+
+    def _get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)  # type: Optional[Tuple[Any, int]]
+
+        if entry is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _put(self, key: str, value: Any) -> None:
+        size = sys.getsizeof(key) + self._estimate_size(value)
+
+        if size > self._max_size:
+            return
+
+        if key in self._entries:
+            self._size -= self._entries.pop(key)[1]
+
+        self._entries[key] = (value, size)
+        self._size += size
+
+        while self._size > self._max_size:
+            self._size -= self._entries.popitem(last=False)[1][1]
+            self._evictions += 1
+
+    def get_transaction(self, txid: str) -> Optional[dict]:
+        """Returns the decoded transaction or None if it is not cached."""
+        return self._get(txid)
+
+    def put_transaction(self, txid: str, transaction: dict) -> None:
+        """Caches the decoded transaction and the addresses of each of its outputs."""
+        for n, vout in enumerate(transaction['vout']):
+            self._put(self._prevout_key(txid, n), vout['scriptPubKey'].get('addresses', list()))
+
+        self._put(txid, transaction)
+
+    def get_prevout_addresses(self, txid: str, vout: int) -> Optional[List[str]]:
+        """Returns the addresses of the given transaction output or None if they are not cached."""
+        return self._get(self._prevout_key(txid, vout))
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,289 @@
+"""
+LitecoinTransactionDecoder
+"""
+
+import struct
+from decimal import Decimal
+from typing import List, Union, Tuple, Optional
+
+from .litecoin_address_encoding import LitecoinNetwork, MAINNET, base58check_encode, bech32_encode, \
+    double_sha256, hash160
+
+OP_0 = 0x00
+OP_PUSHDATA1 = 0x4c
+OP_PUSHDATA2 = 0x4d
+OP_PUSHDATA4 = 0x4e
+OP_1 = 0x51
+OP_8 = 0x58
+OP_16 = 0x60
+OP_RETURN = 0x6a
+OP_DUP = 0x76
+OP_EQUAL = 0x87
+OP_EQUALVERIFY = 0x88
+OP_HASH160 = 0xa9
+OP_CHECKSIG = 0xac
+OP_CHECKMULTISIG = 0xae
+
+
+class _TransactionReader(object):
+    """
+    Reads the fields of a serialized transaction from a memoryview without copying the underlying bytes.
+    """
+
+    def __init__(self, data: memoryview, offset: int = 0) -> None:
+        self._data = data
+        self.offset = offset
+
+    def read(self, length: int) -> memoryview:
+        if self.offset + length > len(self._data):
+            raise ValueError('Unexpected end of transaction data at offset ' + str(self.offset))
+
+        result = self._data[self.offset:self.offset + length]
+        self.offset += length
+        return result
+
+    def _unpack(self, fmt: str, length: int) -> int:
+        if self.offset + length > len(self._data):
+            raise ValueError('Unexpected end of transaction data at offset ' + str(self.offset))
+
+        value = struct.unpack_from(fmt, self._data, self.offset)[0]
+        self.offset += length
+        return value
+
+    def read_uint8(self) -> int:
+        return self._unpack('<B', 1)
+
+    def read_uint32(self) -> int:
+        return self._unpack('<I', 4)
+
+    def read_int32(self) -> int:
+        return self._unpack('<i', 4)
+
+    def read_int64(self) -> int:
+        return self._unpack('<q', 8)
+
+    def read_varint(self) -> int:
+        prefix = self.read_uint8()
+
+        if prefix < 0xfd:
+            return prefix
+        elif prefix == 0xfd:
+            return self._unpack('<H', 2)
+        elif prefix == 0xfe:
+            return self._unpack('<I', 4)
+        else:
+            return self._unpack('<Q', 8)
+
+    def read_varbytes(self) -> memoryview:
+        return self.read(self.read_varint())
+
+
+class LitecoinTransactionDecoder(object):
+    """
+    Decodes serialized Litecoin transactions into the structure returned by the decoderawtransaction RPC,
+    so that no round trip to the node is necessary.
+
+    Legacy and segwit serializations are supported. The MWEB extension data of a transaction is skipped,
+    only its canonical inputs and outputs are decoded. The asm representations of scripts are not generated.
+    """
+
+    SEGWIT_FLAG = 0x01
+    MWEB_FLAG = 0x08
+    SATOSHI_EXPONENT = -8
+    COINBASE_VOUT = 0xffffffff
+    BLOCK_HEADER_SIZE = 80
+
+    def __init__(self, network: LitecoinNetwork = MAINNET) -> None:
+        self._network = network
+
+    def _pubkey_address(self, pubkey: memoryview) -> str:
+        return base58check_encode(self._network.pubkey_address_prefix, hash160(bytes(pubkey)))
+
+    def _parse_multisig(self, script: memoryview) -> Optional[Tuple[int, List[memoryview]]]:
+        """Returns the required signatures and the public keys of a bare multisig script."""
+        if len(script) < 3 or not OP_1 <= script[0] <= OP_16 or not OP_1 <= script[-2] <= OP_16:
+            return None
+
+        pubkeys = list()  # type: List[memoryview]
+        offset = 1
+
+        while offset < len(script) - 2:
+            length = script[offset]
+
+            if length not in (33, 65) or offset + 1 + length > len(script) - 2:
+                return None
+
+            pubkeys.append(script[offset + 1:offset + 1 + length])
+            offset += 1 + length
+
+        required = script[0] - OP_1 + 1
+
+        if len(pubkeys) != script[-2] - OP_1 + 1 or required > len(pubkeys):
+            return None
+
+        return required, pubkeys
+
+    def _decode_script_pub_key(self, script: memoryview) -> dict:
+        """Determines the type and the addresses of an output script."""
+        result = {'hex': script.hex()}
+        length = len(script)
+        addresses = None  # type: Optional[List[str]]
+        required = 1
+
+        if length == 25 and script[0] == OP_DUP and script[1] == OP_HASH160 and script[2] == 20 and \
+                script[23] == OP_EQUALVERIFY and script[24] == OP_CHECKSIG:
+            result['type'] = 'pubkeyhash'
+            addresses = [base58check_encode(self._network.pubkey_address_prefix, bytes(script[3:23]))]
+        elif length == 23 and script[0] == OP_HASH160 and script[1] == 20 and script[22] == OP_EQUAL:
+            result['type'] = 'scripthash'
+            addresses = [base58check_encode(self._network.script_address_prefix, bytes(script[2:22]))]
+        elif 4 <= length <= 42 and (script[0] == OP_0 or OP_1 <= script[0] <= OP_16) and script[1] == length - 2:
+            version = 0 if script[0] == OP_0 else script[0] - OP_1 + 1
+            program = bytes(script[2:])
+
+            if version == 0 and len(program) == 20:
+                result['type'] = 'witness_v0_keyhash'
+            elif version == 0 and len(program) == 32:
+                result['type'] = 'witness_v0_scripthash'
+            elif version == 1 and len(program) == 32:
+                result['type'] = 'witness_v1_taproot'
+            elif script[0] == OP_8 and len(program) == 32:
+                result['type'] = 'witness_mweb_hogaddr'
+            elif version == 0:
+                result['type'] = 'nonstandard'
+            else:
+                result['type'] = 'witness_unknown'
+
+            if result['type'] not in ('witness_mweb_hogaddr', 'nonstandard'):
+                addresses = [bech32_encode(self._network.bech32_hrp, version, program)]
+        elif length in (35, 67) and script[0] == length - 2 and script[-1] == OP_CHECKSIG:
+            result['type'] = 'pubkey'
+            addresses = [self._pubkey_address(script[1:-1])]
+        elif length > 0 and script[0] == OP_RETURN:
+            result['type'] = 'nulldata'
+        else:
+            multisig = self._parse_multisig(script) if length > 0 and script[-1] == OP_CHECKMULTISIG else None
+
+            if multisig is not None:
+                required, pubkeys = multisig
+                result['type'] = 'multisig'
+                addresses = [self._pubkey_address(pubkey) for pubkey in pubkeys]
+            else:
+                result['type'] = 'nonstandard'
+
+        if addresses is not None:
+            result['reqSigs'] = required
+            result['addresses'] = addresses
+
+        return result
+
+    def _read_vin(self, reader: _TransactionReader) -> dict:
+        prev_hash = reader.read(32)
+        prev_index = reader.read_uint32()
+        script_sig = reader.read_varbytes()
+        sequence = reader.read_uint32()
+
+        if prev_index == LitecoinTransactionDecoder.COINBASE_VOUT and not any(prev_hash):
+            return {'coinbase': script_sig.hex(), 'sequence': sequence}
+
+        return {
+            'txid': bytes(prev_hash)[::-1].hex(),
+            'vout': prev_index,
+            'scriptSig': {
+                'hex': script_sig.hex()
+            },
+            'sequence': sequence
+        }
+
+    def _read_vout(self, reader: _TransactionReader, n: int) -> dict:
+        value = reader.read_int64()
+        script_pub_key = reader.read_varbytes()
+
+        return {
+            'value': Decimal(value).scaleb(LitecoinTransactionDecoder.SATOSHI_EXPONENT),
+            'n': n,
+            'scriptPubKey': self._decode_script_pub_key(script_pub_key)
+        }
+
+    def _read_transaction(self, data: memoryview, reader: _TransactionReader, in_block: bool) -> dict:
+        start = reader.offset
+        version = reader.read_int32()
+        flags = 0
+        vin_start = reader.offset
+        vin_count = reader.read_varint()
+
+        if vin_count == 0:
+            flags = reader.read_uint8()
+
+            if flags != 0:
+                vin_start = reader.offset
+                vin_count = reader.read_varint()
+
+        if flags & ~(LitecoinTransactionDecoder.SEGWIT_FLAG | LitecoinTransactionDecoder.MWEB_FLAG):
+            raise ValueError('Unknown transaction serialization flags ' + str(flags))
+
+        vin = [self._read_vin(reader) for _ in range(0, vin_count)]
+        vout = [self._read_vout(reader, n) for n in range(0, reader.read_varint())]
+        vout_end = reader.offset
+
+        if flags & LitecoinTransactionDecoder.SEGWIT_FLAG:
+            for current_vin in vin:
+                witness = [reader.read_varbytes().hex() for _ in range(0, reader.read_varint())]
+
+                if len(witness) > 0:
+                    current_vin['txinwitness'] = witness
+
+        if flags & LitecoinTransactionDecoder.MWEB_FLAG:
+            if not in_block:
+                reader.offset = len(data) - 4  # the MWEB data is followed only by the locktime
+            elif reader.read_uint8() != 0:
+                raise ValueError('Transactions with MWEB data are not supported within a block')
+
+        locktime_offset = reader.offset
+        locktime = reader.read_uint32()
+        end = reader.offset
+
+        stripped = b''.join([data[start:start + 4], data[vin_start:vout_end], data[locktime_offset:end]])
+        txid = double_sha256(stripped)[::-1].hex()
+        size = end - start
+        weight = len(stripped) * 3 + size
+
+        return {
+            'txid': txid,
+            'hash': txid if flags == 0 else double_sha256(data[start:end])[::-1].hex(),
+            'version': version,
+            'size': size,
+            'vsize': (weight + 3) // 4,
+            'weight': weight,
+            'locktime': locktime,
+            'vin': vin,
+            'vout': vout
+        }
+
+    def decode(self, raw_transaction: Union[str, bytes, bytearray, memoryview]) -> dict:
+        """Decodes the given serialized transaction, provided as hex string or as bytes."""
+        if isinstance(raw_transaction, str):
+            raw_transaction = bytes.fromhex(raw_transaction)
+
+        data = memoryview(raw_transaction)
+        reader = _TransactionReader(data)
+        transaction = self._read_transaction(data, reader, False)
+
+        if reader.offset != len(data):
+            raise ValueError('Unexpected data after the end of the transaction')
+
+        return transaction
+
+    def decode_block(self, raw_block: Union[str, bytes, bytearray, memoryview]) -> List[dict]:
+        """
+        Decodes the transactions of the given serialized block, as returned by getblock with a verbosity of 0.
+        The canonical transactions of a block, including the HogEx transaction, carry no MWEB data,
+        the MWEB block that follows them is skipped.
+        """
+        if isinstance(raw_block, str):
+            raw_block = bytes.fromhex(raw_block)
+
+        data = memoryview(raw_block)
+        reader = _TransactionReader(data, LitecoinTransactionDecoder.BLOCK_HEADER_SIZE)
+
+        return [self._read_transaction(data, reader, True) for _ in range(0, reader.read_varint())]
@@ -2,94 +2,126 @@
 LitecoinTransactionService
 """
 
+from collections import OrderedDict
 from decimal import Decimal
-from functools import cmp_to_key
-from typing import Optional, List
+from typing import Optional, List, Dict
 
-import gevent.lock as lock
 import waves_gateway as gw
-from bitcoinrpc.authproxy import AuthServiceProxy
+from bitcoinrpc.authproxy import AuthServiceProxy, JSONRPCException
 
+from .coin_selection import CoinSelector, BestFitCoinSelector
 from .litecoin_chain_query_service import LitecoinChainQueryService
-from .util import sum_unspents
+from .litecoin_utxo_reservation_ledger import LitecoinUtxoReservationLedger
+from .litecoin_utxo_set import LitecoinUtxoSet
+from .util import from_satoshis, to_satoshis
 
 
 class LitecoinTransactionService(gw.TransactionService):
     """
     Implements the sending of an TransactionAttempt on the Litecoin Blockchain.
+
+    The unspent outputs to spend are chosen by the given coin_selector. If the selected outputs exceed the
+    required amount by at most cost_of_change satoshis, the excess is left to the miners instead of creating
+    a change output. All amounts are computed in satoshis and only converted to LTC for the RPC calls.
+    Concurrent payouts reserve their outputs in the utxo_ledger, so that they can be built, signed and broadcast
+    in parallel without spending the same outputs twice.
+    The unspent outputs of the address of the optional utxo_set are taken from memory instead of calling listunspent.
+    If the node rejects a payout because of its inputs, e.g. as they are missing, conflict with the mempool or
+    exceed the limit of unconfirmed ancestors, unconfirmed change outputs among them are not offered anymore.
     """
 
+    # the verify error and the rejection of sendrawtransaction
+    REJECTED_INPUTS_ERROR_CODES = (-25, -26)
+
     def __init__(self,
                  ltc_proxy: AuthServiceProxy,
                  ltc_chain_query_service: LitecoinChainQueryService,
-                 min_optimized_amount: Decimal = Decimal(0.0000001)) -> None:
+                 min_optimized_amount: Decimal = Decimal(0.0000001),
+                 coin_selector: Optional[CoinSelector] = None,
+                 cost_of_change: int = 0,
+                 utxo_ledger: Optional[LitecoinUtxoReservationLedger] = None,
+                 utxo_set: Optional[LitecoinUtxoSet] = None) -> None:
         self._ltc_proxy = ltc_proxy
         self._min_optimized_amount = min_optimized_amount
         self._ltc_chain_query_service = ltc_chain_query_service
-        self._lock = lock.Semaphore()
+        self._coin_selector = coin_selector if coin_selector is not None else BestFitCoinSelector()
+        self._cost_of_change = cost_of_change
+        self._utxo_ledger = utxo_ledger if utxo_ledger is not None else LitecoinUtxoReservationLedger()
+        self._utxo_set = utxo_set
 
-    def _fast_optimize_unspents(self, unspents: List[dict], dst_amount: Decimal) -> Optional[List]:
-        res = list()  # type: List[dict]
-        unspents = list(unspents)
+    def _fast_optimize_unspents(self, unspents: List[dict], dst_amount: int) -> Optional[List]:
+        """Selects unspent outputs that cover the given amount of satoshis."""
+        amounts = [to_satoshis(unspent['amount']) for unspent in unspents]
+        selection = self._coin_selector.select(amounts, dst_amount)
 
-        if sum_unspents(unspents) < dst_amount:
+        if selection is None:
             return None
 
-        for i in range(0, len(unspents)):
+        return [unspents[index] for index in selection]
 
-            diff_dst_amount = dst_amount - sum_unspents(res)
+    def send_coin(self, attempt: gw.TransactionAttempt, secret: Optional[str] = None) -> gw.Transaction:
 
-            def comparator(value: dict, other: dict) -> int:
-                """
-                Compares two unspents by their absolute difference to
-                the required amount.
-                """
-                distance_a = value['amount'] - diff_dst_amount
-                distance_b = other['amount'] - diff_dst_amount
+        utxo_set = self._utxo_set if self._utxo_set is not None and self._utxo_set.address == attempt.sender else None
 
-                if abs(distance_a) != abs(distance_b):
-                    return abs(distance_a) - abs(distance_b)
-                else:
-                    return distance_a - distance_b
+        if utxo_set is not None:
+            unspents = utxo_set.get_unspents()
+        else:
+            unspents = self._ltc_proxy.listunspent(None, None, [attempt.sender])
 
-            sorted_unspents = sorted(unspents, key=cmp_to_key(comparator))
+        unspents = self._utxo_ledger.get_available_unspents(attempt.sender, unspents)
 
-            best_fit = sorted_unspents[0]
+        outputs = OrderedDict()  # type: Dict[str, int]
 
-            res.append(best_fit)
-            unspents.remove(best_fit)
+        for receiver in attempt.receivers:
+            outputs[receiver.address] = outputs.get(receiver.address, 0) + to_satoshis(receiver.amount)
 
-            if sum_unspents(res) >= dst_amount:
-                return res
+        overall_amount = sum(outputs.values())
+        fee = to_satoshis(attempt.fee)
 
-        return None
+        optimized_unspents = self._fast_optimize_unspents(unspents, overall_amount + fee)
 
-    def send_coin(self, attempt: gw.TransactionAttempt, secret: Optional[str] = None) -> gw.Transaction:
-
-        unspents = self._ltc_proxy.listunspent(None, None, [attempt.sender])
+        if optimized_unspents is None or not self._utxo_ledger.reserve(optimized_unspents):
+            raise Exception('Not suitable combination of unspent outputs found')
 
-        outputs = dict()
+        change = sum(to_satoshis(unspent['amount']) for unspent in optimized_unspents) - fee - overall_amount
 
-        overall_amount = Decimal(attempt.overall_amount())
+        if change > self._cost_of_change:
+            outputs[attempt.sender] = change
 
-        optimized_unspents = self._fast_optimize_unspents(unspents, overall_amount + Decimal(attempt.fee))
+        try:
+            raw_transaction = self._ltc_proxy.createrawtransaction(optimized_unspents,
+                                                                   OrderedDict((address, from_satoshis(amount))
+                                                                               for address, amount in outputs.items()))
+            signed_transaction = self._ltc_proxy.signrawtransaction(raw_transaction)
+            tx = self._ltc_proxy.sendrawtransaction(signed_transaction['hex'])
+        except JSONRPCException as ex:
+            self._utxo_ledger.release(optimized_unspents)
 
-        if optimized_unspents is None:
-            raise Exception('Not suitable combination of unspent outputs found')
+            if ex.code in LitecoinTransactionService.REJECTED_INPUTS_ERROR_CODES:
+                self._utxo_ledger.discard_change(optimized_unspents)
 
-        for receiver in attempt.receivers:
-            outputs[receiver.address] = receiver.amount
+                if utxo_set is not None:
+                    utxo_set.invalidate()
 
-        unspents_amount = sum_unspents(optimized_unspents)
+            raise
+        except BaseException:
+            self._utxo_ledger.release(optimized_unspents)
+            raise
 
-        outputs[attempt.sender] = unspents_amount - attempt.fee - overall_amount
+        change_outputs = list()  # type: List[dict]
 
-        self._lock.acquire()
+        if attempt.sender in outputs:
+            # the node keeps the order of the outputs
+            change_outputs.append({
+                'txid': tx,
+                'vout': list(outputs.keys()).index(attempt.sender),
+                'address': attempt.sender,
+                'amount': from_satoshis(outputs[attempt.sender])
+            })
 
-        raw_transaction = self._ltc_proxy.createrawtransaction(optimized_unspents, outputs)
-        signed_transaction = self._ltc_proxy.signrawtransaction(raw_transaction)
-        tx = self._ltc_proxy.sendrawtransaction(signed_transaction['hex'])
+        self._utxo_ledger.spend(optimized_unspents, change_outputs)
 
-        self._lock.release()
+        if utxo_set is not None:
+            utxo_set.apply_payout(optimized_unspents, change_outputs)
 
         return self._ltc_chain_query_service.get_transaction(tx)
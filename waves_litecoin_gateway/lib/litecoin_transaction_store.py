@@ -0,0 +1,170 @@
+"""
+LitecoinTransactionStore
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import gevent
+from gevent.threadpool import ThreadPool
+
+
+class LitecoinTransactionStore(object):
+    """
+    Persists decoded Litecoin transactions in an SQLite database, so that they do not need to be fetched
+    from the node again after a restart. Transactions are immutable, so a stored transaction is never updated.
+
+    The store is compacted by deleting the oldest transactions as soon as it contains more than
+    max_transactions transactions. The compaction runs every compaction_interval_s seconds in the background
+    once it was started.
+
+    SQLite blocks the calling thread, so every statement runs on a dedicated thread and only the calling greenlet
+    waits for it. The number of stored transactions is counted once on startup and kept up to date afterwards.
+    """
+
+    DEFAULT_MAX_TRANSACTIONS = 1000000
+    DEFAULT_COMPACTION_INTERVAL_S = 3600.0
+    DECIMAL_KEY = '__decimal__'
+
+    def __init__(self,
+                 path: str,
+                 max_transactions: int = DEFAULT_MAX_TRANSACTIONS,
+                 compaction_interval_s: float = DEFAULT_COMPACTION_INTERVAL_S) -> None:
+        self._max_transactions = max_transactions
+        self._compaction_interval_s = compaction_interval_s
+        self._logger = logging.getLogger(self.__class__.__name__)
+        # a single thread, so that the statements on the connection never run concurrently
+        self._thread_pool = ThreadPool(1)
+        self._connection = self._thread_pool.apply(self._connect, (path, ))
+        self._count = self._thread_pool.apply(self._count_transactions)  # type: int
+        self._compaction_greenlet = None  # type: Optional[gevent.Greenlet]
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        connection.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        connection.execute('PRAGMA journal_mode = WAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS transactions (txid TEXT PRIMARY KEY, data TEXT)')
+        return connection
+
+    def _count_transactions(self) -> int:
+        return self._connection.execute('SELECT COUNT(*) FROM transactions').fetchone()[0]
+
+    @staticmethod
+    def _encode_value(value: Any) -> Any:
+        if isinstance(value, Decimal):
+            return {LitecoinTransactionStore.DECIMAL_KEY: str(value)}
+
+        raise TypeError('Can not store values of type ' + type(value).__name__)
+
+    @staticmethod
+    def _decode_object(value: dict) -> Any:
+        if len(value) == 1 and LitecoinTransactionStore.DECIMAL_KEY in value:
+            return Decimal(value[LitecoinTransactionStore.DECIMAL_KEY])
+
+        return value
+
+    def _encode(self, transaction: dict) -> str:
+        return json.dumps(transaction, default=self._encode_value, separators=(',', ':'))
+
+    def _decode(self, encoded_transaction: str) -> dict:
+        return json.loads(encoded_transaction, object_hook=self._decode_object)
+
+    def _get_transaction(self, txid: str) -> Optional[dict]:
+        row = self._connection.execute('SELECT data FROM transactions WHERE txid = ?', (txid, )).fetchone()
+
+        if row is None:
+            return None
+
+        return self._decode(row[0])
+
+    def get_transaction(self, txid: str) -> Optional[dict]:
+        """Returns the decoded transaction or None if it is not stored."""
+        return self._thread_pool.apply(self._get_transaction, (txid, ))
+
+    def _get_transactions(self, txids: List[str]) -> Dict[str, dict]:
+        result = dict()  # type: Dict[str, dict]
+
+        # stay below the default limit of SQLite of 999 parameters per statement
+        for start in range(0, len(txids), 900):
+            chunk = txids[start:start + 900]
+            rows = self._connection.execute(
+                'SELECT txid, data FROM transactions WHERE txid IN (' + ','.join('?' * len(chunk)) + ')', chunk)
+
+            for txid, encoded_transaction in rows:
+                result[txid] = self._decode(encoded_transaction)
+
+        return result
+
+    def get_transactions(self, txids: List[str]) -> Dict[str, dict]:
+        """Returns the stored transactions of the given ones by their txid."""
+        return self._thread_pool.apply(self._get_transactions, (txids, ))
+
+    def _put_transactions(self, transactions: List[dict]) -> None:
+        with self._connection:
+            self._connection.execute('BEGIN')
+            cursor = self._connection.executemany('INSERT OR IGNORE INTO transactions (txid, data) VALUES (?, ?)',
+                                                  [(transaction['txid'], self._encode(transaction))
+                                                   for transaction in transactions])
+
+        # ignored transactions that are already stored are not counted
+        self._count += cursor.rowcount
+
+    def put_transactions(self, transactions: List[dict]) -> None:
+        """Stores the given decoded transactions in a single database transaction."""
+        self._thread_pool.apply(self._put_transactions, (transactions, ))
+
+    def put_transaction(self, transaction: dict) -> None:
+        self.put_transactions([transaction])
+
+    def _compact(self) -> int:
+        excess = self._count - self._max_transactions
+
+        if excess <= 0:
+            return 0
+
+        with self._connection:
+            self._connection.execute('BEGIN')
+            cursor = self._connection.execute(
+                'DELETE FROM transactions WHERE rowid IN (SELECT rowid FROM transactions ORDER BY rowid LIMIT ?)',
+                (excess, ))
+
+        self._count -= cursor.rowcount
+        self._connection.execute('PRAGMA incremental_vacuum')
+
+        return cursor.rowcount
+
+    def compact(self) -> int:
+        """Deletes the oldest transactions that exceed max_transactions and returns their number."""
+        return self._thread_pool.apply(self._compact)
+
+    def _run_compaction(self) -> None:
+        while True:
+            gevent.sleep(self._compaction_interval_s)
+
+            try:
+                start = time.monotonic()
+                deleted = self.compact()
+                self._logger.info('Deleted %d transactions in %.3fs', deleted, time.monotonic() - start)
+            except sqlite3.Error as ex:
+                self._logger.warning('Failed to compact the transaction store: %s', str(ex))
+
+    def start_compaction(self) -> None:
+        """Starts compacting the store every compaction_interval_s seconds."""
+        if self._compaction_greenlet is None:
+            self._compaction_greenlet = gevent.spawn(self._run_compaction)
+
+    def close(self) -> None:
+        if self._compaction_greenlet is not None:
+            self._compaction_greenlet.kill()
+            self._compaction_greenlet = None
+
+        self._thread_pool.apply(self._connection.close)
+        self._thread_pool.kill()
+
+    def __len__(self) -> int:
+        return self._count
@@ -0,0 +1,110 @@
+"""
+LitecoinUtxoReservationLedger
+"""
+
+import time
+from typing import Dict, List, Tuple
+
+
+class LitecoinUtxoReservationLedger(object):
+    """
+    Keeps track of the unspent outputs that are used by payouts which have not been broadcast yet,
+    so that concurrent payouts never select the same outputs.
+
+    Outputs spent by a broadcast transaction stay excluded for spent_ttl_s seconds, as a listunspent call that
+    was answered before the broadcast may still return them. The change outputs of broadcast transactions
+    are spendable immediately, although the node only lists them once they are confirmed. As their transaction
+    may be evicted from the mempool or replaced, they are forgotten after change_ttl_s seconds or as soon as the node
+    rejects a transaction spending them.
+
+    All methods return without yielding to other greenlets, so filtering the available outputs,
+    selecting some of them and reserving the selection is atomic as long as the selection does not yield either.
+    """
+
+    DEFAULT_SPENT_TTL_S = 600.0
+    DEFAULT_CHANGE_TTL_S = 3600.0
+
+    def __init__(self, spent_ttl_s: float = DEFAULT_SPENT_TTL_S, change_ttl_s: float = DEFAULT_CHANGE_TTL_S) -> None:
+        self._spent_ttl_s = spent_ttl_s
+        self._change_ttl_s = change_ttl_s
+        self._reserved = set()  # type: set
+        self._spent = dict()  # type: Dict[Tuple[str, int], float]
+        self._pending_change = dict()  # type: Dict[Tuple[str, int], Tuple[dict, float]]
+
+    @staticmethod
+    def _key(unspent: dict) -> Tuple[str, int]:
+        return unspent['txid'], unspent['vout']
+
+    def _expire_spent(self) -> None:
+        now = time.monotonic()
+
+        for key in [key for key, spent_at in self._spent.items() if now - spent_at > self._spent_ttl_s]:
+            del self._spent[key]
+
+        for key in [key for key, (_, added_at) in self._pending_change.items() if now - added_at > self._change_ttl_s]:
+            del self._pending_change[key]
+
+    def _is_available(self, key: Tuple[str, int]) -> bool:
+        return key not in self._reserved and key not in self._spent
+
+    def get_available_unspents(self, address: str, unspents: List[dict]) -> List[dict]:
+        """
+        Filters the given unspent outputs of the given address as returned by listunspent
+        and adds the change outputs that are not listed yet.
+        """
+        self._expire_spent()
+
+        listed = set(self._key(unspent) for unspent in unspents)
+
+        for key in [key for key in self._pending_change if key in listed]:
+            del self._pending_change[key]
+
+        result = [unspent for unspent in unspents if self._is_available(self._key(unspent))]
+        result.extend(change for key, (change, _) in self._pending_change.items()
+                      if change['address'] == address and self._is_available(key))
+
+        return result
+
+    def reserve(self, unspents: List[dict]) -> bool:
+        """Reserves the given outputs, unless any of them is already reserved or spent."""
+        keys = [self._key(unspent) for unspent in unspents]
+
+        if not all(self._is_available(key) for key in keys):
+            return False
+
+        self._reserved.update(keys)
+
+        return True
+
+    def release(self, unspents: List[dict]) -> None:
+        """Makes the given reserved outputs available again, e.g. after the payout failed."""
+        for unspent in unspents:
+            self._reserved.discard(self._key(unspent))
+
+    def discard_change(self, unspents: List[dict]) -> None:
+        """
+        Forgets the change outputs among the given outputs, e.g. after the node rejected a transaction spending them,
+        as the transaction that created them may have been evicted or replaced.
+        """
+        for unspent in unspents:
+            self._pending_change.pop(self._key(unspent), None)
+
+    def spend(self, unspents: List[dict], change_outputs: List[dict]) -> None:
+        """
+        Marks the given reserved outputs as spent and the given change outputs as available.
+        Every change output needs a txid, vout, address and amount.
+        """
+        now = time.monotonic()
+
+        for unspent in unspents:
+            key = self._key(unspent)
+            self._reserved.discard(key)
+            self._pending_change.pop(key, None)
+            self._spent[key] = now
+
+        for change in change_outputs:
+            self._pending_change[self._key(change)] = (change, now)
+
+    @property
+    def reserved(self) -> int:
+        return len(self._reserved)
@@ -0,0 +1,106 @@
+"""
+LitecoinUtxoSet
+"""
+
+import time
+from typing import Dict, List, Tuple, Optional
+
+from bitcoinrpc.authproxy import AuthServiceProxy
+
+
+class LitecoinUtxoSet(object):
+    """
+    Keeps the unspent outputs of a single address in memory, so that payouts of this address
+    do not need to call listunspent.
+
+    The set is loaded from the node on first use and reconciled with the node whenever it is older than
+    reconciliation_interval_s. In between, it is updated by the payouts broadcast by the Gateway and by the
+    transactions of the scanned blocks. As blocks are scanned with some distance to the highest block,
+    the outputs spent by our own payouts are remembered until the spending transaction is scanned
+    or spent_ttl_s seconds have passed, so that the scan does not add them again.
+    """
+
+    DEFAULT_RECONCILIATION_INTERVAL_S = 300.0
+    DEFAULT_SPENT_TTL_S = 86400.0
+
+    def __init__(self,
+                 ltc_proxy: AuthServiceProxy,
+                 address: str,
+                 reconciliation_interval_s: float = DEFAULT_RECONCILIATION_INTERVAL_S,
+                 spent_ttl_s: float = DEFAULT_SPENT_TTL_S) -> None:
+        self._ltc_proxy = ltc_proxy
+        self._address = address
+        self._reconciliation_interval_s = reconciliation_interval_s
+        self._spent_ttl_s = spent_ttl_s
+        self._unspents = dict()  # type: Dict[Tuple[str, int], dict]
+        self._spent = dict()  # type: Dict[Tuple[str, int], float]
+        self._last_reconciliation = None  # type: Optional[float]
+
+    @property
+    def address(self) -> str:
+        return self._address
+
+    def _expire_spent(self) -> None:
+        now = time.monotonic()
+
+        for key in [key for key, spent_at in self._spent.items() if now - spent_at > self._spent_ttl_s]:
+            del self._spent[key]
+
+    def reconcile(self) -> None:
+        """Replaces the unspent outputs by the ones the node knows about."""
+        unspents = self._ltc_proxy.listunspent(None, None, [self._address])
+
+        self._expire_spent()
+        self._unspents = dict(((unspent['txid'], unspent['vout']), unspent) for unspent in unspents
+                              if (unspent['txid'], unspent['vout']) not in self._spent)
+        self._last_reconciliation = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Reconciles the unspent outputs with the node on next use, e.g. after the node rejected a payout."""
+        self._last_reconciliation = None
+
+    def get_unspents(self) -> List[dict]:
+        """Returns the unspent outputs of the address, reconciling them with the node if necessary."""
+        if self._last_reconciliation is None or \
+                time.monotonic() - self._last_reconciliation > self._reconciliation_interval_s:
+            self.reconcile()
+
+        return list(self._unspents.values())
+
+    def apply_transaction(self, transaction: dict) -> None:
+        """Applies a decoded transaction of a scanned block."""
+        for vin in transaction.get('vin', list()):
+            if 'txid' in vin and 'vout' in vin:
+                key = (vin['txid'], vin['vout'])
+                self._unspents.pop(key, None)
+                self._spent.pop(key, None)
+
+        for vout in transaction['vout']:
+            key = (transaction['txid'], vout['n'])
+
+            if self._address in vout['scriptPubKey'].get('addresses', list()) and key not in self._spent:
+                self._unspents[key] = {
+                    'txid': transaction['txid'],
+                    'vout': vout['n'],
+                    'address': self._address,
+                    'scriptPubKey': vout['scriptPubKey'].get('hex'),
+                    'amount': vout['value']
+                }
+
+    def apply_payout(self, unspents: List[dict], change_outputs: List[dict]) -> None:
+        """
+        Applies a payout broadcast by the Gateway. Every change output needs a txid, vout, address and amount.
+        """
+        now = time.monotonic()
+
+        for unspent in unspents:
+            key = (unspent['txid'], unspent['vout'])
+            self._unspents.pop(key, None)
+            self._spent[key] = now
+
+        for change in change_outputs:
+            if change['address'] == self._address:
+                self._unspents[(change['txid'], change['vout'])] = change
+
+    def __len__(self) -> int:
+        return len(self._unspents)
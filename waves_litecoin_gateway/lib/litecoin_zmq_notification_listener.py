@@ -0,0 +1,85 @@
+"""
+LitecoinZmqNotificationListener
+"""
+
+import logging
+from typing import Callable, List, Optional
+
+import gevent
+
+try:
+    import zmq.green as zmq
+except ImportError:  # pragma: no cover
+    zmq = None
+
+
+class LitecoinZmqNotificationListener(object):
+    """
+    Subscribes to the zmqpubhashblock and zmqpubrawtx notifications of a Litecoin node and passes
+    the hashes of new blocks and the new raw transactions to the given callbacks.
+    Requires pyzmq. The notifications are received by a greenlet that is spawned by start.
+    """
+
+    TOPIC_HASH_BLOCK = b'hashblock'
+    TOPIC_RAW_TX = b'rawtx'
+
+    def __init__(self,
+                 endpoints: List[str],
+                 on_block_hash: Callable[[str], None],
+                 on_raw_transaction: Optional[Callable[[bytes], None]] = None) -> None:
+        if zmq is None:
+            raise ImportError('pyzmq is required to receive the notifications of the Litecoin node')
+
+        self._endpoints = endpoints
+        self._on_block_hash = on_block_hash
+        self._on_raw_transaction = on_raw_transaction
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._context = zmq.Context.instance()
+        self._socket = None
+        self._greenlet = None  # type: Optional[gevent.Greenlet]
+
+    def _create_socket(self):
+        socket = self._context.socket(zmq.SUB)
+        socket.setsockopt(zmq.SUBSCRIBE, LitecoinZmqNotificationListener.TOPIC_HASH_BLOCK)
+
+        if self._on_raw_transaction is not None:
+            socket.setsockopt(zmq.SUBSCRIBE, LitecoinZmqNotificationListener.TOPIC_RAW_TX)
+
+        for endpoint in self._endpoints:
+            socket.connect(endpoint)
+
+        return socket
+
+    def _handle_message(self, message: List[bytes]) -> None:
+        topic, body = message[0], message[1]
+
+        if topic == LitecoinZmqNotificationListener.TOPIC_HASH_BLOCK:
+            self._on_block_hash(body.hex())
+        elif topic == LitecoinZmqNotificationListener.TOPIC_RAW_TX and self._on_raw_transaction is not None:
+            self._on_raw_transaction(body)
+
+    def _run(self) -> None:
+        while True:
+            message = self._socket.recv_multipart()
+
+            try:
+                self._handle_message(message)
+            except Exception as ex:  # pylint: disable=broad-except
+                self._logger.warning('Failed to handle notification: %s', str(ex))
+
+    def start(self) -> None:
+        """Connects to the endpoints and starts receiving notifications."""
+        if self._greenlet is not None:
+            return
+
+        self._socket = self._create_socket()
+        self._greenlet = gevent.spawn(self._run)
+
+    def stop(self) -> None:
+        if self._greenlet is None:
+            return
+
+        self._greenlet.kill()
+        self._socket.close(linger=0)
+        self._greenlet = None
+        self._socket = None
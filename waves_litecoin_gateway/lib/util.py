@@ -3,7 +3,9 @@ Utility methods
 """
 
 from decimal import Decimal
-from typing import List
+from typing import List, Union
+
+SATOSHI_EXPONENT = 8
 
 
 def sum_unspents(unspents: List[dict]) -> Decimal:
@@ -16,3 +18,20 @@ def sum_unspents(unspents: List[dict]) -> Decimal:
         amount = amount + vout['amount']
 
     return amount
+
+
+def to_satoshis(amount: Union[Decimal, int, float]) -> int:
+    """
+    Converts the given amount of LTC into satoshis.
+    """
+    if not isinstance(amount, Decimal):
+        amount = Decimal(amount)
+
+    return int(amount.scaleb(SATOSHI_EXPONENT).to_integral_value())
+
+
+def from_satoshis(amount: int) -> Decimal:
+    """
+    Converts the given amount of satoshis into LTC without any rounding.
+    """
+    return Decimal(amount).scaleb(-SATOSHI_EXPONENT)
@@ -4,13 +4,16 @@ LitecoinGateway
 
 import logging
 from logging.handlers import RotatingFileHandler
-from typing import List
+from typing import List, Optional
 
-import bitcoinrpc.authproxy as authproxy
+import gevent
 import pymongo
 import waves_gateway as wg
+from pymongo.database import Database
+from waves_gateway.model import MappingEntry
 
 import waves_litecoin_gateway.lib as lib
+from .litecoin_gateway_config import LitecoinGatewayConfig, LitecoinGatewayConfigParser
 
 
 class LitecoinGateway(object):
@@ -28,23 +31,193 @@ class LitecoinGateway(object):
     WAVES_ASSET_ID = "HtuMVfunYhNpsqhFotXuwXvrC9wt6UD6ENdpQEQxtGAv"
     DEFAULT_PORT = 5000
     DEFAULT_HOST = 'localhost'
+    MAPPING_COLLECTION_NAME = wg.Gateway.DEFAULT_MAP_STORAGE_COLLECTION_NAME
+    DEFAULT_NUM_ATTEMPT_LIST_WORKERS = 1
+    ADDRESS_POOL_COLLECTION_NAME = "address_pool"
 
     def __init__(self,
                  config: wg.GatewayConfigFile,
                  ltc_round_precision: int = DEFAULT_LTC_ROUND_PRECISION,
                  ltc_factor: int = DEFAULT_LTC_FACTOR,
                  transaction_web_link: str = DEFAULT_TRANSACTION_WEB_LINK,
-                 address_web_link: str = DEFAULT_ADDRESS_WEB_LINK) -> None:
-        ltc_proxy = wg.ProxyGuard(authproxy.AuthServiceProxy(config.coin_node), max_parallel_access=1)
-        litecoin_address_factory = lib.LitecoinAddressFactory(ltc_proxy)
-        litecoin_chain_query_service = lib.LitecoinChainQueryService(ltc_proxy)
-        litecoin_transaction_service = lib.LitecoinTransactionService(ltc_proxy, litecoin_chain_query_service)
-        litecoin_integer_converter_service = lib.LitecoinIntegerConverterService(ltc_factor, ltc_round_precision)
-        litecoin_address_validation_service = lib.LitecoinAddressValidationService(ltc_proxy)
+                 address_web_link: str = DEFAULT_ADDRESS_WEB_LINK,
+                 ltc_config: Optional[LitecoinGatewayConfig] = None) -> None:
+        if ltc_config is None:
+            ltc_config = LitecoinGatewayConfig()
+
+        transaction_cache = None
+
+        if ltc_config.coin_transaction_cache_mb is not None:
+            transaction_cache = lib.LitecoinTransactionCache(ltc_config.coin_transaction_cache_mb * 1024 * 1024)
+
+        transaction_decoder = None
+
+        if ltc_config.coin_decode_locally:
+            transaction_decoder = lib.LitecoinTransactionDecoder(lib.LitecoinNetwork.by_name(ltc_config.coin_chain))
+
+        self._decoding_pool = None  # type: Optional[lib.LitecoinDecodingPool]
+
+        if ltc_config.coin_decoding_processes is not None:
+            self._decoding_pool = lib.LitecoinDecodingPool(ltc_config.coin_decoding_processes,
+                                                           lib.LitecoinNetwork.by_name(ltc_config.coin_chain))
+
         mongo_client = pymongo.MongoClient(host=config.mongo_host, port=config.mongo_port)
-        fee_service = wg.ConstantFeeServiceImpl(config.gateway_fee, config.coin_fee)
+        mongo_database = mongo_client.get_database(config.mongo_database)
+
+        address_index = None
+
+        if ltc_config.coin_address_prefilter:
+            address_index = self._init_address_index(mongo_database, config, ltc_config)
+
+        pool_size = ltc_config.coin_pool_size
+
+        # the adaptive limiter orders the waiting requests by their priority, so none of them may wait for a connection
+        if ltc_config.coin_adaptive_limit_max is not None:
+            pool_size = max(pool_size, ltc_config.coin_adaptive_limit_max)
+
+        connection_pool = lib.LitecoinRpcConnectionPool(config.coin_node, pool_size=pool_size)
+        ltc_proxy = connection_pool
+        node_router = None
+
+        if len(ltc_config.coin_read_nodes) > 0:
+            node_router = lib.LitecoinNodeRouter(connection_pool, [
+                lib.LitecoinRpcConnectionPool(read_node, pool_size=pool_size)
+                for read_node in ltc_config.coin_read_nodes
+            ])
+            ltc_proxy = node_router
+
+        self._metrics = None  # type: Optional[lib.LitecoinMetrics]
+        self._metrics_host = config.gateway_host
+        self._metrics_port = ltc_config.metrics_port
+
+        if ltc_config.metrics_port is not None:
+            self._metrics = lib.LitecoinMetrics()
+            ltc_proxy = lib.LitecoinInstrumentedProxy(ltc_proxy, self._metrics)
+
+        adaptive_limiter = None
+
+        if ltc_config.coin_adaptive_limit_max is not None:
+            adaptive_limiter = lib.LitecoinAdaptiveLimiter(
+                ltc_proxy,
+                initial_limit=ltc_config.coin_pool_size,
+                max_limit=ltc_config.coin_adaptive_limit_max,
+                max_latency_s=ltc_config.coin_adaptive_limit_max_latency_s)
+            ltc_proxy = adaptive_limiter
+
+        self._address_pool = None  # type: Optional[lib.LitecoinAddressPool]
+
+        if ltc_config.coin_address_pool_size is not None:
+            self._address_pool = lib.LitecoinAddressPool(
+                ltc_proxy,
+                mongo_database.get_collection(LitecoinGateway.ADDRESS_POOL_COLLECTION_NAME),
+                high_watermark=ltc_config.coin_address_pool_size)
+
+        litecoin_address_factory = lib.LitecoinAddressFactory(
+            ltc_proxy, address_index=address_index, address_pool=self._address_pool)
+        utxo_set = None
+
+        if ltc_config.coin_utxo_reconciliation_interval_s is not None:
+            utxo_set = lib.LitecoinUtxoSet(
+                ltc_proxy,
+                config.gateway_coin_address_secret.public,
+                reconciliation_interval_s=ltc_config.coin_utxo_reconciliation_interval_s)
+
+        block_cache = None
+
+        if ltc_config.coin_block_cache_size is not None:
+            block_cache = lib.LitecoinBlockCache(ltc_config.coin_block_cache_size)
+
+        self._transaction_store = None  # type: Optional[lib.LitecoinTransactionStore]
+
+        if ltc_config.coin_transaction_store is not None:
+            self._transaction_store = lib.LitecoinTransactionStore(
+                ltc_config.coin_transaction_store, max_transactions=ltc_config.coin_transaction_store_size)
+
+        litecoin_chain_query_service = lib.LitecoinChainQueryService(
+            ltc_proxy,
+            batch_size=ltc_config.coin_batch_size,
+            transaction_cache=transaction_cache,
+            transaction_decoder=transaction_decoder,
+            address_index=address_index,
+            utxo_set=utxo_set,
+            prefetch_window=ltc_config.coin_prefetch_window,
+            block_cache=block_cache,
+            transaction_store=self._transaction_store,
+            decoding_pool=self._decoding_pool,
+            block_filters=ltc_config.coin_block_filters)
+        self._chain_query_service = litecoin_chain_query_service
+        self._warm_up_blocks = None  # type: Optional[int]
+
+        if ltc_config.coin_batch_size is not None:
+            self._warm_up_blocks = ltc_config.coin_warm_up_blocks
+        cost_of_change = lib.to_satoshis(ltc_config.coin_cost_of_change)
+        coin_selector = lib.create_coin_selector(ltc_config.coin_selection, cost_of_change)
+        self._mempool_watcher = None  # type: Optional[lib.LitecoinMempoolWatcher]
+        on_raw_transaction = litecoin_chain_query_service.notify_raw_transaction
+
+        if ltc_config.coin_watch_mempool:
+            self._mempool_watcher = lib.LitecoinMempoolWatcher(
+                ltc_proxy,
+                litecoin_chain_query_service,
+                transaction_decoder=transaction_decoder,
+                polling_interval_s=ltc_config.coin_mempool_polling_interval_s,
+                batch_size=ltc_config.coin_batch_size or lib.LitecoinMempoolWatcher.DEFAULT_BATCH_SIZE)
+            on_raw_transaction = self._mempool_watcher.notify_raw_transaction
+
+        self._notification_listener = None  # type: Optional[lib.LitecoinZmqNotificationListener]
+
+        if len(ltc_config.coin_zmq) > 0:
+            self._notification_listener = lib.LitecoinZmqNotificationListener(
+                ltc_config.coin_zmq,
+                on_block_hash=litecoin_chain_query_service.notify_block_hash,
+                on_raw_transaction=on_raw_transaction)
+
+        litecoin_transaction_service = lib.LitecoinTransactionService(
+            ltc_proxy,
+            litecoin_chain_query_service,
+            coin_selector=coin_selector,
+            cost_of_change=cost_of_change,
+            utxo_set=utxo_set)
+        num_attempt_list_workers = LitecoinGateway.DEFAULT_NUM_ATTEMPT_LIST_WORKERS
+
+        if ltc_config.coin_payout_batch_size is not None:
+            # a batch can only be filled by attempt lists that are processed concurrently
+            num_attempt_list_workers = max(num_attempt_list_workers, ltc_config.coin_payout_batch_size)
+            litecoin_transaction_service = lib.LitecoinBatchingTransactionService(
+                litecoin_transaction_service,
+                max_batch_size=ltc_config.coin_payout_batch_size,
+                batch_window_s=ltc_config.coin_payout_batch_window_s)
 
         logging_handlers = self._init_logging_handlers(config.environment)
+        self._log_handler = None  # type: Optional[lib.LitecoinQueueLogHandler]
+
+        if ltc_config.log_queue_size is not None and len(logging_handlers) > 0:
+            self._log_handler = lib.LitecoinQueueLogHandler(
+                logging_handlers,
+                capacity=ltc_config.log_queue_size,
+                sampled_loggers=ltc_config.log_sampled_loggers,
+                sample_interval=ltc_config.log_sample_interval)
+            self._log_handler.start()
+            logging_handlers = [self._log_handler]
+
+        if self._metrics is not None:
+            litecoin_transaction_service = lib.LitecoinInstrumentedTransactionService(
+                litecoin_transaction_service, self._metrics)
+            self._register_metrics(self._metrics, connection_pool, node_router, adaptive_limiter,
+                                   litecoin_chain_query_service, transaction_cache, block_cache)
+
+        litecoin_integer_converter_service = lib.LitecoinIntegerConverterService(ltc_factor, ltc_round_precision)
+        address_validation_network = None
+
+        if ltc_config.coin_validate_addresses_locally:
+            address_validation_network = lib.LitecoinNetwork.by_name(ltc_config.coin_chain)
+
+        litecoin_address_validation_service = lib.LitecoinAddressValidationService(
+            ltc_proxy,
+            network=address_validation_network,
+            strict=ltc_config.coin_validate_addresses_strictly,
+            cache_size=ltc_config.coin_address_validation_cache_size)
+        fee_service = wg.ConstantFeeServiceImpl(config.gateway_fee, config.coin_fee)
 
         self._gateway = wg.Gateway(
             coin_address_factory=litecoin_address_factory,
@@ -52,7 +225,7 @@ class LitecoinGateway(object):
             coin_transaction_service=litecoin_transaction_service,
             gateway_waves_address_secret=config.gateway_waves_address_secret,
             gateway_coin_address_secret=config.gateway_coin_address_secret,
-            mongo_database=mongo_client.get_database(config.mongo_database),
+            mongo_database=mongo_database,
             managed_loggers=["BitcoinRPC"],
             logging_handlers=logging_handlers,
             custom_currency_name=LitecoinGateway.WEB_CURRENCY_NAME,
@@ -69,7 +242,111 @@ class LitecoinGateway(object):
             host=config.gateway_host,
             port=config.gateway_port,
             coin_address_validation_service=litecoin_address_validation_service,
-            coin_last_block_distance=5)
+            coin_last_block_distance=5,
+            num_attempt_list_workers=num_attempt_list_workers)
+
+    def _init_address_index(self, mongo_database: Database, config: wg.GatewayConfigFile,
+                            ltc_config: LitecoinGatewayConfig) -> lib.LitecoinAddressIndex:
+        """
+        Creates the index of the addresses owned by the Gateway. It is seeded with the coin addresses
+        of the already existing mappings and the coin address of the Gateway itself.
+        """
+        network = lib.LitecoinNetwork.by_name(ltc_config.coin_chain) if ltc_config.coin_block_filters else None
+        address_index = lib.LitecoinAddressIndex(
+            bloom_filter_capacity=ltc_config.coin_address_bloom_filter_capacity, network=network)
+        address_index.add(config.gateway_coin_address_secret.public)
+
+        mapping_collection = mongo_database.get_collection(LitecoinGateway.MAPPING_COLLECTION_NAME)
+
+        for entry in mapping_collection.find(projection={MappingEntry.DICT_COIN_KEY: True}):
+            address_index.add(entry[MappingEntry.DICT_COIN_KEY])
+
+        return address_index
+
+    def _register_metrics(self, metrics: lib.LitecoinMetrics, connection_pool: lib.LitecoinRpcConnectionPool,
+                          node_router: Optional[lib.LitecoinNodeRouter],
+                          adaptive_limiter: Optional[lib.LitecoinAdaptiveLimiter],
+                          chain_query_service: lib.LitecoinChainQueryService,
+                          transaction_cache: Optional[lib.LitecoinTransactionCache],
+                          block_cache: Optional[lib.LitecoinBlockCache]) -> None:
+        """Registers the metrics that are tracked by the services themselves."""
+        metrics.gauge_function('litecoin_rpc_idle_connections',
+                               'Idle connections to the Litecoin node that holds the wallet',
+                               lambda: connection_pool.idle_connections)
+
+        if node_router is not None:
+            metrics.gauge_function('litecoin_healthy_read_nodes', 'Read nodes that were not ejected',
+                                   lambda: node_router.healthy_read_nodes)
+
+        if adaptive_limiter is not None:
+            metrics.gauge_function('litecoin_rpc_concurrency_limit', 'Current limit of concurrent RPC requests',
+                                   lambda: adaptive_limiter.limit)
+            metrics.gauge_function('litecoin_rpc_priority_queue_depth',
+                                   'Payout and wallet RPC requests waiting for the concurrency limit',
+                                   lambda: adaptive_limiter.priority_queue_depth)
+            metrics.gauge_function('litecoin_rpc_bulk_queue_depth',
+                                   'Block scanning RPC requests waiting for the concurrency limit',
+                                   lambda: adaptive_limiter.bulk_queue_depth)
+            metrics.counter_function('litecoin_rpc_concurrency_limit_decreases_total',
+                                     'Decreases of the concurrency limit because the node was overloaded',
+                                     lambda: adaptive_limiter.decreases)
+
+        metrics.counter_function('litecoin_scanned_blocks_total', 'Scanned blocks',
+                                 lambda: chain_query_service.scanned_blocks)
+        metrics.counter_function('litecoin_resolved_transactions_total',
+                                 'Transactions of the scanned blocks whose senders were resolved',
+                                 lambda: chain_query_service.resolved_transactions)
+        metrics.counter_function('litecoin_pre_resolved_transactions_total',
+                                 'Transactions of the scanned blocks that were resolved while unconfirmed',
+                                 lambda: chain_query_service.pending_transaction_hits)
+        metrics.gauge_function('litecoin_catch_up_blocks_per_second', 'Blocks scanned per second while catching up',
+                               lambda: chain_query_service.catch_up_rate)
+        metrics.counter_function('litecoin_block_filter_skipped_blocks_total',
+                                 'Blocks that were skipped as their filter did not match',
+                                 lambda: chain_query_service.block_filter_skipped_blocks)
+        metrics.counter_function('litecoin_block_filter_matched_blocks_total',
+                                 'Blocks that were fetched as their filter matched',
+                                 lambda: chain_query_service.block_filter_matched_blocks)
+        metrics.counter_function('litecoin_block_filter_false_positives_total',
+                                 'Blocks whose filter matched without a transaction paying to an address',
+                                 lambda: chain_query_service.block_filter_false_positives)
+        metrics.gauge_function('litecoin_block_filter_false_positive_rate',
+                               'Share of the blocks without a transaction paying to an address whose filter matched',
+                               lambda: chain_query_service.block_filter_false_positive_rate)
+
+        if transaction_cache is not None:
+            metrics.counter_function('litecoin_transaction_cache_hits_total', 'Hits of the transaction cache',
+                                     lambda: transaction_cache.hits)
+            metrics.counter_function('litecoin_transaction_cache_misses_total', 'Misses of the transaction cache',
+                                     lambda: transaction_cache.misses)
+            metrics.counter_function('litecoin_transaction_cache_evictions_total',
+                                     'Transactions that were evicted from the transaction cache',
+                                     lambda: transaction_cache.evictions)
+            metrics.gauge_function('litecoin_transaction_cache_bytes', 'Estimated size of the transaction cache',
+                                   lambda: transaction_cache.size)
+
+        if block_cache is not None:
+            metrics.counter_function('litecoin_block_cache_hits_total', 'Hits of the block cache',
+                                     lambda: block_cache.hits)
+            metrics.counter_function('litecoin_block_cache_misses_total', 'Misses of the block cache',
+                                     lambda: block_cache.misses)
+            metrics.counter_function('litecoin_block_cache_invalidations_total',
+                                     'Blocks that were removed from the block cache by a reorganization',
+                                     lambda: block_cache.invalidations)
+
+        if self._address_pool is not None:
+            metrics.gauge_function('litecoin_address_pool_size', 'Addresses in the address pool',
+                                   lambda: len(self._address_pool))
+
+        if self._log_handler is not None:
+            metrics.gauge_function('litecoin_log_queue_depth', 'Log records waiting to be written',
+                                   lambda: self._log_handler.queue_depth)
+            metrics.counter_function('litecoin_log_dropped_records_total',
+                                     'Log records that were dropped as the log queue was full',
+                                     lambda: self._log_handler.dropped)
+            metrics.counter_function('litecoin_log_sampled_records_total',
+                                     'Log records of the sampled loggers that were skipped',
+                                     lambda: self._log_handler.sampled)
 
     def _init_logging_handlers(self, environment: str) -> List[logging.Handler]:
         formatter = logging.Formatter("[%(asctime)s] %(levelname)s {%(name)s} - %(message)s")
@@ -98,6 +375,26 @@ class LitecoinGateway(object):
         return logging_handlers
 
     def run(self):
+        if self._metrics is not None:
+            self._metrics.start_server(self._metrics_host, self._metrics_port)
+
+        if self._transaction_store is not None:
+            self._transaction_store.start_compaction()
+
+        if self._decoding_pool is not None:
+            self._decoding_pool.start()
+
+        if self._warm_up_blocks is not None:
+            gevent.spawn(self._chain_query_service.warm_up, self._warm_up_blocks)
+
+        if self._address_pool is not None:
+            self._address_pool.start_refill()
+
+        if self._notification_listener is not None:
+            self._notification_listener.start()
+        elif self._mempool_watcher is not None:
+            self._mempool_watcher.start()
+
         self._gateway.run()
 
     def set_log_level(self, level):
@@ -107,4 +404,5 @@ class LitecoinGateway(object):
     def from_config_file(file_content: str):
         parser = wg.INJECTOR.get(wg.GatewayConfigParser)
         parsed_config = parser.parse_config_file_content(file_content)
-        return LitecoinGateway(config=parsed_config)
+        parsed_ltc_config = LitecoinGatewayConfigParser().parse_config_file_content(file_content)
+        return LitecoinGateway(config=parsed_config, ltc_config=parsed_ltc_config)
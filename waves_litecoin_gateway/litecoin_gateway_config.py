@@ -0,0 +1,305 @@
+"""
+LitecoinGatewayConfig
+"""
+
+from configparser import ConfigParser
+from decimal import Decimal
+from typing import Optional, List
+
+from waves_gateway.common import InvalidConfigError
+
+from .lib import LitecoinNetwork, COIN_SELECTION_STRATEGIES
+
+
+class LitecoinGatewayConfig(object):
+    """
+    Contains the Litecoin specific options of a configuration file.
+    The options that are common to every Gateway are parsed by the GatewayConfigParser of the framework.
+    """
+
+    DEFAULT_COIN_BATCH_SIZE = 100
+    DEFAULT_COIN_TRANSACTION_CACHE_MB = 64
+    DEFAULT_COIN_POOL_SIZE = 4
+    DEFAULT_COIN_DECODE_LOCALLY = None
+    DEFAULT_COIN_CHAIN = None
+    DEFAULT_COIN_ADDRESS_PREFILTER = False
+    DEFAULT_COIN_ADDRESS_BLOOM_FILTER_CAPACITY = None
+    DEFAULT_COIN_SELECTION = ['branch_and_bound', 'best_fit']
+    DEFAULT_COIN_COST_OF_CHANGE = Decimal('0.00002')
+    DEFAULT_COIN_PAYOUT_BATCH_SIZE = None
+    DEFAULT_COIN_PAYOUT_BATCH_WINDOW_S = 2.0
+    DEFAULT_COIN_UTXO_RECONCILIATION_INTERVAL_S = 300.0
+    DEFAULT_COIN_ZMQ = []  # type: List[str]
+    DEFAULT_COIN_ADDRESS_POOL_SIZE = None
+    DEFAULT_COIN_VALIDATE_ADDRESSES_LOCALLY = None
+    DEFAULT_COIN_VALIDATE_ADDRESSES_STRICTLY = False
+    DEFAULT_COIN_ADDRESS_VALIDATION_CACHE_SIZE = 10000
+    DEFAULT_COIN_PREFETCH_WINDOW = 16
+    DEFAULT_COIN_BLOCK_CACHE_SIZE = 8
+    DEFAULT_COIN_TRANSACTION_STORE = None
+    DEFAULT_COIN_TRANSACTION_STORE_SIZE = 1000000
+    DEFAULT_COIN_WARM_UP_BLOCKS = None
+    DEFAULT_COIN_READ_NODES = []  # type: List[str]
+    DEFAULT_COIN_WATCH_MEMPOOL = False
+    DEFAULT_COIN_MEMPOOL_POLLING_INTERVAL_S = 2.0
+    DEFAULT_COIN_DECODING_PROCESSES = None
+    DEFAULT_COIN_ADAPTIVE_LIMIT_MAX = None
+    DEFAULT_COIN_ADAPTIVE_LIMIT_MAX_LATENCY_S = None
+    DEFAULT_COIN_BLOCK_FILTERS = False
+    DEFAULT_METRICS_PORT = None
+    DEFAULT_LOG_QUEUE_SIZE = None
+    DEFAULT_LOG_SAMPLED_LOGGERS = ['BitcoinRPC']
+    DEFAULT_LOG_SAMPLE_INTERVAL = 1
+
+    def __init__(self):
+        self.coin_batch_size = LitecoinGatewayConfig.DEFAULT_COIN_BATCH_SIZE  # type: Optional[int]
+        self.coin_transaction_cache_mb = \
+            LitecoinGatewayConfig.DEFAULT_COIN_TRANSACTION_CACHE_MB  # type: Optional[int]
+        self.coin_pool_size = LitecoinGatewayConfig.DEFAULT_COIN_POOL_SIZE  # type: int
+        self.coin_decode_locally = LitecoinGatewayConfig.DEFAULT_COIN_DECODE_LOCALLY  # type: Optional[bool]
+        self.coin_chain = LitecoinGatewayConfig.DEFAULT_COIN_CHAIN  # type: Optional[str]
+        self.coin_address_prefilter = LitecoinGatewayConfig.DEFAULT_COIN_ADDRESS_PREFILTER  # type: bool
+        self.coin_address_bloom_filter_capacity = \
+            LitecoinGatewayConfig.DEFAULT_COIN_ADDRESS_BLOOM_FILTER_CAPACITY  # type: Optional[int]
+        self.coin_selection = list(LitecoinGatewayConfig.DEFAULT_COIN_SELECTION)  # type: List[str]
+        self.coin_cost_of_change = LitecoinGatewayConfig.DEFAULT_COIN_COST_OF_CHANGE  # type: Decimal
+        self.coin_payout_batch_size = LitecoinGatewayConfig.DEFAULT_COIN_PAYOUT_BATCH_SIZE  # type: Optional[int]
+        self.coin_payout_batch_window_s = LitecoinGatewayConfig.DEFAULT_COIN_PAYOUT_BATCH_WINDOW_S  # type: float
+        self.coin_utxo_reconciliation_interval_s = \
+            LitecoinGatewayConfig.DEFAULT_COIN_UTXO_RECONCILIATION_INTERVAL_S  # type: Optional[float]
+        self.coin_zmq = list(LitecoinGatewayConfig.DEFAULT_COIN_ZMQ)  # type: List[str]
+        self.coin_address_pool_size = LitecoinGatewayConfig.DEFAULT_COIN_ADDRESS_POOL_SIZE  # type: Optional[int]
+        self.coin_validate_addresses_locally = \
+            LitecoinGatewayConfig.DEFAULT_COIN_VALIDATE_ADDRESSES_LOCALLY  # type: Optional[bool]
+        self.coin_validate_addresses_strictly = \
+            LitecoinGatewayConfig.DEFAULT_COIN_VALIDATE_ADDRESSES_STRICTLY  # type: bool
+        self.coin_address_validation_cache_size = \
+            LitecoinGatewayConfig.DEFAULT_COIN_ADDRESS_VALIDATION_CACHE_SIZE  # type: Optional[int]
+        self.coin_prefetch_window = LitecoinGatewayConfig.DEFAULT_COIN_PREFETCH_WINDOW  # type: Optional[int]
+        self.coin_block_cache_size = LitecoinGatewayConfig.DEFAULT_COIN_BLOCK_CACHE_SIZE  # type: Optional[int]
+        self.coin_transaction_store = LitecoinGatewayConfig.DEFAULT_COIN_TRANSACTION_STORE  # type: Optional[str]
+        self.coin_transaction_store_size = LitecoinGatewayConfig.DEFAULT_COIN_TRANSACTION_STORE_SIZE  # type: int
+        self.coin_warm_up_blocks = LitecoinGatewayConfig.DEFAULT_COIN_WARM_UP_BLOCKS  # type: Optional[int]
+        self.coin_read_nodes = list(LitecoinGatewayConfig.DEFAULT_COIN_READ_NODES)  # type: List[str]
+        self.coin_watch_mempool = LitecoinGatewayConfig.DEFAULT_COIN_WATCH_MEMPOOL  # type: bool
+        self.coin_mempool_polling_interval_s = \
+            LitecoinGatewayConfig.DEFAULT_COIN_MEMPOOL_POLLING_INTERVAL_S  # type: float
+        self.coin_decoding_processes = LitecoinGatewayConfig.DEFAULT_COIN_DECODING_PROCESSES  # type: Optional[int]
+        self.coin_adaptive_limit_max = LitecoinGatewayConfig.DEFAULT_COIN_ADAPTIVE_LIMIT_MAX  # type: Optional[int]
+        self.coin_adaptive_limit_max_latency_s = \
+            LitecoinGatewayConfig.DEFAULT_COIN_ADAPTIVE_LIMIT_MAX_LATENCY_S  # type: Optional[float]
+        self.coin_block_filters = LitecoinGatewayConfig.DEFAULT_COIN_BLOCK_FILTERS  # type: bool
+        self.metrics_port = LitecoinGatewayConfig.DEFAULT_METRICS_PORT  # type: Optional[int]
+        self.log_queue_size = LitecoinGatewayConfig.DEFAULT_LOG_QUEUE_SIZE  # type: Optional[int]
+        self.log_sampled_loggers = list(LitecoinGatewayConfig.DEFAULT_LOG_SAMPLED_LOGGERS)  # type: List[str]
+        self.log_sample_interval = LitecoinGatewayConfig.DEFAULT_LOG_SAMPLE_INTERVAL  # type: int
+
+
+class LitecoinGatewayConfigParser(object):
+    """
+    May be used to parse the Litecoin specific options of a gateway configuration file.
+    Every option is optional and falls back to the defaults of the LitecoinGatewayConfig.
+    """
+
+    def _parse_optional_int(self, config_parser: ConfigParser, section: str, option: str,
+                            fallback: Optional[int]) -> Optional[int]:
+        """Parses an integer option. A value of zero or less disables the associated feature by returning None."""
+        value = config_parser.getint(section, option, fallback=fallback)  # type: Optional[int]
+
+        if value is not None and value <= 0:
+            return None
+        else:
+            return value
+
+    def _parse_node_section(self, config_parser: ConfigParser, parsed_config: LitecoinGatewayConfig) -> None:
+        parsed_config.coin_batch_size = self._parse_optional_int(config_parser, 'node', 'coin_batch_size',
+                                                                 parsed_config.coin_batch_size)
+        parsed_config.coin_transaction_cache_mb = self._parse_optional_int(
+            config_parser, 'node', 'coin_transaction_cache_mb', parsed_config.coin_transaction_cache_mb)
+        parsed_config.coin_pool_size = config_parser.getint(
+            'node', 'coin_pool_size', fallback=parsed_config.coin_pool_size)
+
+        if parsed_config.coin_pool_size < 1:
+            raise InvalidConfigError('The option coin_pool_size in the section node must be at least 1')
+
+        parsed_config.coin_decode_locally = config_parser.getboolean(
+            'node', 'coin_decode_locally', fallback=parsed_config.coin_decode_locally)
+        parsed_config.coin_address_prefilter = config_parser.getboolean(
+            'node', 'coin_address_prefilter', fallback=parsed_config.coin_address_prefilter)
+        parsed_config.coin_address_bloom_filter_capacity = self._parse_optional_int(
+            config_parser, 'node', 'coin_address_bloom_filter_capacity',
+            parsed_config.coin_address_bloom_filter_capacity)
+        parsed_config.coin_utxo_reconciliation_interval_s = config_parser.getfloat(
+            'node', 'coin_utxo_reconciliation_interval_s', fallback=parsed_config.coin_utxo_reconciliation_interval_s)
+
+        if parsed_config.coin_utxo_reconciliation_interval_s is not None and \
+                parsed_config.coin_utxo_reconciliation_interval_s <= 0:
+            parsed_config.coin_utxo_reconciliation_interval_s = None
+
+        if config_parser.has_option('node', 'coin_zmq'):
+            coin_zmq = config_parser.get('node', 'coin_zmq').split(',')
+            parsed_config.coin_zmq = [endpoint.strip() for endpoint in coin_zmq if endpoint.strip()]
+
+        parsed_config.coin_address_pool_size = self._parse_optional_int(config_parser, 'node', 'coin_address_pool_size',
+                                                                        parsed_config.coin_address_pool_size)
+        parsed_config.coin_validate_addresses_locally = config_parser.getboolean(
+            'node', 'coin_validate_addresses_locally', fallback=parsed_config.coin_validate_addresses_locally)
+        parsed_config.coin_validate_addresses_strictly = config_parser.getboolean(
+            'node', 'coin_validate_addresses_strictly', fallback=parsed_config.coin_validate_addresses_strictly)
+        parsed_config.coin_address_validation_cache_size = self._parse_optional_int(
+            config_parser, 'node', 'coin_address_validation_cache_size',
+            parsed_config.coin_address_validation_cache_size)
+        parsed_config.coin_prefetch_window = self._parse_optional_int(config_parser, 'node', 'coin_prefetch_window',
+                                                                      parsed_config.coin_prefetch_window)
+        parsed_config.coin_block_cache_size = self._parse_optional_int(config_parser, 'node', 'coin_block_cache_size',
+                                                                       parsed_config.coin_block_cache_size)
+        parsed_config.coin_transaction_store = config_parser.get(
+            'node', 'coin_transaction_store', fallback=parsed_config.coin_transaction_store) or None
+        parsed_config.coin_transaction_store_size = config_parser.getint(
+            'node', 'coin_transaction_store_size', fallback=parsed_config.coin_transaction_store_size)
+
+        if parsed_config.coin_transaction_store_size < 1:
+            raise InvalidConfigError('The option coin_transaction_store_size in the section node must be at least 1')
+
+        parsed_config.coin_warm_up_blocks = self._parse_optional_int(config_parser, 'node', 'coin_warm_up_blocks',
+                                                                     parsed_config.coin_warm_up_blocks)
+
+        if config_parser.has_option('node', 'coin_read_nodes'):
+            coin_read_nodes = config_parser.get('node', 'coin_read_nodes').split(',')
+            parsed_config.coin_read_nodes = [node.strip() for node in coin_read_nodes if node.strip()]
+
+        parsed_config.coin_watch_mempool = config_parser.getboolean(
+            'node', 'coin_watch_mempool', fallback=parsed_config.coin_watch_mempool)
+        parsed_config.coin_mempool_polling_interval_s = config_parser.getfloat(
+            'node', 'coin_mempool_polling_interval_s', fallback=parsed_config.coin_mempool_polling_interval_s)
+
+        if parsed_config.coin_mempool_polling_interval_s <= 0:
+            raise InvalidConfigError('The option coin_mempool_polling_interval_s in the section node must be positive')
+
+        if parsed_config.coin_watch_mempool and not parsed_config.coin_address_prefilter:
+            raise InvalidConfigError(
+                'The option coin_watch_mempool in the section node requires coin_address_prefilter')
+
+        parsed_config.coin_decoding_processes = self._parse_optional_int(
+            config_parser, 'node', 'coin_decoding_processes', parsed_config.coin_decoding_processes)
+        parsed_config.coin_adaptive_limit_max = self._parse_optional_int(
+            config_parser, 'node', 'coin_adaptive_limit_max', parsed_config.coin_adaptive_limit_max)
+        parsed_config.coin_adaptive_limit_max_latency_s = config_parser.getfloat(
+            'node', 'coin_adaptive_limit_max_latency_s', fallback=parsed_config.coin_adaptive_limit_max_latency_s)
+
+        if parsed_config.coin_adaptive_limit_max_latency_s is not None and \
+                parsed_config.coin_adaptive_limit_max_latency_s <= 0:
+            parsed_config.coin_adaptive_limit_max_latency_s = None
+
+        parsed_config.coin_block_filters = config_parser.getboolean(
+            'node', 'coin_block_filters', fallback=parsed_config.coin_block_filters)
+
+        if parsed_config.coin_block_filters and not parsed_config.coin_address_prefilter:
+            raise InvalidConfigError(
+                'The option coin_block_filters in the section node requires coin_address_prefilter')
+
+        # the filters are matched against the scripts of all the addresses, which the Bloom filter would not save
+        if parsed_config.coin_block_filters and parsed_config.coin_address_bloom_filter_capacity is not None:
+            raise InvalidConfigError('The option coin_block_filters in the section node cannot be combined with '
+                                     'coin_address_bloom_filter_capacity')
+
+    def _parse_fee_section(self, config_parser: ConfigParser, parsed_config: LitecoinGatewayConfig) -> None:
+        if config_parser.has_option('fee', 'coin_cost_of_change'):
+            parsed_config.coin_cost_of_change = Decimal(config_parser.get('fee', 'coin_cost_of_change'))
+
+        if parsed_config.coin_cost_of_change < 0:
+            raise InvalidConfigError('The option coin_cost_of_change in the section fee must not be negative')
+
+    def _parse_server_section(self, config_parser: ConfigParser, parsed_config: LitecoinGatewayConfig) -> None:
+        parsed_config.metrics_port = self._parse_optional_int(config_parser, 'server', 'metrics_port',
+                                                              parsed_config.metrics_port)
+
+    def _parse_other_section(self, config_parser: ConfigParser, parsed_config: LitecoinGatewayConfig) -> None:
+        parsed_config.coin_chain = config_parser.get('other', 'coin_chain', fallback=parsed_config.coin_chain)
+
+        if parsed_config.coin_chain is not None:
+            try:
+                LitecoinNetwork.by_name(parsed_config.coin_chain)
+            except ValueError as error:
+                raise InvalidConfigError(str(error))
+
+        if config_parser.has_option('other', 'coin_selection'):
+            coin_selection = config_parser.get('other', 'coin_selection').split(',')
+            parsed_config.coin_selection = [strategy.strip() for strategy in coin_selection if strategy.strip()]
+
+        for strategy in parsed_config.coin_selection:
+            if strategy not in COIN_SELECTION_STRATEGIES:
+                raise InvalidConfigError('Unknown coin selection strategy ' + strategy + '. Use one of ' +
+                                         ', '.join(COIN_SELECTION_STRATEGIES))
+
+        if len(parsed_config.coin_selection) == 0:
+            raise InvalidConfigError('The option coin_selection in the section other must not be empty')
+
+        parsed_config.coin_payout_batch_size = self._parse_optional_int(
+            config_parser, 'other', 'coin_payout_batch_size', parsed_config.coin_payout_batch_size)
+        parsed_config.coin_payout_batch_window_s = config_parser.getfloat(
+            'other', 'coin_payout_batch_window_s', fallback=parsed_config.coin_payout_batch_window_s)
+
+        if parsed_config.coin_payout_batch_window_s < 0:
+            raise InvalidConfigError('The option coin_payout_batch_window_s in the section other must not be negative')
+
+        parsed_config.log_queue_size = self._parse_optional_int(config_parser, 'other', 'log_queue_size',
+                                                                parsed_config.log_queue_size)
+
+        if config_parser.has_option('other', 'log_sampled_loggers'):
+            log_sampled_loggers = config_parser.get('other', 'log_sampled_loggers').split(',')
+            parsed_config.log_sampled_loggers = [logger.strip() for logger in log_sampled_loggers if logger.strip()]
+
+        parsed_config.log_sample_interval = config_parser.getint(
+            'other', 'log_sample_interval', fallback=parsed_config.log_sample_interval)
+
+        if parsed_config.log_sample_interval < 1:
+            raise InvalidConfigError('The option log_sample_interval in the section other must be at least 1')
+
+    def _apply_coin_chain(self, parsed_config: LitecoinGatewayConfig) -> None:
+        """
+        Decoding locally encodes the addresses of outputs for coin_chain, so the options depending on it are only
+        enabled by default if coin_chain is set. Otherwise, no address would match on another network and every
+        address of another network would be rejected.
+        """
+        if parsed_config.coin_decode_locally is None:
+            parsed_config.coin_decode_locally = parsed_config.coin_chain is not None
+
+        if parsed_config.coin_validate_addresses_locally is None:
+            parsed_config.coin_validate_addresses_locally = parsed_config.coin_chain is not None
+
+        if parsed_config.coin_chain is not None:
+            return
+
+        chain_dependent_options = [('coin_decode_locally', parsed_config.coin_decode_locally),
+                                   ('coin_decoding_processes', parsed_config.coin_decoding_processes is not None),
+                                   ('coin_block_filters',
+                                    parsed_config.coin_block_filters), ('coin_validate_addresses_locally',
+                                                                        parsed_config.coin_validate_addresses_locally)]
+
+        for option, enabled in chain_dependent_options:
+            if enabled:
+                raise InvalidConfigError(
+                    'The option ' + option + ' in the section node requires coin_chain in the section other')
+
+    def parse_config_file_content(self, file_content: str) -> LitecoinGatewayConfig:
+        """Parses the given config file."""
+        config_parser = ConfigParser()
+        config_parser.read_string(file_content)
+        parsed_config = LitecoinGatewayConfig()
+
+        if config_parser.has_section('node'):
+            self._parse_node_section(config_parser, parsed_config)
+
+        if config_parser.has_section('fee'):
+            self._parse_fee_section(config_parser, parsed_config)
+
+        if config_parser.has_section('server'):
+            self._parse_server_section(config_parser, parsed_config)
+
+        if config_parser.has_section('other'):
+            self._parse_other_section(config_parser, parsed_config)
+
+        self._apply_coin_chain(parsed_config)
+
+        return parsed_config
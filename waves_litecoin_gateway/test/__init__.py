@@ -5,3 +5,25 @@ from .test_litecoin_chain_query_service import *
 from .test_litecoin_gateway import *
 from .test_litecoin_integer_converter_service import *
 from .test_litecoin_transaction_service import *
+from .test_litecoin_gateway_config import *
+from .test_litecoin_transaction_cache import *
+from .test_litecoin_rpc_connection_pool import *
+from .test_litecoin_transaction_decoder import *
+from .test_litecoin_address_index import *
+from .test_litecoin_address_pool import *
+from .test_litecoin_address_validation_service import *
+from .test_litecoin_block_cache import *
+from .test_litecoin_transaction_store import *
+from .test_litecoin_metrics import *
+from .test_litecoin_instrumented_proxy import *
+from .test_litecoin_node_router import *
+from .test_coin_selection import *
+from .test_litecoin_batching_transaction_service import *
+from .test_litecoin_utxo_reservation_ledger import *
+from .test_litecoin_utxo_set import *
+from .test_litecoin_zmq_notification_listener import *
+from .test_litecoin_mempool_watcher import *
+from .test_litecoin_decoding_pool import *
+from .test_litecoin_adaptive_limiter import *
+from .test_litecoin_block_filter import *
+from .test_litecoin_queue_log_handler import *
@@ -0,0 +1,84 @@
+import random
+import unittest
+
+from waves_litecoin_gateway.lib import BestFitCoinSelector, BranchAndBoundCoinSelector, LargestFirstCoinSelector, \
+    SingleRandomDrawCoinSelector, FallbackCoinSelector, create_coin_selector
+
+
+class BestFitCoinSelectorTest(unittest.TestCase):
+    def setUp(self):
+        self._selector = BestFitCoinSelector()
+
+    def test_select_closest(self):
+        self.assertEqual(self._selector.select([40, 20, 60], 60), [2])
+        self.assertEqual(self._selector.select([40, 20, 70], 60), [2])
+
+    def test_select_prefers_smaller_on_tie(self):
+        self.assertEqual(self._selector.select([70, 50], 60), [1, 0])
+
+    def test_select_multiple(self):
+        self.assertEqual(sorted(self._selector.select([40, 20, 70], 120)), [0, 1, 2])
+
+    def test_select_insufficient(self):
+        self.assertIsNone(self._selector.select([40, 10], 60))
+        self.assertIsNone(self._selector.select([], 60))
+
+
+class BranchAndBoundCoinSelectorTest(unittest.TestCase):
+    def test_select_exact_match(self):
+        selector = BranchAndBoundCoinSelector(cost_of_change=0)
+
+        self.assertEqual(sorted(selector.select([50, 30, 20, 7, 3], 60)), [0, 3, 4])
+
+    def test_select_within_cost_of_change(self):
+        selector = BranchAndBoundCoinSelector(cost_of_change=5)
+
+        selection = selector.select([50, 30, 14], 42)
+
+        self.assertEqual(sorted(selection), [1, 2])
+
+    def test_select_without_changeless_match(self):
+        selector = BranchAndBoundCoinSelector(cost_of_change=1)
+
+        self.assertIsNone(selector.select([50, 30, 14], 42))
+        self.assertIsNone(selector.select([10], 42))
+
+    def test_select_gives_up_after_max_tries(self):
+        selector = BranchAndBoundCoinSelector(cost_of_change=0, max_tries=3)
+
+        self.assertIsNone(selector.select([2 * i + 1 for i in range(0, 20)], 100))
+
+
+class LargestFirstCoinSelectorTest(unittest.TestCase):
+    def test_select(self):
+        selector = LargestFirstCoinSelector()
+
+        self.assertEqual(selector.select([10, 50, 30], 70), [1, 2])
+        self.assertIsNone(selector.select([10, 50, 30], 100))
+
+
+class SingleRandomDrawCoinSelectorTest(unittest.TestCase):
+    def test_select(self):
+        selector = SingleRandomDrawCoinSelector(random.Random(42))
+        amounts = [10, 50, 30, 20]
+
+        selection = selector.select(amounts, 70)
+
+        self.assertGreaterEqual(sum(amounts[i] for i in selection), 70)
+        self.assertEqual(len(set(selection)), len(selection))
+        self.assertIsNone(selector.select(amounts, 120))
+
+
+class FallbackCoinSelectorTest(unittest.TestCase):
+    def test_select_falls_back(self):
+        selector = FallbackCoinSelector([BranchAndBoundCoinSelector(cost_of_change=0), LargestFirstCoinSelector()])
+
+        self.assertEqual(selector.select([50, 30, 14], 30), [1])
+        self.assertEqual(selector.select([50, 30, 14], 42), [0])
+
+    def test_create_coin_selector(self):
+        self.assertIsInstance(create_coin_selector(['largest_first'], 0), LargestFirstCoinSelector)
+        self.assertIsInstance(create_coin_selector(['branch_and_bound', 'best_fit'], 0), FallbackCoinSelector)
+
+        with self.assertRaises(ValueError):
+            create_coin_selector(['knapsack'], 0)
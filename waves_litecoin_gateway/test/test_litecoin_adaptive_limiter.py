@@ -0,0 +1,202 @@
+import unittest
+from unittest.mock import MagicMock
+
+import gevent
+import gevent.event
+from bitcoinrpc.authproxy import JSONRPCException
+
+from waves_litecoin_gateway.lib import LitecoinAdaptiveLimiter
+
+
+class LitecoinAdaptiveLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self._ltc_proxy = MagicMock()
+        self._limiter = LitecoinAdaptiveLimiter(self._ltc_proxy, initial_limit=2, max_limit=4)
+
+    def _block(self, method: str, release: gevent.event.Event, order: list) -> None:
+        def func(*args):
+            order.append(args)
+            release.wait()
+            return args
+
+        getattr(self._ltc_proxy, method).side_effect = func
+
+    def test_call(self):
+        self._ltc_proxy.getblockhash.return_value = 'ab' * 32
+
+        self.assertEqual(self._limiter.getblockhash(5), 'ab' * 32)
+
+        self._ltc_proxy.getblockhash.assert_called_once_with(5)
+        self.assertEqual(self._limiter.in_flight, 0)
+
+    def test_initial_limit_is_bounded(self):
+        self.assertEqual(LitecoinAdaptiveLimiter(self._ltc_proxy, initial_limit=10, max_limit=4).limit, 4)
+        self.assertEqual(LitecoinAdaptiveLimiter(self._ltc_proxy, initial_limit=0, min_limit=1).limit, 1)
+
+    def test_calls_wait_for_limit(self):
+        release = gevent.event.Event()
+        order = list()
+        self._block('getblock', release, order)
+
+        greenlets = [gevent.spawn(self._limiter.getblock, str(i)) for i in range(0, 5)]
+        gevent.sleep(0)
+
+        self.assertEqual(len(order), 2)
+        self.assertEqual(self._limiter.in_flight, 2)
+        self.assertEqual(self._limiter.bulk_queue_depth, 3)
+
+        release.set()
+        gevent.joinall(greenlets)
+
+        self.assertEqual([greenlet.value for greenlet in greenlets], [(str(i), ) for i in range(0, 5)])
+        self.assertEqual(self._limiter.in_flight, 0)
+        self.assertEqual(self._limiter.bulk_queue_depth, 0)
+
+    def test_priority_calls_are_admitted_before_bulk_calls(self):
+        release = gevent.event.Event()
+        order = list()
+        self._block('getblock', release, order)
+        self._block('sendrawtransaction', release, order)
+
+        greenlets = [gevent.spawn(self._limiter.getblock, 'block%d' % i) for i in range(0, 4)]
+        gevent.sleep(0)
+        greenlets.append(gevent.spawn(self._limiter.sendrawtransaction, 'payout'))
+        gevent.sleep(0)
+
+        self.assertEqual(self._limiter.priority_queue_depth, 1)
+        self.assertEqual(self._limiter.bulk_queue_depth, 2)
+
+        release.set()
+        gevent.joinall(greenlets)
+
+        self.assertEqual(order[2], ('payout', ))
+
+    def test_batch_of_bulk_calls_is_bulk(self):
+        release = gevent.event.Event()
+        order = list()
+        self._block('getblock', release, order)
+
+        greenlets = [gevent.spawn(self._limiter.getblock, str(i)) for i in range(0, 2)]
+        gevent.sleep(0)
+        greenlets.append(gevent.spawn(self._limiter.batch_, [['getrawtransaction', 'tx1'], ['getblockhash', 1]]))
+        greenlets.append(gevent.spawn(self._limiter.batch_, [['getrawtransaction', 'tx1'], ['gettransaction', 'tx2']]))
+        gevent.sleep(0)
+
+        self.assertEqual(self._limiter.bulk_queue_depth, 1)
+        self.assertEqual(self._limiter.priority_queue_depth, 1)
+
+        release.set()
+        gevent.joinall(greenlets)
+
+    def test_decreases_limit_on_full_work_queue(self):
+        self._limiter._limit = 4.0
+        self._ltc_proxy.getblock.side_effect = JSONRPCException({
+            'code':
+            -342,
+            'message':
+            "non-JSON HTTP response with '503 Service Unavailable' from server"
+        })
+
+        with self.assertRaises(JSONRPCException):
+            self._limiter.getblock('hash')
+
+        self.assertEqual(self._limiter.limit, 2)
+        self.assertEqual(self._limiter.decreases, 1)
+        self.assertEqual(self._limiter.in_flight, 0)
+
+    def test_decreases_limit_on_connection_error(self):
+        self._ltc_proxy.getblock.side_effect = ConnectionResetError()
+
+        with self.assertRaises(ConnectionResetError):
+            self._limiter.getblock('hash')
+
+        self.assertEqual(self._limiter.limit, 1)
+
+    def test_keeps_limit_on_rpc_error(self):
+        self._ltc_proxy.getrawtransaction.side_effect = JSONRPCException({'code': -5, 'message': 'not found'})
+
+        with self.assertRaises(JSONRPCException):
+            self._limiter.getrawtransaction('tx')
+
+        self.assertEqual(self._limiter.limit, 2)
+        self.assertEqual(self._limiter.decreases, 0)
+
+    def test_does_not_decrease_below_min_limit(self):
+        self._ltc_proxy.getblock.side_effect = ConnectionResetError()
+
+        for _ in range(0, 3):
+            with self.assertRaises(ConnectionResetError):
+                self._limiter.getblock('hash')
+
+        self.assertEqual(self._limiter.limit, 1)
+
+    def test_decreases_at_most_once_per_latency(self):
+        self._limiter._limit = 4.0
+        self._limiter._latency = 10.0
+        self._ltc_proxy.getblock.side_effect = ConnectionResetError()
+
+        for _ in range(0, 2):
+            with self.assertRaises(ConnectionResetError):
+                self._limiter.getblock('hash')
+
+        self.assertEqual(self._limiter.limit, 2)
+        self.assertEqual(self._limiter.decreases, 1)
+
+    def test_decreases_limit_on_slow_request(self):
+        limiter = LitecoinAdaptiveLimiter(self._ltc_proxy, initial_limit=4, max_latency_s=0.01)
+        self._ltc_proxy.getblock.side_effect = lambda block_hash: gevent.sleep(0.02)
+
+        limiter.getblock('hash')
+
+        self.assertEqual(limiter.limit, 2)
+
+    def test_increases_limit_when_exhausted(self):
+        release = gevent.event.Event()
+        order = list()
+        self._block('getblock', release, order)
+
+        greenlets = [gevent.spawn(self._limiter.getblock, str(i)) for i in range(0, 2)]
+        gevent.sleep(0)
+        release.set()
+        gevent.joinall(greenlets)
+
+        # only the second call was sent while the limit was exhausted
+        self.assertEqual(self._limiter._limit, 2.5)
+
+    def test_keeps_limit_when_not_exhausted(self):
+        self._limiter.getblockcount()
+
+        self.assertEqual(self._limiter._limit, 2.0)
+
+    def test_does_not_increase_above_max_limit(self):
+        self._limiter._limit = 4.0
+        release = gevent.event.Event()
+        order = list()
+        self._block('getblock', release, order)
+
+        greenlets = [gevent.spawn(self._limiter.getblock, str(i)) for i in range(0, 4)]
+        gevent.sleep(0)
+        release.set()
+        gevent.joinall(greenlets)
+
+        self.assertEqual(self._limiter.limit, 4)
+
+    def test_killed_waiter_leaves_queue(self):
+        release = gevent.event.Event()
+        order = list()
+        self._block('getblock', release, order)
+
+        greenlets = [gevent.spawn(self._limiter.getblock, str(i)) for i in range(0, 3)]
+        gevent.sleep(0)
+        greenlets[2].kill()
+
+        self.assertEqual(self._limiter.bulk_queue_depth, 0)
+
+        release.set()
+        gevent.joinall(greenlets)
+
+        self.assertEqual(self._limiter.in_flight, 0)
+
+    def test_private_attributes_are_not_proxied(self):
+        with self.assertRaises(AttributeError):
+            getattr(self._limiter, '_unknown')
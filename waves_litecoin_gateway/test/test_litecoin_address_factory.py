@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import MagicMock
 
-from waves_litecoin_gateway.lib import LitecoinAddressFactory
+from waves_litecoin_gateway.lib import LitecoinAddressFactory, LitecoinAddressIndex, LitecoinAddressPool
 
 
 class LitecoinAddressFactoryTest(unittest.TestCase):
@@ -17,3 +17,30 @@ class LitecoinAddressFactoryTest(unittest.TestCase):
         self.assertEqual(self._address_factory.create_address(), expected_result)
 
         self._ltc_proxy.getnewaddress.assert_called_once_with()
+
+    def test_create_address_updates_address_index(self):
+        address_index = LitecoinAddressIndex()
+        address_factory = LitecoinAddressFactory(self._ltc_proxy, address_index=address_index)
+
+        self._ltc_proxy.getnewaddress.return_value = 'mzWnYA5kQxiBJu9zWsnpEVtp3Kz2BfSeJU'
+
+        self.assertEqual(address_factory.create_address(), 'mzWnYA5kQxiBJu9zWsnpEVtp3Kz2BfSeJU')
+        self.assertIn('mzWnYA5kQxiBJu9zWsnpEVtp3Kz2BfSeJU', address_index)
+
+    def test_create_address_from_address_pool(self):
+        address_pool = MagicMock(spec=LitecoinAddressPool)
+        address_pool.take.return_value = 'mzWnYA5kQxiBJu9zWsnpEVtp3Kz2BfSeJU'
+        address_factory = LitecoinAddressFactory(self._ltc_proxy, address_pool=address_pool)
+
+        self.assertEqual(address_factory.create_address(), 'mzWnYA5kQxiBJu9zWsnpEVtp3Kz2BfSeJU')
+        self._ltc_proxy.getnewaddress.assert_not_called()
+
+    def test_create_address_with_empty_address_pool(self):
+        address_pool = MagicMock(spec=LitecoinAddressPool)
+        address_pool.take.return_value = None
+        address_factory = LitecoinAddressFactory(self._ltc_proxy, address_pool=address_pool)
+
+        self._ltc_proxy.getnewaddress.return_value = 'mzWnYA5kQxiBJu9zWsnpEVtp3Kz2BfSeJU'
+
+        self.assertEqual(address_factory.create_address(), 'mzWnYA5kQxiBJu9zWsnpEVtp3Kz2BfSeJU')
+        self._ltc_proxy.getnewaddress.assert_called_once_with()
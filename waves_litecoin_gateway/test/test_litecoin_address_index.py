@@ -0,0 +1,68 @@
+import unittest
+
+from waves_litecoin_gateway.lib import LitecoinAddressIndex, LitecoinNetwork
+from waves_litecoin_gateway.lib.litecoin_address_encoding import base58check_encode, bech32_encode
+
+
+class LitecoinAddressIndexTest(unittest.TestCase):
+    def setUp(self):
+        self._addresses = ['LTC' + str(i) for i in range(0, 1000)]
+
+    def test_contains(self):
+        address_index = LitecoinAddressIndex(self._addresses[0:2])
+
+        self.assertIn(self._addresses[0], address_index)
+        self.assertIn(self._addresses[1], address_index)
+        self.assertNotIn(self._addresses[2], address_index)
+        self.assertEqual(len(address_index), 2)
+
+    def test_add(self):
+        address_index = LitecoinAddressIndex()
+
+        address_index.add(self._addresses[0])
+        address_index.add(self._addresses[0])
+
+        self.assertIn(self._addresses[0], address_index)
+        self.assertEqual(len(address_index), 1)
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        address_index = LitecoinAddressIndex(self._addresses, bloom_filter_capacity=len(self._addresses))
+
+        for address in self._addresses:
+            self.assertIn(address, address_index)
+
+    def test_bloom_filter_false_positive_rate(self):
+        address_index = LitecoinAddressIndex(
+            self._addresses, bloom_filter_capacity=len(self._addresses), false_positive_rate=0.01)
+
+        false_positives = sum(1 for i in range(0, 10000) if ('other' + str(i)) in address_index)
+
+        self.assertLess(false_positives, 300)
+
+    def test_scripts(self):
+        network = LitecoinNetwork.by_name('testnet')
+        key_hash = bytes(range(0, 20))
+        address_index = LitecoinAddressIndex(
+            [
+                'n4UtgQSUHQUTDgiDkEmgYJvFqNBrcmQYc2',
+                base58check_encode(network.script_address_prefix, key_hash),
+                base58check_encode(network.legacy_script_address_prefix, key_hash),
+                bech32_encode(network.bech32_hrp, 0, key_hash)
+            ],
+            network=network)
+
+        self.assertEqual(
+            address_index.scripts, {
+                bytes.fromhex('76a914fbe70b337c1d2c233b46575fbf75ae9bd10c889688ac'), b'\xa9\x14' + key_hash + b'\x87',
+                b'\x00\x14' + key_hash
+            })
+
+    def test_scripts_are_unknown_for_invalid_address(self):
+        address_index = LitecoinAddressIndex(
+            ['n4UtgQSUHQUTDgiDkEmgYJvFqNBrcmQYc2'], network=LitecoinNetwork.by_name('mainnet'))
+
+        self.assertIsNone(address_index.scripts)
+        self.assertIn('n4UtgQSUHQUTDgiDkEmgYJvFqNBrcmQYc2', address_index)
+
+    def test_scripts_are_not_kept_without_network(self):
+        self.assertIsNone(LitecoinAddressIndex(['n4UtgQSUHQUTDgiDkEmgYJvFqNBrcmQYc2']).scripts)
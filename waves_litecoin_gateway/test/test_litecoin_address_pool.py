@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import MagicMock
+
+import gevent
+
+from waves_litecoin_gateway.lib import LitecoinAddressPool
+
+
+class LitecoinAddressPoolTest(unittest.TestCase):
+    def setUp(self):
+        self._ltc_proxy = MagicMock()
+        self._ltc_proxy.batch_.side_effect = lambda calls: ['address' + str(self._next_address()) for _ in calls]
+        self._created_addresses = 0
+        self._collection = MagicMock()
+        self._collection.find.return_value = list()
+        self._collection.delete_one.return_value.deleted_count = 1
+
+    def _next_address(self) -> int:
+        self._created_addresses += 1
+        return self._created_addresses
+
+    def test_refill(self):
+        address_pool = LitecoinAddressPool(self._ltc_proxy, self._collection, high_watermark=5, refill_batch_size=2)
+
+        address_pool.refill()
+
+        self.assertEqual(len(address_pool), 5)
+        self.assertEqual(self._ltc_proxy.batch_.call_count, 3)
+        self._ltc_proxy.batch_.assert_called_with([['getnewaddress']])
+        self._collection.insert_many.assert_any_call([{'address': 'address1'}, {'address': 'address2'}])
+        self.assertEqual(self._collection.insert_many.call_count, 3)
+
+    def test_load_persisted_addresses(self):
+        self._collection.find.return_value = [{'address': 'address1'}, {'address': 'address2'}]
+        address_pool = LitecoinAddressPool(self._ltc_proxy, self._collection, high_watermark=2)
+
+        self.assertEqual(len(address_pool), 2)
+        self.assertEqual(address_pool.take(), 'address1')
+        self._collection.delete_one.assert_called_once_with({'address': 'address1'})
+        self._ltc_proxy.batch_.assert_not_called()
+
+    def test_take_from_empty_pool(self):
+        address_pool = LitecoinAddressPool(self._ltc_proxy, self._collection, high_watermark=2)
+
+        self.assertIsNone(address_pool.take())
+
+        gevent.sleep(0)
+
+        self.assertEqual(len(address_pool), 2)
+
+    def test_take_skips_addresses_taken_by_another_instance(self):
+        self._collection.find.return_value = [{'address': 'address1'}, {'address': 'address2'}]
+        self._collection.delete_one.side_effect = [MagicMock(deleted_count=0), MagicMock(deleted_count=1)]
+        address_pool = LitecoinAddressPool(self._ltc_proxy, self._collection, high_watermark=2, low_watermark=0)
+
+        self.assertEqual(address_pool.take(), 'address2')
+        self.assertEqual(len(address_pool), 0)
+
+    def test_take_refills_below_low_watermark(self):
+        self._collection.find.return_value = [{'address': 'persisted' + str(i)} for i in range(0, 4)]
+        address_pool = LitecoinAddressPool(self._ltc_proxy, self._collection, high_watermark=4, low_watermark=3)
+
+        self.assertEqual(address_pool.take(), 'persisted0')
+        self._ltc_proxy.batch_.assert_not_called()
+
+        self.assertEqual(address_pool.take(), 'persisted1')
+
+        gevent.sleep(0)
+
+        self.assertEqual(len(address_pool), 4)
+        self._ltc_proxy.batch_.assert_called_once_with([['getnewaddress'], ['getnewaddress']])
+
+    def test_failed_refill_is_retried(self):
+        self._ltc_proxy.batch_.side_effect = [IOError('connection refused'), ['address1', 'address2']]
+        address_pool = LitecoinAddressPool(self._ltc_proxy, self._collection, high_watermark=2)
+
+        address_pool.start_refill()
+        gevent.sleep(0)
+
+        self.assertEqual(len(address_pool), 0)
+
+        address_pool.start_refill()
+        gevent.sleep(0)
+
+        self.assertEqual(len(address_pool), 2)
@@ -0,0 +1,119 @@
+import unittest
+from unittest.mock import MagicMock
+
+from waves_litecoin_gateway.lib import LitecoinAddressValidationService, LitecoinNetwork
+from waves_litecoin_gateway.lib.litecoin_address_encoding import base58check_encode, bech32_encode
+
+
+class LitecoinAddressValidationServiceTest(unittest.TestCase):
+    def setUp(self):
+        self._ltc_proxy = MagicMock()
+        self._ltc_proxy.validateaddress.return_value = {'isvalid': True}
+        self._mainnet = LitecoinNetwork.by_name('mainnet')
+        self._validation_service = LitecoinAddressValidationService(self._ltc_proxy, network=self._mainnet)
+        self._hash160 = bytes(range(0, 20))
+
+    def test_validate_address_by_node(self):
+        validation_service = LitecoinAddressValidationService(self._ltc_proxy)
+
+        self.assertTrue(validation_service.validate_address('LVg2kJoFNg45Nbpy53h7Fe1wKyeXVRhMH9'))
+        self._ltc_proxy.validateaddress.assert_called_once_with('LVg2kJoFNg45Nbpy53h7Fe1wKyeXVRhMH9')
+
+    def test_validate_base58check_addresses(self):
+        for prefix in [48, 50, 5]:
+            address = base58check_encode(prefix, self._hash160)
+
+            self.assertTrue(self._validation_service.validate_address(address), address)
+
+        self._ltc_proxy.validateaddress.assert_not_called()
+
+    def test_validate_invalid_base58check_addresses(self):
+        address = base58check_encode(48, self._hash160)
+        tampered = address[:-1] + ('1' if address[-1] != '1' else '2')
+
+        self.assertFalse(self._validation_service.validate_address(tampered))
+        self.assertFalse(self._validation_service.validate_address(base58check_encode(111, self._hash160)))
+        self.assertFalse(self._validation_service.validate_address(base58check_encode(48, self._hash160[:19])))
+        self.assertFalse(self._validation_service.validate_address(''))
+        self._ltc_proxy.validateaddress.assert_not_called()
+
+    def test_validate_mweb_addresses_by_node(self):
+        mweb_address = 'ltcmweb1qq0hqdmdxvt7pgmnqqgz3nyqf9mz9yayz3ymdwnkx2cltmclngjx2fq0l2dv5s6t2emtlhn7gqu3ptw42yz6n' \
+            'xn5y7g2g2ycvqyq5xdv9snnv0tq'
+
+        self.assertTrue(self._validation_service.validate_address(mweb_address))
+        self._ltc_proxy.validateaddress.assert_called_once_with(mweb_address)
+
+    def test_validate_other_address_forms_without_node(self):
+        addresses = [
+            '0', 'hello world', "'; drop", 'LOl0',
+            base58check_encode(48, self._hash160) + '0',
+            bech32_encode('bc', 0, self._hash160),
+            bech32_encode('tltc', 0, self._hash160), 'tmweb1qq', 'ltcmweb'
+        ]
+
+        for address in addresses:
+            self.assertFalse(self._validation_service.validate_address(address), address)
+
+        self._ltc_proxy.validateaddress.assert_not_called()
+
+    def test_validate_segwit_addresses(self):
+        addresses = [
+            bech32_encode('ltc', 0, self._hash160),
+            bech32_encode('ltc', 0, bytes(32)),
+            bech32_encode('ltc', 1, bytes(32)),
+            bech32_encode('ltc', 0, self._hash160).upper()
+        ]
+
+        for address in addresses:
+            self.assertTrue(self._validation_service.validate_address(address), address)
+
+    def test_validate_invalid_segwit_addresses(self):
+        v0_address = bech32_encode('ltc', 0, self._hash160)
+        tampered = v0_address[:-1] + ('q' if v0_address[-1] != 'q' else 'p')
+        mixed_case = v0_address[:5].upper() + v0_address[5:]
+
+        addresses = [
+            tampered, mixed_case,
+            bech32_encode('tltc', 0, self._hash160),
+            bech32_encode('ltc', 0, bytes(25)),
+            bech32_encode('ltc', 1, bytes(1)), 'ltc1', 'ltc1qbbbbbbb'
+        ]
+
+        for address in addresses:
+            self.assertFalse(self._validation_service.validate_address(address), address)
+
+    def test_validate_testnet_addresses(self):
+        validation_service = LitecoinAddressValidationService(
+            self._ltc_proxy, network=LitecoinNetwork.by_name('testnet'))
+
+        self.assertTrue(validation_service.validate_address(base58check_encode(111, self._hash160)))
+        self.assertTrue(validation_service.validate_address(base58check_encode(58, self._hash160)))
+        self.assertTrue(validation_service.validate_address(bech32_encode('tltc', 0, self._hash160)))
+        self.assertFalse(validation_service.validate_address(base58check_encode(48, self._hash160)))
+        self.assertFalse(validation_service.validate_address(bech32_encode('ltc', 0, self._hash160)))
+
+    def test_validate_address_strictly(self):
+        validation_service = LitecoinAddressValidationService(self._ltc_proxy, network=self._mainnet, strict=True)
+        address = base58check_encode(48, self._hash160)
+        self._ltc_proxy.validateaddress.return_value = {'isvalid': False}
+
+        self.assertFalse(validation_service.validate_address(address))
+        self.assertFalse(validation_service.validate_address(base58check_encode(111, self._hash160)))
+        self._ltc_proxy.validateaddress.assert_called_once_with(address)
+
+    def test_validate_address_uses_cache(self):
+        validation_service = LitecoinAddressValidationService(self._ltc_proxy, cache_size=2)
+
+        validation_service.validate_address('address1')
+        validation_service.validate_address('address2')
+        validation_service.validate_address('address1')
+        validation_service.validate_address('address3')
+
+        self.assertEqual(self._ltc_proxy.validateaddress.call_count, 3)
+
+        # address2 was the least recently used address
+        validation_service.validate_address('address1')
+        validation_service.validate_address('address2')
+
+        self.assertEqual(self._ltc_proxy.validateaddress.call_count, 4)
@@ -0,0 +1,74 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import gevent
+from waves_gateway import TransactionAttempt, TransactionAttemptReceiver
+
+from waves_litecoin_gateway.lib import LitecoinBatchingTransactionService
+
+
+class LitecoinBatchingTransactionServiceTest(unittest.TestCase):
+    def setUp(self):
+        self._transaction_service = MagicMock()
+        self._attempts = [
+            TransactionAttempt(
+                sender="gateway",
+                receivers=[TransactionAttemptReceiver(address="receiver" + str(i), amount=Decimal(i + 1))],
+                fee=Decimal("0.0" + str(i + 1)),
+                currency="coin") for i in range(0, 3)
+        ]
+
+    def _send_concurrently(self, batching_transaction_service: LitecoinBatchingTransactionService,
+                           attempts: list) -> list:
+        tasks = [gevent.spawn(batching_transaction_service.send_coin, attempt, None) for attempt in attempts]
+        gevent.joinall(tasks, raise_error=True)
+        return [task.value for task in tasks]
+
+    def test_send_coin_full_batch(self):
+        batching_transaction_service = LitecoinBatchingTransactionService(
+            self._transaction_service, max_batch_size=3, batch_window_s=60)
+        mock_transaction = MagicMock()
+        self._transaction_service.send_coin.return_value = mock_transaction
+
+        results = self._send_concurrently(batching_transaction_service, self._attempts)
+
+        self.assertEqual(results, [mock_transaction] * 3)
+        self.assertEqual(self._transaction_service.send_coin.call_count, 1)
+        merged_attempt, secret = self._transaction_service.send_coin.call_args[0]
+        self.assertEqual(merged_attempt.sender, "gateway")
+        self.assertEqual(merged_attempt.fee, Decimal("0.03"))
+        self.assertEqual(merged_attempt.receivers, [attempt.receivers[0] for attempt in self._attempts])
+        self.assertIsNone(secret)
+
+    def test_send_coin_after_window(self):
+        batching_transaction_service = LitecoinBatchingTransactionService(
+            self._transaction_service, max_batch_size=10, batch_window_s=0.01)
+        mock_transaction = MagicMock()
+        self._transaction_service.send_coin.return_value = mock_transaction
+
+        results = self._send_concurrently(batching_transaction_service, self._attempts[0:2])
+
+        self.assertEqual(results, [mock_transaction] * 2)
+        self.assertEqual(self._transaction_service.send_coin.call_count, 1)
+
+    def test_send_coin_separates_senders(self):
+        batching_transaction_service = LitecoinBatchingTransactionService(
+            self._transaction_service, max_batch_size=10, batch_window_s=0.01)
+        other_attempt = TransactionAttempt(
+            sender="other", receivers=self._attempts[0].receivers, fee=Decimal("0.01"), currency="coin")
+
+        self._send_concurrently(batching_transaction_service, [self._attempts[0], other_attempt])
+
+        self.assertEqual(self._transaction_service.send_coin.call_count, 2)
+
+    def test_send_coin_failure(self):
+        batching_transaction_service = LitecoinBatchingTransactionService(
+            self._transaction_service, max_batch_size=2, batch_window_s=60)
+        self._transaction_service.send_coin.side_effect = Exception('insufficient funds')
+        tasks = [gevent.spawn(batching_transaction_service.send_coin, attempt, None) for attempt in self._attempts[0:2]]
+
+        gevent.joinall(tasks)
+
+        for task in tasks:
+            self.assertIsInstance(task.exception, Exception)
@@ -0,0 +1,45 @@
+import unittest
+
+from waves_litecoin_gateway.lib import LitecoinBlockCache
+
+
+class LitecoinBlockCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._block_cache = LitecoinBlockCache(max_blocks=3)
+        self._transactions = [{'txid': 'ab' * 32, 'vout': []}]
+
+    def test_get(self):
+        self._block_cache.put(10, 'hash10', self._transactions)
+
+        self.assertEqual(self._block_cache.get(10, 'hash10'), self._transactions)
+        self.assertIsNone(self._block_cache.get(11, 'hash11'))
+        self.assertEqual(self._block_cache.hits, 1)
+        self.assertEqual(self._block_cache.misses, 1)
+
+    def test_get_replaced_block(self):
+        for height in range(10, 13):
+            self._block_cache.put(height, 'hash' + str(height), self._transactions)
+
+        self.assertIsNone(self._block_cache.get(11, 'other11'))
+        self.assertEqual(self._block_cache.invalidations, 2)
+        self.assertEqual(len(self._block_cache), 1)
+        self.assertIsNone(self._block_cache.get(12, 'hash12'))
+        self.assertEqual(self._block_cache.get(10, 'hash10'), self._transactions)
+
+    def test_put_evicts_lowest_blocks(self):
+        for height in range(10, 14):
+            self._block_cache.put(height, 'hash' + str(height), self._transactions)
+
+        self.assertEqual(len(self._block_cache), 3)
+        self.assertIsNone(self._block_cache.get(10, 'hash10'))
+        self.assertEqual(self._block_cache.get(13, 'hash13'), self._transactions)
+        self.assertEqual(self._block_cache.invalidations, 0)
+
+    def test_put_replaced_block(self):
+        self._block_cache.put(10, 'hash10', self._transactions)
+        self._block_cache.put(11, 'hash11', self._transactions)
+        self._block_cache.put(10, 'other10', list())
+
+        self.assertEqual(self._block_cache.get(10, 'other10'), list())
+        self.assertIsNone(self._block_cache.get(11, 'hash11'))
+        self.assertEqual(self._block_cache.invalidations, 2)
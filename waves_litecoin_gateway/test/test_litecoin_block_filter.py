@@ -0,0 +1,81 @@
+import hashlib
+import unittest
+
+from waves_litecoin_gateway.lib import LitecoinBlockFilter
+from waves_litecoin_gateway.lib.litecoin_block_filter import siphash24
+
+
+class LitecoinBlockFilterTest(unittest.TestCase):
+    def setUp(self):
+        # the genesis block of the Bitcoin testnet and its basic filter, the first test vector of BIP158
+        self._genesis_hash = '000000000933ea01ad0ee984209779baaec3ced90fa3f408719526f8d77f4943'
+        self._genesis_script = bytes.fromhex(
+            '4104678afdb0fe5548271967f1a67130b7105cd6a828e03909a67962e0ea1f61deb649f6bc3f4cef38c4f35504e51ec112de5c3'
+            '84df7ba0b8d578a4c702b6bf11d5fac')
+        self._genesis_filter = '019dfca8'
+        self._block_hash = 'ab' * 32
+        self._scripts = [
+            b'\x76\xa9\x14' + hashlib.sha256(i.to_bytes(2, 'little')).digest()[:20] + b'\x88\xac'
+            for i in range(0, 1000)
+        ]
+
+    def test_siphash24(self):
+        # the test vectors of the SipHash reference implementation
+        k0 = int.from_bytes(bytes(range(0, 8)), 'little')
+        k1 = int.from_bytes(bytes(range(8, 16)), 'little')
+
+        self.assertEqual(siphash24(k0, k1, b''), 0x726fdb47dd0e0e31)
+        self.assertEqual(siphash24(k0, k1, bytes(range(0, 15))), 0xa129ca6149be45e5)
+        self.assertEqual(siphash24(k0, k1, bytes(range(0, 63))), 0x958a324ceb064572)
+
+    def test_create(self):
+        self.assertEqual(LitecoinBlockFilter.create(self._genesis_hash, [self._genesis_script]), self._genesis_filter)
+
+    def test_match_any(self):
+        block_filter = LitecoinBlockFilter(self._genesis_hash, self._genesis_filter)
+
+        self.assertEqual(len(block_filter), 1)
+        self.assertTrue(block_filter.match_any([self._scripts[0], self._genesis_script]))
+        self.assertFalse(block_filter.match_any(self._scripts[0:10]))
+
+    def test_match_any_has_no_false_negatives(self):
+        block_filter = LitecoinBlockFilter(self._block_hash,
+                                           LitecoinBlockFilter.create(self._block_hash, self._scripts[0:500]))
+
+        self.assertEqual(len(block_filter), 500)
+
+        for script in self._scripts[0:500]:
+            self.assertTrue(block_filter.match_any([script]))
+
+        self.assertTrue(block_filter.match_any(self._scripts[500:1000] + [self._scripts[250]]))
+
+    def test_match_any_false_positive_rate(self):
+        block_filter = LitecoinBlockFilter(self._block_hash,
+                                           LitecoinBlockFilter.create(self._block_hash, self._scripts[0:500]))
+
+        false_positives = sum(1 for script in self._scripts[500:1000] if block_filter.match_any([script]))
+
+        self.assertLess(false_positives, 3)
+
+    def test_match_any_depends_on_block_hash(self):
+        block_filter = LitecoinBlockFilter('cd' * 32, LitecoinBlockFilter.create(self._block_hash, self._scripts[0:1]))
+
+        self.assertFalse(block_filter.match_any(self._scripts[0:1]))
+
+    def test_match_any_empty(self):
+        self.assertFalse(LitecoinBlockFilter(self._block_hash, '00').match_any(self._scripts))
+        self.assertFalse(LitecoinBlockFilter(self._genesis_hash, self._genesis_filter).match_any([]))
+
+    def test_create_ignores_duplicate_and_empty_scripts(self):
+        self.assertEqual(
+            LitecoinBlockFilter.create(self._genesis_hash, [self._genesis_script, b'', self._genesis_script]),
+            self._genesis_filter)
+
+    def test_truncated_filter(self):
+        block_filter = LitecoinBlockFilter(self._block_hash, '05ff')
+
+        with self.assertRaises(ValueError):
+            block_filter.match_any(self._scripts[0:1])
+
+        with self.assertRaises(ValueError):
+            LitecoinBlockFilter(self._block_hash, 'fd01')
@@ -1,10 +1,17 @@
 import unittest
+import weakref
 from decimal import Decimal
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch, call
 
-from waves_gateway import Transaction, TransactionReceiver
+import gevent
 
-from waves_litecoin_gateway.lib import LitecoinChainQueryService
+from bitcoinrpc.authproxy import JSONRPCException
+from waves_gateway import Transaction, TransactionReceiver, TransactionSender
+
+from waves_litecoin_gateway.lib import LitecoinChainQueryService, LitecoinTransactionCache, \
+    LitecoinTransactionDecoder, LitecoinAddressIndex, LitecoinBlockCache, LitecoinDecodingPool, LitecoinBlockFilter, \
+    LitecoinNetwork
+from waves_litecoin_gateway.lib.litecoin_address_encoding import address_to_script
 
 
 class LitecoinChainQueryServiceTest(unittest.TestCase):
@@ -126,6 +133,548 @@ class LitecoinChainQueryServiceTest(unittest.TestCase):
         self._ltc_proxy.getblock.assert_called_once_with(block['hash'])
         self._ltc_proxy.getblockhash.assert_called_once_with(height)
 
+    def _create_batch_fixture(self):
+        funding_tx = {
+            'txid':
+            'a1' * 32,
+            'vout': [{
+                'value': Decimal('1.5'),
+                'n': 0,
+                'scriptPubKey': {
+                    'addresses': ['n4UtgQSUHQUTDgiDkEmgYJvFqNBrcmQYc2']
+                }
+            }, {
+                'value': Decimal('0.5'),
+                'n': 1,
+                'scriptPubKey': {
+                    'addresses': ['QWShbV2woggL1X1DHSHc5Aamv7NsZKuKFn']
+                }
+            }]
+        }
+
+        coinbase_tx = {
+            'txid':
+            'c0' * 32,
+            'vin': [{
+                'coinbase': '03a0bb0d'
+            }],
+            'vout': [{
+                'value': Decimal('25'),
+                'n': 0,
+                'scriptPubKey': {
+                    'addresses': ['QYe3T35wXfYTNqgYw6DmaLrQ9ARUUfLTX2']
+                }
+            }]
+        }
+
+        spending_tx = {
+            'txid':
+            'b2' * 32,
+            'vin': [{
+                'txid': funding_tx['txid'],
+                'vout': 0
+            }, {
+                'txid': funding_tx['txid'],
+                'vout': 1
+            }, {
+                'txid': coinbase_tx['txid'],
+                'vout': 0
+            }],
+            'vout': [{
+                'value': Decimal('26.9'),
+                'n': 0,
+                'scriptPubKey': {
+                    'addresses': ['mzWnYA5kQxiBJu9zWsnpEVtp3Kz2BfSeJU']
+                }
+            }]
+        }
+
+        expected_transactions = [
+            Transaction(
+                tx=coinbase_tx['txid'],
+                receivers=[TransactionReceiver('QYe3T35wXfYTNqgYw6DmaLrQ9ARUUfLTX2', Decimal('25'))],
+                senders=[]),
+            Transaction(
+                tx=spending_tx['txid'],
+                receivers=[TransactionReceiver('mzWnYA5kQxiBJu9zWsnpEVtp3Kz2BfSeJU', Decimal('26.9'))],
+                senders=[
+                    TransactionSender('n4UtgQSUHQUTDgiDkEmgYJvFqNBrcmQYc2'),
+                    TransactionSender('QWShbV2woggL1X1DHSHc5Aamv7NsZKuKFn'),
+                    TransactionSender('QYe3T35wXfYTNqgYw6DmaLrQ9ARUUfLTX2')
+                ])
+        ]
+
+        return funding_tx, coinbase_tx, spending_tx, expected_transactions
+
+    def test_get_transactions_of_block_at_height_batched_verbose_block(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, batch_size=10)
+        block_hash = 'ab' * 32
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.return_value = {'hash': block_hash, 'tx': [coinbase_tx, spending_tx]}
+
+        def batch(calls):
+            if calls == [['getrawtransaction', funding_tx['txid']]]:
+                return ['raw_funding_tx']
+            elif calls == [['decoderawtransaction', 'raw_funding_tx']]:
+                return [funding_tx]
+            else:
+                raise KeyError('called with unknown batch')
+
+        self._ltc_proxy.batch_.side_effect = batch
+
+        transactions = chain_query_service.get_transactions_of_block_at_height(MagicMock())
+
+        self.assertEqual(transactions, expected_transactions)
+        self.assertEqual(transactions[0].senders, expected_transactions[0].senders)
+        self.assertEqual(transactions[1].senders, expected_transactions[1].senders)
+        self._ltc_proxy.getblock.assert_called_once_with(block_hash, 2)
+        self.assertEqual(self._ltc_proxy.batch_.call_count, 2)
+        self._ltc_proxy.getrawtransaction.assert_not_called()
+        self._ltc_proxy.decoderawtransaction.assert_not_called()
+
+    def test_get_transactions_of_block_at_height_batched_without_verbose_block(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, batch_size=1)
+        block_hash = 'ab' * 32
+        decoded_transactions = {
+            'raw_funding_tx': funding_tx,
+            'raw_coinbase_tx': coinbase_tx,
+            'raw_spending_tx': spending_tx
+        }
+        raw_transactions = {
+            funding_tx['txid']: 'raw_funding_tx',
+            coinbase_tx['txid']: 'raw_coinbase_tx',
+            spending_tx['txid']: 'raw_spending_tx'
+        }
+
+        def getblock(requested_block_hash, *args):
+            if len(args) > 0:
+                raise JSONRPCException({'code': -1, 'message': 'JSON value is not a boolean as expected'})
+            return {'hash': requested_block_hash, 'tx': [coinbase_tx['txid'], spending_tx['txid']]}
+
+        def batch(calls):
+            self.assertEqual(len(calls), 1)
+            method, param = calls[0]
+
+            if method == 'getrawtransaction':
+                return [raw_transactions[param]]
+            elif method == 'decoderawtransaction':
+                return [decoded_transactions[param]]
+            else:
+                raise KeyError('called with unknown method')
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.side_effect = getblock
+        self._ltc_proxy.batch_.side_effect = batch
+
+        transactions = chain_query_service.get_transactions_of_block_at_height(MagicMock())
+
+        self.assertEqual(transactions, expected_transactions)
+        self.assertEqual(transactions[1].senders, expected_transactions[1].senders)
+        self.assertEqual(self._ltc_proxy.batch_.call_count, 6)
+
+        chain_query_service.get_transactions_of_block_at_height(MagicMock())
+
+        self._ltc_proxy.getblock.assert_called_with(block_hash)
+        self.assertEqual(self._ltc_proxy.getblock.call_count, 3)
+
+    def test_get_transactions_of_block_at_height_keeps_verbosity_on_other_errors(self):
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, batch_size=100)
+        block_hash = 'ab' * 32
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.side_effect = JSONRPCException({
+            'code':
+            -342,
+            'message':
+            "non-JSON HTTP response with '503 Service Unavailable' from server"
+        })
+
+        with self.assertRaises(JSONRPCException):
+            chain_query_service.get_transactions_of_block_at_height(MagicMock())
+
+        self._ltc_proxy.getblock.side_effect = None
+        self._ltc_proxy.getblock.return_value = {'hash': block_hash, 'tx': []}
+
+        chain_query_service.get_transactions_of_block_at_height(MagicMock())
+
+        self._ltc_proxy.getblock.assert_called_with(block_hash, 2)
+
+    def test_iter_transactions_of_block_at_height_batched_resolves_chunks(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, batch_size=1)
+        block_hash = 'ab' * 32
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.return_value = {'hash': block_hash, 'tx': [coinbase_tx, spending_tx]}
+        self._ltc_proxy.batch_.side_effect = lambda calls: ['raw_funding_tx'] if calls[0][0] == 'getrawtransaction' \
+            else [funding_tx]
+
+        transactions = chain_query_service.iter_transactions_of_block_at_height(MagicMock())
+
+        self.assertEqual(next(transactions), expected_transactions[0])
+        self._ltc_proxy.batch_.assert_not_called()
+        self.assertEqual(chain_query_service.resolved_transactions, 1)
+        self.assertEqual(chain_query_service.scanned_blocks, 0)
+
+        self.assertEqual(next(transactions).senders, expected_transactions[1].senders)
+        self.assertEqual(self._ltc_proxy.batch_.call_count, 2)
+
+        self.assertEqual(list(transactions), [])
+        self.assertEqual(chain_query_service.scanned_blocks, 1)
+
+    def test_iter_transactions_of_block_at_height_batched_releases_block(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        address_index = LitecoinAddressIndex(['mzWnYA5kQxiBJu9zWsnpEVtp3Kz2BfSeJU'])
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, batch_size=10, address_index=address_index)
+        block_hash = 'ab' * 32
+        block_transactions = list()
+
+        class BlockTransaction(dict):
+            pass
+
+        def getblock(requested_block_hash, verbosity):
+            transactions = [BlockTransaction(coinbase_tx), BlockTransaction(spending_tx)]
+            block_transactions.extend(weakref.ref(transaction) for transaction in transactions)
+            return {'hash': requested_block_hash, 'tx': transactions}
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.side_effect = getblock
+        self._ltc_proxy.batch_.side_effect = lambda calls: ['raw_funding_tx'] if calls[0][0] == 'getrawtransaction' \
+            else [funding_tx]
+
+        transactions = chain_query_service.iter_transactions_of_block_at_height(MagicMock())
+        transaction = next(transactions)
+
+        self.assertEqual(transaction.senders, expected_transactions[1].senders)
+        self.assertEqual([block_transaction() for block_transaction in block_transactions], [None, None])
+        self.assertEqual(list(transactions), [])
+
+    def test_iter_transactions_of_block_at_height_limits_concurrency(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, max_concurrency=1)
+        decoded_transactions = {
+            funding_tx['txid']: funding_tx,
+            coinbase_tx['txid']: coinbase_tx,
+            spending_tx['txid']: spending_tx
+        }
+        in_flight = [0]
+        max_in_flight = [0]
+
+        def getrawtransaction(tx):
+            in_flight[0] += 1
+            max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+            gevent.sleep(0.001)
+            in_flight[0] -= 1
+            return tx
+
+        self._ltc_proxy.getblockhash.return_value = 'ab' * 32
+        self._ltc_proxy.getblock.return_value = {'hash': 'ab' * 32, 'tx': [coinbase_tx['txid'], spending_tx['txid']]}
+        self._ltc_proxy.getrawtransaction.side_effect = getrawtransaction
+        self._ltc_proxy.decoderawtransaction.side_effect = lambda tx: decoded_transactions[tx]
+
+        transactions = list(chain_query_service.iter_transactions_of_block_at_height(MagicMock()))
+
+        self.assertEqual(transactions, expected_transactions)
+        self.assertEqual(max_in_flight[0], 1)
+
+    def test_get_transaction_resolves_senders_from_cache(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        transaction_cache = LitecoinTransactionCache(max_size=1024 * 1024)
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, transaction_cache=transaction_cache)
+        decoded_transactions = {
+            'raw_funding_tx': funding_tx,
+            'raw_coinbase_tx': coinbase_tx,
+            'raw_spending_tx': spending_tx
+        }
+
+        self._ltc_proxy.getrawtransaction.side_effect = lambda tx: {
+            funding_tx['txid']: 'raw_funding_tx',
+            coinbase_tx['txid']: 'raw_coinbase_tx',
+            spending_tx['txid']: 'raw_spending_tx'
+        }[tx]
+        self._ltc_proxy.decoderawtransaction.side_effect = lambda raw: decoded_transactions[raw]
+
+        transaction = chain_query_service.get_transaction(spending_tx['txid'])
+
+        self.assertEqual(transaction, expected_transactions[1])
+        self.assertEqual(transaction.senders, expected_transactions[1].senders)
+        self.assertEqual(self._ltc_proxy.getrawtransaction.call_count, 3)
+        self.assertEqual(self._ltc_proxy.decoderawtransaction.call_count, 3)
+        self.assertEqual(transaction_cache.hits, 1)
+
+        transaction = chain_query_service.get_transaction_by_tx(spending_tx['txid'])
+
+        self.assertEqual(transaction.senders, expected_transactions[1].senders)
+        self.assertEqual(self._ltc_proxy.getrawtransaction.call_count, 3)
+        self.assertEqual(self._ltc_proxy.decoderawtransaction.call_count, 3)
+        self.assertEqual(transaction_cache.hits, 5)
+
+    def test_get_transactions_of_block_at_height_batched_uses_cache(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        transaction_cache = LitecoinTransactionCache(max_size=1024 * 1024)
+        transaction_cache.put_transaction(funding_tx['txid'], funding_tx)
+        chain_query_service = LitecoinChainQueryService(
+            self._ltc_proxy, batch_size=10, transaction_cache=transaction_cache)
+        block_hash = 'ab' * 32
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.return_value = {'hash': block_hash, 'tx': [coinbase_tx, spending_tx]}
+
+        transactions = chain_query_service.get_transactions_of_block_at_height(MagicMock())
+
+        self.assertEqual(transactions, expected_transactions)
+        self.assertEqual(transactions[1].senders, expected_transactions[1].senders)
+        self._ltc_proxy.batch_.assert_not_called()
+        self.assertEqual(transaction_cache.get_transaction(spending_tx['txid']), spending_tx)
+
+    def test_get_transaction_decodes_locally(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        transaction_decoder = MagicMock(spec=LitecoinTransactionDecoder)
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, transaction_decoder=transaction_decoder)
+        decoded_transactions = {
+            'raw_funding_tx': funding_tx,
+            'raw_coinbase_tx': coinbase_tx,
+            'raw_spending_tx': spending_tx
+        }
+
+        self._ltc_proxy.getrawtransaction.side_effect = lambda tx: {
+            funding_tx['txid']: 'raw_funding_tx',
+            coinbase_tx['txid']: 'raw_coinbase_tx',
+            spending_tx['txid']: 'raw_spending_tx'
+        }[tx]
+        transaction_decoder.decode.side_effect = lambda raw: decoded_transactions[raw]
+
+        transaction = chain_query_service.get_transaction(spending_tx['txid'])
+
+        self.assertEqual(transaction, expected_transactions[1])
+        self.assertEqual(transaction.senders, expected_transactions[1].senders)
+        self._ltc_proxy.decoderawtransaction.assert_not_called()
+        transaction_decoder.decode.assert_any_call('raw_spending_tx')
+
+    def test_get_transactions_of_block_at_height_batched_decodes_locally(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        transaction_decoder = MagicMock(spec=LitecoinTransactionDecoder)
+        chain_query_service = LitecoinChainQueryService(
+            self._ltc_proxy, batch_size=10, transaction_decoder=transaction_decoder)
+        block_hash = 'ab' * 32
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.return_value = {'hash': block_hash, 'tx': [coinbase_tx, spending_tx]}
+        self._ltc_proxy.batch_.return_value = ['raw_funding_tx']
+        transaction_decoder.decode.return_value = funding_tx
+
+        transactions = chain_query_service.get_transactions_of_block_at_height(MagicMock())
+
+        self.assertEqual(transactions, expected_transactions)
+        self.assertEqual(transactions[1].senders, expected_transactions[1].senders)
+        self._ltc_proxy.batch_.assert_called_once_with([['getrawtransaction', funding_tx['txid']]])
+        transaction_decoder.decode.assert_called_once_with('raw_funding_tx')
+
+    def test_get_transactions_of_block_at_height_batched_skips_irrelevant_transactions(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        address_index = LitecoinAddressIndex(['QYe3T35wXfYTNqgYw6DmaLrQ9ARUUfLTX2'])
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, batch_size=10, address_index=address_index)
+        block_hash = 'ab' * 32
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.return_value = {'hash': block_hash, 'tx': [coinbase_tx, spending_tx]}
+
+        transactions = chain_query_service.get_transactions_of_block_at_height(MagicMock())
+
+        self.assertEqual(transactions, [expected_transactions[0]])
+        self._ltc_proxy.batch_.assert_not_called()
+        self.assertEqual(chain_query_service.scanned_blocks, 1)
+        self.assertEqual(chain_query_service.resolved_transactions, 1)
+
+    def test_get_transactions_of_block_at_height_skips_irrelevant_transactions(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        address_index = LitecoinAddressIndex(['mzWnYA5kQxiBJu9zWsnpEVtp3Kz2BfSeJU'])
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, address_index=address_index)
+        block_hash = 'ab' * 32
+        decoded_transactions = {
+            'raw_funding_tx': funding_tx,
+            'raw_coinbase_tx': coinbase_tx,
+            'raw_spending_tx': spending_tx
+        }
+        raw_transactions = {
+            funding_tx['txid']: 'raw_funding_tx',
+            coinbase_tx['txid']: 'raw_coinbase_tx',
+            spending_tx['txid']: 'raw_spending_tx'
+        }
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.return_value = {'hash': block_hash, 'tx': [coinbase_tx['txid'], spending_tx['txid']]}
+        self._ltc_proxy.getrawtransaction.side_effect = lambda tx: raw_transactions[tx]
+        self._ltc_proxy.decoderawtransaction.side_effect = lambda raw: decoded_transactions[raw]
+
+        transactions = chain_query_service.get_transactions_of_block_at_height(MagicMock())
+
+        self.assertEqual(transactions, [expected_transactions[1]])
+        self.assertEqual(transactions[0].senders, expected_transactions[1].senders)
+
+    def test_get_transactions_of_block_at_height_batched_updates_utxo_set(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        utxo_set = MagicMock()
+        chain_query_service = LitecoinChainQueryService(
+            self._ltc_proxy,
+            batch_size=10,
+            address_index=LitecoinAddressIndex(['QYe3T35wXfYTNqgYw6DmaLrQ9ARUUfLTX2']),
+            utxo_set=utxo_set)
+        block_hash = 'ab' * 32
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.return_value = {'hash': block_hash, 'tx': [coinbase_tx, spending_tx]}
+
+        chain_query_service.get_transactions_of_block_at_height(MagicMock())
+
+        self.assertEqual(utxo_set.apply_transaction.call_count, 2)
+        utxo_set.apply_transaction.assert_any_call(coinbase_tx)
+        utxo_set.apply_transaction.assert_any_call(spending_tx)
+
+    def _create_catch_up_fixture(self, prefetch_window: int) -> LitecoinChainQueryService:
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, batch_size=10, prefetch_window=prefetch_window)
+        self._ltc_proxy.getblockcount.return_value = 100
+        self._ltc_proxy.getblockhash.side_effect = lambda height: 'hash' + str(height)
+        self._ltc_proxy.getblock.side_effect = lambda block_hash, verbosity: {'hash': block_hash, 'tx': []}
+        chain_query_service.get_height_of_highest_block()
+
+        return chain_query_service
+
+    def test_get_transactions_of_block_at_height_prefetches_while_catching_up(self):
+        chain_query_service = self._create_catch_up_fixture(prefetch_window=3)
+
+        self.assertEqual(chain_query_service.get_transactions_of_block_at_height(10), [])
+        gevent.sleep(0)
+
+        self.assertEqual(self._ltc_proxy.getblockhash.call_args_list, [call(10), call(11), call(12), call(13)])
+
+        self.assertEqual(chain_query_service.get_transactions_of_block_at_height(11), [])
+        gevent.sleep(0)
+
+        self.assertEqual(self._ltc_proxy.getblockhash.call_count, 5)
+        self._ltc_proxy.getblockhash.assert_called_with(14)
+        self.assertIsNotNone(chain_query_service.catch_up_rate)
+
+    def test_get_transactions_of_block_at_height_does_not_prefetch_near_highest_block(self):
+        chain_query_service = self._create_catch_up_fixture(prefetch_window=3)
+
+        chain_query_service.get_transactions_of_block_at_height(95)
+        gevent.sleep(0)
+
+        self.assertEqual(self._ltc_proxy.getblockhash.call_args_list, [call(95), call(96), call(97)])
+
+        chain_query_service.get_transactions_of_block_at_height(96)
+        chain_query_service.get_transactions_of_block_at_height(97)
+        chain_query_service.get_transactions_of_block_at_height(98)
+        gevent.sleep(0)
+
+        self.assertEqual(self._ltc_proxy.getblockhash.call_count, 4)
+        self.assertIsNone(chain_query_service.catch_up_rate)
+
+    def test_get_transactions_of_block_at_height_retries_failed_prefetch(self):
+        chain_query_service = self._create_catch_up_fixture(prefetch_window=1)
+        failures = [11]
+
+        def getblockhash(height: int) -> str:
+            if height in failures:
+                failures.remove(height)
+                raise IOError('connection reset')
+
+            return 'hash' + str(height)
+
+        self._ltc_proxy.getblockhash.side_effect = getblockhash
+
+        chain_query_service.get_transactions_of_block_at_height(10)
+        gevent.sleep(0)
+
+        with self.assertRaises(IOError):
+            chain_query_service.get_transactions_of_block_at_height(11)
+
+        self.assertEqual(chain_query_service.get_transactions_of_block_at_height(11), [])
+
+    def test_get_transactions_of_block_at_height_uses_block_cache(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        block_cache = LitecoinBlockCache()
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, batch_size=10, block_cache=block_cache)
+        block_hashes = {10: 'ab' * 32}
+
+        self._ltc_proxy.getblockhash.side_effect = lambda height: block_hashes[height]
+        self._ltc_proxy.getblock.side_effect = lambda block_hash, verbosity: {
+            'hash': block_hash, 'tx': [coinbase_tx, spending_tx]}
+        self._ltc_proxy.batch_.side_effect = lambda calls: ['raw_funding_tx'] if calls[0][0] == 'getrawtransaction' \
+            else [funding_tx]
+
+        self.assertEqual(chain_query_service.get_transactions_of_block_at_height(10), expected_transactions)
+        self.assertEqual(chain_query_service.get_transactions_of_block_at_height(10), expected_transactions)
+        self.assertEqual(self._ltc_proxy.getblockhash.call_count, 2)
+        self._ltc_proxy.getblock.assert_called_once_with('ab' * 32, 2)
+
+        block_hashes[10] = 'cd' * 32
+
+        chain_query_service.get_transactions_of_block_at_height(10)
+
+        self._ltc_proxy.getblock.assert_called_with('cd' * 32, 2)
+        self.assertEqual(block_cache.invalidations, 1)
+
+    def test_get_transactions_of_block_at_height_batched_uses_transaction_store(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        transaction_store = MagicMock()
+        transaction_store.get_transactions.return_value = {funding_tx['txid']: funding_tx}
+        chain_query_service = LitecoinChainQueryService(
+            self._ltc_proxy, batch_size=10, transaction_store=transaction_store)
+        block_hash = 'ab' * 32
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.return_value = {'hash': block_hash, 'tx': [coinbase_tx, spending_tx]}
+        self._ltc_proxy.batch_.return_value = list()
+
+        transactions = chain_query_service.get_transactions_of_block_at_height(10)
+
+        self.assertEqual(transactions, expected_transactions)
+        self.assertEqual(transactions[1].senders, expected_transactions[1].senders)
+        transaction_store.get_transactions.assert_called_once_with([funding_tx['txid']])
+        transaction_store.put_transactions.assert_called_once_with([coinbase_tx, spending_tx])
+        self._ltc_proxy.batch_.assert_not_called()
+
+    def test_get_transaction_uses_transaction_store(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        transaction_store = MagicMock()
+        transaction_store.get_transaction.side_effect = lambda tx: funding_tx if tx == funding_tx['txid'] else None
+        transaction_decoder = MagicMock()
+        transaction_decoder.decode.side_effect = lambda raw: {'b2': spending_tx, 'c0': coinbase_tx}[raw]
+        chain_query_service = LitecoinChainQueryService(
+            self._ltc_proxy, transaction_decoder=transaction_decoder, transaction_store=transaction_store)
+
+        self._ltc_proxy.getrawtransaction.side_effect = lambda tx: tx[0:2]
+
+        transaction = chain_query_service.get_transaction(spending_tx['txid'])
+
+        self.assertEqual(transaction.senders, expected_transactions[1].senders)
+        self.assertEqual(self._ltc_proxy.getrawtransaction.call_count, 2)
+        transaction_store.put_transactions.assert_any_call([spending_tx])
+        transaction_store.put_transactions.assert_any_call([coinbase_tx])
+
+    def test_warm_up(self):
+        transaction_cache = LitecoinTransactionCache(max_size=1024 * 1024)
+        transaction_store = MagicMock()
+        chain_query_service = LitecoinChainQueryService(
+            self._ltc_proxy, batch_size=10, transaction_cache=transaction_cache, transaction_store=transaction_store)
+        transactions = {'hash9': [{'txid': 'a9', 'vout': []}], 'hash10': [{'txid': 'a10', 'vout': []}]}
+
+        self._ltc_proxy.getblockcount.return_value = 10
+        self._ltc_proxy.getblockhash.side_effect = lambda height: 'hash' + str(height)
+        self._ltc_proxy.getblock.side_effect = lambda block_hash, verbosity: {
+            'hash': block_hash, 'tx': transactions[block_hash]}
+
+        chain_query_service.warm_up(2)
+
+        self.assertEqual(transaction_cache.get_transaction('a9'), transactions['hash9'][0])
+        self.assertEqual(transaction_cache.get_transaction('a10'), transactions['hash10'][0])
+        self.assertEqual(transaction_store.put_transactions.call_count, 2)
+
     def test_get_amount_of_transaction(self):
         tx = MagicMock()
         expected_result = MagicMock()
@@ -138,6 +687,239 @@ class LitecoinChainQueryServiceTest(unittest.TestCase):
         self._ltc_proxy.gettransaction.assert_called_once_with(tx)
 
     def test_get_height_of_highest_block(self):
-        info = {'blocks': MagicMock()}
-        self._ltc_proxy.getinfo.return_value = info
-        self.assertEqual(self._chain_query_service.get_height_of_highest_block(), info['blocks'])
+        self._ltc_proxy.getblockcount.return_value = 1000
+        self.assertEqual(self._chain_query_service.get_height_of_highest_block(), 1000)
+
+    @patch('time.monotonic')
+    def test_get_height_of_highest_block_after_notification(self, mock_monotonic):
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, notification_timeout_s=60)
+        mock_monotonic.return_value = 100.0
+        self._ltc_proxy.getblockheader.return_value = {'height': 1001}
+        self._ltc_proxy.getblockcount.return_value = 1002
+
+        chain_query_service.notify_block_hash('ab' * 32)
+
+        self.assertEqual(chain_query_service.get_height_of_highest_block(), 1001)
+        self._ltc_proxy.getblockheader.assert_called_once_with('ab' * 32)
+        self._ltc_proxy.getblockcount.assert_not_called()
+
+        mock_monotonic.return_value = 161.0
+
+        self.assertEqual(chain_query_service.get_height_of_highest_block(), 1002)
+
+    def test_notify_raw_transaction(self):
+        transaction_cache = LitecoinTransactionCache(max_size=1024 * 1024)
+        transaction_decoder = MagicMock()
+        transaction = {'txid': 'ab' * 32, 'vout': []}
+        transaction_decoder.decode.return_value = transaction
+        chain_query_service = LitecoinChainQueryService(
+            self._ltc_proxy, transaction_cache=transaction_cache, transaction_decoder=transaction_decoder)
+
+        chain_query_service.notify_raw_transaction(b'raw')
+
+        transaction_decoder.decode.assert_called_once_with(b'raw')
+        self.assertEqual(transaction_cache.get_transaction('ab' * 32), transaction)
+
+    def _create_pending_fixture(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        address_index = LitecoinAddressIndex(['mzWnYA5kQxiBJu9zWsnpEVtp3Kz2BfSeJU'])
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, batch_size=10, address_index=address_index)
+        decoded_transactions = {'raw_funding_tx': funding_tx, 'raw_coinbase_tx': coinbase_tx}
+        raw_transactions = {funding_tx['txid']: 'raw_funding_tx', coinbase_tx['txid']: 'raw_coinbase_tx'}
+
+        self._ltc_proxy.getrawtransaction.side_effect = lambda tx: raw_transactions[tx]
+        self._ltc_proxy.decoderawtransaction.side_effect = lambda raw: decoded_transactions[raw]
+
+        return chain_query_service, coinbase_tx, spending_tx, expected_transactions
+
+    def test_resolve_pending_transaction(self):
+        chain_query_service, coinbase_tx, spending_tx, expected_transactions = self._create_pending_fixture()
+
+        transaction = chain_query_service.resolve_pending_transaction(spending_tx)
+
+        self.assertEqual(transaction, expected_transactions[1])
+        self.assertEqual(transaction.senders, expected_transactions[1].senders)
+        self.assertIsNone(chain_query_service.resolve_pending_transaction(coinbase_tx))
+
+    def test_get_transactions_of_block_at_height_batched_uses_pending_transactions(self):
+        chain_query_service, coinbase_tx, spending_tx, expected_transactions = self._create_pending_fixture()
+        block_hash = 'ab' * 32
+
+        chain_query_service.resolve_pending_transaction(spending_tx)
+        self._ltc_proxy.getrawtransaction.reset_mock()
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.return_value = {'hash': block_hash, 'tx': [coinbase_tx, spending_tx]}
+
+        transactions = chain_query_service.get_transactions_of_block_at_height(MagicMock())
+
+        self.assertEqual(transactions, [expected_transactions[1]])
+        self.assertEqual(transactions[0].senders, expected_transactions[1].senders)
+        self._ltc_proxy.getrawtransaction.assert_not_called()
+        self._ltc_proxy.batch_.assert_not_called()
+        self.assertEqual(chain_query_service.pending_transaction_hits, 1)
+
+    def test_get_transactions_of_block_at_height_batched_decodes_in_decoding_pool(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        decoding_pool = MagicMock(spec=LitecoinDecodingPool)
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, batch_size=10, decoding_pool=decoding_pool)
+        block_hash = 'ab' * 32
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.return_value = 'raw_block'
+        self._ltc_proxy.batch_.return_value = ['raw_funding_tx']
+        decoding_pool.decode_block.return_value = [coinbase_tx, spending_tx]
+        decoding_pool.decode_transactions.return_value = [funding_tx]
+
+        transactions = chain_query_service.get_transactions_of_block_at_height(MagicMock())
+
+        self.assertEqual(transactions, expected_transactions)
+        self.assertEqual(transactions[1].senders, expected_transactions[1].senders)
+        self._ltc_proxy.getblock.assert_called_once_with(block_hash, 0)
+        decoding_pool.decode_block.assert_called_once_with('raw_block')
+        decoding_pool.decode_transactions.assert_called_once_with(['raw_funding_tx'])
+
+    def test_get_transactions_of_block_at_height_batched_falls_back_to_verbose_block(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        decoding_pool = MagicMock(spec=LitecoinDecodingPool)
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, batch_size=10, decoding_pool=decoding_pool)
+        block_hash = 'ab' * 32
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.side_effect = ['raw_block', {'hash': block_hash, 'tx': [coinbase_tx, spending_tx]}]
+        self._ltc_proxy.batch_.return_value = ['raw_funding_tx']
+        decoding_pool.decode_block.side_effect = ValueError()
+        decoding_pool.decode_transactions.return_value = [funding_tx]
+
+        transactions = chain_query_service.get_transactions_of_block_at_height(MagicMock())
+
+        self.assertEqual(transactions, expected_transactions)
+        self._ltc_proxy.getblock.assert_called_with(block_hash, 2)
+
+    def test_get_transactions_of_block_at_height_batched_falls_back_if_a_decoding_worker_died(self):
+        funding_tx, coinbase_tx, spending_tx, expected_transactions = self._create_batch_fixture()
+        decoding_pool = MagicMock(spec=LitecoinDecodingPool)
+        chain_query_service = LitecoinChainQueryService(self._ltc_proxy, batch_size=10, decoding_pool=decoding_pool)
+        block_hash = 'ab' * 32
+
+        def batch(calls):
+            if calls == [['getrawtransaction', funding_tx['txid']]]:
+                return ['raw_funding_tx']
+            elif calls == [['decoderawtransaction', 'raw_funding_tx']]:
+                return [funding_tx]
+            else:
+                raise KeyError('called with unknown batch')
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblock.side_effect = ['raw_block', {'hash': block_hash, 'tx': [coinbase_tx, spending_tx]}]
+        self._ltc_proxy.batch_.side_effect = batch
+        decoding_pool.decode_block.side_effect = BrokenPipeError()
+        decoding_pool.decode_transactions.side_effect = EOFError()
+
+        transactions = chain_query_service.get_transactions_of_block_at_height(MagicMock())
+
+        self.assertEqual(transactions, expected_transactions)
+        self.assertEqual(transactions[1].senders, expected_transactions[1].senders)
+        self._ltc_proxy.getblock.assert_called_with(block_hash, 2)
+        decoding_pool.decode_transactions.assert_called_once_with(['raw_funding_tx'])
+
+    def _create_block_filter_fixture(self, filter_addresses: list):
+        network = LitecoinNetwork.by_name('testnet')
+        address_index = LitecoinAddressIndex(['QYe3T35wXfYTNqgYw6DmaLrQ9ARUUfLTX2'], network=network)
+        chain_query_service = LitecoinChainQueryService(
+            self._ltc_proxy, batch_size=10, address_index=address_index, block_filters=True)
+        block_hash = 'ab' * 32
+        coinbase_tx = {
+            'txid':
+            'c0' * 32,
+            'vin': [{
+                'coinbase': '03a0bb0d'
+            }],
+            'vout': [{
+                'value': Decimal('25'),
+                'n': 0,
+                'scriptPubKey': {
+                    'addresses': ['QYe3T35wXfYTNqgYw6DmaLrQ9ARUUfLTX2']
+                }
+            }]
+        }
+
+        self._ltc_proxy.getblockhash.return_value = block_hash
+        self._ltc_proxy.getblockfilter.return_value = {
+            'filter':
+            LitecoinBlockFilter.create(block_hash,
+                                       [address_to_script(address, network) for address in filter_addresses]),
+            'header':
+            '00' * 32
+        }
+        self._ltc_proxy.getblock.return_value = {'hash': block_hash, 'tx': [coinbase_tx]}
+
+        return chain_query_service, block_hash
+
+    def test_get_transactions_of_block_at_height_skips_block_not_matching_filter(self):
+        chain_query_service, block_hash = self._create_block_filter_fixture(['n4UtgQSUHQUTDgiDkEmgYJvFqNBrcmQYc2'])
+
+        self.assertEqual(chain_query_service.get_transactions_of_block_at_height(5), [])
+
+        self._ltc_proxy.getblockfilter.assert_called_once_with(block_hash, 'basic')
+        self._ltc_proxy.getblock.assert_not_called()
+        self.assertEqual(chain_query_service.block_filter_skipped_blocks, 1)
+        self.assertEqual(chain_query_service.block_filter_matched_blocks, 0)
+        self.assertEqual(chain_query_service.block_filter_false_positive_rate, 0.0)
+
+    def test_get_transactions_of_block_at_height_fetches_block_matching_filter(self):
+        chain_query_service, block_hash = self._create_block_filter_fixture(['QYe3T35wXfYTNqgYw6DmaLrQ9ARUUfLTX2'])
+
+        transactions = chain_query_service.get_transactions_of_block_at_height(5)
+
+        self.assertEqual(transactions, [
+            Transaction(
+                tx='c0' * 32,
+                receivers=[TransactionReceiver(address='QYe3T35wXfYTNqgYw6DmaLrQ9ARUUfLTX2', amount=Decimal('25'))])
+        ])
+        self._ltc_proxy.getblock.assert_called_once_with(block_hash, 2)
+        self.assertEqual(chain_query_service.block_filter_skipped_blocks, 0)
+        self.assertEqual(chain_query_service.block_filter_matched_blocks, 1)
+        self.assertEqual(chain_query_service.block_filter_false_positives, 0)
+        self.assertIsNone(chain_query_service.block_filter_false_positive_rate)
+
+    def test_get_transactions_of_block_at_height_matches_filter_without_blocking_other_greenlets(self):
+        chain_query_service, block_hash = self._create_block_filter_fixture(['n4UtgQSUHQUTDgiDkEmgYJvFqNBrcmQYc2'])
+        other_greenlet = gevent.spawn(lambda: None)
+
+        self.assertEqual(chain_query_service.get_transactions_of_block_at_height(5), [])
+
+        self.assertTrue(other_greenlet.dead)
+
+    def test_get_transactions_of_block_at_height_counts_filter_false_positives(self):
+        chain_query_service, block_hash = self._create_block_filter_fixture(['QYe3T35wXfYTNqgYw6DmaLrQ9ARUUfLTX2'])
+        self._ltc_proxy.getblock.return_value = {'hash': block_hash, 'tx': []}
+
+        self.assertEqual(chain_query_service.get_transactions_of_block_at_height(5), [])
+
+        self.assertEqual(chain_query_service.block_filter_matched_blocks, 1)
+        self.assertEqual(chain_query_service.block_filter_false_positives, 1)
+        self.assertEqual(chain_query_service.block_filter_false_positive_rate, 1.0)
+
+    def test_get_transactions_of_block_at_height_fetches_block_without_filter(self):
+        chain_query_service, block_hash = self._create_block_filter_fixture([])
+        self._ltc_proxy.getblockfilter.side_effect = JSONRPCException({
+            'code':
+            -1,
+            'message':
+            'Index is not enabled for filtertype basic'
+        })
+
+        self.assertEqual(len(chain_query_service.get_transactions_of_block_at_height(5)), 1)
+
+        self._ltc_proxy.getblock.assert_called_once_with(block_hash, 2)
+        self.assertEqual(chain_query_service.block_filter_skipped_blocks, 0)
+        self.assertEqual(chain_query_service.block_filter_matched_blocks, 0)
+
+    def test_get_transactions_of_block_at_height_ignores_filter_for_unknown_script(self):
+        chain_query_service, block_hash = self._create_block_filter_fixture([])
+        chain_query_service._address_index.add('unknown')
+
+        self.assertEqual(len(chain_query_service.get_transactions_of_block_at_height(5)), 1)
+        self.assertEqual(len(chain_query_service.get_transactions_of_block_at_height(6)), 1)
+
+        self._ltc_proxy.getblockfilter.assert_not_called()
@@ -0,0 +1,72 @@
+import unittest
+
+from waves_litecoin_gateway.lib import LitecoinDecodingPool, LitecoinNetwork, LitecoinTransactionDecoder
+from .test_litecoin_transaction_decoder import _serialize, _varint
+
+
+class LitecoinDecodingPoolTest(unittest.TestCase):
+    PREV_TXID = '345fe8a6c9cfc992f5fa8982ec39f0a4f64a2b99f88a00fdbe6556dd784bfa53'
+    PUBKEY_HASH_SCRIPT = bytes.fromhex('76a914fbe34b8f8a3a8ad0b7e4b1c8e2b3c3d4a5b6c7d888ac')
+
+    @classmethod
+    def setUpClass(cls):
+        cls._network = LitecoinNetwork.by_name('testnet')
+        cls._decoding_pool = LitecoinDecodingPool(2, cls._network)
+        cls._decoding_pool.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._decoding_pool.stop()
+
+    def _serialize_transactions(self, count: int) -> list:
+        return [
+            _serialize(
+                vins=[(self.PREV_TXID, n, bytes(range(0, 106)), 0xffffffff)],
+                vouts=[(1000 * (n + 1), self.PUBKEY_HASH_SCRIPT), (0, b'\x6a\x04test')]) for n in range(0, count)
+        ]
+
+    def test_decode_transactions(self):
+        raw_transactions = self._serialize_transactions(5)
+        decoder = LitecoinTransactionDecoder(self._network)
+
+        transactions = self._decoding_pool.decode_transactions([raw.hex() for raw in raw_transactions])
+
+        self.assertEqual(len(transactions), 5)
+
+        for transaction, raw_transaction in zip(transactions, raw_transactions):
+            expected_transaction = decoder.decode(raw_transaction)
+            self.assertEqual(transaction['txid'], expected_transaction['txid'])
+            self.assertEqual(transaction['vin'], [{
+                'txid': self.PREV_TXID,
+                'vout': expected_transaction['vin'][0]['vout']
+            }])
+            self.assertEqual(
+                transaction['vout'][0], {
+                    'value': expected_transaction['vout'][0]['value'],
+                    'n': 0,
+                    'scriptPubKey': {
+                        'hex': self.PUBKEY_HASH_SCRIPT.hex(),
+                        'addresses': expected_transaction['vout'][0]['scriptPubKey']['addresses']
+                    }
+                })
+            self.assertEqual(transaction['vout'][1], {
+                'value': expected_transaction['vout'][1]['value'],
+                'n': 1,
+                'scriptPubKey': {
+                    'hex': '6a0474657374'
+                }
+            })
+
+    def test_decode_block(self):
+        raw_transactions = self._serialize_transactions(3)
+        raw_block = bytes(80) + _varint(3) + b''.join(raw_transactions)
+
+        transactions = self._decoding_pool.decode_block(raw_block.hex())
+
+        self.assertEqual(transactions, self._decoding_pool.decode_transactions(raw_transactions))
+
+    def test_decode_invalid_transaction(self):
+        with self.assertRaises(ValueError):
+            self._decoding_pool.decode_transactions(['00'])
+
+        self.assertEqual(len(self._decoding_pool.decode_transactions(self._serialize_transactions(1))), 1)
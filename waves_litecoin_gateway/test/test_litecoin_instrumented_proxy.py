@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import MagicMock
+
+from bitcoinrpc.authproxy import JSONRPCException
+
+from waves_litecoin_gateway.lib import LitecoinInstrumentedProxy, LitecoinMetrics
+
+
+class LitecoinInstrumentedProxyTest(unittest.TestCase):
+    def setUp(self):
+        self._ltc_proxy = MagicMock()
+        self._metrics = LitecoinMetrics()
+        self._instrumented_proxy = LitecoinInstrumentedProxy(self._ltc_proxy, self._metrics)
+
+    def test_call(self):
+        self._ltc_proxy.getblockhash.return_value = 'hash'
+
+        self.assertEqual(self._instrumented_proxy.getblockhash(10), 'hash')
+
+        self._ltc_proxy.getblockhash.assert_called_once_with(10)
+        rendered = self._metrics.render()
+        self.assertIn('litecoin_rpc_calls_total{method="getblockhash"} 1\n', rendered)
+        self.assertIn('litecoin_rpc_in_flight{method="getblockhash"} 0\n', rendered)
+        self.assertIn('litecoin_rpc_duration_seconds_count{method="getblockhash"} 1\n', rendered)
+        self.assertNotIn('litecoin_rpc_errors_total{', rendered)
+
+    def test_call_error(self):
+        self._ltc_proxy.getrawtransaction.side_effect = JSONRPCException({'code': -5, 'message': 'not found'})
+
+        with self.assertRaises(JSONRPCException):
+            self._instrumented_proxy.getrawtransaction('tx')
+
+        rendered = self._metrics.render()
+        self.assertIn('litecoin_rpc_errors_total{method="getrawtransaction"} 1\n', rendered)
+        self.assertIn('litecoin_rpc_in_flight{method="getrawtransaction"} 0\n', rendered)
+
+    def test_batch(self):
+        self._ltc_proxy.batch_.return_value = ['raw1', 'raw2']
+
+        self.assertEqual(
+            self._instrumented_proxy.batch_([['getrawtransaction', 'tx1'], ['getrawtransaction', 'tx2']]),
+            ['raw1', 'raw2'])
+
+        rendered = self._metrics.render()
+        self.assertIn('litecoin_rpc_calls_total{method="getrawtransaction"} 2\n', rendered)
+        self.assertIn('litecoin_rpc_duration_seconds_count{method="batch"} 1\n', rendered)
+        self.assertNotIn('litecoin_rpc_calls_total{method="batch"}', rendered)
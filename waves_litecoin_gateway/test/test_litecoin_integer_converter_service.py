@@ -1,31 +1,62 @@
 import unittest
 from decimal import Decimal
-from unittest.mock import MagicMock, patch
+
+import waves_gateway as gw
 
 from waves_litecoin_gateway.lib import LitecoinIntegerConverterService
 
 
 class LitecoinIntegerConverterServiceTest(unittest.TestCase):
     def setUp(self):
-        self._ltc_factor = pow(10, 2)
-        self._ltc_round_precision = 2
+        self._ltc_factor = pow(10, 8)
+        self._ltc_round_precision = 8
         self._integer_converter_service = LitecoinIntegerConverterService(
             ltc_factor=self._ltc_factor, ltc_round_precision=self._ltc_round_precision)
 
-    @patch('waves_gateway.convert_to_int', autospec=True)
-    def test_convert_amount_to_int(self, mock_convert_to_int: MagicMock):
-        mock_result = 23
-        mock_arg = Decimal("0.23")
-        mock_convert_to_int.return_value = mock_result
-        actual_result = self._integer_converter_service.convert_amount_to_int(mock_arg)
-        self.assertEqual(actual_result, mock_result)
-        mock_convert_to_int.assert_called_once_with(mock_arg, self._ltc_factor)
-
-    @patch('waves_gateway.convert_to_decimal')
-    def test_revert_amount_conversion(self, mock_convert_to_decimal: MagicMock):
-        mock_arg = 23
-        mock_result = Decimal("0.23")
-        mock_convert_to_decimal.return_value = mock_result
-        actual_result = self._integer_converter_service.revert_amount_conversion(mock_arg)
-        self.assertEqual(actual_result, mock_result)
-        mock_convert_to_decimal.assert_called_once_with(mock_arg, self._ltc_factor, self._ltc_round_precision)
+    def test_convert_amount_to_int(self):
+        self.assertEqual(self._integer_converter_service.convert_amount_to_int(Decimal("0.23")), 23000000)
+        self.assertEqual(
+            self._integer_converter_service.convert_amount_to_int(Decimal("20999999.99999999")), 2099999999999999)
+        self.assertEqual(self._integer_converter_service.convert_amount_to_int(0.1), 10000000)
+        self.assertEqual(self._integer_converter_service.convert_amount_to_int(2), 200000000)
+
+    def test_convert_amount_to_int_matches_framework(self):
+        for amount in [Decimal("0.000000005"), Decimal("0.000000015"), Decimal("1.23456789"), 0.3, 1.005]:
+            self.assertEqual(
+                self._integer_converter_service.convert_amount_to_int(amount),
+                gw.convert_to_int(amount, self._ltc_factor), amount)
+
+    def test_revert_amount_conversion(self):
+        result = self._integer_converter_service.revert_amount_conversion(23000000)
+
+        self.assertEqual(result, Decimal("0.23"))
+        self.assertEqual(str(result), "0.23000000")
+
+    def test_revert_amount_conversion_is_exact(self):
+        # the conversion of the framework is rounded through a float and returns 72222096.50546943
+        self.assertEqual(
+            self._integer_converter_service.revert_amount_conversion(7222209650546942), Decimal("72222096.50546942"))
+
+    def test_bulk_conversion(self):
+        amounts = [Decimal("0.1"), Decimal("2"), Decimal("0.00000001")]
+
+        converted = self._integer_converter_service.convert_amounts_to_int(amounts)
+
+        self.assertEqual(converted, [10000000, 200000000, 1])
+        self.assertEqual(self._integer_converter_service.revert_amount_conversions(converted), amounts)
+
+    def test_convert_transactions_to_int(self):
+        senders = [gw.TransactionSender("sender")]
+        transaction = gw.Transaction(
+            tx="tx",
+            receivers=[gw.TransactionReceiver("a", Decimal("0.5")),
+                       gw.TransactionReceiver("b", Decimal("1"))],
+            senders=senders)
+
+        converted = self._integer_converter_service.convert_transactions_to_int([transaction])
+
+        self.assertEqual(converted, [
+            gw.Transaction("tx", [gw.TransactionReceiver("a", 50000000),
+                                  gw.TransactionReceiver("b", 100000000)], senders)
+        ])
+        self.assertEqual(transaction.receivers[0].amount, Decimal("0.5"))
@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import MagicMock, call
+
+import gevent
+import gevent.event
+
+from bitcoinrpc.authproxy import JSONRPCException
+
+from waves_litecoin_gateway.lib import LitecoinChainQueryService, LitecoinMempoolWatcher, LitecoinTransactionDecoder
+
+
+class LitecoinMempoolWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self._ltc_proxy = MagicMock()
+        self._chain_query_service = MagicMock(spec=LitecoinChainQueryService)
+        self._mempool_watcher = LitecoinMempoolWatcher(self._ltc_proxy, self._chain_query_service, batch_size=2)
+
+    def test_poll_resolves_new_transactions(self):
+        transactions = {'raw_' + tx: {'txid': tx} for tx in ['a1', 'b2', 'c3']}
+
+        def batch(calls):
+            if calls[0][0] == 'getrawtransaction':
+                return ['raw_' + tx for _, tx in calls]
+
+            return [transactions[raw_transaction] for _, raw_transaction in calls]
+
+        self._ltc_proxy.getrawmempool.return_value = ['a1', 'b2']
+        self._ltc_proxy.batch_.side_effect = batch
+
+        self.assertEqual(self._mempool_watcher.poll(), 2)
+
+        self._ltc_proxy.getrawmempool.return_value = ['b2', 'c3']
+
+        self.assertEqual(self._mempool_watcher.poll(), 1)
+        self._ltc_proxy.batch_.assert_called_with([['decoderawtransaction', 'raw_c3']])
+        self.assertEqual(self._chain_query_service.resolve_pending_transaction.call_args_list,
+                         [call({
+                             'txid': 'a1'
+                         }), call({
+                             'txid': 'b2'
+                         }), call({
+                             'txid': 'c3'
+                         })])
+
+    def test_poll_fetches_failed_transactions_again(self):
+        self._ltc_proxy.getrawmempool.return_value = ['a1']
+        self._ltc_proxy.batch_.side_effect = JSONRPCException({'code': -5, 'message': 'No such mempool transaction'})
+
+        self.assertEqual(self._mempool_watcher.poll(), 1)
+
+        self._chain_query_service.resolve_pending_transaction.assert_not_called()
+
+        self._ltc_proxy.batch_.side_effect = [['raw_a1'], [{'txid': 'a1'}]]
+
+        self.assertEqual(self._mempool_watcher.poll(), 1)
+        self._chain_query_service.resolve_pending_transaction.assert_called_once_with({'txid': 'a1'})
+
+    def test_notify_raw_transaction_decodes_locally(self):
+        transaction_decoder = MagicMock(spec=LitecoinTransactionDecoder)
+        transaction_decoder.decode.return_value = {'txid': 'a1'}
+        mempool_watcher = LitecoinMempoolWatcher(
+            self._ltc_proxy, self._chain_query_service, transaction_decoder=transaction_decoder)
+        self._chain_query_service.resolve_pending_transaction.side_effect = Exception()
+
+        mempool_watcher.notify_raw_transaction(b'raw')
+        gevent.sleep()
+
+        transaction_decoder.decode.assert_called_once_with(b'raw')
+        self._chain_query_service.resolve_pending_transaction.assert_called_once_with({'txid': 'a1'})
+        self._ltc_proxy.decoderawtransaction.assert_not_called()
+
+    def test_notify_raw_transaction_returns_immediately(self):
+        resolved = gevent.event.Event()
+        self._chain_query_service.resolve_pending_transaction.side_effect = lambda transaction: resolved.wait()
+        self._ltc_proxy.decoderawtransaction.side_effect = lambda raw: {'txid': raw}
+        mempool_watcher = LitecoinMempoolWatcher(self._ltc_proxy, self._chain_query_service, max_concurrency=2)
+
+        for raw_transaction in [b'\xa1', b'\xb2', b'\xc3']:
+            mempool_watcher.notify_raw_transaction(raw_transaction)
+
+        gevent.sleep()
+
+        self.assertEqual(self._chain_query_service.resolve_pending_transaction.call_args_list,
+                         [call({
+                             'txid': 'a1'
+                         }), call({
+                             'txid': 'b2'
+                         })])
+        self.assertEqual(mempool_watcher.dropped_notifications, 1)
+
+        resolved.set()
+        gevent.idle()
+        mempool_watcher.notify_raw_transaction(b'\xd4')
+        gevent.sleep()
+
+        self._chain_query_service.resolve_pending_transaction.assert_called_with({'txid': 'd4'})
+        mempool_watcher.stop()
+
+    def test_notify_raw_transaction_ignores_decoding_errors(self):
+        self._ltc_proxy.decoderawtransaction.side_effect = JSONRPCException({
+            'code': -22,
+            'message': 'TX decode failed'
+        })
+
+        self._mempool_watcher.notify_raw_transaction(b'raw')
+        gevent.sleep()
+
+        self._chain_query_service.resolve_pending_transaction.assert_not_called()
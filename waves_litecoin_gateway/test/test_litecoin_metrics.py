@@ -0,0 +1,90 @@
+import unittest
+import urllib.request
+
+from waves_litecoin_gateway.lib import LitecoinMetrics
+
+
+class LitecoinMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self._metrics = LitecoinMetrics()
+
+    def test_render_counter(self):
+        counter = self._metrics.counter('calls_total', 'Calls', ['method'])
+        counter.labels('getblock').inc()
+        counter.labels('getblock').inc(2)
+        counter.labels('say "hi"\n').inc()
+
+        self.assertEqual(self._metrics.render(), '# HELP calls_total Calls\n'
+                         '# TYPE calls_total counter\n'
+                         'calls_total{method="getblock"} 3\n'
+                         'calls_total{method="say \\"hi\\"\\n"} 1\n')
+
+    def test_render_gauge(self):
+        gauge = self._metrics.gauge('in_flight', 'Requests in flight')
+        gauge.labels().inc()
+        gauge.labels().inc()
+        gauge.labels().dec()
+
+        self.assertEqual(self._metrics.render(), '# HELP in_flight Requests in flight\n'
+                         '# TYPE in_flight gauge\n'
+                         'in_flight 1\n')
+
+    def test_render_histogram(self):
+        histogram = self._metrics.histogram('duration_seconds', 'Durations', buckets=[1.0, 0.1])
+        histogram.labels().observe(0.05)
+        histogram.labels().observe(0.1)
+        histogram.labels().observe(0.5)
+        histogram.labels().observe(5.0)
+
+        self.assertEqual(self._metrics.render(), '# HELP duration_seconds Durations\n'
+                         '# TYPE duration_seconds histogram\n'
+                         'duration_seconds_bucket{le="0.1"} 2\n'
+                         'duration_seconds_bucket{le="1.0"} 3\n'
+                         'duration_seconds_bucket{le="+Inf"} 4\n'
+                         'duration_seconds_sum 5.65\n'
+                         'duration_seconds_count 4\n')
+
+    def test_render_functions(self):
+        values = {'hits': 5, 'rate': None}
+        self._metrics.counter_function('hits_total', 'Hits', lambda: values['hits'])
+        self._metrics.gauge_function('rate', 'Rate', lambda: values['rate'])
+
+        self.assertEqual(self._metrics.render(), '# HELP hits_total Hits\n'
+                         '# TYPE hits_total counter\n'
+                         'hits_total 5\n'
+                         '# HELP rate Rate\n'
+                         '# TYPE rate gauge\n')
+
+        values['rate'] = 2.5
+
+        self.assertIn('rate 2.5\n', self._metrics.render())
+
+    def test_labels_mismatch(self):
+        counter = self._metrics.counter('calls_total', 'Calls', ['method'])
+
+        with self.assertRaises(ValueError):
+            counter.labels()
+
+    def test_register_duplicate(self):
+        self._metrics.counter('calls_total', 'Calls')
+
+        with self.assertRaises(ValueError):
+            self._metrics.gauge('calls_total', 'Calls')
+
+    def test_server(self):
+        self._metrics.counter('calls_total', 'Calls').labels().inc()
+        self._metrics.start_server('127.0.0.1', 0)
+
+        try:
+            url = 'http://127.0.0.1:%d' % self._metrics.server_port
+
+            with urllib.request.urlopen(url + '/metrics') as response:
+                self.assertEqual(response.headers['Content-Type'], LitecoinMetrics.CONTENT_TYPE)
+                self.assertIn(b'calls_total 1\n', response.read())
+
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(url + '/other')
+        finally:
+            self._metrics.stop_server()
+
+        self.assertIsNone(self._metrics.server_port)
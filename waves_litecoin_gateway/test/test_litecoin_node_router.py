@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from bitcoinrpc.authproxy import JSONRPCException
+
+from waves_litecoin_gateway.lib import LitecoinNodeRouter
+
+
+class LitecoinNodeRouterTest(unittest.TestCase):
+    def setUp(self):
+        self._wallet_proxy = MagicMock()
+        self._read_proxies = [MagicMock(), MagicMock()]
+        self._router = LitecoinNodeRouter(self._wallet_proxy, self._read_proxies, max_failures=2, ejection_s=0)
+
+    def test_wallet_calls_use_wallet_node(self):
+        self._wallet_proxy.listunspent.return_value = []
+
+        self.assertEqual(self._router.listunspent(None, None, ['address']), [])
+
+        self._wallet_proxy.listunspent.assert_called_once_with(None, None, ['address'])
+        for read_proxy in self._read_proxies:
+            read_proxy.listunspent.assert_not_called()
+
+    def test_read_calls_use_read_node(self):
+        self._read_proxies[0].getblockhash.return_value = 'hash'
+
+        self.assertEqual(self._router.getblockhash(10), 'hash')
+
+        self._read_proxies[0].getblockhash.assert_called_once_with(10)
+        self._wallet_proxy.getblockhash.assert_not_called()
+
+    def test_read_calls_prefer_faster_node(self):
+        self._router._read_nodes[0].latency = 0.2
+        self._router._read_nodes[1].latency = 0.1
+
+        self._router.getblockcount()
+
+        self._read_proxies[1].getblockcount.assert_called_once_with()
+        self._read_proxies[0].getblockcount.assert_not_called()
+
+    def test_read_batch_uses_read_node(self):
+        rpc_calls = [['getrawtransaction', 'tx1'], ['getrawtransaction', 'tx2']]
+        self._read_proxies[0].batch_.side_effect = lambda calls: [call.pop(0) for call in calls]
+
+        self.assertEqual(self._router.batch_(rpc_calls), ['getrawtransaction', 'getrawtransaction'])
+        self.assertEqual(rpc_calls, [['getrawtransaction', 'tx1'], ['getrawtransaction', 'tx2']])
+
+    def test_mixed_batch_uses_wallet_node(self):
+        self._router.batch_([['getnewaddress'], ['getblockcount']])
+
+        self._wallet_proxy.batch_.assert_called_once_with([['getnewaddress'], ['getblockcount']])
+
+    def test_json_rpc_error_is_repeated_on_wallet_node(self):
+        self._read_proxies[0].getrawtransaction.side_effect = JSONRPCException({'code': -5, 'message': 'not found'})
+        self._wallet_proxy.getrawtransaction.return_value = 'raw'
+
+        self.assertEqual(self._router.getrawtransaction('tx'), 'raw')
+
+        self._read_proxies[1].getrawtransaction.assert_not_called()
+        self.assertEqual(self._router.healthy_read_nodes, 2)
+
+    @patch('gevent.spawn', autospec=True)
+    def test_failed_node_is_ejected(self, mock_spawn: MagicMock):
+        self._read_proxies[0].getblockcount.side_effect = ConnectionError()
+        self._read_proxies[1].getblockcount.return_value = 10
+
+        self.assertEqual(self._router.getblockcount(), 10)
+        self.assertEqual(self._router.healthy_read_nodes, 2)
+
+        self._router._read_nodes[1].latency = 1.0
+        self.assertEqual(self._router.getblockcount(), 10)
+
+        self.assertEqual(self._router.healthy_read_nodes, 1)
+        mock_spawn.assert_called_once_with(self._router._probe, self._router._read_nodes[0])
+
+        self._read_proxies[0].getblockcount.side_effect = None
+        self._read_proxies[0].getblockcount.return_value = 11
+        self._router._probe(self._router._read_nodes[0])
+
+        self.assertEqual(self._router.healthy_read_nodes, 2)
+        self.assertEqual(self._router.getblockcount(), 11)
+
+    @patch('gevent.spawn', autospec=True)
+    def test_wallet_node_answers_reads_without_healthy_read_nodes(self, mock_spawn: MagicMock):
+        for read_proxy in self._read_proxies:
+            read_proxy.getblockcount.side_effect = ConnectionError()
+
+        self._wallet_proxy.getblockcount.return_value = 10
+
+        self.assertEqual(self._router.getblockcount(), 10)
+        self.assertEqual(self._router.getblockcount(), 10)
+        self.assertEqual(self._router.healthy_read_nodes, 0)
+
+        self.assertEqual(self._router.getblockcount(), 10)
+        self.assertEqual(self._read_proxies[0].getblockcount.call_count, 2)
@@ -0,0 +1,144 @@
+import logging
+import unittest
+
+from waves_litecoin_gateway.lib import LitecoinQueueLogHandler
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self, level: int = logging.NOTSET) -> None:
+        super().__init__(level)
+        self.records = list()
+        self.flushes = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+
+class LitecoinQueueLogHandlerTest(unittest.TestCase):
+    def setUp(self):
+        self._target = _ListHandler(logging.INFO)
+        self._target.setFormatter(logging.Formatter('%(levelname)s {%(name)s} - %(message)s'))
+        self._handler = LitecoinQueueLogHandler([self._target], capacity=10, batch_size=4)
+        self._logger = logging.getLogger('LitecoinQueueLogHandlerTest')
+        self._logger.setLevel(logging.DEBUG)
+        self._logger.propagate = False
+        self._logger.addHandler(self._handler)
+        self._rpc_logger = logging.getLogger('LitecoinQueueLogHandlerTest.BitcoinRPC')
+
+    def tearDown(self):
+        self._logger.removeHandler(self._handler)
+        self._handler.close()
+
+    def _messages(self) -> list:
+        return [self._target.format(record) for record in self._target.records]
+
+    def test_level_of_wrapped_handlers(self):
+        self.assertEqual(self._handler.level, logging.INFO)
+
+        self._handler.setLevel(logging.DEBUG)
+
+        self.assertEqual(self._target.level, logging.DEBUG)
+
+    def test_records_are_queued(self):
+        self._logger.info('block %d', 5)
+
+        self.assertEqual(self._handler.queue_depth, 1)
+        self.assertEqual(self._target.records, [])
+
+        self._handler.close()
+
+        self.assertEqual(self._messages(), ['INFO {LitecoinQueueLogHandlerTest} - block 5'])
+        self.assertEqual(self._handler.written, 1)
+
+    def test_arguments_are_merged_into_message(self):
+        block = {'height': 5}
+        self._logger.info('block %s', block)
+        block['height'] = 6
+
+        self._handler.close()
+
+        self.assertEqual(self._messages(), ["INFO {LitecoinQueueLogHandlerTest} - block {'height': 5}"])
+        self.assertIsNone(self._target.records[0].args)
+
+    def test_exception_is_merged_into_message(self):
+        try:
+            raise ValueError('invalid block')
+        except ValueError:
+            self._logger.exception('failed')
+
+        self._handler.close()
+
+        self.assertIsNone(self._target.records[0].exc_info)
+        self.assertIn('ValueError: invalid block', self._messages()[0])
+        self.assertEqual(self._messages()[0].count('ValueError: invalid block'), 1)
+
+    def test_level_of_wrapped_handler_applies(self):
+        warning_target = _ListHandler(logging.WARNING)
+        handler = LitecoinQueueLogHandler([self._target, warning_target])
+        self._logger.addHandler(handler)
+
+        try:
+            self._logger.info('info')
+            self._logger.warning('warning')
+        finally:
+            self._logger.removeHandler(handler)
+            handler.close()
+
+        self.assertEqual(len(self._target.records), 2)
+        self.assertEqual([record.msg for record in warning_target.records], ['warning'])
+
+    def test_records_are_written_in_batches(self):
+        for i in range(0, 10):
+            self._logger.info('record %d', i)
+
+        self._handler.close()
+
+        self.assertEqual(len(self._target.records), 10)
+        self.assertEqual(self._target.flushes, 3)
+
+    def test_records_are_dropped_when_full(self):
+        for i in range(0, 15):
+            self._logger.info('record %d', i)
+
+        self.assertEqual(self._handler.queue_depth, 10)
+        self.assertEqual(self._handler.dropped, 5)
+
+        self._handler.close()
+
+        self.assertEqual(self._messages()[0],
+                         'WARNING {LitecoinQueueLogHandler} - Dropped 5 log records as the queue was full')
+        self.assertEqual(self._messages()[-1], 'INFO {LitecoinQueueLogHandlerTest} - record 9')
+
+    def test_sampled_loggers(self):
+        handler = LitecoinQueueLogHandler(
+            [self._target], sampled_loggers=['LitecoinQueueLogHandlerTest.BitcoinRPC'], sample_interval=10)
+        self._logger.removeHandler(self._handler)
+        self._logger.addHandler(handler)
+
+        try:
+            for i in range(0, 25):
+                self._rpc_logger.info('request %d', i)
+
+            self._rpc_logger.warning('slow request')
+            self._logger.info('block')
+        finally:
+            self._logger.removeHandler(handler)
+            handler.close()
+
+        self.assertEqual(handler.sampled, 22)
+        self.assertEqual([record.msg for record in self._target.records],
+                         ['request 0', 'request 10', 'request 20', 'slow request', 'block'])
+
+    def test_writer_thread(self):
+        self._handler.start()
+
+        for i in range(0, 5):
+            self._logger.info('record %d', i)
+
+        self._handler.close()
+
+        self.assertEqual(len(self._target.records), 5)
+        self.assertEqual(self._handler.queue_depth, 0)
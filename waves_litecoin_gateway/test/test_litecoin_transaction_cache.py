@@ -0,0 +1,75 @@
+import unittest
+from decimal import Decimal
+
+from waves_litecoin_gateway.lib import LitecoinTransactionCache
+
+
+class LitecoinTransactionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._cache = LitecoinTransactionCache(max_size=1024 * 1024)
+
+    def _create_transaction(self, txid: str, addresses: list) -> dict:
+        return {
+            'txid':
+            txid,
+            'vout': [{
+                'value': Decimal('0.1'),
+                'n': n,
+                'scriptPubKey': {
+                    'addresses': [address]
+                }
+            } for n, address in enumerate(addresses)]
+        }
+
+    def test_get_transaction_miss(self):
+        self.assertIsNone(self._cache.get_transaction('a1' * 32))
+        self.assertEqual(self._cache.misses, 1)
+        self.assertEqual(self._cache.hits, 0)
+
+    def test_put_transaction(self):
+        transaction = self._create_transaction('a1' * 32, ['LaddressA', 'LaddressB'])
+
+        self._cache.put_transaction(transaction['txid'], transaction)
+
+        self.assertEqual(self._cache.get_transaction(transaction['txid']), transaction)
+        self.assertEqual(self._cache.get_prevout_addresses(transaction['txid'], 0), ['LaddressA'])
+        self.assertEqual(self._cache.get_prevout_addresses(transaction['txid'], 1), ['LaddressB'])
+        self.assertEqual(self._cache.hits, 3)
+        self.assertEqual(self._cache.misses, 0)
+        self.assertEqual(len(self._cache), 3)
+        self.assertGreater(self._cache.size, 0)
+
+    def test_put_transaction_without_addresses(self):
+        transaction = {'txid': 'a1' * 32, 'vout': [{'value': Decimal('0'), 'n': 0, 'scriptPubKey': {'hex': '6a'}}]}
+
+        self._cache.put_transaction(transaction['txid'], transaction)
+
+        self.assertEqual(self._cache.get_prevout_addresses(transaction['txid'], 0), [])
+
+    def test_evicts_least_recently_used(self):
+        first_transaction = self._create_transaction('a1' * 32, ['LaddressA'])
+        second_transaction = self._create_transaction('b2' * 32, ['LaddressB'])
+        third_transaction = self._create_transaction('c3' * 32, ['LaddressC'])
+
+        self._cache.put_transaction(first_transaction['txid'], first_transaction)
+        self._cache = LitecoinTransactionCache(max_size=int(self._cache.size * 2.5))
+
+        self._cache.put_transaction(first_transaction['txid'], first_transaction)
+        self._cache.put_transaction(second_transaction['txid'], second_transaction)
+        self._cache.get_transaction(first_transaction['txid'])
+        self._cache.put_transaction(third_transaction['txid'], third_transaction)
+
+        self.assertIsNone(self._cache.get_transaction(second_transaction['txid']))
+        self.assertEqual(self._cache.get_transaction(first_transaction['txid']), first_transaction)
+        self.assertEqual(self._cache.get_transaction(third_transaction['txid']), third_transaction)
+        self.assertGreater(self._cache.evictions, 0)
+        self.assertLessEqual(self._cache.size, self._cache.max_size)
+
+    def test_ignores_entries_larger_than_max_size(self):
+        self._cache = LitecoinTransactionCache(max_size=1)
+        transaction = self._create_transaction('a1' * 32, ['LaddressA'])
+
+        self._cache.put_transaction(transaction['txid'], transaction)
+
+        self.assertEqual(len(self._cache), 0)
+        self.assertEqual(self._cache.size, 0)
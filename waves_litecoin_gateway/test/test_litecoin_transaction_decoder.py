@@ -0,0 +1,244 @@
+import hashlib
+import struct
+import unittest
+from decimal import Decimal
+from typing import List, Optional
+
+from waves_litecoin_gateway.lib import LitecoinTransactionDecoder, LitecoinNetwork
+
+
+def _varint(value: int) -> bytes:
+    if value < 0xfd:
+        return bytes([value])
+    return b'\xfd' + struct.pack('<H', value)
+
+
+def _serialize(vins: List[tuple],
+               vouts: List[tuple],
+               witnesses: Optional[List[List[bytes]]] = None,
+               mweb: Optional[bytes] = None,
+               version: int = 2,
+               locktime: int = 0) -> bytes:
+    """Serializes a transaction; vins are (txid, vout, script_sig, sequence), vouts are (satoshis, script)."""
+    flags = (1 if witnesses is not None else 0) | (8 if mweb is not None else 0)
+    result = struct.pack('<i', version)
+
+    if flags != 0:
+        result += b'\x00' + bytes([flags])
+
+    result += _varint(len(vins))
+
+    for txid, vout, script_sig, sequence in vins:
+        result += bytes.fromhex(txid)[::-1] + struct.pack('<I', vout) + _varint(len(script_sig)) + script_sig
+        result += struct.pack('<I', sequence)
+
+    result += _varint(len(vouts))
+
+    for satoshis, script in vouts:
+        result += struct.pack('<q', satoshis) + _varint(len(script)) + script
+
+    if witnesses is not None:
+        for witness in witnesses:
+            result += _varint(len(witness)) + b''.join(_varint(len(item)) + item for item in witness)
+
+    if mweb is not None:
+        result += mweb
+
+    return result + struct.pack('<I', locktime)
+
+
+def _txid(data: bytes) -> str:
+    return hashlib.sha256(hashlib.sha256(data).digest()).digest()[::-1].hex()
+
+
+class LitecoinTransactionDecoderTest(unittest.TestCase):
+    GENESIS_COINBASE = '01000000010000000000000000000000000000000000000000000000000000000000000000ffffffff4d04ffff00' \
+                       '1d0104455468652054696d65732030332f4a616e2f32303039204368616e63656c6c6f72206f6e206272696e6b20' \
+                       '6f66207365636f6e64206261696c6f757420666f722062616e6b73ffffffff0100f2052a010000004341046' \
+                       '78afdb0fe5548271967f1a67130b7105cd6a828e03909a67962e0ea1f61deb649f6bc3f4cef38c4f35504e51ec1' \
+                       '12de5c384df7ba0b8d578a4c702b6bf11d5fac00000000'
+
+    # outputs as recorded from decoderawtransaction of a testnet node, without the asm representation
+    RECORDED_TESTNET_VOUTS = [{
+        'value': Decimal('50.00100000'),
+        'n': 0,
+        'scriptPubKey': {
+            'addresses': ['n4UtgQSUHQUTDgiDkEmgYJvFqNBrcmQYc2'],
+            'hex': '76a914fbe70b337c1d2c233b46575fbf75ae9bd10c889688ac',
+            'type': 'pubkeyhash',
+            'reqSigs': 1
+        }
+    }, {
+        'value': Decimal('2.24400000'),
+        'n': 1,
+        'scriptPubKey': {
+            'addresses': ['QWShbV2woggL1X1DHSHc5Aamv7NsZKuKFn'],
+            'reqSigs': 1,
+            'type': 'scripthash',
+            'hex': 'a9146befba9c6c8f76638dc402a6c6d16ebcdf3e1dc387'
+        }
+    }, {
+        'value': Decimal('0.00100000'),
+        'n': 2,
+        'scriptPubKey': {
+            'addresses': ['QYe3T35wXfYTNqgYw6DmaLrQ9ARUUfLTX2'],
+            'reqSigs': 1,
+            'type': 'scripthash',
+            'hex': 'a91484052132913c64c7a52e5836d70201b419e042f087'
+        }
+    }]
+
+    PREV_TXID = '345fe8a6c9cfc992f5fa8982ec39f0a4f64a2b99f88a00fdbe6556dd784bfa53'
+
+    def setUp(self):
+        self._decoder = LitecoinTransactionDecoder(LitecoinNetwork.by_name('testnet'))
+
+    def test_decode_genesis_coinbase(self):
+        bitcoin_like_network = LitecoinNetwork('bitcoin', 0, 5, 5, 'bc')
+
+        transaction = LitecoinTransactionDecoder(bitcoin_like_network).decode(self.GENESIS_COINBASE)
+
+        self.assertEqual(transaction['txid'], '4a5e1e4baab89f3a32518a88c31bc87f618f76673e2cc77ab2127b7afdeda33b')
+        self.assertEqual(transaction['hash'], transaction['txid'])
+        self.assertEqual(transaction['version'], 1)
+        self.assertEqual(transaction['locktime'], 0)
+        self.assertEqual(transaction['size'], 204)
+        self.assertEqual(transaction['vsize'], 204)
+        self.assertEqual(len(transaction['vin']), 1)
+        self.assertEqual(transaction['vin'][0]['sequence'], 0xffffffff)
+        self.assertTrue(transaction['vin'][0]['coinbase'].startswith('04ffff001d0104455468652054696d6573'))
+        self.assertNotIn('txid', transaction['vin'][0])
+        self.assertEqual(transaction['vout'][0]['value'], Decimal('50'))
+        self.assertEqual(transaction['vout'][0]['scriptPubKey']['type'], 'pubkey')
+        self.assertEqual(transaction['vout'][0]['scriptPubKey']['addresses'], ['1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa'])
+
+    def test_decode_legacy_transaction_matches_recorded_outputs(self):
+        raw_transaction = _serialize(
+            vins=[(self.PREV_TXID, 1, bytes(range(0, 106)), 0xfffffffe)],
+            vouts=[(5000100000, bytes.fromhex(self.RECORDED_TESTNET_VOUTS[0]['scriptPubKey']['hex'])),
+                   (224400000, bytes.fromhex(self.RECORDED_TESTNET_VOUTS[1]['scriptPubKey']['hex'])),
+                   (100000, bytes.fromhex(self.RECORDED_TESTNET_VOUTS[2]['scriptPubKey']['hex']))],
+            version=1,
+            locktime=1234)
+
+        transaction = self._decoder.decode(raw_transaction.hex())
+
+        self.assertEqual(transaction['vout'], self.RECORDED_TESTNET_VOUTS)
+        self.assertEqual(transaction['txid'], _txid(raw_transaction))
+        self.assertEqual(transaction['hash'], transaction['txid'])
+        self.assertEqual(transaction['version'], 1)
+        self.assertEqual(transaction['locktime'], 1234)
+        self.assertEqual(transaction['size'], len(raw_transaction))
+        self.assertEqual(transaction['vin'], [{
+            'txid': self.PREV_TXID,
+            'vout': 1,
+            'scriptSig': {
+                'hex': bytes(range(0, 106)).hex()
+            },
+            'sequence': 0xfffffffe
+        }])
+
+    def test_decode_accepts_bytes(self):
+        raw_transaction = _serialize(vins=[(self.PREV_TXID, 0, b'', 0xffffffff)], vouts=[(1, b'\x51')])
+
+        self.assertEqual(self._decoder.decode(raw_transaction), self._decoder.decode(raw_transaction.hex()))
+        self.assertEqual(self._decoder.decode(memoryview(raw_transaction)), self._decoder.decode(raw_transaction))
+
+    def test_decode_segwit_transaction(self):
+        bitcoin_like_network = LitecoinNetwork('bitcoin', 0, 5, 5, 'bc')
+        witness = [bytes(range(0, 71)), bytes(range(0, 33))]
+        vins = [(self.PREV_TXID, 0, b'', 0xffffffff)]
+        vouts = [(1000, bytes.fromhex('0014751e76e8199196d454941c45d1b3a323f1433bd6'))]
+        raw_transaction = _serialize(vins=vins, vouts=vouts, witnesses=[witness])
+        stripped_transaction = _serialize(vins=vins, vouts=vouts)
+
+        transaction = LitecoinTransactionDecoder(bitcoin_like_network).decode(raw_transaction)
+
+        self.assertEqual(transaction['txid'], _txid(stripped_transaction))
+        self.assertEqual(transaction['hash'], _txid(raw_transaction))
+        self.assertEqual(transaction['size'], len(raw_transaction))
+        self.assertEqual(transaction['weight'], len(stripped_transaction) * 3 + len(raw_transaction))
+        self.assertEqual(transaction['vsize'], (transaction['weight'] + 3) // 4)
+        self.assertEqual(transaction['vin'][0]['txinwitness'], [item.hex() for item in witness])
+        self.assertEqual(transaction['vout'][0]['scriptPubKey']['type'], 'witness_v0_keyhash')
+        self.assertEqual(transaction['vout'][0]['scriptPubKey']['addresses'],
+                         ['bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4'])
+
+    def test_decode_witness_output_types(self):
+        raw_transaction = _serialize(
+            vins=[(self.PREV_TXID, 0, b'', 0xffffffff)],
+            vouts=[(1, b'\x00\x20' + bytes(32)), (2, b'\x51\x20' + bytes(32)), (3, b'\x58\x20' + bytes(32))])
+
+        vouts = LitecoinTransactionDecoder().decode(raw_transaction)['vout']
+
+        self.assertEqual(vouts[0]['scriptPubKey']['type'], 'witness_v0_scripthash')
+        self.assertTrue(vouts[0]['scriptPubKey']['addresses'][0].startswith('ltc1q'))
+        self.assertEqual(vouts[1]['scriptPubKey']['type'], 'witness_v1_taproot')
+        self.assertTrue(vouts[1]['scriptPubKey']['addresses'][0].startswith('ltc1p'))
+        self.assertEqual(vouts[2]['scriptPubKey']['type'], 'witness_mweb_hogaddr')
+        self.assertNotIn('addresses', vouts[2]['scriptPubKey'])
+
+    def test_decode_skips_mweb_data(self):
+        vins = [(self.PREV_TXID, 0, b'', 0xffffffff)]
+        vouts = [(1000, bytes.fromhex(self.RECORDED_TESTNET_VOUTS[0]['scriptPubKey']['hex']))]
+        raw_transaction = _serialize(vins=vins, vouts=vouts, mweb=b'\x01' + bytes(range(0, 200)), locktime=77)
+
+        transaction = self._decoder.decode(raw_transaction)
+
+        self.assertEqual(transaction['txid'], _txid(_serialize(vins=vins, vouts=vouts, locktime=77)))
+        self.assertEqual(transaction['locktime'], 77)
+        self.assertEqual(transaction['vout'][0]['scriptPubKey']['addresses'], ['n4UtgQSUHQUTDgiDkEmgYJvFqNBrcmQYc2'])
+
+    def test_decode_nulldata_and_multisig(self):
+        pubkey = bytes.fromhex(self.GENESIS_COINBASE[-140:-10])
+        multisig = b'\x51\x41' + pubkey + b'\x41' + pubkey + b'\x52\xae'
+        raw_transaction = _serialize(
+            vins=[(self.PREV_TXID, 0, b'', 0xffffffff)], vouts=[(0, b'\x6a\x04test'), (5, multisig), (6, b'\x01')])
+
+        vouts = self._decoder.decode(raw_transaction)['vout']
+
+        self.assertEqual(vouts[0]['scriptPubKey']['type'], 'nulldata')
+        self.assertNotIn('addresses', vouts[0]['scriptPubKey'])
+        self.assertEqual(vouts[1]['scriptPubKey']['type'], 'multisig')
+        self.assertEqual(vouts[1]['scriptPubKey']['reqSigs'], 1)
+        self.assertEqual(len(vouts[1]['scriptPubKey']['addresses']), 2)
+        self.assertTrue(vouts[1]['scriptPubKey']['addresses'][0].startswith(('m', 'n')))
+        self.assertEqual(vouts[2]['scriptPubKey']['type'], 'nonstandard')
+
+    def test_decode_truncated_transaction(self):
+        with self.assertRaises(ValueError):
+            self._decoder.decode(self.GENESIS_COINBASE[:-10])
+
+    def test_decode_trailing_data(self):
+        with self.assertRaises(ValueError):
+            self._decoder.decode(self.GENESIS_COINBASE + '00')
+
+    def test_decode_unknown_flags(self):
+        raw_transaction = bytearray(
+            _serialize(vins=[(self.PREV_TXID, 0, b'', 0xffffffff)], vouts=[(1, b'\x51')], witnesses=[[]]))
+        raw_transaction[5] = 0x02
+
+        with self.assertRaises(ValueError):
+            self._decoder.decode(bytes(raw_transaction))
+
+    def test_decode_block(self):
+        legacy_transaction = _serialize(vins=[(self.PREV_TXID, 0, b'', 0xffffffff)], vouts=[(1, b'\x51')])
+        segwit_transaction = _serialize(
+            vins=[(self.PREV_TXID, 1, b'', 0xffffffff)], vouts=[(2, b'\x51')], witnesses=[[bytes(range(0, 71))]])
+        hog_ex_transaction = _serialize(vins=[(self.PREV_TXID, 2, b'', 0xffffffff)], vouts=[(3, b'\x51')], mweb=b'\x00')
+        raw_block = bytes(80) + _varint(3) + legacy_transaction + segwit_transaction + hog_ex_transaction + b'mweb'
+
+        transactions = self._decoder.decode_block(raw_block.hex())
+
+        self.assertEqual(transactions, [
+            self._decoder.decode(legacy_transaction),
+            self._decoder.decode(segwit_transaction),
+            self._decoder.decode(hog_ex_transaction)
+        ])
+
+    def test_decode_block_with_mweb_transaction(self):
+        raw_transaction = _serialize(
+            vins=[(self.PREV_TXID, 0, b'', 0xffffffff)], vouts=[(1, b'\x51')], mweb=b'\x01' + bytes(10))
+
+        with self.assertRaises(ValueError):
+            self._decoder.decode_block(bytes(80) + _varint(1) + raw_transaction)
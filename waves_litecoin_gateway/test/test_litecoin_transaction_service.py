@@ -3,10 +3,11 @@ from decimal import Decimal
 from typing import cast
 from unittest.mock import MagicMock, patch
 
-from bitcoinrpc.authproxy import AuthServiceProxy
+import gevent
+from bitcoinrpc.authproxy import AuthServiceProxy, JSONRPCException
 from waves_gateway import TransactionAttempt, TransactionAttemptReceiver
 
-from waves_litecoin_gateway.lib import LitecoinTransactionService, LitecoinChainQueryService
+from waves_litecoin_gateway.lib import LitecoinTransactionService, LitecoinChainQueryService, BranchAndBoundCoinSelector
 
 
 class LitecoinTransactionServiceSpec(unittest.TestCase):
@@ -23,14 +24,14 @@ class LitecoinTransactionServiceSpec(unittest.TestCase):
         unspents.append({'amount': Decimal("0.4")})
         unspents.append({'amount': Decimal("0.1")})
 
-        res = self._transaction_service._fast_optimize_unspents(unspents, Decimal("0.6"))
+        res = self._transaction_service._fast_optimize_unspents(unspents, 60000000)
 
         self.assertIsNone(res)
 
     def test_fast_optimize_unspents_empty_unspents(self):
         unspents = list()
 
-        res = self._transaction_service._fast_optimize_unspents(unspents, Decimal("0.6"))
+        res = self._transaction_service._fast_optimize_unspents(unspents, 60000000)
 
         self.assertIsNone(res)
 
@@ -41,7 +42,7 @@ class LitecoinTransactionServiceSpec(unittest.TestCase):
         unspents.append({'amount': Decimal("0.2")})
         unspents.append({'amount': Decimal("0.6")})
 
-        res = self._transaction_service._fast_optimize_unspents(unspents, Decimal("0.6"))
+        res = self._transaction_service._fast_optimize_unspents(unspents, 60000000)
 
         self.assertEqual(res, [unspents[2]])
 
@@ -52,7 +53,7 @@ class LitecoinTransactionServiceSpec(unittest.TestCase):
         unspents.append({'amount': Decimal("0.2")})
         unspents.append({'amount': Decimal("0.6")})
 
-        res = self._transaction_service._fast_optimize_unspents(unspents, Decimal("1.2"))
+        res = self._transaction_service._fast_optimize_unspents(unspents, 120000000)
 
         self.assertTrue(unspents[0] in res)
         self.assertTrue(unspents[1] in res)
@@ -66,7 +67,7 @@ class LitecoinTransactionServiceSpec(unittest.TestCase):
         unspents.append({'amount': Decimal("0.2")})
         unspents.append({'amount': Decimal("0.7")})
 
-        res = self._transaction_service._fast_optimize_unspents(unspents, Decimal("1.2"))
+        res = self._transaction_service._fast_optimize_unspents(unspents, 120000000)
 
         self.assertTrue(unspents[0] in res)
         self.assertTrue(unspents[1] in res)
@@ -74,7 +75,15 @@ class LitecoinTransactionServiceSpec(unittest.TestCase):
         self.assertTrue(len(unspents), 3)
 
     def test_send_coin(self):
-        mock_unspents = [{'amount': Decimal("2")}, {'amount': Decimal("3")}]
+        mock_unspents = [{
+            'txid': 'a1',
+            'vout': 0,
+            'amount': Decimal("2")
+        }, {
+            'txid': 'a2',
+            'vout': 1,
+            'amount': Decimal("3")
+        }]
         mock_attempt = TransactionAttempt(
             currency="coin",
             fee=Decimal("0.02"),
@@ -108,3 +117,192 @@ class LitecoinTransactionServiceSpec(unittest.TestCase):
             self._ltc_proxy.sendrawtransaction.assert_called_once_with(mock_signed_raw_transaction['hex'])
             self.assertEqual(res, mock_transaction)
             self._ltc_chain_query_service.get_transaction.assert_called_once_with(mock_tx)
+
+    def test_send_coin_without_change(self):
+        mock_unspents = [{
+            'txid': 'a1',
+            'vout': 0,
+            'amount': Decimal("1.02001")
+        }, {
+            'txid': 'a2',
+            'vout': 1,
+            'amount': Decimal("3")
+        }]
+        mock_attempt = TransactionAttempt(
+            currency="coin",
+            fee=Decimal("0.02"),
+            receivers=[TransactionAttemptReceiver(address="2195378", amount=Decimal("1"))],
+            sender="29873587235")
+        transaction_service = LitecoinTransactionService(
+            ltc_proxy=cast(AuthServiceProxy, self._ltc_proxy),
+            ltc_chain_query_service=cast(LitecoinChainQueryService, self._ltc_chain_query_service),
+            coin_selector=BranchAndBoundCoinSelector(2000),
+            cost_of_change=2000)
+
+        self._ltc_proxy.listunspent.return_value = mock_unspents
+        self._ltc_proxy.signrawtransaction.return_value = {"hex": MagicMock()}
+
+        transaction_service.send_coin(mock_attempt, None)
+
+        self._ltc_proxy.createrawtransaction.assert_called_once_with([mock_unspents[0]], {"2195378": Decimal("1")})
+
+    def test_send_coin_merges_receivers_with_same_address(self):
+        mock_unspents = [{'txid': 'a1', 'vout': 0, 'amount': Decimal("5")}]
+        mock_attempt = TransactionAttempt(
+            currency="coin",
+            fee=Decimal("0.02"),
+            receivers=[
+                TransactionAttemptReceiver(address="2195378", amount=Decimal("1")),
+                TransactionAttemptReceiver(address="2195378", amount=Decimal("2"))
+            ],
+            sender="29873587235")
+
+        self._ltc_proxy.listunspent.return_value = mock_unspents
+        self._ltc_proxy.signrawtransaction.return_value = {"hex": MagicMock()}
+
+        self._transaction_service.send_coin(mock_attempt, None)
+
+        self._ltc_proxy.createrawtransaction.assert_called_once_with(mock_unspents, {
+            "2195378": Decimal("3"),
+            "29873587235": Decimal("1.98")
+        })
+
+    def test_send_coin_concurrently(self):
+        mock_unspents = [{
+            'txid': 'a1',
+            'vout': 0,
+            'amount': Decimal("2")
+        }, {
+            'txid': 'a2',
+            'vout': 1,
+            'amount': Decimal("2")
+        }]
+        mock_attempts = [
+            TransactionAttempt(
+                currency="coin",
+                fee=Decimal("0.02"),
+                receivers=[TransactionAttemptReceiver(address="receiver" + str(i), amount=Decimal("1"))],
+                sender="gateway") for i in range(0, 3)
+        ]
+
+        def sendrawtransaction(signed_transaction: str) -> str:
+            tx = 'tx' + str(self._ltc_proxy.sendrawtransaction.call_count)
+            gevent.sleep(0.01)
+            return tx
+
+        self._ltc_proxy.listunspent.return_value = mock_unspents
+        self._ltc_proxy.signrawtransaction.return_value = {"hex": MagicMock()}
+        self._ltc_proxy.sendrawtransaction.side_effect = sendrawtransaction
+
+        tasks = [gevent.spawn(self._transaction_service.send_coin, attempt, None) for attempt in mock_attempts[0:2]]
+        gevent.joinall(tasks, raise_error=True)
+
+        spent_inputs = [call[0][0][0] for call in self._ltc_proxy.createrawtransaction.call_args_list]
+        self.assertEqual(sorted(unspent['txid'] for unspent in spent_inputs), ['a1', 'a2'])
+
+        self._transaction_service.send_coin(mock_attempts[2], None)
+
+        change_input = self._ltc_proxy.createrawtransaction.call_args[0][0][0]
+        self.assertEqual(change_input['vout'], 1)
+        self.assertIn(change_input['txid'], ['tx1', 'tx2'])
+        self.assertEqual(change_input['amount'], Decimal("0.98"))
+
+    def test_send_coin_releases_unspents_on_failure(self):
+        mock_unspents = [{'txid': 'a1', 'vout': 0, 'amount': Decimal("2")}]
+        mock_attempt = TransactionAttempt(
+            currency="coin",
+            fee=Decimal("0.02"),
+            receivers=[TransactionAttemptReceiver(address="receiver", amount=Decimal("1"))],
+            sender="gateway")
+
+        self._ltc_proxy.listunspent.return_value = mock_unspents
+        self._ltc_proxy.signrawtransaction.return_value = {"hex": MagicMock()}
+        self._ltc_proxy.sendrawtransaction.side_effect = [Exception('rejected'), 'tx1']
+
+        with self.assertRaises(Exception):
+            self._transaction_service.send_coin(mock_attempt, None)
+
+        self._transaction_service.send_coin(mock_attempt, None)
+
+        self.assertEqual(self._ltc_proxy.createrawtransaction.call_count, 2)
+
+    def test_send_coin_discards_change_on_rejected_inputs(self):
+        mock_unspents = [{'txid': 'a1', 'vout': 0, 'amount': Decimal("2")}]
+        mock_attempt = TransactionAttempt(
+            currency="coin",
+            fee=Decimal("0.02"),
+            receivers=[TransactionAttemptReceiver(address="receiver", amount=Decimal("0.5"))],
+            sender="gateway")
+
+        self._ltc_proxy.listunspent.return_value = mock_unspents
+        self._ltc_proxy.signrawtransaction.return_value = {"hex": MagicMock()}
+        self._ltc_proxy.sendrawtransaction.side_effect = [
+            'tx1', JSONRPCException({
+                'code': -26,
+                'message': 'too-long-mempool-chain'
+            }), 'tx2'
+        ]
+        self._transaction_service.send_coin(mock_attempt, None)
+
+        # the first payout spent a1, so only its change is available
+        self._ltc_proxy.listunspent.return_value = []
+
+        with self.assertRaises(JSONRPCException):
+            self._transaction_service.send_coin(mock_attempt, None)
+
+        self.assertEqual(self._ltc_proxy.createrawtransaction.call_args[0][0][0]['txid'], 'tx1')
+
+        with self.assertRaisesRegex(Exception, 'Not suitable combination'):
+            self._transaction_service.send_coin(mock_attempt, None)
+
+    def test_send_coin_keeps_change_on_other_errors(self):
+        mock_attempt = TransactionAttempt(
+            currency="coin",
+            fee=Decimal("0.02"),
+            receivers=[TransactionAttemptReceiver(address="receiver", amount=Decimal("0.5"))],
+            sender="gateway")
+
+        self._ltc_proxy.listunspent.return_value = [{'txid': 'a1', 'vout': 0, 'amount': Decimal("2")}]
+        self._ltc_proxy.signrawtransaction.return_value = {"hex": MagicMock()}
+        self._ltc_proxy.sendrawtransaction.side_effect = [
+            'tx1', JSONRPCException({
+                'code': -28,
+                'message': 'Loading block index...'
+            }), 'tx2'
+        ]
+        self._transaction_service.send_coin(mock_attempt, None)
+        self._ltc_proxy.listunspent.return_value = []
+
+        with self.assertRaises(JSONRPCException):
+            self._transaction_service.send_coin(mock_attempt, None)
+
+        self._transaction_service.send_coin(mock_attempt, None)
+
+        self.assertEqual(self._ltc_proxy.createrawtransaction.call_args[0][0][0]['txid'], 'tx1')
+
+    def test_send_coin_uses_utxo_set(self):
+        utxo_set = MagicMock()
+        utxo_set.address = "gateway"
+        utxo_set.get_unspents.return_value = [{'txid': 'a1', 'vout': 0, 'amount': Decimal("2")}]
+        transaction_service = LitecoinTransactionService(
+            ltc_proxy=cast(AuthServiceProxy, self._ltc_proxy),
+            ltc_chain_query_service=cast(LitecoinChainQueryService, self._ltc_chain_query_service),
+            utxo_set=utxo_set)
+        mock_attempt = TransactionAttempt(
+            currency="coin",
+            fee=Decimal("0.02"),
+            receivers=[TransactionAttemptReceiver(address="receiver", amount=Decimal("1"))],
+            sender="gateway")
+
+        self._ltc_proxy.signrawtransaction.return_value = {"hex": MagicMock()}
+        self._ltc_proxy.sendrawtransaction.return_value = "tx1"
+
+        transaction_service.send_coin(mock_attempt, None)
+
+        self._ltc_proxy.listunspent.assert_not_called()
+        utxo_set.apply_payout.assert_called_once_with(utxo_set.get_unspents.return_value, [{
+            'txid': 'tx1',
+            'vout': 1,
+            'address': 'gateway',
+            'amount': Decimal("0.98")
+        }])
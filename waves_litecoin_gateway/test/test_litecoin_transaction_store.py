@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import unittest
+from decimal import Decimal
+
+import gevent
+
+from waves_litecoin_gateway.lib import LitecoinTransactionStore
+
+
+class LitecoinTransactionStoreTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, 'transactions.sqlite')
+        self._transaction_store = LitecoinTransactionStore(self._path, max_transactions=2)
+
+    def tearDown(self):
+        self._transaction_store.close()
+        shutil.rmtree(self._directory)
+
+    def _create_transaction(self, txid: str) -> dict:
+        return {
+            'txid':
+            txid,
+            'vin': [{
+                'coinbase': '04ffff001d0104',
+                'sequence': 4294967295
+            }],
+            'vout': [{
+                'value': Decimal('50.00100000'),
+                'n': 0,
+                'scriptPubKey': {
+                    'addresses': ['n4UtgQSUHQUTDgiDkEmgYJvFqNBrcmQYc2']
+                }
+            }]
+        }
+
+    def test_put_transaction(self):
+        transaction = self._create_transaction('ab' * 32)
+
+        self._transaction_store.put_transaction(transaction)
+
+        stored_transaction = self._transaction_store.get_transaction('ab' * 32)
+
+        self.assertEqual(stored_transaction, transaction)
+        self.assertIsInstance(stored_transaction['vout'][0]['value'], Decimal)
+        self.assertIsNone(self._transaction_store.get_transaction('cd' * 32))
+
+    def test_get_transactions(self):
+        self._transaction_store.put_transactions(
+            [self._create_transaction('ab' * 32),
+             self._create_transaction('cd' * 32)])
+
+        transactions = self._transaction_store.get_transactions(['ab' * 32, 'ef' * 32, 'cd' * 32])
+
+        self.assertEqual(sorted(transactions.keys()), ['ab' * 32, 'cd' * 32])
+        self.assertEqual(transactions['cd' * 32], self._create_transaction('cd' * 32))
+
+    def test_transactions_survive_restart(self):
+        self._transaction_store.put_transaction(self._create_transaction('ab' * 32))
+        self._transaction_store.close()
+
+        self._transaction_store = LitecoinTransactionStore(self._path)
+
+        self.assertEqual(self._transaction_store.get_transaction('ab' * 32), self._create_transaction('ab' * 32))
+
+    def test_compact(self):
+        self._transaction_store.put_transactions([self._create_transaction(txid) for txid in ['ab', 'cd', 'ef']])
+
+        self.assertEqual(len(self._transaction_store), 3)
+        self.assertEqual(self._transaction_store.compact(), 1)
+        self.assertEqual(len(self._transaction_store), 2)
+        self.assertIsNone(self._transaction_store.get_transaction('ab'))
+        self.assertIsNotNone(self._transaction_store.get_transaction('ef'))
+        self.assertEqual(self._transaction_store.compact(), 0)
+
+    def test_count_ignores_stored_transactions_and_survives_restart(self):
+        self._transaction_store.put_transactions([self._create_transaction(txid) for txid in ['ab', 'cd']])
+        self._transaction_store.put_transactions([self._create_transaction(txid) for txid in ['cd', 'ef']])
+
+        self.assertEqual(len(self._transaction_store), 3)
+
+        self._transaction_store.close()
+        self._transaction_store = LitecoinTransactionStore(self._path)
+
+        self.assertEqual(len(self._transaction_store), 3)
+
+    def test_statements_do_not_block_other_greenlets(self):
+        other_greenlet = gevent.spawn(lambda: None)
+
+        self._transaction_store.put_transaction(self._create_transaction('ab'))
+
+        self.assertTrue(other_greenlet.dead)
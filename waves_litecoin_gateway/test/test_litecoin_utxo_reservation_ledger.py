@@ -0,0 +1,82 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+from waves_litecoin_gateway.lib import LitecoinUtxoReservationLedger
+
+
+class LitecoinUtxoReservationLedgerTest(unittest.TestCase):
+    def setUp(self):
+        self._ledger = LitecoinUtxoReservationLedger(spent_ttl_s=60, change_ttl_s=600)
+        self._unspents = [{
+            'txid': 'a1',
+            'vout': 0,
+            'address': 'gateway',
+            'amount': Decimal('1')
+        }, {
+            'txid': 'a2',
+            'vout': 1,
+            'address': 'gateway',
+            'amount': Decimal('2')
+        }]
+
+    def test_reserve(self):
+        self.assertTrue(self._ledger.reserve([self._unspents[0]]))
+        self.assertFalse(self._ledger.reserve(self._unspents))
+        self.assertEqual(self._ledger.get_available_unspents('gateway', self._unspents), [self._unspents[1]])
+        self.assertEqual(self._ledger.reserved, 1)
+
+    def test_release(self):
+        self._ledger.reserve(self._unspents)
+        self._ledger.release(self._unspents)
+
+        self.assertEqual(self._ledger.get_available_unspents('gateway', self._unspents), self._unspents)
+
+    def test_spend_adds_change(self):
+        change = {'txid': 'b1', 'vout': 1, 'address': 'gateway', 'amount': Decimal('0.5')}
+        self._ledger.reserve([self._unspents[0]])
+        self._ledger.spend([self._unspents[0]], [change])
+
+        self.assertEqual(self._ledger.get_available_unspents('gateway', self._unspents), [self._unspents[1], change])
+        self.assertEqual(self._ledger.get_available_unspents('other', []), [])
+        self.assertEqual(self._ledger.reserved, 0)
+
+    def test_listed_change_is_not_duplicated(self):
+        change = {'txid': 'b1', 'vout': 1, 'address': 'gateway', 'amount': Decimal('0.5')}
+        self._ledger.spend([self._unspents[0]], [change])
+
+        self.assertEqual(self._ledger.get_available_unspents('gateway', [change]), [change])
+        self.assertEqual(self._ledger.get_available_unspents('gateway', []), [])
+
+    @patch('time.monotonic')
+    def test_spent_outputs_expire(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        self._ledger.spend([self._unspents[0]], [])
+
+        self.assertEqual(self._ledger.get_available_unspents('gateway', self._unspents), [self._unspents[1]])
+
+        mock_monotonic.return_value = 161.0
+
+        self.assertEqual(self._ledger.get_available_unspents('gateway', self._unspents), self._unspents)
+
+    @patch('time.monotonic')
+    def test_change_expires(self, mock_monotonic):
+        change = {'txid': 'b1', 'vout': 1, 'address': 'gateway', 'amount': Decimal('0.5')}
+        mock_monotonic.return_value = 100.0
+        self._ledger.spend([self._unspents[0]], [change])
+
+        self.assertEqual(self._ledger.get_available_unspents('gateway', []), [change])
+
+        mock_monotonic.return_value = 701.0
+
+        self.assertEqual(self._ledger.get_available_unspents('gateway', []), [])
+
+    def test_discard_change(self):
+        change = {'txid': 'b1', 'vout': 1, 'address': 'gateway', 'amount': Decimal('0.5')}
+        self._ledger.spend([self._unspents[0]], [change])
+        self._ledger.reserve([change, self._unspents[1]])
+        self._ledger.release([change, self._unspents[1]])
+
+        self._ledger.discard_change([change, self._unspents[1]])
+
+        self.assertEqual(self._ledger.get_available_unspents('gateway', [self._unspents[1]]), [self._unspents[1]])
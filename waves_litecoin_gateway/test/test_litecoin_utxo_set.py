@@ -0,0 +1,114 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from waves_litecoin_gateway.lib import LitecoinUtxoSet
+
+
+class LitecoinUtxoSetTest(unittest.TestCase):
+    def setUp(self):
+        self._ltc_proxy = MagicMock()
+        self._utxo_set = LitecoinUtxoSet(self._ltc_proxy, 'gateway', reconciliation_interval_s=60)
+        self._unspents = [{
+            'txid': 'a1',
+            'vout': 0,
+            'address': 'gateway',
+            'amount': Decimal('1')
+        }, {
+            'txid': 'a2',
+            'vout': 1,
+            'address': 'gateway',
+            'amount': Decimal('2')
+        }]
+        self._ltc_proxy.listunspent.return_value = self._unspents
+
+    @patch('time.monotonic')
+    def test_get_unspents_reconciles_periodically(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+
+        self.assertEqual(self._utxo_set.get_unspents(), self._unspents)
+        self.assertEqual(self._utxo_set.get_unspents(), self._unspents)
+        self._ltc_proxy.listunspent.assert_called_once_with(None, None, ['gateway'])
+
+        mock_monotonic.return_value = 161.0
+        self._utxo_set.get_unspents()
+
+        self.assertEqual(self._ltc_proxy.listunspent.call_count, 2)
+
+    def test_apply_transaction(self):
+        self._utxo_set.get_unspents()
+
+        self._utxo_set.apply_transaction({
+            'txid':
+            'b1',
+            'vin': [{
+                'txid': 'a1',
+                'vout': 0
+            }],
+            'vout': [{
+                'value': Decimal('0.4'),
+                'n': 0,
+                'scriptPubKey': {
+                    'hex': '76a9',
+                    'addresses': ['other']
+                }
+            }, {
+                'value': Decimal('0.5'),
+                'n': 1,
+                'scriptPubKey': {
+                    'hex': '76a9',
+                    'addresses': ['gateway']
+                }
+            }]
+        })
+
+        self.assertEqual(self._utxo_set.get_unspents(), [
+            self._unspents[1], {
+                'txid': 'b1',
+                'vout': 1,
+                'address': 'gateway',
+                'scriptPubKey': '76a9',
+                'amount': Decimal('0.5')
+            }
+        ])
+
+    def test_apply_payout(self):
+        change = {'txid': 'b1', 'vout': 1, 'address': 'gateway', 'amount': Decimal('0.5')}
+        self._utxo_set.get_unspents()
+
+        self._utxo_set.apply_payout([self._unspents[0]], [change])
+
+        self.assertEqual(self._utxo_set.get_unspents(), [self._unspents[1], change])
+
+    def test_scanned_output_spent_by_payout_is_not_added(self):
+        self._utxo_set.get_unspents()
+        self._utxo_set.apply_payout([{'txid': 'c1', 'vout': 0}], [])
+
+        self._utxo_set.apply_transaction({
+            'txid':
+            'c1',
+            'vin': [],
+            'vout': [{
+                'value': Decimal('0.5'),
+                'n': 0,
+                'scriptPubKey': {
+                    'addresses': ['gateway']
+                }
+            }]
+        })
+
+        self.assertEqual(len(self._utxo_set), 2)
+
+    def test_reconcile_ignores_outputs_spent_by_payout(self):
+        self._utxo_set.apply_payout([self._unspents[0]], [])
+
+        self.assertEqual(self._utxo_set.get_unspents(), [self._unspents[1]])
+
+    def test_invalidate(self):
+        self._utxo_set.get_unspents()
+        self._utxo_set.apply_payout([], [{'txid': 'b1', 'vout': 1, 'address': 'gateway', 'amount': Decimal('0.5')}])
+
+        self._utxo_set.invalidate()
+
+        self.assertEqual(self._utxo_set.get_unspents(), self._unspents)
+        self.assertEqual(self._ltc_proxy.listunspent.call_count, 2)
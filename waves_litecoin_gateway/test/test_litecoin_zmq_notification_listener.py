@@ -0,0 +1,67 @@
+import unittest
+
+import gevent
+from gevent.event import AsyncResult
+
+from waves_litecoin_gateway.lib import LitecoinZmqNotificationListener
+
+try:
+    import zmq.green as zmq
+except ImportError:
+    zmq = None
+
+
+@unittest.skipIf(zmq is None, 'pyzmq is not installed')
+class LitecoinZmqNotificationListenerTest(unittest.TestCase):
+    def setUp(self):
+        self._endpoint = 'inproc://litecoin-notifications-' + str(id(self))
+        self._publisher = zmq.Context.instance().socket(zmq.PUB)
+        self._publisher.bind(self._endpoint)
+        self._block_hash = AsyncResult()
+        self._raw_transaction = AsyncResult()
+        self._listener = LitecoinZmqNotificationListener([self._endpoint], self._block_hash.set,
+                                                         self._raw_transaction.set)
+        self._listener.start()
+
+    def tearDown(self):
+        self._listener.stop()
+        self._publisher.close(linger=0)
+
+    def _publish(self, topic: bytes, body: bytes, result: AsyncResult):
+        # the subscription reaches the publisher asynchronously, so the first messages may be dropped
+        for sequence in range(0, 100):
+            self._publisher.send_multipart([topic, body, sequence.to_bytes(4, 'little')])
+
+            if result.wait(0.01) is not None:
+                return
+
+    def test_block_hash(self):
+        self._publish(b'hashblock', bytes.fromhex('ab' * 32), self._block_hash)
+
+        self.assertEqual(self._block_hash.get(timeout=1), 'ab' * 32)
+
+    def test_raw_transaction(self):
+        self._publish(b'rawtx', b'\x01\x02', self._raw_transaction)
+
+        self.assertEqual(self._raw_transaction.get(timeout=1), b'\x01\x02')
+
+    def test_handler_errors_do_not_stop_listener(self):
+        calls = list()
+        result = AsyncResult()
+
+        def on_block_hash(block_hash: str):
+            calls.append(block_hash)
+
+            if len(calls) == 1:
+                raise ValueError('first notification fails')
+
+            result.set(block_hash)
+
+        self._listener.stop()
+        self._listener = LitecoinZmqNotificationListener([self._endpoint], on_block_hash)
+        self._listener.start()
+        gevent.sleep(0.01)
+
+        self._publish(b'hashblock', bytes.fromhex('cd' * 32), result)
+
+        self.assertEqual(result.get(timeout=1), 'cd' * 32)